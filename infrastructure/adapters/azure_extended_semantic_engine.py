@@ -6,15 +6,256 @@ multiple cloud services and their GCP equivalents from both AWS and Azure.
 """
 
 import ast
+import hashlib
 import re
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
 from abc import ABC, abstractmethod
 
-from infrastructure.adapters.service_mapping import ServiceMapper, ServiceMigrationMapping
+from infrastructure.adapters.service_mapping import ServiceMapper, ServiceMigrationMapping, ExtendedCodeAnalyzer
 from infrastructure.adapters.azure_mapping import AzureServiceMapper, AzureToGCPServiceMapping
+from infrastructure.adapters.result_cache import LRUCache
 from domain.value_objects import AWSService, GCPService, AzureService
 
 
+# Superset of the tokens touched by the Azure-specific steps of
+# AzureExtendedASTTransformationEngine._aggressive_azure_cleanup, so
+# AWS-only code can skip those passes with a single scan
+_AZURE_CLEANUP_HINT_RE = re.compile(
+    r'azure|(?:blobservice|blob|container|cosmos|servicebus|eventhubproducer)client'
+    r'|_blob\(|_(?:blob|container)_client\(|func\.http',
+    re.IGNORECASE
+)
+
+# Superset of the tokens touched by AzureExtendedGoTransformer._aggressive_azure_cleanup
+_GO_AZURE_CLEANUP_HINT_RE = re.compile(
+    r'azure|blob|container_client|from_connection_string\(|\.readall\(\)',
+    re.IGNORECASE
+)
+
+# AWS regions commented out / stripped by the S3 migration, matched in one pass
+_AWS_REGIONS = (
+    'us-east-1', 'us-east-2', 'us-west-1', 'us-west-2',
+    'eu-west-1', 'eu-west-2', 'eu-west-3', 'eu-central-1',
+    'ap-southeast-1', 'ap-southeast-2', 'ap-northeast-1', 'ap-northeast-2',
+    'ap-south-1', 'sa-east-1', 'ca-central-1'
+)
+_AWS_REGION_ALTERNATION = '|'.join(re.escape(region) for region in _AWS_REGIONS)
+_AWS_REGION_ASSIGN_RE = re.compile(
+    rf'\b(\w+)\s*=\s*[\'"](?P<region>{_AWS_REGION_ALTERNATION})[\'"]'
+)
+_AWS_REGION_KWARG_LEADING_COMMA_RE = re.compile(
+    rf',\s*region_name=[\'"]?(?:{_AWS_REGION_ALTERNATION})[\'"]?'
+)
+_AWS_REGION_KWARG_TRAILING_COMMA_RE = re.compile(
+    rf'region_name=[\'"]?(?:{_AWS_REGION_ALTERNATION})[\'"]?\s*,'
+)
+# region_name arguments passed as a variable
+_AWS_REGION_VARIABLE_KWARG_LEADING_COMMA_RE = re.compile(r',\s*region_name=\w+')
+_AWS_REGION_VARIABLE_KWARG_TRAILING_COMMA_RE = re.compile(r'region_name=\w+\s*,')
+# "name = boto3.client('s3', ...)" assignments; group 1 is the client variable
+_AWS_S3_CLIENT_ASSIGN_RE = re.compile(r'\b(\w+)\s*=\s*boto3\.client\([\'\"]s3[\'\"][^)]*\)')
+
+# A bare "import boto3" line or the "from boto3" prefix of an import, matched in
+# one scan by the AWS migrations' import rewrites
+_BOTO3_IMPORT_RE = re.compile(r'^(?:import boto3\s*$|from boto3)', re.MULTILINE)
+
+
+# Attribute calls (".name(") made by a source file, collected in one pass so
+# the per-method rewrites below only run for methods the code calls
+_ATTRIBUTE_CALL_RE = re.compile(r'\.(\w+)\(')
+
+
+def _apply_call_rewrites(code: str, rewrites) -> str:
+    """
+    Apply a (method, pattern, replacement) table to code.
+    
+    Only rules whose method the code calls are used. Their matches are
+    collected against the original code and spliced in with a single join;
+    if any matches overlap, later rules depend on earlier rewrites, so the
+    rules are applied one after another instead.
+    """
+    called = set(_ATTRIBUTE_CALL_RE.findall(code))
+    active = [(pattern, replacement) for method, pattern, replacement in rewrites if method in called]
+    edits = []
+    for order, (pattern, replacement) in enumerate(active):
+        edits.extend(
+            (match.start(), order, match.end(), match.expand(replacement))
+            for match in pattern.finditer(code)
+        )
+    if not edits:
+        return code
+    
+    edits.sort()
+    parts = []
+    position = 0
+    for start, _, end, replacement in edits:
+        if start < position:
+            for pattern, replacement in active:
+                code = pattern.sub(replacement, code)
+            return code
+        parts.append(code[position:start])
+        parts.append(replacement)
+        position = end
+    parts.append(code[position:])
+    return ''.join(parts)
+
+# (boto3 method, pattern, replacement) for _migrate_aws_s3_to_gcs, in application order
+_AWS_S3_CALL_REWRITES = (
+    # upload_file -> GCS upload_from_filename
+    ('upload_file', re.compile(
+        r'\b(\w+)\.upload_file\([\'\"]([^\'\"]+)[\'\"],\s*[\'\"]([^\'\"]+)[\'\"],\s*[\'\"]([^\'\"]+)[\'\"]\)'),
+     r'bucket = \1.bucket("\3")\n    blob = bucket.blob("\4")\n    blob.upload_from_filename("\2")'),
+    # download_file -> GCS download_to_filename
+    ('download_file', re.compile(
+        r'\b(\w+)\.download_file\([\'\"]([^\'\"]+)[\'\"],\s*[\'\"]([^\'\"]+)[\'\"],\s*[\'\"]([^\'\"]+)[\'\"]\)'),
+     r'bucket = \1.bucket("\2")\n    blob = bucket.blob("\3")\n    blob.download_to_filename("\4")'),
+    # put_object -> GCS upload
+    ('put_object', re.compile(r'\b(\w+)\.put_object\(Bucket=([^,]+),\s*Key=([^,]+),\s*Body=([^,\)]+)'),
+     r'bucket = \1.bucket(\2)\n    blob = bucket.blob(\3)\n    blob.upload_from_string(\4)'),
+    # get_object -> GCS download
+    ('get_object', re.compile(r'\b(\w+)\.get_object\(Bucket=([^,]+),\s*Key=([^,\)]+)\)'),
+     r'bucket = \1.bucket(\2)\n    blob = bucket.blob(\3)\n    content = blob.download_as_text()'),
+    # delete_object -> GCS delete
+    ('delete_object', re.compile(r'\b(\w+)\.delete_object\(Bucket=([^,]+),\s*Key=([^,\)]+)\)'),
+     r'bucket = \1.bucket(\2)\n    blob = bucket.blob(\3)\n    blob.delete()'),
+    # list_objects_v2 / list_objects -> GCS list_blobs
+    ('list_objects_v2', re.compile(r'\b(\w+)\.list_objects_v2\(Bucket=([^,\)]+)\)'),
+     r'bucket = \1.bucket(\2)\n    blobs = list(bucket.list_blobs())'),
+    ('list_objects', re.compile(r'\b(\w+)\.list_objects\(Bucket=([^,\)]+)\)'),
+     r'bucket = \1.bucket(\2)\n    blobs = list(bucket.list_blobs())'),
+    # list_buckets: assignment form first, then direct calls not already wrapped in list()
+    ('list_buckets', re.compile(r'\b(\w+)\s*=\s*(\w+)\.list_buckets\(\)'),
+     r'\1 = list(\2.list_buckets())'),
+    ('list_buckets', re.compile(r'\b(\w+)\.list_buckets\(\)(?!\s*\))'),
+     r'list(\1.list_buckets())'),
+    # create_bucket, dropping CreateBucketConfiguration
+    ('create_bucket', re.compile(r'\b(\w+)\.create_bucket\(Bucket=([^,]+)(?:,\s*CreateBucketConfiguration=[^\)]+)?\)'),
+     r'\1.create_bucket(\2)'),
+    ('create_bucket', re.compile(r'\b(\w+)\.create_bucket\(Bucket=([^,\)]+)\)'),
+     r'\1.create_bucket(\2)'),
+    # delete_bucket -> GCS bucket.delete
+    ('delete_bucket', re.compile(r'\b(\w+)\.delete_bucket\(Bucket=([^,\)]+)\)'),
+     r'bucket = \1.bucket(\2)\n    bucket.delete()'),
+)
+
+# (boto3 method, pattern, replacement) for _migrate_aws_lambda_to_cloud_functions
+_AWS_LAMBDA_CALL_REWRITES = (
+    # invoke -> HTTP or Pub/Sub trigger note
+    ('invoke', re.compile(
+        r'\b(\w+)\.invoke\(FunctionName=([^,]+),\s*InvocationType=([^,]+)?,\s*Payload=([^,\)]+)\)'),
+     r'# Cloud Functions invocation via HTTP or Pub/Sub\n# Function: \2\n# Payload: \4'),
+    # create_function -> deployment note
+    ('create_function', re.compile(
+        r'\b(\w+)\.create_function\(FunctionName=([^,]+),\s*Runtime=([^,]+),\s*Role=([^,]+),\s*Handler=([^,]+),\s*Code=([^,\)]+)\)'),
+     r'# Cloud Functions deployment via gcloud or Cloud Build\n# Function name: \2\n# Runtime: \3\n# Entry point: \5'),
+)
+
+# (boto3 method, pattern, replacement) for the application-code mode of
+# _migrate_aws_dynamodb_to_firestore, in application order
+_AWS_DYNAMODB_CALL_REWRITES = (
+    # table.put_item() -> collection.add() or document.set()
+    ('put_item', re.compile(r'\b(\w+)\.put_item\(Item=([^,\)]+)\)'),
+     r'doc_ref = \1.document()\n    doc_ref.set(\2)'),
+    ('put_item', re.compile(r'\b(\w+)\.put_item\(TableName=([^,]+),\s*Item=([^,\)]+)\)'),
+     r'db.collection(\2).document().set(\3)'),
+    # table.get_item() -> document.get()
+    ('get_item', re.compile(r'\b(\w+)\.get_item\(Key=([^,\)]+)\)'),
+     r'doc_ref = \1.document(\2)\n    doc = doc_ref.get()'),
+    ('get_item', re.compile(r'\b(\w+)\.get_item\(TableName=([^,]+),\s*Key=([^,\)]+)\)'),
+     r'doc = db.collection(\2).document(\3).get()'),
+    # table.query() -> collection.where()
+    ('query', re.compile(r'\b(\w+)\.query\(KeyConditionExpression=([^,\)]+)\)'),
+     r'query = \1.where(\2)\n    results = query.stream()'),
+    ('query', re.compile(r'\b(\w+)\.query\(TableName=([^,]+),\s*KeyConditionExpression=([^,\)]+)\)'),
+     r'query = db.collection(\2).where(\3)\n    results = query.stream()'),
+    # table.delete_item() -> document.delete()
+    ('delete_item', re.compile(r'\b(\w+)\.delete_item\(Key=([^,\)]+)\)'),
+     r'\1.document(\2).delete()'),
+)
+
+# botocore exception imports/usages rewritten by _rewrite_botocore_exceptions
+_BOTOCORE_IMPORT_BOTH_RE = re.compile(
+    r'from botocore\.exceptions import\s+(?:NoCredentialsError,\s*ClientError|ClientError,\s*NoCredentialsError)'
+)
+_BOTOCORE_IMPORT_NO_CREDENTIALS_RE = re.compile(r'from botocore\.exceptions import\s+NoCredentialsError\b')
+_BOTOCORE_IMPORT_CLIENT_ERROR_RE = re.compile(r'from botocore\.exceptions import\s+ClientError\b')
+_NO_CREDENTIALS_ERROR_RE = re.compile(r'\bNoCredentialsError\b')
+_CLIENT_ERROR_RE = re.compile(r'\bClientError\b')
+
+# Service keys from ExtendedCodeAnalyzer.identify_all_cloud_services_usage
+# ("azure_<name>" / "aws_<name>") resolved to enum members by member name
+_AZURE_SERVICE_BY_KEY = {f'azure_{service.name.lower()}': service for service in AzureService}
+_AWS_SERVICE_BY_KEY = {f'aws_{service.name.lower()}': service for service in AWSService}
+
+# DynamoDB -> Firestore migration-script rewrites (reads stay on DynamoDB,
+# writes move to Firestore); see _migrate_aws_dynamodb_to_firestore
+_DYNAMODB_INIT_RE = re.compile(r'\b(\w+)\s*=\s*boto3\.(resource|client)\([\'\"]dynamodb[\'\"][^\)]*\)')
+_DYNAMODB_PUT_ITEM_RE = re.compile(r'\b(\w+)\.put_item\(\s*Item\s*=\s*([^\)]+)\)', re.DOTALL)
+_DYNAMODB_BATCH_WRITE_RE = re.compile(
+    r'\b(\w+)\.batch_write_item\(\s*RequestItems\s*=\s*\{[^}]+\}\s*\)',
+    re.DOTALL
+)
+
+_FIRESTORE_INIT_SNIPPET = '''
+
+# Initialize Firestore for writing
+if not firebase_admin._apps:
+    cred = credentials.Certificate(GOOGLE_KEY_PATH)
+    firebase_admin.initialize_app(cred)
+
+firestore_db = firestore.Client()'''
+
+_FIRESTORE_BATCH_WRITE_SNIPPET = '''# Convert DynamoDB batch write to Firestore batch
+    batch = firestore_db.batch()
+    collection_ref = firestore_db.collection(FIRESTORE_COLLECTION)
+    for item in items:
+        clean_item = convert_decimal(item)  # Convert Decimal types
+        doc_id = clean_item.get(PRIMARY_KEY_FIELD, None)
+        if doc_id:
+            doc_ref = collection_ref.document(str(doc_id))
+        else:
+            doc_ref = collection_ref.document()
+        batch.set(doc_ref, clean_item)
+    batch.commit()'''
+
+
+def _add_firestore_init(match) -> str:
+    """Keep the DynamoDB client line and append Firestore initialization"""
+    return match.group(0) + _FIRESTORE_INIT_SNIPPET
+
+
+def _replace_put_item(match) -> str:
+    """Turn a DynamoDB put_item() call into a Firestore document set()"""
+    item = match.group(2)
+    return f'# Write to Firestore\n    doc_ref = firestore_db.collection(FIRESTORE_COLLECTION).document()\n    doc_ref.set({item})'
+
+
+def _replace_batch_write(match) -> str:
+    """Turn a DynamoDB batch_write_item() call into a Firestore batch"""
+    return _FIRESTORE_BATCH_WRITE_SNIPPET
+
+
+# Sources longer than this are parsed every time rather than kept alive by
+# the syntax check cache
+_MAX_CACHED_CODE_LENGTH = 64 * 1024
+
+
+@lru_cache(maxsize=4096)
+def _cached_syntax_check(code: str) -> bool:
+    """ast.parse code, remembering sources that parse; a SyntaxError is not cached"""
+    ast.parse(code)
+    return True
+
+
+def _check_python_syntax(code: str) -> None:
+    """Raise SyntaxError if code does not parse as Python"""
+    if len(code) > _MAX_CACHED_CODE_LENGTH:
+        ast.parse(code)
+    else:
+        _cached_syntax_check(code)
+
+
 class AzureExtendedASTTransformationEngine:
     """
     Extended Semantic Refactoring Engine supporting multiple cloud services
@@ -22,25 +263,37 @@ class AzureExtendedASTTransformationEngine:
     Supports migration of various AWS and Azure services to their GCP equivalents.
     """
     
-    def __init__(self):
-        self.aws_service_mapper = ServiceMapper()
-        self.azure_service_mapper = AzureServiceMapper()
+    def __init__(self, aws_service_mapper: Optional[ServiceMapper] = None,
+                 azure_service_mapper: Optional[AzureServiceMapper] = None):
+        self.aws_service_mapper = aws_service_mapper if aws_service_mapper is not None else ServiceMapper()
+        self.azure_service_mapper = azure_service_mapper if azure_service_mapper is not None else AzureServiceMapper()
+        # Set when a Gemini transformation falls back to the source; such
+        # results are not cached, so a later call can succeed
+        self._used_fallback = False
+        go_transformer = AzureExtendedGoTransformer(self.aws_service_mapper, self.azure_service_mapper)  # Uses Gemini API
         self.transformers = {
             'python': AzureExtendedPythonTransformer(self.aws_service_mapper, self.azure_service_mapper),
             'java': AzureExtendedJavaTransformer(self.aws_service_mapper, self.azure_service_mapper),  # Simplified implementation
-            'go': AzureExtendedGoTransformer(self.aws_service_mapper, self.azure_service_mapper),  # Uses Gemini API
-            'golang': AzureExtendedGoTransformer(self.aws_service_mapper, self.azure_service_mapper)  # Alias
+            'go': go_transformer,
+            'golang': go_transformer  # Alias
         }
     
+    @property
+    def used_fallback(self) -> bool:
+        """Whether the last transform_code call fell back after Gemini failed"""
+        return self._used_fallback
+    
     def transform_code(self, code: str, language: str, transformation_recipe: Dict[str, Any]) -> tuple[str, dict]:
         """
         Transform code based on the transformation recipe
         Ensures the output is syntactically correct and contains no AWS/Azure references.
+        used_fallback reports afterwards whether this call fell back.
         
         Returns:
             tuple: (transformed_code, variable_mapping) where variable_mapping is a dict
                    mapping old variable names to new variable names
         """
+        self._used_fallback = False
         # Check if code is shell/bash script with Azure CLI commands FIRST (before language check)
         is_shell_script = (
             code.strip().startswith('#!') or
@@ -377,6 +630,7 @@ class AzureExtendedASTTransformationEngine:
             
             if not Config.GEMINI_API_KEY:
                 logger.warning("GEMINI_API_KEY not set, falling back to regex")
+                self._used_fallback = True
                 return code
             
             genai.configure(api_key=Config.GEMINI_API_KEY)
@@ -451,6 +705,7 @@ class AzureExtendedASTTransformationEngine:
             
         except Exception as e:
             logger.warning(f"Gemini Azure transformation failed: {e}, falling back to regex")
+            self._used_fallback = True
             return code
     
     def _build_azure_transformation_prompt(self, code: str, service_type: str, target_api: str, retry: bool = False) -> str:
@@ -647,33 +902,33 @@ When generating the refactored code, you MUST follow Clean Architecture principl
     def _aggressive_go_azure_cleanup(self, code: str) -> str:
         """Aggressive cleanup of Azure patterns in Go code"""
         # Remove Azure SDK imports
-        code = re.sub(r'github\.com/Azure/azure-sdk-for-go/sdk/storage/azblob', 'cloud.google.com/go/storage', code)
-        code = re.sub(r'github\.com/Azure/azure-sdk-for-go/sdk/data/azcosmos', 'cloud.google.com/go/firestore', code)
-        code = re.sub(r'github\.com/Azure/azure-sdk-for-go/sdk/messaging/azservicebus', 'cloud.google.com/go/pubsub', code)
-        code = re.sub(r'github\.com/Azure/azure-event-hubs-go', 'cloud.google.com/go/pubsub', code)
-        code = re.sub(r'github\.com/Azure/azure-sdk-for-go/sdk/keyvault/azsecrets', 'cloud.google.com/go/secretmanager/apiv1', code)
-        code = re.sub(r'github\.com/Azure/azure-sdk-for-go/sdk/monitor', 'cloud.google.com/go/monitoring/apiv3', code)
+        code = code.replace('github.com/Azure/azure-sdk-for-go/sdk/storage/azblob', 'cloud.google.com/go/storage')
+        code = code.replace('github.com/Azure/azure-sdk-for-go/sdk/data/azcosmos', 'cloud.google.com/go/firestore')
+        code = code.replace('github.com/Azure/azure-sdk-for-go/sdk/messaging/azservicebus', 'cloud.google.com/go/pubsub')
+        code = code.replace('github.com/Azure/azure-event-hubs-go', 'cloud.google.com/go/pubsub')
+        code = code.replace('github.com/Azure/azure-sdk-for-go/sdk/keyvault/azsecrets', 'cloud.google.com/go/secretmanager/apiv1')
+        code = code.replace('github.com/Azure/azure-sdk-for-go/sdk/monitor', 'cloud.google.com/go/monitoring/apiv3')
         
         # Replace Azure client creation
-        code = re.sub(r'azblob\.NewClient\(', 'storage.NewClient(', code)
-        code = re.sub(r'azcosmos\.NewClientWithKey\(', 'firestore.NewClient(', code)
-        code = re.sub(r'azservicebus\.NewClientWithConnectionString\(', 'pubsub.NewClient(', code)
-        code = re.sub(r'azsecrets\.NewClient\(', 'secretmanager.NewClient(', code)
+        code = code.replace('azblob.NewClient(', 'storage.NewClient(')
+        code = code.replace('azcosmos.NewClientWithKey(', 'firestore.NewClient(')
+        code = code.replace('azservicebus.NewClientWithConnectionString(', 'pubsub.NewClient(')
+        code = code.replace('azsecrets.NewClient(', 'secretmanager.NewClient(')
         
         # Replace Azure method calls
-        code = re.sub(r'\.UploadBuffer\(', '.NewWriter(ctx); w.Write(', code)
-        code = re.sub(r'\.DownloadBuffer\(', '.NewReader(ctx); io.Copy(', code)
-        code = re.sub(r'\.CreateItem\(', '.Set(ctx, ', code)
-        code = re.sub(r'\.ReadItem\(', '.Get(ctx)', code)
-        code = re.sub(r'\.SendMessage\(', '.Publish(ctx, &pubsub.Message', code)
-        code = re.sub(r'\.GetSecret\(', '.AccessSecretVersion(ctx, req)', code)
-        code = re.sub(r'\.SetSecret\(', '.CreateSecret(ctx, req)', code)
+        code = code.replace('.UploadBuffer(', '.NewWriter(ctx); w.Write(')
+        code = code.replace('.DownloadBuffer(', '.NewReader(ctx); io.Copy(')
+        code = code.replace('.CreateItem(', '.Set(ctx, ')
+        code = code.replace('.ReadItem(', '.Get(ctx)')
+        code = code.replace('.SendMessage(', '.Publish(ctx, &pubsub.Message')
+        code = code.replace('.GetSecret(', '.AccessSecretVersion(ctx, req)')
+        code = code.replace('.SetSecret(', '.CreateSecret(ctx, req)')
         
         # Replace Azure environment variables
-        code = re.sub(r'AZURE_STORAGE_CONNECTION_STRING', 'GOOGLE_APPLICATION_CREDENTIALS', code)
-        code = re.sub(r'COSMOS_ENDPOINT', 'GOOGLE_CLOUD_PROJECT', code)
-        code = re.sub(r'AZURE_KEY_VAULT_URL', 'GOOGLE_CLOUD_PROJECT', code)
-        code = re.sub(r'APPINSIGHTS_INSTRUMENTATION_KEY', 'GOOGLE_CLOUD_PROJECT', code)
+        code = code.replace('AZURE_STORAGE_CONNECTION_STRING', 'GOOGLE_APPLICATION_CREDENTIALS')
+        code = code.replace('COSMOS_ENDPOINT', 'GOOGLE_CLOUD_PROJECT')
+        code = code.replace('AZURE_KEY_VAULT_URL', 'GOOGLE_CLOUD_PROJECT')
+        code = code.replace('APPINSIGHTS_INSTRUMENTATION_KEY', 'GOOGLE_CLOUD_PROJECT')
         
         return code
     
@@ -736,70 +991,73 @@ When generating the refactored code, you MUST follow Clean Architecture principl
         This ensures zero Azure references in output code.
         """
         result = code
+        # AWS-only code has nothing for STEPS 1-5 and 6 to match
+        has_azure = _AZURE_CLEANUP_HINT_RE.search(result) is not None
+        
+        if has_azure:
+            # STEP 1: Replace ALL Azure imports
+            result = re.sub(r'from azure\.storage\.blob import.*', 'from google.cloud import storage', result)
+            result = result.replace('import azure.storage.blob', 'from google.cloud import storage')
+            result = re.sub(r'from azure\.functions import.*', 'from google.cloud import functions', result)
+            result = result.replace('import azure.functions', 'from google.cloud import functions')
+            result = re.sub(r'from azure\.cosmos import.*', 'from google.cloud import firestore', result)
+            result = result.replace('import azure.cosmos', 'from google.cloud import firestore')
+            result = re.sub(r'from azure\.servicebus import.*', 'from google.cloud import pubsub_v1', result)
+            result = result.replace('import azure.servicebus', 'from google.cloud import pubsub_v1')
+            result = re.sub(r'from azure\.eventhub import.*', 'from google.cloud import pubsub_v1', result)
+            result = result.replace('import azure.eventhub', 'from google.cloud import pubsub_v1')
+        
+            # STEP 2: Replace ALL Azure client instantiations
+            result = re.sub(
+                r'\b(\w+)\s*=\s*BlobServiceClient\.[^)]+\)',
+                r'\1 = storage.Client()',
+                result,
+                flags=re.DOTALL | re.IGNORECASE
+            )
+            result = re.sub(
+                r'\b(\w+)\s*=\s*CosmosClient\s*\([^)]+\)',
+                r'\1 = firestore.Client()',
+                result,
+                flags=re.DOTALL | re.IGNORECASE
+            )
+            result = re.sub(
+                r'\b(\w+)\s*=\s*ServiceBusClient\.[^)]+\)',
+                r'\1 = pubsub_v1.PublisherClient()',
+                result,
+                flags=re.DOTALL | re.IGNORECASE
+            )
+            result = re.sub(
+                r'\b(\w+)\s*=\s*EventHubProducerClient\s*\([^)]+\)',
+                r'\1 = pubsub_v1.PublisherClient()',
+                result,
+                flags=re.DOTALL | re.IGNORECASE
+            )
         
-        # STEP 1: Replace ALL Azure imports
-        result = re.sub(r'from azure\.storage\.blob import.*', 'from google.cloud import storage', result)
-        result = re.sub(r'import azure\.storage\.blob', 'from google.cloud import storage', result)
-        result = re.sub(r'from azure\.functions import.*', 'from google.cloud import functions', result)
-        result = re.sub(r'import azure\.functions', 'from google.cloud import functions', result)
-        result = re.sub(r'from azure\.cosmos import.*', 'from google.cloud import firestore', result)
-        result = re.sub(r'import azure\.cosmos', 'from google.cloud import firestore', result)
-        result = re.sub(r'from azure\.servicebus import.*', 'from google.cloud import pubsub_v1', result)
-        result = re.sub(r'import azure\.servicebus', 'from google.cloud import pubsub_v1', result)
-        result = re.sub(r'from azure\.eventhub import.*', 'from google.cloud import pubsub_v1', result)
-        result = re.sub(r'import azure\.eventhub', 'from google.cloud import pubsub_v1', result)
-        
-        # STEP 2: Replace ALL Azure client instantiations
-        result = re.sub(
-            r'(\w+)\s*=\s*BlobServiceClient\.[^)]+\)',
-            r'\1 = storage.Client()',
-            result,
-            flags=re.DOTALL | re.IGNORECASE
-        )
-        result = re.sub(
-            r'(\w+)\s*=\s*CosmosClient\s*\([^)]+\)',
-            r'\1 = firestore.Client()',
-            result,
-            flags=re.DOTALL | re.IGNORECASE
-        )
-        result = re.sub(
-            r'(\w+)\s*=\s*ServiceBusClient\.[^)]+\)',
-            r'\1 = pubsub_v1.PublisherClient()',
-            result,
-            flags=re.DOTALL | re.IGNORECASE
-        )
-        result = re.sub(
-            r'(\w+)\s*=\s*EventHubProducerClient\s*\([^)]+\)',
-            r'\1 = pubsub_v1.PublisherClient()',
-            result,
-            flags=re.DOTALL | re.IGNORECASE
-        )
-        
-        # STEP 3: Replace Azure environment variables
-        result = re.sub(r'AZURE_STORAGE_CONTAINER', 'GCS_BUCKET_NAME', result)
-        result = re.sub(r'AZURE_STORAGE_CONNECTION_STRING', 'GOOGLE_APPLICATION_CREDENTIALS', result)
-        result = re.sub(r'AZURE_COSMOS_ENDPOINT', 'GCP_PROJECT_ID', result)
-        result = re.sub(r'AZURE_COSMOS_KEY', 'GOOGLE_APPLICATION_CREDENTIALS', result)
-        result = re.sub(r'AZURE_SERVICE_BUS_CONNECTION_STRING', 'GCP_PROJECT_ID', result)
-        result = re.sub(r'AZURE_SERVICE_BUS_QUEUE_NAME', 'GCP_PUBSUB_TOPIC_ID', result)
-        result = re.sub(r'AZURE_FUNCTION_NAME', 'GCP_CLOUD_FUNCTION_NAME', result)
-        result = re.sub(r'AZURE_CLIENT_ID', 'GCP_PROJECT_ID', result)
-        result = re.sub(r'AZURE_CLIENT_SECRET', 'GOOGLE_APPLICATION_CREDENTIALS', result)
-        result = re.sub(r'AZURE_LOCATION', 'GCP_REGION', result)
-        
-        # STEP 4: Replace Azure-specific patterns
-        result = re.sub(r'\bBlobServiceClient\b', 'storage.Client', result)
-        result = re.sub(r'\bBlobClient\b', 'blob', result)
-        result = re.sub(r'\bContainerClient\b', 'bucket', result)
-        result = re.sub(r'\bCosmosClient\b', 'firestore.Client', result)
-        result = re.sub(r'\bServiceBusClient\b', 'pubsub_v1.PublisherClient', result)
-        result = re.sub(r'\bEventHubProducerClient\b', 'pubsub_v1.PublisherClient', result)
-        
-        # STEP 5: Replace Azure method calls
-        result = re.sub(r'\.upload_blob\(', '.upload_from_string(', result)
-        result = re.sub(r'\.download_blob\(', '.download_as_text(', result)
-        result = re.sub(r'\.get_blob_client\(', '.blob(', result)
-        result = re.sub(r'\.get_container_client\(', '.bucket(', result)
+            # STEP 3: Replace Azure environment variables
+            result = result.replace('AZURE_STORAGE_CONTAINER', 'GCS_BUCKET_NAME')
+            result = result.replace('AZURE_STORAGE_CONNECTION_STRING', 'GOOGLE_APPLICATION_CREDENTIALS')
+            result = result.replace('AZURE_COSMOS_ENDPOINT', 'GCP_PROJECT_ID')
+            result = result.replace('AZURE_COSMOS_KEY', 'GOOGLE_APPLICATION_CREDENTIALS')
+            result = result.replace('AZURE_SERVICE_BUS_CONNECTION_STRING', 'GCP_PROJECT_ID')
+            result = result.replace('AZURE_SERVICE_BUS_QUEUE_NAME', 'GCP_PUBSUB_TOPIC_ID')
+            result = result.replace('AZURE_FUNCTION_NAME', 'GCP_CLOUD_FUNCTION_NAME')
+            result = result.replace('AZURE_CLIENT_ID', 'GCP_PROJECT_ID')
+            result = result.replace('AZURE_CLIENT_SECRET', 'GOOGLE_APPLICATION_CREDENTIALS')
+            result = result.replace('AZURE_LOCATION', 'GCP_REGION')
+        
+            # STEP 4: Replace Azure-specific patterns
+            result = re.sub(r'\bBlobServiceClient\b', 'storage.Client', result)
+            result = re.sub(r'\bBlobClient\b', 'blob', result)
+            result = re.sub(r'\bContainerClient\b', 'bucket', result)
+            result = re.sub(r'\bCosmosClient\b', 'firestore.Client', result)
+            result = re.sub(r'\bServiceBusClient\b', 'pubsub_v1.PublisherClient', result)
+            result = re.sub(r'\bEventHubProducerClient\b', 'pubsub_v1.PublisherClient', result)
+        
+            # STEP 5: Replace Azure method calls
+            result = result.replace('.upload_blob(', '.upload_from_string(')
+            result = result.replace('.download_blob(', '.download_as_text(')
+            result = result.replace('.get_blob_client(', '.blob(')
+            result = result.replace('.get_container_client(', '.bucket(')
         
         # STEP 5.5: Remove Azure/Cosmos DB parameter patterns (similar to AWS DynamoDB)
         # Remove Item= parameter (Cosmos DB uses this, Firestore doesn't)
@@ -811,10 +1069,11 @@ When generating the refactored code, you MUST follow Clean Architecture principl
         # Remove Key= parameter in Cosmos context
         result = re.sub(r'Key\s*=\s*', '', result)
         
-        # STEP 6: Replace Azure Functions patterns
-        result = re.sub(r'func\.HttpRequest', 'functions.HttpRequest', result)
-        result = re.sub(r'func\.HttpResponse', 'functions.HttpResponse', result)
-        result = re.sub(r'azure\.functions', 'google.cloud.functions', result)
+        if has_azure:
+            # STEP 6: Replace Azure Functions patterns
+            result = result.replace('func.HttpRequest', 'functions.HttpRequest')
+            result = result.replace('func.HttpResponse', 'functions.HttpResponse')
+            result = result.replace('azure.functions', 'google.cloud.functions')
         
         # Clean up syntax issues
         result = re.sub(r',\s*,', ',', result)  # Double commas
@@ -828,7 +1087,6 @@ When generating the refactored code, you MUST follow Clean Architecture principl
         Validate Python syntax and ensure no AWS/Azure references in output code.
         Returns syntactically correct code or raises SyntaxError.
         """
-        import ast
         import logging
         import re
         logger = logging.getLogger(__name__)
@@ -885,7 +1143,7 @@ When generating the refactored code, you MUST follow Clean Architecture principl
         
         # Validate syntax (only for Python code)
         try:
-            ast.parse(code)
+            _check_python_syntax(code)
             return code  # Code is valid
         except SyntaxError as e:
             logger.debug(f"Syntax error detected: {e}")
@@ -907,9 +1165,27 @@ When generating the refactored code, you MUST follow Clean Architecture principl
 class BaseAzureExtendedTransformer(ABC):
     """Base class for language-specific extended transformers"""
     
+    # service_type -> name of the migration method that handles it, in the
+    # order _migration_containing tries them
+    _migration_methods: Dict[str, str] = {}
+    
     def __init__(self, aws_service_mapper, azure_service_mapper):
         self.aws_service_mapper = aws_service_mapper
         self.azure_service_mapper = azure_service_mapper
+        self._migrations = {
+            service_type: getattr(self, method_name)
+            for service_type, method_name in self._migration_methods.items()
+        }
+    
+    def _migration_containing(self, service_type: str):
+        """Return the migration for service_type, or the first whose service type it contains, or None"""
+        migrate = self._migrations.get(service_type)
+        if migrate is None:
+            migrate = next(
+                (migration for name, migration in self._migrations.items() if name in service_type),
+                None
+            )
+        return migrate
     
     @abstractmethod
     def transform(self, code: str, recipe: Dict[str, Any]) -> str:
@@ -920,6 +1196,27 @@ class BaseAzureExtendedTransformer(ABC):
 class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
     """Extended transformer for Python code using AST manipulation"""
     
+    _migration_methods = {
+        'aws_s3_to_gcs': '_migrate_aws_s3_to_gcs',
+        'aws_lambda_to_cloud_functions': '_migrate_aws_lambda_to_cloud_functions',
+        'aws_dynamodb_to_firestore': '_migrate_aws_dynamodb_to_firestore',
+        'azure_blob_storage_to_gcs': '_migrate_azure_blob_storage_to_gcs',
+        'azure_functions_to_cloud_functions': '_migrate_azure_functions_to_cloud_functions',
+        'azure_cosmos_db_to_firestore': '_migrate_azure_cosmos_db_to_firestore',
+        'azure_service_bus_to_pubsub': '_migrate_azure_service_bus_to_pubsub',
+        'azure_event_hubs_to_pubsub': '_migrate_azure_event_hubs_to_pubsub',
+        'azure_sql_database_to_cloud_sql': '_migrate_azure_sql_database_to_cloud_sql',
+        'azure_virtual_machines_to_compute_engine': '_migrate_azure_virtual_machines_to_compute_engine',
+        'azure_monitor_to_monitoring': '_migrate_azure_monitor_to_monitoring',
+        'azure_api_management_to_apigee': '_migrate_azure_api_management_to_apigee',
+        'azure_redis_cache_to_memorystore': '_migrate_azure_redis_cache_to_memorystore',
+        'azure_aks_to_gke': '_migrate_azure_aks_to_gke',
+        'azure_container_instances_to_cloud_run': '_migrate_azure_container_instances_to_cloud_run',
+        'azure_app_service_to_cloud_run': '_migrate_azure_app_service_to_cloud_run',
+        'azure_key_vault_to_secret_manager': '_migrate_azure_key_vault_to_secret_manager',
+        'azure_application_insights_to_monitoring': '_migrate_azure_application_insights_to_monitoring',
+    }
+    
     def transform(self, code: str, recipe: Dict[str, Any]) -> str:
         """Transform Python code based on the recipe"""
         operation = recipe.get('operation', '')
@@ -927,42 +1224,9 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
         
         if operation == 'service_migration' and service_type:
             # Handle specific service migration based on service type
-            if 'aws_s3_to_gcs' in service_type:
-                return self._migrate_aws_s3_to_gcs(code)
-            elif 'aws_lambda_to_cloud_functions' in service_type:
-                return self._migrate_aws_lambda_to_cloud_functions(code)
-            elif 'aws_dynamodb_to_firestore' in service_type:
-                return self._migrate_aws_dynamodb_to_firestore(code)
-            elif 'azure_blob_storage_to_gcs' in service_type:
-                return self._migrate_azure_blob_storage_to_gcs(code)
-            elif 'azure_functions_to_cloud_functions' in service_type:
-                return self._migrate_azure_functions_to_cloud_functions(code)
-            elif 'azure_cosmos_db_to_firestore' in service_type:
-                return self._migrate_azure_cosmos_db_to_firestore(code)
-            elif 'azure_service_bus_to_pubsub' in service_type:
-                return self._migrate_azure_service_bus_to_pubsub(code)
-            elif 'azure_event_hubs_to_pubsub' in service_type:
-                return self._migrate_azure_event_hubs_to_pubsub(code)
-            elif 'azure_sql_database_to_cloud_sql' in service_type:
-                return self._migrate_azure_sql_database_to_cloud_sql(code)
-            elif 'azure_virtual_machines_to_compute_engine' in service_type:
-                return self._migrate_azure_virtual_machines_to_compute_engine(code)
-            elif 'azure_monitor_to_monitoring' in service_type:
-                return self._migrate_azure_monitor_to_monitoring(code)
-            elif 'azure_api_management_to_apigee' in service_type:
-                return self._migrate_azure_api_management_to_apigee(code)
-            elif 'azure_redis_cache_to_memorystore' in service_type:
-                return self._migrate_azure_redis_cache_to_memorystore(code)
-            elif 'azure_aks_to_gke' in service_type:
-                return self._migrate_azure_aks_to_gke(code)
-            elif 'azure_container_instances_to_cloud_run' in service_type:
-                return self._migrate_azure_container_instances_to_cloud_run(code)
-            elif 'azure_app_service_to_cloud_run' in service_type:
-                return self._migrate_azure_app_service_to_cloud_run(code)
-            elif 'azure_key_vault_to_secret_manager' in service_type:
-                return self._migrate_azure_key_vault_to_secret_manager(code)
-            elif 'azure_application_insights_to_monitoring' in service_type:
-                return self._migrate_azure_application_insights_to_monitoring(code)
+            migrate = self._migration_containing(service_type)
+            if migrate is not None:
+                return migrate(code)
         
         # If no specific service migration, try to detect and migrate automatically
         return self._auto_detect_and_migrate(code)
@@ -1015,20 +1279,20 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
         code = re.sub(r'import azure\.storage\.blob.*', 'from google.cloud import storage', code)
         
         # Track variable name for blob service client
-        blob_client_match = re.search(r'(\w+)\s*=\s*BlobServiceClient', code)
+        blob_client_match = re.search(r'\b(\w+)\s*=\s*BlobServiceClient', code)
         blob_client_var = blob_client_match.group(1) if blob_client_match else 'blob_service_client'
         gcs_client_var = 'gcs_client' if blob_client_var == 'blob_service_client' else f'{blob_client_var}_gcs'
         
         # Replace client instantiation - handle all patterns
         code = re.sub(
-            r'(\w+)\s*=\s*BlobServiceClient\.from_connection_string\([^)]+\)',
+            r'\b(\w+)\s*=\s*BlobServiceClient\.from_connection_string\([^)]+\)',
             rf'{gcs_client_var} = storage.Client()',
             code,
             flags=re.DOTALL
         )
         # Handle BlobServiceClient with account_url and credential
         code = re.sub(
-            r'(\w+)\s*=\s*BlobServiceClient\s*\([^)]*account_url[^)]*credential[^)]*\)',
+            r'\b(\w+)\s*=\s*BlobServiceClient\s*\([^)]*account_url[^)]*credential[^)]*\)',
             rf'{gcs_client_var} = storage.Client()',
             code,
             flags=re.DOTALL
@@ -1042,7 +1306,7 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
         )
         # Handle BlobServiceClient with DefaultAzureCredential
         code = re.sub(
-            r'(\w+)\s*=\s*BlobServiceClient\s*\([^)]*DefaultAzureCredential[^)]*\)',
+            r'\b(\w+)\s*=\s*BlobServiceClient\s*\([^)]*DefaultAzureCredential[^)]*\)',
             rf'{gcs_client_var} = storage.Client()',
             code,
             flags=re.DOTALL
@@ -1064,7 +1328,7 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
                     paren_count += lines[j].count('(') - lines[j].count(')')
                     j += 1
                 # Replace the entire multi-line BlobServiceClient call
-                var_match = re.search(r'(\w+)\s*=\s*BlobServiceClient', line)
+                var_match = re.search(r'\b(\w+)\s*=\s*BlobServiceClient', line)
                 if var_match:
                     var_name = var_match.group(1)
                     result_lines.append(f'{gcs_client_var} = storage.Client()')
@@ -1076,14 +1340,14 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
         
         # Handle BlobServiceClient with comment in the middle (single line)
         code = re.sub(
-            r'(\w+)\s*=\s*BlobServiceClient\s*\([^)]*#.*?credential[^)]*\)',
+            r'\b(\w+)\s*=\s*BlobServiceClient\s*\([^)]*#.*?credential[^)]*\)',
             rf'{gcs_client_var} = storage.Client()',
             code,
             flags=re.DOTALL
         )
         # Original pattern for backward compatibility
         code = re.sub(
-            r'(\w+)\s*=\s*BlobServiceClient\([^)]+account_url=([^,]+),\s*credential=([^)]+)\)',
+            r'\b(\w+)\s*=\s*BlobServiceClient\([^)]+account_url=([^,]+),\s*credential=([^)]+)\)',
             rf'{gcs_client_var} = storage.Client()',
             code,
             flags=re.DOTALL
@@ -1091,42 +1355,42 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
         
         # Replace get_container_client -> bucket
         code = re.sub(
-            r'(\w+)\.get_container_client\(([^)]+)\)',
+            r'\b(\w+)\.get_container_client\(([^)]+)\)',
             rf'bucket = {gcs_client_var}.bucket(\2)',
             code
         )
         # Handle container_client variable assignments
         code = re.sub(
-            r'(\w+)\s*=\s*(\w+)\.get_container_client\(([^)]+)\)',
+            r'\b(\w+)\s*=\s*(\w+)\.get_container_client\(([^)]+)\)',
             rf'\1 = {gcs_client_var}.bucket(\3)',
             code
         )
         
         # Replace blob_client.get_blob_client -> bucket.blob
         code = re.sub(
-            r'(\w+)\s*=\s*(\w+)\.get_blob_client\([^)]*container=([^,]+),\s*blob=([^)]+)\)',
+            r'\b(\w+)\s*=\s*(\w+)\.get_blob_client\([^)]*container=([^,]+),\s*blob=([^)]+)\)',
             r'\1 = \2.bucket(\3).blob(\4)',
             code
         )
         code = re.sub(
-            r'(\w+)\s*=\s*(\w+)\.get_blob_client\([^)]*blob=([^,]+),\s*container=([^)]+)\)',
+            r'\b(\w+)\s*=\s*(\w+)\.get_blob_client\([^)]*blob=([^,]+),\s*container=([^)]+)\)',
             r'\1 = \2.bucket(\4).blob(\3)',
             code
         )
         code = re.sub(
-            r'(\w+)\s*=\s*(\w+)\.get_blob_client\(([^)]+)\)',
+            r'\b(\w+)\s*=\s*(\w+)\.get_blob_client\(([^)]+)\)',
             r'\1 = bucket.blob(\3)',
             code
         )
         
         # Replace container_client.create_container -> bucket.create
         code = re.sub(
-            r'(\w+)\s*=\s*(\w+)\.create_container\(([^)]*)\)',
+            r'\b(\w+)\s*=\s*(\w+)\.create_container\(([^)]*)\)',
             r'\1 = \2.create()',
             code
         )
         code = re.sub(
-            r'(\w+)\.create_container\(([^)]*)\)',
+            r'\b(\w+)\.create_container\(([^)]*)\)',
             r'bucket.create()',
             code
         )
@@ -1146,12 +1410,12 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
             flags=re.DOTALL
         )
         code = re.sub(
-            r'(\w+)\.upload_blob\(([^)]+),\s*overwrite=True\)',
+            r'\b(\w+)\.upload_blob\(([^)]+),\s*overwrite=True\)',
             r'blob = bucket.blob("blob_name")\n    blob.upload_from_filename(\2) if isinstance(\2, str) else blob.upload_from_string(\2)',
             code
         )
         code = re.sub(
-            r'(\w+)\.upload_blob\(([^)]+)\)',
+            r'\b(\w+)\.upload_blob\(([^)]+)\)',
             r'blob = bucket.blob("blob_name")\n    blob.upload_from_filename(\2) if isinstance(\2, str) else blob.upload_from_string(\2)',
             code
         )
@@ -1159,30 +1423,30 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
         # Replace download_blob -> download_as_bytes/download_to_filename
         # Handle with open() pattern for download
         code = re.sub(
-            r'(\w+)\s*=\s*(\w+)\.download_blob\(([^)]*)\)\s*with\s+open\(([^,]+),\s*["\']wb["\']\)\s+as\s+(\w+)\s*:\s*(\5)\.write\((\1)\.readall\(\)\)',
+            r'\b(\w+)\s*=\s*(\w+)\.download_blob\(([^)]*)\)\s*with\s+open\(([^,]+),\s*["\']wb["\']\)\s+as\s+(\w+)\s*:\s*(\5)\.write\((\1)\.readall\(\)\)',
             r'blob = bucket.blob("blob_name")\n    blob.download_to_filename(\4)',
             code,
             flags=re.DOTALL
         )
         code = re.sub(
-            r'(\w+)\s*=\s*(\w+)\.download_blob\(([^)]*)\)',
+            r'\b(\w+)\s*=\s*(\w+)\.download_blob\(([^)]*)\)',
             r'\1 = \2.download_as_bytes()',
             code
         )
         code = re.sub(
-            r'(\w+)\.download_blob\(([^)]*)\)',
+            r'\b(\w+)\.download_blob\(([^)]*)\)',
             r'blob.download_as_bytes()',
             code
         )
         # Handle download_stream.readall() -> content (remove readall, use content directly)
         code = re.sub(
-            r'(\w+)\.readall\(\)',
+            r'\b(\w+)\.readall\(\)',
             r'\1',
             code
         )
         # Handle download_file.write(download_stream.readall()) -> blob.download_to_filename()
         code = re.sub(
-            r'(\w+)\.write\(([^)]+)\.readall\(\)\)',
+            r'\b(\w+)\.write\(([^)]+)\.readall\(\)\)',
             r'# Content already downloaded',
             code
         )
@@ -1204,7 +1468,7 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
         # Replace SAS token generation -> GCS signed URLs
         # Pattern: sas_token = generate_account_sas(...)
         code = re.sub(
-            r'(\w+)\s*=\s*generate_account_sas\([^)]+account_name=([^,]+),\s*account_key=([^,]+),\s*resource_types=([^,]+),\s*permission=([^,]+),\s*expiry=([^\)]+)\)',
+            r'\b(\w+)\s*=\s*generate_account_sas\([^)]+account_name=([^,]+),\s*account_key=([^,]+),\s*resource_types=([^,]+),\s*permission=([^,]+),\s*expiry=([^\)]+)\)',
             r'# GCS uses blob.generate_signed_url() instead of account SAS\n# Example: blob.generate_signed_url(expiration=datetime.utcnow() + timedelta(hours=1), method="GET")\n# Note: Generate signed URL on the blob object, not account-level\n# \1 = blob.generate_signed_url(...)',
             code
         )
@@ -1224,103 +1488,95 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
             r'from google.cloud import storage\nfrom datetime import datetime, timedelta',
             code
         )
-        code = re.sub(
-            r'ResourceTypes\(object=True\)',
-            r'# ResourceTypes not needed for GCS',
-            code
-        )
-        code = re.sub(
-            r'AccountSasPermissions\(read=True\)',
-            r'# Permissions specified in generate_signed_url method parameter',
-            code
-        )
+        code = code.replace('ResourceTypes(object=True)', '# ResourceTypes not needed for GCS')
+        code = code.replace('AccountSasPermissions(read=True)', '# Permissions specified in generate_signed_url method parameter')
         # Remove generate_account_sas from imports
         code = re.sub(r',\s*generate_account_sas', '', code)
         code = re.sub(r'generate_account_sas\s*,', '', code)
         
         # Replace blob_client.exists() -> blob.exists()
         code = re.sub(
-            r'(\w+)\s*=\s*(\w+)\.exists\(\)',
+            r'\b(\w+)\s*=\s*(\w+)\.exists\(\)',
             r'\1 = \2.exists()',
             code
         )
         code = re.sub(
-            r'(\w+)\.exists\(\)',
+            r'\b(\w+)\.exists\(\)',
             r'blob.exists()',
             code
         )
         
         # Replace blob_client.delete_blob() -> blob.delete()
         code = re.sub(
-            r'(\w+)\.delete_blob\(([^)]*)\)',
+            r'\b(\w+)\.delete_blob\(([^)]*)\)',
             r'blob.delete()',
             code
         )
         
         # Replace blob_client.get_blob_properties() -> blob.reload()
         code = re.sub(
-            r'(\w+)\s*=\s*(\w+)\.get_blob_properties\(([^)]*)\)',
+            r'\b(\w+)\s*=\s*(\w+)\.get_blob_properties\(([^)]*)\)',
             r'\1 = \2\n    \2.reload()',
             code
         )
         # Handle properties access
         code = re.sub(
-            r'(\w+)\.content_settings\.content_type',
+            r'\b(\w+)\.content_settings\.content_type',
             r'\1.content_type',
             code
         )
         code = re.sub(
-            r'(\w+)\.size',
+            r'\b(\w+)\.size',
             r'\1.size',
             code
         )
         code = re.sub(
-            r'(\w+)\.last_modified',
+            r'\b(\w+)\.last_modified',
             r'\1.updated',
             code
         )
         code = re.sub(
-            r'(\w+)\.metadata',
+            r'\b(\w+)\.metadata',
             r'\1.metadata',
             code
         )
         
         # Replace blob_client.set_blob_metadata() -> blob.metadata = ...
         code = re.sub(
-            r'(\w+)\.set_blob_metadata\(metadata=([^)]+)\)',
+            r'\b(\w+)\.set_blob_metadata\(metadata=([^)]+)\)',
             r'\1.metadata = \2',
             code
         )
         
         # Replace blob_client.set_http_headers() -> blob.content_type = ...
         code = re.sub(
-            r'(\w+)\.set_http_headers\(content_settings=ContentSettings\(content_type=([^)]+)\)\)',
+            r'\b(\w+)\.set_http_headers\(content_settings=ContentSettings\(content_type=([^)]+)\)\)',
             r'\1.content_type = \2',
             code
         )
         
         # Replace blob_client.create_snapshot() -> blob.generation (GCS uses generations)
         code = re.sub(
-            r'(\w+)\s*=\s*(\w+)\.create_snapshot\(([^)]*)\)',
+            r'\b(\w+)\s*=\s*(\w+)\.create_snapshot\(([^)]*)\)',
             r'# GCS uses blob generations instead of snapshots\n    # blob.generation contains the generation number\n    \1 = {"generation": blob.generation}',
             code
         )
         
         # Replace blob_client.start_copy_from_url() -> blob.copy_to()
         code = re.sub(
-            r'(\w+)\.start_copy_from_url\(([^)]+)\)',
+            r'\b(\w+)\.start_copy_from_url\(([^)]+)\)',
             r'# Use blob.rewrite() or blob.copy_to() for copying',
             code
         )
         
         # Replace container_client.list_blobs() -> bucket.list_blobs()
         code = re.sub(
-            r'(\w+)\s*=\s*(\w+)\.list_blobs\(([^)]*)\)',
+            r'\b(\w+)\s*=\s*(\w+)\.list_blobs\(([^)]*)\)',
             r'\1 = list(\2.list_blobs(\3))',
             code
         )
         code = re.sub(
-            r'(\w+)\.list_blobs\(([^)]*)\)',
+            r'\b(\w+)\.list_blobs\(([^)]*)\)',
             r'bucket.list_blobs(\2)',
             code
         )
@@ -1332,49 +1588,49 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
         )
         # Handle blob.name and blob.size
         code = re.sub(
-            r'(\w+)\.name',
+            r'\b(\w+)\.name',
             r'\1.name',
             code
         )
         code = re.sub(
-            r'(\w+)\.size',
+            r'\b(\w+)\.size',
             r'\1.size',
             code
         )
         
         # Replace blob_service_client.list_containers() -> storage_client.list_buckets()
         code = re.sub(
-            r'(\w+)\s*=\s*(\w+)\.list_containers\(([^)]*)\)',
+            r'\b(\w+)\s*=\s*(\w+)\.list_containers\(([^)]*)\)',
             r'\1 = list(\2.list_buckets(\3))',
             code
         )
         code = re.sub(
-            r'(\w+)\.list_containers\(([^)]*)\)',
+            r'\b(\w+)\.list_containers\(([^)]*)\)',
             rf'{gcs_client_var}.list_buckets(\2)',
             code
         )
         # Handle container.name -> bucket.name
         code = re.sub(
-            r'(\w+)\.name',
+            r'\b(\w+)\.name',
             r'\1.name',
             code
         )
         
         # Replace container_client.delete_container() -> bucket.delete()
         code = re.sub(
-            r'(\w+)\.delete_container\(([^)]*)\)',
+            r'\b(\w+)\.delete_container\(([^)]*)\)',
             r'bucket.delete(force=True)',
             code
         )
         
         # Handle generate_blob_sas and generate_container_sas -> blob.generate_signed_url()
         code = re.sub(
-            r'(\w+)\s*=\s*generate_blob_sas\([^)]+\)',
+            r'\b(\w+)\s*=\s*generate_blob_sas\([^)]+\)',
             r'# \1 = blob.generate_signed_url(expiration=datetime.utcnow() + timedelta(hours=1), method="GET")',
             code
         )
         code = re.sub(
-            r'(\w+)\s*=\s*generate_container_sas\([^)]+\)',
+            r'\b(\w+)\s*=\s*generate_container_sas\([^)]+\)',
             r'# \1 = bucket.generate_signed_url(expiration=datetime.utcnow() + timedelta(hours=1), method="GET")',
             code
         )
@@ -1408,11 +1664,7 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
             '',
             code
         )
-        code = re.sub(
-            r'BlobSasPermissions\(read=True\)',
-            r'# Permissions specified in generate_signed_url method parameter',
-            code
-        )
+        code = code.replace('BlobSasPermissions(read=True)', '# Permissions specified in generate_signed_url method parameter')
         code = re.sub(
             r'ContainerSasPermissions\(read=True[^)]*\)',
             r'# Permissions specified in generate_signed_url method parameter',
@@ -1421,27 +1673,15 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
         
         # Handle blob tags
         code = re.sub(
-            r'(\w+)\.upload_blob\(([^,]+),\s*tags=([^,]+),\s*overwrite=True\)',
+            r'\b(\w+)\.upload_blob\(([^,]+),\s*tags=([^,]+),\s*overwrite=True\)',
             r'blob = bucket.blob("blob_name")\n    blob.upload_from_filename(\2) if isinstance(\2, str) else blob.upload_from_string(\2)\n    # Note: GCS uses blob.metadata instead of tags',
             code
         )
         
         # Replace environment variables
-        code = re.sub(
-            r'AZURE_STORAGE_CONNECTION_STRING',
-            'GOOGLE_APPLICATION_CREDENTIALS',
-            code
-        )
-        code = re.sub(
-            r'AZURE_STORAGE_ACCOUNT_NAME',
-            'GOOGLE_CLOUD_PROJECT',
-            code
-        )
-        code = re.sub(
-            r'AZURE_STORAGE_ACCOUNT_KEY',
-            'GOOGLE_APPLICATION_CREDENTIALS',
-            code
-        )
+        code = code.replace('AZURE_STORAGE_CONNECTION_STRING', 'GOOGLE_APPLICATION_CREDENTIALS')
+        code = code.replace('AZURE_STORAGE_ACCOUNT_NAME', 'GOOGLE_CLOUD_PROJECT')
+        code = code.replace('AZURE_STORAGE_ACCOUNT_KEY', 'GOOGLE_APPLICATION_CREDENTIALS')
         
         # Remove Azure-specific imports
         code = re.sub(r'from azure\.identity import.*', '', code)
@@ -1457,7 +1697,7 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
     def _migrate_azure_functions_to_cloud_functions(self, code: str) -> str:
         """Migrate Azure Functions to Google Cloud Functions"""
         # Replace Azure Functions imports
-        code = re.sub(r'import azure\.functions as func', 'import functions_framework', code)
+        code = code.replace('import azure.functions as func', 'import functions_framework')
         
         # Replace function trigger patterns
         code = re.sub(
@@ -1465,18 +1705,10 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
             '@functions_framework.http',
             code
         )
-        code = re.sub(
-            r'def main\(req: func\.HttpRequest\) -> func\.HttpResponse:',
-            'def function_handler(request):',
-            code
-        )
+        code = code.replace('def main(req: func.HttpRequest) -> func.HttpResponse:', 'def function_handler(request):')
         
         # Replace request/response handling
-        code = re.sub(
-            r'req\.get_json\(\)',
-            'request.get_json()',
-            code
-        )
+        code = code.replace('req.get_json()', 'request.get_json()')
         code = re.sub(
             r'return func\.HttpResponse\([^)]+\)',
             'return "response"',
@@ -1488,9 +1720,9 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
             code = self._migrate_azure_cosmos_db_to_firestore(code)
         
         # Final cleanup: remove any remaining azure.functions references
-        code = re.sub(r'func\.DocumentList', 'list', code)
-        code = re.sub(r'func\.HttpRequest', 'request', code)
-        code = re.sub(r'func\.HttpResponse', 'str', code)
+        code = code.replace('func.DocumentList', 'list')
+        code = code.replace('func.HttpRequest', 'request')
+        code = code.replace('func.HttpResponse', 'str')
         
         return code
 
@@ -1509,42 +1741,42 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
         # Replace client instantiation patterns - handle both patterns
         # Match: client = cosmos_client.CosmosClient(url_connection=..., auth=...)
         code = re.sub(
-            r'(\w+)\s*=\s*cosmos_client\.CosmosClient\s*\([^)]*url_connection[^)]*auth[^)]*\)',
+            r'\b(\w+)\s*=\s*cosmos_client\.CosmosClient\s*\([^)]*url_connection[^)]*auth[^)]*\)',
             r'\1 = firestore.Client()',
             code,
             flags=re.DOTALL
         )
         # Match: client = CosmosClient(url_connection=..., auth=...)
         code = re.sub(
-            r'(\w+)\s*=\s*CosmosClient\s*\([^)]*url_connection[^)]*auth[^)]*\)',
+            r'\b(\w+)\s*=\s*CosmosClient\s*\([^)]*url_connection[^)]*auth[^)]*\)',
             r'\1 = firestore.Client()',
             code,
             flags=re.DOTALL
         )
         # Match: client = CosmosClient(url=..., credential=...)
         code = re.sub(
-            r'(\w+)\s*=\s*CosmosClient\s*\([^)]*url[^)]*credential[^)]*\)',
+            r'\b(\w+)\s*=\s*CosmosClient\s*\([^)]*url[^)]*credential[^)]*\)',
             r'\1 = firestore.Client()',
             code,
             flags=re.DOTALL
         )
         # Match: client = CosmosClient( with multiline parameters
         code = re.sub(
-            r'(\w+)\s*=\s*CosmosClient\s*\([^)]*url_connection[^)]*\)',
+            r'\b(\w+)\s*=\s*CosmosClient\s*\([^)]*url_connection[^)]*\)',
             r'\1 = firestore.Client()',
             code,
             flags=re.DOTALL
         )
         # Match: client = cosmos_client.CosmosClient( with multiline - be more aggressive
         code = re.sub(
-            r'(\w+)\s*=\s*cosmos_client\.CosmosClient\s*\([^)]*\)',
+            r'\b(\w+)\s*=\s*cosmos_client\.CosmosClient\s*\([^)]*\)',
             r'\1 = firestore.Client()',
             code,
             flags=re.DOTALL
         )
         # Match: client = CosmosClient( with any parameters
         code = re.sub(
-            r'(\w+)\s*=\s*CosmosClient\s*\([^)]*\)',
+            r'\b(\w+)\s*=\s*CosmosClient\s*\([^)]*\)',
             r'\1 = firestore.Client()',
             code,
             flags=re.DOTALL
@@ -1559,22 +1791,22 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
         
         # Replace GetDatabase/GetContainer patterns
         code = re.sub(
-            r'(\w+)\s*=\s*(\w+)\.GetDatabase\(([^)]+)\)',
+            r'\b(\w+)\s*=\s*(\w+)\.GetDatabase\(([^)]+)\)',
             r'\1 = \2  # Database reference (Firestore uses project-level)',
             code
         )
         code = re.sub(
-            r'(\w+)\.GetDatabase\(([^)]+)\)',
+            r'\b(\w+)\.GetDatabase\(([^)]+)\)',
             r'\1  # Database reference (Firestore uses project-level)',
             code
         )
         code = re.sub(
-            r'(\w+)\s*=\s*(\w+)\.GetContainer\(([^,]+),\s*([^)]+)\)',
+            r'\b(\w+)\s*=\s*(\w+)\.GetContainer\(([^,]+),\s*([^)]+)\)',
             r'\1 = \2.collection(\4)',
             code
         )
         code = re.sub(
-            r'(\w+)\.GetContainer\(([^,]+),\s*([^)]+)\)',
+            r'\b(\w+)\.GetContainer\(([^,]+),\s*([^)]+)\)',
             r'\1.collection(\3)',
             code
         )
@@ -1631,35 +1863,35 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
         code = re.sub(r'from\s+azure\.servicebus[^\n]*', 'import os\nfrom google.cloud import pubsub_v1', code, flags=re.DOTALL)
         
         # Track variable name for ServiceBusClient
-        servicebus_match = re.search(r'(\w+)\s*=\s*ServiceBusClient', code)
+        servicebus_match = re.search(r'\b(\w+)\s*=\s*ServiceBusClient', code)
         servicebus_var = servicebus_match.group(1) if servicebus_match else 'servicebus_client'
         publisher_var = 'publisher' if servicebus_var == 'servicebus_client' else f'{servicebus_var}_publisher'
         
         # Replace client instantiation patterns
         code = re.sub(
-            r'(\w+)\s*=\s*ServiceBusClient\.from_connection_string\([^)]+\)',
+            r'\b(\w+)\s*=\s*ServiceBusClient\.from_connection_string\([^)]+\)',
             rf'{publisher_var} = pubsub_v1.PublisherClient()',
             code
         )
         code = re.sub(
-            r'(\w+)\s*=\s*ServiceBusClient\([^)]+\)',
+            r'\b(\w+)\s*=\s*ServiceBusClient\([^)]+\)',
             rf'{publisher_var} = pubsub_v1.PublisherClient()',
             code
         )
         
         # Replace get_queue_sender/get_topic_sender patterns
         code = re.sub(
-            r'(\w+)\s*=\s*(\w+)\.get_queue_sender\(queue_name=([^)]+)\)',
+            r'\b(\w+)\s*=\s*(\w+)\.get_queue_sender\(queue_name=([^)]+)\)',
             rf'import os\n    topic_path = {publisher_var}.topic_path(os.getenv("GCP_PROJECT_ID", "your-project-id"), \3)',
             code
         )
         code = re.sub(
-            r'(\w+)\.get_queue_sender\(queue_name=([^)]+)\)',
+            r'\b(\w+)\.get_queue_sender\(queue_name=([^)]+)\)',
             rf'# Queue sender replaced with Pub/Sub publisher\n    topic_path = {publisher_var}.topic_path(os.getenv("GCP_PROJECT_ID", "your-project-id"), \2)',
             code
         )
         code = re.sub(
-            r'(\w+)\.get_topic_sender\(topic_name=([^)]+)\)',
+            r'\b(\w+)\.get_topic_sender\(topic_name=([^)]+)\)',
             rf'# Topic sender replaced with Pub/Sub publisher\n    topic_path = {publisher_var}.topic_path(os.getenv("GCP_PROJECT_ID", "your-project-id"), \2)',
             code
         )
@@ -1670,11 +1902,7 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
             r'data = \1.encode("utf-8")',
             code
         )
-        code = re.sub(
-            r'sender\.send_messages\(message\)',
-            rf'future = {publisher_var}.publish(topic_path, data=data)',
-            code
-        )
+        code = code.replace('sender.send_messages(message)', f'future = {publisher_var}.publish(topic_path, data=data)')
         code = re.sub(
             r'sender\.send_messages\(([^)]+)\)',
             rf'future = {publisher_var}.publish(topic_path, data=\1.encode("utf-8"))',
@@ -1682,7 +1910,7 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
         )
         
         # Replace ServiceBusMessage import
-        code = re.sub(r'ServiceBusMessage', 'str', code)
+        code = code.replace('ServiceBusMessage', 'str')
         
         # Replace 'with servicebus_client:' context manager
         code = re.sub(
@@ -1706,16 +1934,11 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
         )
         
         # Replace event operations
-        code = re.sub(
-            r'event_data_batch = producer\.create_batch\(\)',
-            r'data = b"event_data"\n    future = publisher.publish(topic_path, data=data)',
-            code
-        )
-        code = re.sub(
-            r'producer\.send_batch\(event_data_batch\)',
-            r'future = publisher.publish(topic_path, data=data)',
-            code
+        code = code.replace(
+            'event_data_batch = producer.create_batch()',
+            'data = b"event_data"\n    future = publisher.publish(topic_path, data=data)'
         )
+        code = code.replace('producer.send_batch(event_data_batch)', 'future = publisher.publish(topic_path, data=data)')
         
         return code
     
@@ -1746,11 +1969,7 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
         code = re.sub(r'from azure\.mgmt\.compute import.*', 'from google.cloud import compute_v1', code)
         
         # Replace VM operations
-        code = re.sub(
-            r'compute_client\.virtual_machines\.',
-            r'compute_v1.InstancesClient()',
-            code
-        )
+        code = code.replace('compute_client.virtual_machines.', 'compute_v1.InstancesClient()')
         
         # Replace VM creation
         code = re.sub(
@@ -1781,11 +2000,7 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
         code = re.sub(r'from azure\.mgmt\.apimanagement import.*', 'from apigee import apis, environments, proxy', code)
         
         # Replace API management operations
-        code = re.sub(
-            r'apim_client\.api\.',
-            r'apis.create_api(',
-            code
-        )
+        code = code.replace('apim_client.api.', 'apis.create_api(')
         
         return code
     
@@ -1809,11 +2024,7 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
         code = re.sub(r'from azure\.mgmt\.containerservice import.*', 'from google.cloud import container_v1', code)
         
         # Replace cluster operations
-        code = re.sub(
-            r'container_service_client\.managed_clusters\.',
-            r'container_v1.ClusterManagerClient()',
-            code
-        )
+        code = code.replace('container_service_client.managed_clusters.', 'container_v1.ClusterManagerClient()')
         
         return code
     
@@ -1823,11 +2034,7 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
         code = re.sub(r'from azure\.mgmt\.containerinstance import.*', 'from google.cloud import run_v2', code)
         
         # Replace container operations
-        code = re.sub(
-            r'container_client\.container_groups\.',
-            r'run_v2.ServicesClient()',
-            code
-        )
+        code = code.replace('container_client.container_groups.', 'run_v2.ServicesClient()')
         
         return code
     
@@ -1837,11 +2044,7 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
         code = re.sub(r'from azure\.mgmt\.web import.*', 'from google.cloud import run_v2', code)
         
         # Replace app service operations
-        code = re.sub(
-            r'web_client\.webapps\.',
-            r'run_v2.ServicesClient()',
-            code
-        )
+        code = code.replace('web_client.webapps.', 'run_v2.ServicesClient()')
         
         return code
 
@@ -1858,58 +2061,50 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
             'from google.auth import default',
             code
         )
-        code = re.sub(
-            r'import azure\.keyvault\.secrets',
-            'from google.cloud import secretmanager',
-            code
-        )
+        code = code.replace('import azure.keyvault.secrets', 'from google.cloud import secretmanager')
         
         # Replace SecretClient instantiation
         code = re.sub(
-            r'(\w+)\s*=\s*SecretClient\(vault_url=([^,]+),\s*credential=([^\)]+)\)',
+            r'\b(\w+)\s*=\s*SecretClient\(vault_url=([^,]+),\s*credential=([^\)]+)\)',
             r'\1 = secretmanager.SecretManagerServiceClient()',
             code
         )
         code = re.sub(
-            r'(\w+)\s*=\s*SecretClient\(([^\)]+)\)',
+            r'\b(\w+)\s*=\s*SecretClient\(([^\)]+)\)',
             r'\1 = secretmanager.SecretManagerServiceClient()',
             code
         )
         
         # Replace get_secret() -> access_secret_version()
         code = re.sub(
-            r'(\w+)\.get_secret\(([^\)]+)\)',
+            r'\b(\w+)\.get_secret\(([^\)]+)\)',
             r'\1.access_secret_version(request={"name": \2})',
             code
         )
         
         # Replace set_secret() -> create_secret() / add_secret_version()
         code = re.sub(
-            r'(\w+)\.set_secret\(name=([^,]+),\s*value=([^\)]+)\)',
+            r'\b(\w+)\.set_secret\(name=([^,]+),\s*value=([^\)]+)\)',
             r'\1.create_secret(request={"parent": parent, "secret_id": \2, "secret": {"replication": {"automatic": {}}}})\n    \1.add_secret_version(request={"parent": parent + "/secrets/" + \2, "payload": {"data": \3.encode("utf-8")}})',
             code
         )
         
         # Replace delete_secret() -> delete_secret()
         code = re.sub(
-            r'(\w+)\.delete_secret\(name=([^\)]+)\)',
+            r'\b(\w+)\.delete_secret\(name=([^\)]+)\)',
             r'\1.delete_secret(request={"name": \2})',
             code
         )
         
         # Replace list_secrets() -> list_secrets()
         code = re.sub(
-            r'(\w+)\.list_secrets\(\)',
+            r'\b(\w+)\.list_secrets\(\)',
             r'\1.list_secrets(request={"parent": parent})',
             code
         )
         
         # Replace environment variables
-        code = re.sub(
-            r'AZURE_KEY_VAULT_URL',
-            'GOOGLE_CLOUD_PROJECT',
-            code
-        )
+        code = code.replace('AZURE_KEY_VAULT_URL', 'GOOGLE_CLOUD_PROJECT')
         code = re.sub(
             r'AZURE_CLIENT_ID|AZURE_CLIENT_SECRET|AZURE_TENANT_ID',
             'GOOGLE_APPLICATION_CREDENTIALS',
@@ -1926,62 +2121,58 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
             'from google.cloud import monitoring_v3\nfrom google.cloud import logging',
             code
         )
-        code = re.sub(
-            r'import applicationinsights',
-            'from google.cloud import monitoring_v3\nfrom google.cloud import logging',
-            code
-        )
+        code = code.replace('import applicationinsights', 'from google.cloud import monitoring_v3\nfrom google.cloud import logging')
         
         # Replace ApplicationInsightsClient -> MetricServiceClient
         code = re.sub(
-            r'(\w+)\s*=\s*ApplicationInsightsClient\(([^\)]+)\)',
+            r'\b(\w+)\s*=\s*ApplicationInsightsClient\(([^\)]+)\)',
             r'\1 = monitoring_v3.MetricServiceClient()',
             code
         )
         
         # Replace TelemetryClient -> Logging Client
         code = re.sub(
-            r'(\w+)\s*=\s*TelemetryClient\(instrumentation_key=([^\)]+)\)',
+            r'\b(\w+)\s*=\s*TelemetryClient\(instrumentation_key=([^\)]+)\)',
             r'\1 = logging.Client()',
             code
         )
         code = re.sub(
-            r'(\w+)\s*=\s*TelemetryClient\(([^\)]+)\)',
+            r'\b(\w+)\s*=\s*TelemetryClient\(([^\)]+)\)',
             r'\1 = logging.Client()',
             code
         )
         
         # Replace track_event() -> log_struct() with event data
         code = re.sub(
-            r'(\w+)\.track_event\(name=([^,]+),\s*properties=([^\)]+)\)',
+            r'\b(\w+)\.track_event\(name=([^,]+),\s*properties=([^\)]+)\)',
             r'\1.log_struct({"event_name": \2, "properties": \3})',
             code
         )
         
         # Replace track_exception() -> log_struct() with exception data
         code = re.sub(
-            r'(\w+)\.track_exception\(exception=([^,]+),\s*properties=([^\)]+)\)',
+            r'\b(\w+)\.track_exception\(exception=([^,]+),\s*properties=([^\)]+)\)',
             r'\1.log_struct({"exception": str(\2), "properties": \3, "severity": "ERROR"})',
             code
         )
         
         # Replace track_metric() -> create_time_series()
         code = re.sub(
-            r'(\w+)\.track_metric\(name=([^,]+),\s*value=([^\)]+)\)',
+            r'\b(\w+)\.track_metric\(name=([^,]+),\s*value=([^\)]+)\)',
             r'# Create time series for metric\n    series = monitoring_v3.TimeSeries()\n    series.metric.type = "custom.googleapis.com/" + \2\n    point = monitoring_v3.Point()\n    point.value.double_value = \3\n    point.interval.end_time.seconds = int(time.time())\n    series.points = [point]\n    \1.create_time_series(request={"name": project_name, "time_series": [series]})',
             code
         )
         
         # Replace track_trace() -> log_text()
         code = re.sub(
-            r'(\w+)\.track_trace\(message=([^\)]+)\)',
+            r'\b(\w+)\.track_trace\(message=([^\)]+)\)',
             r'\1.log_text(\2)',
             code
         )
         
         # Replace flush() -> no-op (GCP logging is async)
         code = re.sub(
-            r'(\w+)\.flush\(\)',
+            r'\b(\w+)\.flush\(\)',
             r'# Flush not needed - GCP logging is async',
             code
         )
@@ -1999,191 +2190,43 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
     def _migrate_aws_s3_to_gcs(self, code: str) -> str:
         """Migrate AWS S3 to Google Cloud Storage"""
         # Replace boto3 imports with GCS imports
-        code = re.sub(r'^import boto3\s*$', 'from google.cloud import storage', code, flags=re.MULTILINE)
-        code = re.sub(r'^from boto3', 'from google.cloud import storage', code, flags=re.MULTILINE)
+        code = _BOTO3_IMPORT_RE.sub('from google.cloud import storage', code)
         
         # Replace client instantiation - handle various formats
-        code = re.sub(
-            r'(\w+)\s*=\s*boto3\.client\([\'\"]s3[\'\"].*?\)',
-            r'\1 = storage.Client()',
-            code,
-            flags=re.DOTALL
-        )
-        
-        # Replace S3 upload_file -> GCS upload_from_filename
-        code = re.sub(
-            r'(\w+)\.upload_file\([\'\"]([^\'\"]+)[\'\"],\s*[\'\"]([^\'\"]+)[\'\"],\s*[\'\"]([^\'\"]+)[\'\"]\)',
-            r'bucket = \1.bucket("\3")\n    blob = bucket.blob("\4")\n    blob.upload_from_filename("\2")',
-            code
-        )
-        
-        # Replace S3 download_file -> GCS download_to_filename
-        code = re.sub(
-            r'(\w+)\.download_file\([\'\"]([^\'\"]+)[\'\"],\s*[\'\"]([^\'\"]+)[\'\"],\s*[\'\"]([^\'\"]+)[\'\"]\)',
-            r'bucket = \1.bucket("\2")\n    blob = bucket.blob("\3")\n    blob.download_to_filename("\4")',
-            code
-        )
-        
-        # Replace S3 put_object -> GCS upload
-        code = re.sub(
-            r'(\w+)\.put_object\(Bucket=([^,]+),\s*Key=([^,]+),\s*Body=([^,\)]+)',
-            r'bucket = \1.bucket(\2)\n    blob = bucket.blob(\3)\n    blob.upload_from_string(\4)',
-            code
-        )
-        
-        # Replace S3 get_object -> GCS download
-        code = re.sub(
-            r'(\w+)\.get_object\(Bucket=([^,]+),\s*Key=([^,\)]+)\)',
-            r'bucket = \1.bucket(\2)\n    blob = bucket.blob(\3)\n    content = blob.download_as_text()',
-            code
-        )
-        
-        # Replace S3 delete_object -> GCS delete
-        code = re.sub(
-            r'(\w+)\.delete_object\(Bucket=([^,]+),\s*Key=([^,\)]+)\)',
-            r'bucket = \1.bucket(\2)\n    blob = bucket.blob(\3)\n    blob.delete()',
-            code
-        )
-        
-        # Replace S3 list_objects_v2 -> GCS list_blobs
-        code = re.sub(
-            r'(\w+)\.list_objects_v2\(Bucket=([^,\)]+)\)',
-            r'bucket = \1.bucket(\2)\n    blobs = list(bucket.list_blobs())',
-            code
-        )
-        
-        # Replace S3 list_objects -> GCS list_blobs
-        code = re.sub(
-            r'(\w+)\.list_objects\(Bucket=([^,\)]+)\)',
-            r'bucket = \1.bucket(\2)\n    blobs = list(bucket.list_blobs())',
-            code
-        )
-        
-        # Replace S3 list_buckets -> GCS list_buckets
-        # Handle assignment pattern: buckets = s3.list_buckets()
-        code = re.sub(
-            r'(\w+)\s*=\s*(\w+)\.list_buckets\(\)',
-            r'\1 = list(\2.list_buckets())',
-            code
-        )
-        # Handle direct call pattern: s3.list_buckets() (but not if already wrapped in list())
-        code = re.sub(
-            r'(\w+)\.list_buckets\(\)(?!\s*\))',
-            r'list(\1.list_buckets())',
-            code
-        )
-        
-        # Replace S3 create_bucket -> GCS create_bucket
-        code = re.sub(
-            r'(\w+)\.create_bucket\(Bucket=([^,]+)(?:,\s*CreateBucketConfiguration=[^\)]+)?\)',
-            r'\1.create_bucket(\2)',
-            code
-        )
-        code = re.sub(
-            r'(\w+)\.create_bucket\(Bucket=([^,\)]+)\)',
-            r'\1.create_bucket(\2)',
-            code
-        )
+        code = _AWS_S3_CLIENT_ASSIGN_RE.sub(r'\1 = storage.Client()', code)
         
-        # Replace S3 delete_bucket -> GCS delete_bucket
-        code = re.sub(
-            r'(\w+)\.delete_bucket\(Bucket=([^,\)]+)\)',
-            r'bucket = \1.bucket(\2)\n    bucket.delete()',
-            code
-        )
+        # Rewrite only the S3 calls this code actually makes
+        code = _apply_call_rewrites(code, _AWS_S3_CALL_REWRITES)
         
         # Remove or comment AWS region names
-        # Replace AWS region constants/variables
-        aws_regions = [
-            'us-east-1', 'us-east-2', 'us-west-1', 'us-west-2',
-            'eu-west-1', 'eu-west-2', 'eu-west-3', 'eu-central-1',
-            'ap-southeast-1', 'ap-southeast-2', 'ap-northeast-1', 'ap-northeast-2',
-            'ap-south-1', 'sa-east-1', 'ca-central-1'
-        ]
-        for region in aws_regions:
-            # Comment out region assignments
-            code = re.sub(
-                rf'(\w+)\s*=\s*[\'"]{region}[\'"]',
-                rf'# \1 = \'{region}\'  # AWS region - not needed for GCP',
-                code
-            )
-            # Replace region_name parameter in client calls (already handled above, but ensure it's removed)
-            code = re.sub(
-                rf',\s*region_name=[\'"]?{region}[\'"]?',
-                '',
-                code
-            )
-            code = re.sub(
-                rf'region_name=[\'"]?{region}[\'"]?\s*,',
-                '',
-                code
-            )
-        
-        # Remove region_name parameter completely if still present
-        code = re.sub(
-            r',\s*region_name=\w+',
-            '',
-            code
-        )
-        code = re.sub(
-            r'region_name=\w+\s*,',
-            '',
+        # Comment out region assignments
+        code = _AWS_REGION_ASSIGN_RE.sub(
+            r"# \1 = '\g<region>'  # AWS region - not needed for GCP",
             code
         )
+        # Replace region_name parameter in client calls (already handled above, but ensure it's removed)
+        code = _AWS_REGION_KWARG_LEADING_COMMA_RE.sub('', code)
+        code = _AWS_REGION_KWARG_TRAILING_COMMA_RE.sub('', code)
         
-        # Replace botocore exceptions imports
-        # Handle multiple imports on one line first (most specific pattern first)
-        if 'NoCredentialsError' in code and 'ClientError' in code:
-            # Check if they're on the same import line
-            code = re.sub(
-                r'from botocore\.exceptions import\s+NoCredentialsError,\s*ClientError',
-                'from google.auth.exceptions import DefaultCredentialsError\nfrom google.api_core import exceptions',
-                code
-            )
-            code = re.sub(
-                r'from botocore\.exceptions import\s+ClientError,\s*NoCredentialsError',
-                'from google.auth.exceptions import DefaultCredentialsError\nfrom google.api_core import exceptions',
-                code
-            )
+        # Remove region_name parameter completely if still present
+        code = _AWS_REGION_VARIABLE_KWARG_LEADING_COMMA_RE.sub('', code)
+        code = _AWS_REGION_VARIABLE_KWARG_TRAILING_COMMA_RE.sub('', code)
         
-        # Handle single NoCredentialsError import
-        code = re.sub(
-            r'from botocore\.exceptions import\s+NoCredentialsError\b',
-            'from google.auth.exceptions import DefaultCredentialsError',
-            code
-        )
-        # Handle single ClientError import
-        code = re.sub(
-            r'from botocore\.exceptions import\s+ClientError\b',
-            'from google.api_core import exceptions',
-            code
-        )
-        # Replace exception usage (after imports are fixed)
-        code = re.sub(
-            r'\bNoCredentialsError\b',
-            'DefaultCredentialsError',
-            code
-        )
-        code = re.sub(
-            r'\bClientError\b',
-            'exceptions.GoogleAPIError',
-            code
-        )
+        # Add exception handling
+        code = self._add_exception_handling(code)
         
         return code
 
     def _migrate_aws_lambda_to_cloud_functions(self, code: str) -> str:
         """Migrate AWS Lambda to Google Cloud Functions"""
         # Replace Lambda client imports
-        code = re.sub(r'^import boto3\s*$', 'from google.cloud import functions_v1\nimport functions_framework', code, flags=re.MULTILINE)
-        code = re.sub(r'^from boto3', 'from google.cloud import functions_v1\nimport functions_framework', code, flags=re.MULTILINE)
+        code = _BOTO3_IMPORT_RE.sub('from google.cloud import functions_v1\nimport functions_framework', code)
         
         # Replace Lambda client instantiation
         code = re.sub(
-            r'(\w+)\s*=\s*boto3\.client\([\'\"]lambda[\'\"].*?\)',
+            r'\b(\w+)\s*=\s*boto3\.client\([\'\"]lambda[\'\"][^)]*\)',
             r'\1 = functions_v1.CloudFunctionsServiceClient()',
-            code,
-            flags=re.DOTALL
+            code
         )
         
         # Replace Lambda function decorator patterns
@@ -2193,19 +2236,8 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
             code
         )
         
-        # Replace Lambda invocation calls
-        code = re.sub(
-            r'(\w+)\.invoke\(FunctionName=([^,]+),\s*InvocationType=([^,]+)?,\s*Payload=([^,\)]+)\)',
-            r'# Cloud Functions invocation via HTTP or Pub/Sub\n# Function: \2\n# Payload: \4',
-            code
-        )
-        
-        # Replace create_function
-        code = re.sub(
-            r'(\w+)\.create_function\(FunctionName=([^,]+),\s*Runtime=([^,]+),\s*Role=([^,]+),\s*Handler=([^,]+),\s*Code=([^,\)]+)\)',
-            r'# Cloud Functions deployment via gcloud or Cloud Build\n# Function name: \2\n# Runtime: \3\n# Entry point: \5',
-            code
-        )
+        # Replace Lambda invocation and deployment calls
+        code = _apply_call_rewrites(code, _AWS_LAMBDA_CALL_REWRITES)
         
         # Add exception handling
         code = self._add_exception_handling(code)
@@ -2215,9 +2247,10 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
     def _migrate_aws_dynamodb_to_firestore(self, code: str) -> str:
         """Migrate AWS DynamoDB to Google Cloud Firestore"""
         # Detect if this is a migration script (reads from DynamoDB, writes to Firestore)
+        # Plain substring checks: boto3 method names are case-sensitive
         is_migration_script = (
-            re.search(r'\.(scan|get_item|query)\(', code, re.IGNORECASE) and
-            re.search(r'\.(put_item|batch_write_item)\(', code, re.IGNORECASE)
+            ('.scan(' in code or '.get_item(' in code or '.query(' in code) and
+            ('.put_item(' in code or '.batch_write_item(' in code)
         )
         
         if is_migration_script:
@@ -2235,115 +2268,37 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
             
             # Preserve DynamoDB resource/client initialization (for reading)
             # Add Firestore client initialization (for writing)
-            init_pattern = r'(\w+)\s*=\s*boto3\.(resource|client)\([\'\"]dynamodb[\'\"][^\)]*\)'
-            def add_firestore_init(match):
-                return match.group(0) + f'\n\n# Initialize Firestore for writing\nif not firebase_admin._apps:\n    cred = credentials.Certificate(GOOGLE_KEY_PATH)\n    firebase_admin.initialize_app(cred)\n\nfirestore_db = firestore.Client()'
-            code = re.sub(init_pattern, add_firestore_init, code, count=1)
+            code = _DYNAMODB_INIT_RE.sub(_add_firestore_init, code, count=1)
             
             # Replace write operations only: put_item() -> Firestore set()
-            def replace_put_item(match):
-                item = match.group(2)
-                return f'# Write to Firestore\n    doc_ref = firestore_db.collection(FIRESTORE_COLLECTION).document()\n    doc_ref.set({item})'
-            
-            code = re.sub(
-                r'(\w+)\.put_item\(\s*Item\s*=\s*([^\)]+)\)',
-                replace_put_item,
-                code,
-                flags=re.DOTALL
-            )
+            code = _DYNAMODB_PUT_ITEM_RE.sub(_replace_put_item, code)
             
             # Replace batch_write_item() -> Firestore batch operations
-            def replace_batch_write(match):
-                return '''# Convert DynamoDB batch write to Firestore batch
-    batch = firestore_db.batch()
-    collection_ref = firestore_db.collection(FIRESTORE_COLLECTION)
-    for item in items:
-        clean_item = convert_decimal(item)  # Convert Decimal types
-        doc_id = clean_item.get(PRIMARY_KEY_FIELD, None)
-        if doc_id:
-            doc_ref = collection_ref.document(str(doc_id))
-        else:
-            doc_ref = collection_ref.document()
-        batch.set(doc_ref, clean_item)
-    batch.commit()'''
-            
-            code = re.sub(
-                r'(\w+)\.batch_write_item\(\s*RequestItems\s*=\s*\{[^}]+\}\s*\)',
-                replace_batch_write,
-                code,
-                flags=re.DOTALL
-            )
+            code = _DYNAMODB_BATCH_WRITE_RE.sub(_replace_batch_write, code)
             
             # Keep scan(), get_item(), query() operations as DynamoDB operations
             return code
         
         # APPLICATION CODE MODE: Replace all DynamoDB with Firestore
         # Replace DynamoDB imports
-        code = re.sub(r'^import boto3\s*$', 'from google.cloud import firestore', code, flags=re.MULTILINE)
-        code = re.sub(r'^from boto3', 'from google.cloud import firestore', code, flags=re.MULTILINE)
+        code = _BOTO3_IMPORT_RE.sub('from google.cloud import firestore', code)
         
         # Replace DynamoDB resource (common pattern)
         code = re.sub(
-            r'(\w+)\s*=\s*boto3\.resource\([\'\"]dynamodb[\'\"].*?\)',
+            r'\b(\w+)\s*=\s*boto3\.resource\([\'\"]dynamodb[\'\"][^)]*\)',
             r'\1 = firestore.Client()',
-            code,
-            flags=re.DOTALL
+            code
         )
         
         # Replace DynamoDB client instantiation
         code = re.sub(
-            r'(\w+)\s*=\s*boto3\.client\([\'\"]dynamodb[\'\"].*?\)',
+            r'\b(\w+)\s*=\s*boto3\.client\([\'\"]dynamodb[\'\"][^)]*\)',
             r'\1 = firestore.Client()',
-            code,
-            flags=re.DOTALL
-        )
-        
-        # Replace table operations with collection/document operations
-        # table.put_item() -> collection.add() or document.set()
-        code = re.sub(
-            r'(\w+)\.put_item\(Item=([^,\)]+)\)',
-            r'doc_ref = \1.document()\n    doc_ref.set(\2)',
             code
         )
         
-        code = re.sub(
-            r'(\w+)\.put_item\(TableName=([^,]+),\s*Item=([^,\)]+)\)',
-            r'db.collection(\2).document().set(\3)',
-            code
-        )
-        
-        # table.get_item() -> document.get()
-        code = re.sub(
-            r'(\w+)\.get_item\(Key=([^,\)]+)\)',
-            r'doc_ref = \1.document(\2)\n    doc = doc_ref.get()',
-            code
-        )
-        
-        code = re.sub(
-            r'(\w+)\.get_item\(TableName=([^,]+),\s*Key=([^,\)]+)\)',
-            r'doc = db.collection(\2).document(\3).get()',
-            code
-        )
-        
-        # table.query() -> collection.where()
-        code = re.sub(
-            r'(\w+)\.query\(KeyConditionExpression=([^,\)]+)\)',
-            r'query = \1.where(\2)\n    results = query.stream()',
-            code
-        )
-        
-        code = re.sub(
-            r'(\w+)\.query\(TableName=([^,]+),\s*KeyConditionExpression=([^,\)]+)\)',
-            r'query = db.collection(\2).where(\3)\n    results = query.stream()',
-            code
-        )
-        
-        # table.delete_item() -> document.delete()
-        code = re.sub(
-            r'(\w+)\.delete_item\(Key=([^,\)]+)\)',
-            r'\1.document(\2).delete()',
-            code
-        )
+        # Replace table operations with collection/document operations
+        code = _apply_call_rewrites(code, _AWS_DYNAMODB_CALL_REWRITES)
         
         # Add exception handling
         code = self._add_exception_handling(code)
@@ -2352,50 +2307,41 @@ class AzureExtendedPythonTransformer(BaseAzureExtendedTransformer):
     
     def _add_exception_handling(self, code: str) -> str:
         """Add exception handling transformations for all cloud services"""
+        return self._rewrite_botocore_exceptions(code)
+    
+    def _rewrite_botocore_exceptions(self, code: str) -> str:
+        """Replace botocore exception imports and usages with Google equivalents"""
+        # Every pattern below needs one of these names; skipping here also makes
+        # repeated calls on already-migrated code (S3 then Lambda/DynamoDB) free
+        if 'NoCredentialsError' not in code and 'ClientError' not in code:
+            return code
+        
         # Replace botocore exceptions imports
-        # Handle multiple imports on one line first (most specific pattern first)
-        if 'NoCredentialsError' in code and 'ClientError' in code:
-            # Check if they're on the same import line
-            code = re.sub(
-                r'from botocore\.exceptions import\s+NoCredentialsError,\s*ClientError',
-                'from google.auth.exceptions import DefaultCredentialsError\nfrom google.api_core import exceptions',
-                code
-            )
-            code = re.sub(
-                r'from botocore\.exceptions import\s+ClientError,\s*NoCredentialsError',
+        if 'botocore.exceptions' in code:
+            # Handle both names on one import line first (most specific pattern first)
+            code = _BOTOCORE_IMPORT_BOTH_RE.sub(
                 'from google.auth.exceptions import DefaultCredentialsError\nfrom google.api_core import exceptions',
                 code
             )
+            # Handle single NoCredentialsError import
+            code = _BOTOCORE_IMPORT_NO_CREDENTIALS_RE.sub('from google.auth.exceptions import DefaultCredentialsError', code)
+            # Handle single ClientError import
+            code = _BOTOCORE_IMPORT_CLIENT_ERROR_RE.sub('from google.api_core import exceptions', code)
         
-        # Handle single NoCredentialsError import
-        code = re.sub(
-            r'from botocore\.exceptions import\s+NoCredentialsError\b',
-            'from google.auth.exceptions import DefaultCredentialsError',
-            code
-        )
-        # Handle single ClientError import
-        code = re.sub(
-            r'from botocore\.exceptions import\s+ClientError\b',
-            'from google.api_core import exceptions',
-            code
-        )
         # Replace exception usage (after imports are fixed)
-        code = re.sub(
-            r'\bNoCredentialsError\b',
-            'DefaultCredentialsError',
-            code
-        )
-        code = re.sub(
-            r'\bClientError\b',
-            'exceptions.GoogleAPIError',
-            code
-        )
+        code = _NO_CREDENTIALS_ERROR_RE.sub('DefaultCredentialsError', code)
+        code = _CLIENT_ERROR_RE.sub('exceptions.GoogleAPIError', code)
         return code
 
 
 class AzureExtendedJavaTransformer(BaseAzureExtendedTransformer):
     """Extended transformer for Java code (simplified implementation)"""
     
+    _migration_methods = {
+        'azure_blob_storage_to_gcs': '_migrate_azure_blob_storage_to_gcs',
+        'azure_functions_to_cloud_functions': '_migrate_azure_functions_to_cloud_functions',
+    }
+    
     def transform(self, code: str, recipe: Dict[str, Any]) -> str:
         """Transform Java code based on the recipe"""
         # For Java, we would typically use JDT AST or similar, but this is a simplified version
@@ -2403,10 +2349,9 @@ class AzureExtendedJavaTransformer(BaseAzureExtendedTransformer):
         service_type = recipe.get('service_type', '')
         
         if operation == 'service_migration' and service_type:
-            if service_type == 'azure_blob_storage_to_gcs':
-                return self._migrate_azure_blob_storage_to_gcs(code)
-            elif service_type == 'azure_functions_to_cloud_functions':
-                return self._migrate_azure_functions_to_cloud_functions(code)
+            migrate = self._migrations.get(service_type)
+            if migrate is not None:
+                return migrate(code)
         
         return code
     
@@ -2436,6 +2381,16 @@ class AzureExtendedJavaTransformer(BaseAzureExtendedTransformer):
 class AzureExtendedGoTransformer(BaseAzureExtendedTransformer):
     """Extended transformer for Go code - uses Gemini API for Azure transformations"""
     
+    _migration_methods = {
+        'azure_blob_storage_to_gcs': '_migrate_azure_blob_storage_to_gcs',
+        'azure_functions_to_cloud_functions': '_migrate_azure_functions_to_cloud_functions',
+        'azure_cosmos_db_to_firestore': '_migrate_azure_cosmos_db_to_firestore',
+        'azure_service_bus_to_pubsub': '_migrate_azure_service_bus_to_pubsub',
+        'azure_event_hubs_to_pubsub': '_migrate_azure_event_hubs_to_pubsub',
+        'azure_key_vault_to_secret_manager': '_migrate_azure_key_vault_to_secret_manager',
+        'azure_application_insights_to_monitoring': '_migrate_azure_application_insights_to_monitoring',
+    }
+    
     def transform(self, code: str, recipe: Dict[str, Any]) -> str:
         """Transform Go code based on the recipe"""
         # Go transformations are handled by Gemini API in transform_code()
@@ -2444,89 +2399,46 @@ class AzureExtendedGoTransformer(BaseAzureExtendedTransformer):
         service_type = recipe.get('service_type', '')
         
         if operation == 'service_migration' and service_type:
-            if 'azure_blob_storage_to_gcs' in service_type:
-                return self._migrate_azure_blob_storage_to_gcs(code)
-            elif 'azure_functions_to_cloud_functions' in service_type:
-                return self._migrate_azure_functions_to_cloud_functions(code)
-            elif 'azure_cosmos_db_to_firestore' in service_type:
-                return self._migrate_azure_cosmos_db_to_firestore(code)
-            elif 'azure_service_bus_to_pubsub' in service_type:
-                return self._migrate_azure_service_bus_to_pubsub(code)
-            elif 'azure_event_hubs_to_pubsub' in service_type:
-                return self._migrate_azure_event_hubs_to_pubsub(code)
-            elif 'azure_key_vault_to_secret_manager' in service_type:
-                return self._migrate_azure_key_vault_to_secret_manager(code)
-            elif 'azure_application_insights_to_monitoring' in service_type:
-                return self._migrate_azure_application_insights_to_monitoring(code)
+            migrate = self._migration_containing(service_type)
+            if migrate is not None:
+                return migrate(code)
         
         return code
     
     def _migrate_azure_blob_storage_to_gcs(self, code: str) -> str:
         """Migrate Azure Blob Storage Go code to Google Cloud Storage (fallback regex)"""
-        code = re.sub(
-            r'github\.com/Azure/azure-sdk-for-go/sdk/storage/azblob',
-            'cloud.google.com/go/storage',
-            code
-        )
-        code = re.sub(
-            r'azblob\.NewClient',
-            'storage.NewClient',
-            code
-        )
+        code = code.replace('github.com/Azure/azure-sdk-for-go/sdk/storage/azblob', 'cloud.google.com/go/storage')
+        code = code.replace('azblob.NewClient', 'storage.NewClient')
         return code
     
     def _migrate_azure_functions_to_cloud_functions(self, code: str) -> str:
         """Migrate Azure Functions Go code to Google Cloud Functions (fallback regex)"""
-        code = re.sub(
-            r'github\.com/Azure/azure-functions-go',
-            'cloud.google.com/go/functions',
-            code
-        )
+        code = code.replace('github.com/Azure/azure-functions-go', 'cloud.google.com/go/functions')
         return code
     
     def _migrate_azure_cosmos_db_to_firestore(self, code: str) -> str:
         """Migrate Azure Cosmos DB Go code to Google Firestore (fallback regex)"""
-        code = re.sub(
-            r'github\.com/Azure/azure-sdk-for-go/sdk/data/azcosmos',
-            'cloud.google.com/go/firestore',
-            code
-        )
+        code = code.replace('github.com/Azure/azure-sdk-for-go/sdk/data/azcosmos', 'cloud.google.com/go/firestore')
         return code
     
     def _migrate_azure_service_bus_to_pubsub(self, code: str) -> str:
         """Migrate Azure Service Bus Go code to Google Pub/Sub (fallback regex)"""
-        code = re.sub(
-            r'github\.com/Azure/azure-sdk-for-go/sdk/messaging/azservicebus',
-            'cloud.google.com/go/pubsub',
-            code
-        )
+        code = code.replace('github.com/Azure/azure-sdk-for-go/sdk/messaging/azservicebus', 'cloud.google.com/go/pubsub')
         return code
     
     def _migrate_azure_event_hubs_to_pubsub(self, code: str) -> str:
         """Migrate Azure Event Hubs Go code to Google Pub/Sub (fallback regex)"""
-        code = re.sub(
-            r'github\.com/Azure/azure-event-hubs-go',
-            'cloud.google.com/go/pubsub',
-            code
-        )
+        code = code.replace('github.com/Azure/azure-event-hubs-go', 'cloud.google.com/go/pubsub')
         return code
     
     def _migrate_azure_key_vault_to_secret_manager(self, code: str) -> str:
         """Migrate Azure Key Vault Go code to Google Secret Manager (fallback regex)"""
-        code = re.sub(
-            r'github\.com/Azure/azure-sdk-for-go/sdk/keyvault/azsecrets',
-            'cloud.google.com/go/secretmanager/apiv1',
-            code
-        )
+        code = code.replace('github.com/Azure/azure-sdk-for-go/sdk/keyvault/azsecrets', 'cloud.google.com/go/secretmanager/apiv1')
         return code
     
     def _migrate_azure_application_insights_to_monitoring(self, code: str) -> str:
         """Migrate Azure Application Insights Go code to Google Cloud Monitoring (fallback regex)"""
-        code = re.sub(
-            r'github\.com/Azure/azure-sdk-for-go/sdk/monitor',
-            'cloud.google.com/go/monitoring/apiv3',
-            code
-        )
+        code = code.replace('github.com/Azure/azure-sdk-for-go/sdk/monitor', 'cloud.google.com/go/monitoring/apiv3')
         return code
 
 
@@ -2537,6 +2449,8 @@ class AzureExtendedGoTransformer(BaseAzureExtendedTransformer):
         """
         if code is None:
             return ""
+        if not _GO_AZURE_CLEANUP_HINT_RE.search(code):
+            return code
         
         result = code
         
@@ -2555,16 +2469,16 @@ class AzureExtendedGoTransformer(BaseAzureExtendedTransformer):
         
         # Remove Azure-specific exceptions
         result = re.sub(r'from azure\.core\.exceptions import.*', '', result)
-        result = re.sub(r'AzureException', 'Exception', result)
+        result = result.replace('AzureException', 'Exception')
         
         # Remove Azure credential patterns
-        result = re.sub(r'DefaultAzureCredential\(\)', 'storage.Client()', result)
+        result = result.replace('DefaultAzureCredential()', 'storage.Client()')
         result = re.sub(r'AzureKeyCredential\([^)]+\)', '', result)
         
         # Remove Azure environment variables
-        result = re.sub(r'AZURE_STORAGE_CONNECTION_STRING', 'GOOGLE_APPLICATION_CREDENTIALS', result)
-        result = re.sub(r'AZURE_STORAGE_ACCOUNT_NAME', 'GOOGLE_CLOUD_PROJECT', result)
-        result = re.sub(r'AZURE_STORAGE_ACCOUNT_KEY', 'GOOGLE_APPLICATION_CREDENTIALS', result)
+        result = result.replace('AZURE_STORAGE_CONNECTION_STRING', 'GOOGLE_APPLICATION_CREDENTIALS')
+        result = result.replace('AZURE_STORAGE_ACCOUNT_NAME', 'GOOGLE_CLOUD_PROJECT')
+        result = result.replace('AZURE_STORAGE_ACCOUNT_KEY', 'GOOGLE_APPLICATION_CREDENTIALS')
         
         # Remove Azure-specific method calls that weren't transformed
         result = re.sub(r'\.from_connection_string\([^)]+\)', '()', result)
@@ -2572,11 +2486,55 @@ class AzureExtendedGoTransformer(BaseAzureExtendedTransformer):
         result = re.sub(r'\.get_blob_client\([^)]+\)', '.blob()', result)
         result = re.sub(r'\.upload_blob\([^)]+\)', '.upload_from_string()', result)
         result = re.sub(r'\.download_blob\([^)]+\)', '.download_as_bytes()', result)
-        result = re.sub(r'\.readall\(\)', '', result)
+        result = result.replace('.readall()', '')
         
         return result
 
 
+@lru_cache(maxsize=128)
+def _source_api_name(service_type: str) -> str:
+    """Source API name for a service type, e.g. 'Azure BLOB_STORAGE' for 'azure_blob_storage_to_gcs'"""
+    source = service_type.partition("_to_")[0]
+    if 'azure_' in service_type:
+        return f'Azure {source.replace("azure_", "").upper()}'
+    return f'AWS {source.replace("aws_", "").upper()}'
+
+
+@lru_cache(maxsize=128)
+def _migration_service_type(service_key: str, gcp_service: GCPService) -> str:
+    """Service type identify_and_migrate_services migrates a service key under, e.g. 'azure_blob_storage_to_cloud-storage'"""
+    return f"{service_key}_to_{gcp_service.value.replace('_', '-').lower()}"
+
+
+# GCP target API inferred by apply_refactoring when none is given
+_TARGET_API = {
+    'azure_blob_storage_to_gcs': 'GCS',
+    'azure_functions_to_cloud_functions': 'Cloud Functions',
+    'azure_cosmos_db_to_firestore': 'Firestore',
+    'azure_service_bus_to_pubsub': 'Pub/Sub',
+    'azure_event_hubs_to_pubsub': 'Pub/Sub',
+    'azure_sql_database_to_cloud_sql': 'Cloud SQL',
+    'azure_monitor_to_monitoring': 'Cloud Monitoring',
+    'azure_api_management_to_apigee': 'Apigee',
+    'azure_redis_cache_to_memorystore': 'Memorystore',
+    'azure_aks_to_gke': 'GKE',
+    'azure_container_instances_to_cloud_run': 'Cloud Run',
+    'azure_app_service_to_cloud_run': 'Cloud Run',
+    'aws_s3_to_gcs': 'GCS',
+    'aws_lambda_to_cloud_functions': 'Cloud Functions',
+    'aws_dynamodb_to_firestore': 'Firestore',
+}
+
+
+@lru_cache(maxsize=128)
+def _inferred_target_api(service_type: str) -> Optional[str]:
+    """Target API of service_type, or of the first known service type it contains"""
+    target_api = _TARGET_API.get(service_type)
+    if target_api is None:
+        target_api = next((api for name, api in _TARGET_API.items() if name in service_type), None)
+    return target_api
+
+
 class AzureExtendedSemanticRefactoringService:
     """
     Extended Service layer for semantic refactoring operations
@@ -2585,10 +2543,18 @@ class AzureExtendedSemanticRefactoringService:
     for multiple cloud services across AWS and Azure.
     """
     
+    # Maximum number of transformed sources kept by apply_refactoring
+    REFACTORING_CACHE_SIZE = 1024
+    
     def __init__(self, ast_engine: AzureExtendedASTTransformationEngine):
         self.ast_engine = ast_engine
-        self.azure_service_mapper = AzureServiceMapper()
-        self.aws_service_mapper = ServiceMapper()
+        # Share the engine's mappers rather than building second copies
+        self.azure_service_mapper = ast_engine.azure_service_mapper
+        self.aws_service_mapper = ast_engine.aws_service_mapper
+        # Reused by every identify_and_migrate_services call
+        self.code_analyzer = ExtendedCodeAnalyzer(self.aws_service_mapper, self.azure_service_mapper)
+        # (source digest, language, service_type, target_api) -> transformed code
+        self._refactoring_cache = LRUCache(self.REFACTORING_CACHE_SIZE)
     
     def generate_transformation_recipe(self, source_code: str, target_api: str, language: str, service_type: str) -> Dict[str, Any]:
         """
@@ -2601,7 +2567,7 @@ class AzureExtendedSemanticRefactoringService:
             'language': language,
             'operation': 'service_migration',
             'service_type': service_type,
-            'source_api': f'Azure {service_type.split("_to_")[0].replace("azure_", "").upper()}' if 'azure_' in service_type else f'AWS {service_type.split("_to_")[0].replace("aws_", "").upper()}',
+            'source_api': _source_api_name(service_type),
             'target_api': target_api,
             'transformation_steps': [
                 {
@@ -2627,39 +2593,24 @@ class AzureExtendedSemanticRefactoringService:
     def apply_refactoring(self, source_code: str, language: str, service_type: str, target_api: str = None) -> str:
         """
         Apply refactoring to the source code for the specified service type
+        
+        Results are cached per source, except those produced after Gemini
+        failed, so a later call can still transform the source.
         """
         # If target API is not specified, infer it from the service type
         if not target_api:
-            if 'azure_blob_storage_to_gcs' in service_type:
-                target_api = 'GCS'
-            elif 'azure_functions_to_cloud_functions' in service_type:
-                target_api = 'Cloud Functions'
-            elif 'azure_cosmos_db_to_firestore' in service_type:
-                target_api = 'Firestore'
-            elif 'azure_service_bus_to_pubsub' in service_type:
-                target_api = 'Pub/Sub'
-            elif 'azure_event_hubs_to_pubsub' in service_type:
-                target_api = 'Pub/Sub'
-            elif 'azure_sql_database_to_cloud_sql' in service_type:
-                target_api = 'Cloud SQL'
-            elif 'azure_monitor_to_monitoring' in service_type:
-                target_api = 'Cloud Monitoring'
-            elif 'azure_api_management_to_apigee' in service_type:
-                target_api = 'Apigee'
-            elif 'azure_redis_cache_to_memorystore' in service_type:
-                target_api = 'Memorystore'
-            elif 'azure_aks_to_gke' in service_type:
-                target_api = 'GKE'
-            elif 'azure_container_instances_to_cloud_run' in service_type:
-                target_api = 'Cloud Run'
-            elif 'azure_app_service_to_cloud_run' in service_type:
-                target_api = 'Cloud Run'
-            elif 'aws_s3_to_gcs' in service_type:
-                target_api = 'GCS'
-            elif 'aws_lambda_to_cloud_functions' in service_type:
-                target_api = 'Cloud Functions'
-            elif 'aws_dynamodb_to_firestore' in service_type:
-                target_api = 'Firestore'
+            target_api = _inferred_target_api(service_type) or target_api
+        
+        # Identical sources (e.g. generated files in a monorepo) are transformed once
+        cache_key = (
+            hashlib.blake2b(source_code.encode('utf-8', 'surrogatepass'), digest_size=16).digest(),
+            language,
+            service_type,
+            target_api
+        )
+        cached = self._refactoring_cache.get(cache_key)
+        if cached is not None:
+            return cached
         
         # Generate transformation recipe
         recipe = self.generate_transformation_recipe(source_code, target_api, language, service_type)
@@ -2667,6 +2618,7 @@ class AzureExtendedSemanticRefactoringService:
         # Apply transformations using AST engine
         # transform_code returns (transformed_code, variable_mapping) tuple
         result = self.ast_engine.transform_code(source_code, language, recipe)
+        used_fallback = self.ast_engine.used_fallback
         
         # Handle both tuple and string returns
         if isinstance(result, tuple):
@@ -2674,15 +2626,16 @@ class AzureExtendedSemanticRefactoringService:
         else:
             transformed_code = result
         
+        if not used_fallback:
+            self._refactoring_cache.put(cache_key, transformed_code)
+        
         return transformed_code
     
     def identify_and_migrate_services(self, source_code: str, language: str) -> Dict[str, str]:
         """
         Identify which cloud services are used in the code and migrate them
         """
-        from infrastructure.adapters.service_mapping import ExtendedCodeAnalyzer
-        code_analyzer = ExtendedCodeAnalyzer()
-        services_found = code_analyzer.identify_all_cloud_services_usage(source_code)
+        services_found = self.code_analyzer.identify_all_cloud_services_usage(source_code)
         
         migrated_code = source_code
         migration_results = {}
@@ -2691,12 +2644,11 @@ class AzureExtendedSemanticRefactoringService:
             # Determine the service and provider
             if service_key.startswith('azure_'):
                 # Process Azure services
-                azure_service_name = service_key.replace('azure_', '')
-                azure_service_enum = getattr(AzureService, azure_service_name.upper().replace('-', '_').replace(' ', '_'), None)
+                azure_service_enum = _AZURE_SERVICE_BY_KEY.get(service_key)
                 
                 if azure_service_enum and azure_service_enum in self.azure_service_mapper.get_all_mappings():
                     service_mapping = self.azure_service_mapper.get_mapping(azure_service_enum)
-                    service_type = f"{service_key}_to_{service_mapping.gcp_service.value.replace('_', '-').lower()}"
+                    service_type = _migration_service_type(service_key, service_mapping.gcp_service)
                     
                     migrated_code = self.apply_refactoring(migrated_code, language, service_type)
                     migration_results[service_key] = {
@@ -2713,12 +2665,11 @@ class AzureExtendedSemanticRefactoringService:
             
             elif service_key.startswith('aws_'):
                 # Process AWS services
-                aws_service_name = service_key.replace('aws_', '')
-                aws_service_enum = getattr(AWSService, aws_service_name.upper().replace('-', '_'), None)
+                aws_service_enum = _AWS_SERVICE_BY_KEY.get(service_key)
                 
                 if aws_service_enum and aws_service_enum in self.aws_service_mapper.get_all_mappings():
                     service_mapping = self.aws_service_mapper.get_mapping(aws_service_enum)
-                    service_type = f"{service_key}_to_{service_mapping.gcp_service.value.replace('_', '-').lower()}"
+                    service_type = _migration_service_type(service_key, service_mapping.gcp_service)
                     
                     migrated_code = self.apply_refactoring(migrated_code, language, service_type)
                     migration_results[service_key] = {
@@ -5,14 +5,24 @@ This module adds Azure-specific service mappings for the Cloud Refactor Agent,
 extending it to support Azure to GCP migrations in addition to AWS to GCP.
 """
 
+import re
+import sys
 from enum import Enum
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Pattern, Tuple
 from dataclasses import dataclass
 
 from domain.value_objects import AzureService, GCPService
 
 
-@dataclass
+# Mappings are built once at import time and only read afterwards, so they are
+# frozen, and slotted where dataclasses support it (Python 3.10+)
+_MAPPING_DATACLASS_OPTIONS = {'frozen': True}
+if sys.version_info >= (3, 10):
+    _MAPPING_DATACLASS_OPTIONS['slots'] = True
+
+
+@dataclass(**_MAPPING_DATACLASS_OPTIONS)
 class AzureToGCPServiceMapping:
     """Mapping between Azure and GCP services for migration"""
     azure_service: AzureService
@@ -425,24 +435,43 @@ class AzureServiceMapper:
         )
     }
     
+    # The mappings are fixed at import time; expose them read-only and derive
+    # the service list and compiled API patterns once
+    SERVICE_MAPPINGS = MappingProxyType(SERVICE_MAPPINGS)
+    _AZURE_SERVICES = tuple(SERVICE_MAPPINGS.keys())
+    _COMPILED_API_PATTERNS = {
+        azure_service: (
+            tuple(re.compile(p, re.IGNORECASE) for p in mapping.azure_api_patterns),
+            tuple(re.compile(p, re.IGNORECASE) for p in mapping.gcp_api_patterns)
+        )
+        for azure_service, mapping in SERVICE_MAPPINGS.items()
+    }
+    
     @classmethod
     def get_mapping(cls, azure_service: AzureService) -> Optional[AzureToGCPServiceMapping]:
         """Get the migration mapping for an Azure service"""
         return cls.SERVICE_MAPPINGS.get(azure_service)
     
     @classmethod
-    def get_all_mappings(cls) -> Dict[AzureService, AzureToGCPServiceMapping]:
-        """Get all Azure to GCP service mappings"""
+    def get_all_mappings(cls) -> Mapping[AzureService, AzureToGCPServiceMapping]:
+        """Get all Azure to GCP service mappings (read-only)"""
         return cls.SERVICE_MAPPINGS
     
     @classmethod
-    def get_azure_services(cls) -> List[AzureService]:
-        """Get list of all supported Azure services"""
-        return list(cls.SERVICE_MAPPINGS.keys())
+    def get_azure_services(cls) -> Tuple[AzureService, ...]:
+        """Get all supported Azure services (a shared, immutable tuple)"""
+        return cls._AZURE_SERVICES
+    
+    @classmethod
+    def get_compiled_api_patterns(
+        cls, azure_service: AzureService
+    ) -> Tuple[Tuple[Pattern, ...], Tuple[Pattern, ...]]:
+        """Get the (Azure, GCP) API patterns for a service, compiled case-insensitively"""
+        return cls._COMPILED_API_PATTERNS.get(azure_service, ((), ()))
 
 
 # Extended service mapping to include cloud provider information
-@dataclass
+@dataclass(**_MAPPING_DATACLASS_OPTIONS)
 class ExtendedServiceMapping:
     """Extended service mapping with cloud provider information"""
     source_provider: str  # 'aws', 'azure', 'gcp'
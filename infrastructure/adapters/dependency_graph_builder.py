@@ -10,11 +10,182 @@ Architectural Intent:
 import os
 import ast
 import re
-from typing import List, Dict, Set, Optional
-from collections import defaultdict
+import sys
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
+from typing import List, Dict, Set, Optional, Tuple
+from collections import defaultdict, deque
 
 from domain.value_objects.mar import CrossFileDependency
 
+logger = logging.getLogger(__name__)
+
+# Node types that can hold Python statements (match_case exists from 3.10)
+_STATEMENT_CONTAINER_TYPES = (ast.stmt, ast.excepthandler) + (
+    (ast.match_case,) if hasattr(ast, 'match_case') else ()
+)
+
+# Directories never searched for code files
+_SKIP_DIRS = frozenset({'.git', '__pycache__', 'node_modules', '.venv', 'venv', 'target', '.idea'})
+
+# Java import statements and public type declarations
+_JAVA_IMPORT_RE = re.compile(r'import\s+([\w.]+)')
+_JAVA_EXPORT_RE = re.compile(r'public\s+(class|interface|enum)\s+(\w+)')
+# Keywords after which the patterns above may continue onto the next line
+_JAVA_CONTINUATION_KEYWORDS = ('import', 'public', 'class', 'interface', 'enum')
+# Characters of Java source buffered per regex scan. Each pattern has a
+# literal prefix that re searches for quickly, so scanning blocks is much
+# cheaper than scanning line by line (or with one combined alternation).
+_JAVA_SCAN_BLOCK_SIZE = 64 * 1024
+
+
+def _walk_statements(tree: ast.AST):
+    """
+    Yield the statements of a module in ast.walk order, skipping expressions
+    
+    Imports and definitions are statements, and statements only ever sit under
+    other statements, except handlers and match cases, so expression subtrees
+    never need to be visited.
+    """
+    pending = deque([tree])
+    while pending:
+        node = pending.popleft()
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, _STATEMENT_CONTAINER_TYPES):
+                pending.append(child)
+        yield node
+
+
+def _analyze_python_source(file_path: str) -> Optional[Tuple[List[str], List[str]]]:
+    """Return (imports, exports) for a Python file, or None if it can't be parsed"""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        
+        tree = ast.parse(content, filename=file_path)
+        
+        # Extract imports, including ones nested in functions
+        imports = []
+        for node in _walk_statements(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    imports.append(alias.name.split('.')[0])
+            elif isinstance(node, ast.ImportFrom):
+                if node.module:
+                    imports.append(node.module.split('.')[0])
+        
+        # Extract exports (top-level functions, classes, constants)
+        exports = []
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+                if not node.name.startswith('_'):
+                    exports.append(node.name)
+            elif isinstance(node, ast.Assign):
+                for target in node.targets:
+                    if isinstance(target, ast.Name) and not target.id.startswith('_'):
+                        exports.append(target.id)
+        
+        return imports, exports
+        
+    except SyntaxError:
+        # Skip files with syntax errors
+        return None
+    except Exception:
+        # Skip files that can't be parsed
+        return None
+
+
+def _analyze_java_source(file_path: str) -> Optional[Tuple[List[str], List[str]]]:
+    """Return (imports, exports) for a Java file, or None if it can't be read"""
+    try:
+        imports = []
+        exports = []
+        
+        # Read the file a line at a time and scan it in blocks of about
+        # _JAVA_SCAN_BLOCK_SIZE characters. A declaration can only continue onto
+        # the next line after one of the keywords, so a block is never cut
+        # after such a line (or the blank lines following it).
+        pending_lines = []
+        pending_size = 0
+        continued = False
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                pending_lines.append(line)
+                pending_size += len(line)
+                stripped = line.rstrip()
+                if stripped:
+                    continued = stripped.endswith(_JAVA_CONTINUATION_KEYWORDS)
+                if continued or pending_size < _JAVA_SCAN_BLOCK_SIZE:
+                    continue
+                _scan_java_text(''.join(pending_lines), imports, exports)
+                pending_lines.clear()
+                pending_size = 0
+        if pending_lines:
+            _scan_java_text(''.join(pending_lines), imports, exports)
+        
+        return imports, exports
+        
+    except Exception:
+        # Skip files that can't be parsed
+        return None
+
+
+def _scan_java_text(text: str, imports: List[str], exports: List[str]) -> None:
+    """Append the imports and exports declared in a chunk of Java source"""
+    # Extract imports
+    for match in _JAVA_IMPORT_RE.finditer(text):
+        import_name = match.group(1)
+        # Extract package name (first part)
+        package = import_name.split('.')[0]
+        imports.append(package)
+    
+    # Extract exports (public classes, interfaces, enums)
+    for match in _JAVA_EXPORT_RE.finditer(text):
+        exports.append(match.group(2))
+
+
+def _analyze_code_file(file_path: str, analyze_python: bool,
+                       analyze_java: bool) -> List[Optional[Tuple[List[str], List[str]]]]:
+    """Run the requested analyzers on one file, in the order their results apply"""
+    results = []
+    if analyze_python:
+        results.append(_analyze_python_source(file_path))
+    if analyze_java:
+        results.append(_analyze_java_source(file_path))
+    return results
+
+
+def _iter_code_files(root: str, extensions: Tuple[str, ...]):
+    """
+    Yield files under root ending in one of extensions
+    
+    Visits directories in the same order as os.walk (a directory's files before
+    its subdirectories), but reads each directory once with os.scandir and
+    classifies entries from the cached DirEntry data.
+    """
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                subdirs = []
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        # Like os.walk, don't descend into symlinked directories
+                        if entry.name not in _SKIP_DIRS and not entry.is_symlink():
+                            subdirs.append(entry.path)
+                    elif entry.name.endswith(extensions):
+                        yield entry.path
+        except OSError:
+            continue
+        pending.extend(reversed(subdirs))
+
 
 class DependencyGraphBuilder:
     """
@@ -24,7 +195,18 @@ class DependencyGraphBuilder:
     a comprehensive dependency graph.
     """
     
-    def __init__(self):
+    # Repositories with fewer code files than this are analyzed in-process
+    PARALLEL_ANALYSIS_MIN_FILES = 64
+    
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Initialize the builder
+        
+        Args:
+            max_workers: Worker processes for file analysis (None uses the CPU
+                         count, 1 disables parallel analysis)
+        """
+        self.max_workers = max_workers
         self.dependencies: List[CrossFileDependency] = []
         self.imports_map: Dict[str, List[str]] = defaultdict(list)  # file -> imports
         self.exports_map: Dict[str, List[str]] = defaultdict(list)  # file -> exports
@@ -47,18 +229,45 @@ class DependencyGraphBuilder:
         # Find all code files
         code_files = self._find_code_files(repository_path, languages)
         
+        relative_paths = [os.path.relpath(file_path, repository_path) for file_path in code_files]
+        
         # Build imports and exports for each file
-        for file_path in code_files:
-            if 'python' in languages:
-                self._analyze_python_file(file_path, repository_path)
-            if 'java' in languages:
-                self._analyze_java_file(file_path, repository_path)
+        analyze_python = 'python' in languages
+        analyze_java = 'java' in languages
+        analysis = self._analyze_code_files(code_files, analyze_python, analyze_java)
+        for relative_path, results in zip(relative_paths, analysis):
+            for result in results:
+                self._record_analysis(relative_path, result)
         
         # Build cross-file dependencies
-        self._build_cross_file_dependencies(code_files, repository_path)
+        self._build_cross_file_dependencies(code_files, repository_path, relative_paths)
         
         return self.dependencies
     
+    def _analyze_code_files(self, code_files: List[str], analyze_python: bool,
+                            analyze_java: bool) -> List[List[Optional[Tuple[List[str], List[str]]]]]:
+        """
+        Analyze files, spreading the work over a process pool for large repositories
+        
+        Parsing is CPU-bound and independent per file, so worker processes avoid
+        the GIL. Small repositories are analyzed inline, where starting a pool
+        would cost more than it saves.
+        """
+        if len(code_files) >= self.PARALLEL_ANALYSIS_MIN_FILES and self.max_workers != 1:
+            try:
+                with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                    return list(executor.map(
+                        _analyze_code_file,
+                        code_files,
+                        repeat(analyze_python),
+                        repeat(analyze_java),
+                        chunksize=32
+                    ))
+            except (OSError, BrokenProcessPool) as e:
+                logger.warning(f"Parallel file analysis unavailable, analyzing serially: {e}")
+        
+        return [_analyze_code_file(file_path, analyze_python, analyze_java) for file_path in code_files]
+    
     def _find_code_files(self, repo_path: str, languages: List[str]) -> List[str]:
         """Find all code files in repository"""
         code_files = []
@@ -69,133 +278,87 @@ class DependencyGraphBuilder:
         if 'java' in languages:
             extensions.extend(['.java'])
         
-        for root, dirs, files in os.walk(repo_path):
-            # Skip common directories
-            dirs[:] = [d for d in dirs if d not in ['.git', '__pycache__', 'node_modules', '.venv', 'venv', 'target', '.idea']]
-            
-            for file in files:
-                if any(file.endswith(ext) for ext in extensions):
-                    code_files.append(os.path.join(root, file))
+        if extensions:
+            code_files.extend(_iter_code_files(repo_path, tuple(extensions)))
         
         return code_files
     
     def _analyze_python_file(self, file_path: str, repo_path: str) -> None:
         """Analyze Python file for imports and exports"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            tree = ast.parse(content, filename=file_path)
-            relative_path = os.path.relpath(file_path, repo_path)
-            
-            # Extract imports
-            imports = []
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        imports.append(alias.name.split('.')[0])
-                elif isinstance(node, ast.ImportFrom):
-                    if node.module:
-                        imports.append(node.module.split('.')[0])
-            
-            self.imports_map[relative_path] = imports
-            
-            # Extract exports (top-level functions, classes, constants)
-            exports = []
-            for node in ast.walk(tree):
-                if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
-                    if not node.name.startswith('_'):
-                        exports.append(node.name)
-                elif isinstance(node, ast.Assign):
-                    for target in node.targets:
-                        if isinstance(target, ast.Name) and not target.id.startswith('_'):
-                            exports.append(target.id)
-            
-            self.exports_map[relative_path] = exports
-            
-        except SyntaxError:
-            # Skip files with syntax errors
-            pass
-        except Exception:
-            # Skip files that can't be parsed
-            pass
+        self._record_analysis(os.path.relpath(file_path, repo_path), _analyze_python_source(file_path))
     
     def _analyze_java_file(self, file_path: str, repo_path: str) -> None:
         """Analyze Java file for imports and exports"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            relative_path = os.path.relpath(file_path, repo_path)
-            
-            # Extract imports
-            imports = []
-            import_pattern = r'import\s+([\w.]+)'
-            for match in re.finditer(import_pattern, content):
-                import_name = match.group(1)
-                # Extract package name (first part)
-                package = import_name.split('.')[0]
-                imports.append(package)
-            
-            self.imports_map[relative_path] = imports
-            
-            # Extract exports (public classes, interfaces, enums)
-            exports = []
-            # Match public class/interface/enum declarations
-            export_pattern = r'public\s+(class|interface|enum)\s+(\w+)'
-            for match in re.finditer(export_pattern, content):
-                exports.append(match.group(2))
-            
-            self.exports_map[relative_path] = exports
-            
-        except Exception:
-            # Skip files that can't be parsed
-            pass
+        self._record_analysis(os.path.relpath(file_path, repo_path), _analyze_java_source(file_path))
+    
+    def _record_analysis(self, relative_path: str,
+                         result: Optional[Tuple[List[str], List[str]]]) -> None:
+        """Store the imports and exports found for a file"""
+        if result is None:
+            return
+        imports, exports = result
+        # The same package and symbol names recur across many files; intern them
+        # here, after results from worker processes have been unpickled, so
+        # every map shares one string per name
+        self.imports_map[relative_path] = [sys.intern(name) for name in imports]
+        self.exports_map[relative_path] = [sys.intern(name) for name in exports]
     
-    def _build_cross_file_dependencies(self, code_files: List[str], repo_path: str) -> None:
+    def _build_cross_file_dependencies(self, code_files: List[str], repo_path: str,
+                                       relative_paths: Optional[List[str]] = None) -> None:
         """Build cross-file dependency relationships"""
+        if relative_paths is None:
+            relative_paths = [os.path.relpath(file_path, repo_path) for file_path in code_files]
+        
         # Create a map of module names to file paths
         module_to_file = {}
-        for file_path in code_files:
-            relative_path = os.path.relpath(file_path, repo_path)
+        for relative_path in relative_paths:
             module_name = self._get_module_name(relative_path)
             module_to_file[module_name] = relative_path
+        module_index = self._index_modules(module_to_file)
+        
+        # Imports repeat across files and resolution doesn't depend on the
+        # importing file, so resolve each module name once
+        resolved_targets: Dict[str, Optional[str]] = {}
+        
+        # Track usage counts per (source, target) and build the frozen
+        # dependency objects once, after all imports have been counted
+        usage_counts: Dict[Tuple[str, str], int] = {}
+        dependency_names: Dict[Tuple[str, str], str] = {}
+        for dep in self.dependencies:
+            key = (dep.source_file, dep.target_file)
+            usage_counts[key] = dep.usage_count
+            dependency_names[key] = dep.dependency_name
         
         # Build dependencies based on imports
-        for file_path in code_files:
-            relative_path = os.path.relpath(file_path, repo_path)
+        for relative_path in relative_paths:
             imports = self.imports_map.get(relative_path, [])
             
             for imported_module in imports:
                 # Try to find the file that exports this module
-                target_file = self._find_target_file(imported_module, module_to_file, relative_path)
+                if imported_module in resolved_targets:
+                    target_file = resolved_targets[imported_module]
+                else:
+                    target_file = self._find_target_file(
+                        imported_module, module_to_file, relative_path, module_index
+                    )
+                    resolved_targets[imported_module] = target_file
                 
                 if target_file and target_file != relative_path:
-                    # Check if this dependency already exists
-                    existing = next(
-                        (d for d in self.dependencies 
-                         if d.source_file == relative_path and d.target_file == target_file),
-                        None
-                    )
-                    
-                    if existing:
-                        # Update usage count
-                        self.dependencies.remove(existing)
-                        self.dependencies.append(CrossFileDependency(
-                            source_file=relative_path,
-                            target_file=target_file,
-                            dependency_type='import',
-                            dependency_name=imported_module,
-                            usage_count=existing.usage_count + 1
-                        ))
-                    else:
-                        self.dependencies.append(CrossFileDependency(
-                            source_file=relative_path,
-                            target_file=target_file,
-                            dependency_type='import',
-                            dependency_name=imported_module,
-                            usage_count=1
-                        ))
+                    # Re-insert so the most recently updated dependency stays last
+                    key = (relative_path, target_file)
+                    usage_counts[key] = usage_counts.pop(key, 0) + 1
+                    dependency_names[key] = imported_module
+        
+        self.dependencies = [
+            CrossFileDependency(
+                source_file=source_file,
+                target_file=target_file,
+                dependency_type='import',
+                dependency_name=dependency_names[(source_file, target_file)],
+                usage_count=usage_count
+            )
+            for (source_file, target_file), usage_count in usage_counts.items()
+        ]
     
     def _get_module_name(self, file_path: str) -> str:
         """Extract module name from file path"""
@@ -207,21 +370,40 @@ class DependencyGraphBuilder:
         module_name = module_name.lstrip('.')
         return module_name
     
+    def _index_modules(self, module_to_file: Dict[str, str]) -> Tuple[List[Tuple[str, str]], Dict[str, int]]:
+        """Index modules by the position of the first module containing each dotted component"""
+        module_items = list(module_to_file.items())
+        component_positions: Dict[str, int] = {}
+        for position, (module, _) in enumerate(module_items):
+            for component in module.split('.'):
+                component_positions.setdefault(component, position)
+        return module_items, component_positions
+    
     def _find_target_file(self, module_name: str, module_to_file: Dict[str, str], 
-                         current_file: str) -> Optional[str]:
+                         current_file: str,
+                         module_index: Optional[Tuple[List[Tuple[str, str]], Dict[str, int]]] = None) -> Optional[str]:
         """Find target file for an imported module"""
         # Direct match
         if module_name in module_to_file:
             return module_to_file[module_name]
         
-        # Try partial matches (for relative imports)
-        for module, file_path in module_to_file.items():
-            if module.endswith(module_name) or module_name in module.split('.'):
+        if module_index is None:
+            module_index = self._index_modules(module_to_file)
+        module_items, component_positions = module_index
+        
+        # Try partial matches (for relative imports). The component index gives
+        # the first module containing module_name as a component, so only the
+        # modules before it need the suffix check.
+        component_position = component_positions.get(module_name, len(module_items))
+        for module, file_path in module_items[:component_position]:
+            if module.endswith(module_name):
                 return file_path
+        if component_position < len(module_items):
+            return module_items[component_position][1]
         
         # Try to find file with matching name
         module_base = module_name.split('.')[-1]
-        for module, file_path in module_to_file.items():
+        for module, file_path in module_items:
             if module_base in file_path or module_base == os.path.splitext(os.path.basename(file_path))[0]:
                 return file_path
         
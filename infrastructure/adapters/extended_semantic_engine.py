@@ -6,13 +6,94 @@ multiple AWS services and their GCP equivalents.
 """
 
 import ast
+import hashlib
+import io
 import re
-from typing import Dict, Any, List, Optional
+import tokenize
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache, wraps
+from types import MappingProxyType
+from typing import Dict, Any, FrozenSet, List, Optional
 from abc import ABC, abstractmethod
 
 from infrastructure.adapters.service_mapping import ServiceMapper, ServiceMigrationMapping, ExtendedCodeAnalyzer
+from infrastructure.adapters.result_cache import LRUCache
 from domain.value_objects import AWSService, GCPService
 
+# Optional: Hyperscan matches all the service usage patterns in one DFA scan
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+
+# Recipe fields that decide a transformation's output; the rest (transformation
+# steps, LLM guidance) only describe it
+_RECIPE_CACHE_FIELDS = ('operation', 'service_type', 'target_api')
+
+
+def _recipe_cache_key(recipe: Dict[str, Any]) -> Optional[tuple]:
+    """Hashable form of a transformation recipe's output-deciding fields, or None if they are unhashable"""
+    try:
+        key = tuple(recipe.get(field) for field in _RECIPE_CACHE_FIELDS)
+        hash(key)
+    except (AttributeError, TypeError):
+        return None
+    return key
+
+
+# Sources longer than this bypass the source caches: a few large files would
+# otherwise keep megabytes of source text and syntax trees alive long after
+# they are migrated, while parsing them again costs little next to migrating
+_MAX_CACHED_CODE_LENGTH = 64 * 1024
+
+
+def _source_cache(maxsize: int):
+    """lru_cache for a function of source code that skips sources above _MAX_CACHED_CODE_LENGTH"""
+    def decorator(function):
+        cached = lru_cache(maxsize=maxsize)(function)
+        
+        @wraps(function)
+        def wrapper(code):
+            if len(code) > _MAX_CACHED_CODE_LENGTH:
+                return function(code)
+            return cached(code)
+        
+        wrapper.cache_info = cached.cache_info
+        wrapper.cache_clear = cached.cache_clear
+        return wrapper
+    return decorator
+
+
+def _source_digest(code: str) -> bytes:
+    """Fixed-size digest identifying a source by its content"""
+    return hashlib.blake2b(code.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+@_source_cache(maxsize=4096)
+def _is_valid_python(code: str) -> bool:
+    """Whether code parses as Python; cached since retries re-validate the same output"""
+    try:
+        ast.parse(code)
+        return True
+    except SyntaxError:
+        return False
+
+
+@_source_cache(maxsize=512)
+def _parse_python(code: str) -> Optional[ast.Module]:
+    """
+    Parsed module for code, or None if it does not parse
+    
+    Cached so the passes inspecting the same source (already-migrated checks,
+    call location) share one parse; callers must not mutate the returned tree.
+    """
+    try:
+        return ast.parse(code)
+    except (SyntaxError, ValueError):
+        return None
+
 
 class ExtendedASTTransformationEngine:
     """
@@ -21,24 +102,95 @@ class ExtendedASTTransformationEngine:
     Supports migration of various AWS services to their GCP equivalents.
     """
     
-    def __init__(self):
-        self.service_mapper = ServiceMapper()
+    # Most recent transform_code results kept for repeated identical inputs
+    TRANSFORM_CACHE_SIZE = 1024
+    # transform_batch uses a process pool once a batch has this many sources
+    # totalling this many characters
+    PARALLEL_BATCH_MIN_ITEMS = 2
+    PARALLEL_BATCH_MIN_SOURCE_SIZE = 256 * 1024
+    
+    def __init__(self, service_mapper: Optional[ServiceMapper] = None):
+        self.service_mapper = service_mapper if service_mapper is not None else ServiceMapper()
+        self._transform_cache = LRUCache(self.TRANSFORM_CACHE_SIZE)
+        # Set when a transformation falls back after Gemini or a migration
+        # fails; such results are not cached, so a later call can succeed
+        self._used_fallback = False
+        # Language aliases share one transformer instance
+        csharp_transformer = ExtendedCSharpTransformer(self.service_mapper)  # Uses Gemini API
+        javascript_transformer = ExtendedJavaScriptTransformer(self.service_mapper)  # Uses Gemini API
+        go_transformer = ExtendedGoTransformer(self.service_mapper)  # Uses Gemini API
         self.transformers = {
             'python': ExtendedPythonTransformer(self.service_mapper),
             'java': ExtendedJavaTransformer(self.service_mapper),
-            'csharp': ExtendedCSharpTransformer(self.service_mapper),  # Uses Gemini API
-            'c#': ExtendedCSharpTransformer(self.service_mapper),  # Alias
-            'javascript': ExtendedJavaScriptTransformer(self.service_mapper),  # Uses Gemini API
-            'js': ExtendedJavaScriptTransformer(self.service_mapper),  # Alias
-            'nodejs': ExtendedJavaScriptTransformer(self.service_mapper),  # Alias
-            'node': ExtendedJavaScriptTransformer(self.service_mapper),  # Alias
-            'go': ExtendedGoTransformer(self.service_mapper),  # Uses Gemini API
-            'golang': ExtendedGoTransformer(self.service_mapper)  # Alias
+            'csharp': csharp_transformer,
+            'c#': csharp_transformer,  # Alias
+            'javascript': javascript_transformer,
+            'js': javascript_transformer,  # Alias
+            'nodejs': javascript_transformer,  # Alias
+            'node': javascript_transformer,  # Alias
+            'go': go_transformer,
+            'golang': go_transformer  # Alias
         }
     
+    @property
+    def used_fallback(self) -> bool:
+        """Whether the last transform_code call fell back after Gemini or a migration failed"""
+        return self._used_fallback
+    
     def transform_code(self, code: str, language: str, transformation_recipe: Dict[str, Any]) -> tuple[str, dict]:
         """
         Transform code based on the transformation recipe.
+        
+        Results are cached per (code, language, operation, service type, target
+        API), so repeating a transformation skips the migration, cleanup and
+        validation passes; fallback results and sources above
+        _MAX_CACHED_CODE_LENGTH are not cached. used_fallback reports afterwards
+        whether this call fell back.
+        
+        Returns:
+            tuple: (transformed_code, variable_mapping) where variable_mapping is a dict
+                   mapping old variable names to new variable names
+        """
+        self._used_fallback = False
+        recipe_key = _recipe_cache_key(transformation_recipe)
+        if recipe_key is None or not isinstance(code, str) or len(code) > _MAX_CACHED_CODE_LENGTH:
+            return self._transform_code_uncached(code, language, transformation_recipe)
+        
+        cache_key = (code, language, recipe_key)
+        cached = self._transform_cache.get(cache_key)
+        if cached is None:
+            cached = self._transform_code_uncached(code, language, transformation_recipe)
+            if not self._used_fallback:
+                self._transform_cache.put(cache_key, cached)
+        transformed_code, variable_mapping = cached
+        return transformed_code, dict(variable_mapping)
+    
+    def transform_batch(self, items: List[tuple], max_workers: Optional[int] = None) -> List[tuple[str, dict]]:
+        """
+        Transform many independent sources, given as (code, language, recipe) tuples
+        
+        Results are returned in input order, as transform_code would return them.
+        Large batches are spread over a process pool whose workers each build an
+        engine of this engine's class around its service mapper; small ones, or
+        max_workers=1, run inline where starting a pool would cost more than it saves.
+        """
+        items = list(items)
+        if (len(items) >= self.PARALLEL_BATCH_MIN_ITEMS
+                and sum(len(code) for code, _, _ in items) >= self.PARALLEL_BATCH_MIN_SOURCE_SIZE
+                and max_workers != 1):
+            try:
+                with ProcessPoolExecutor(max_workers=max_workers, initializer=_start_transform_worker,
+                                         initargs=(type(self), self.service_mapper)) as executor:
+                    return list(executor.map(_transform_code_in_worker, *zip(*items)))
+            except (OSError, BrokenProcessPool) as e:
+                import logging
+                logging.getLogger(__name__).warning(f"Parallel batch transformation unavailable, transforming serially: {e}")
+        
+        return [self.transform_code(code, language, recipe) for code, language, recipe in items]
+    
+    def _transform_code_uncached(self, code: str, language: str, transformation_recipe: Dict[str, Any]) -> tuple[str, dict]:
+        """
+        Transform code based on the transformation recipe.
         NEW APPROACH: Use Gemini FIRST for transformation, regex only for simple patterns.
         This is more reliable than regex-based transformation.
         
@@ -85,6 +237,7 @@ class ExtendedASTTransformationEngine:
                     import logging
                     logging.error(f"Error in S3 to GCS migration: {e}")
                     # Fallback to aggressive cleanup only
+                    self._used_fallback = True
                     transformed_code = self._aggressive_aws_cleanup(code)
                     return transformed_code if transformed_code else code, {}
             elif service_type == 'lambda_to_cloud_functions':
@@ -284,8 +437,7 @@ class ExtendedASTTransformationEngine:
         # Get variable mapping if available
         variable_mapping = {}
         if hasattr(self.transformers.get(language), '_variable_mappings'):
-            code_id = id(code)
-            variable_mapping = self.transformers[language]._variable_mappings.get(code_id, {})
+            variable_mapping = self.transformers[language]._variable_mappings.get(_source_digest(code)) or {}
         
         return transformed_code, variable_mapping
     
@@ -304,6 +456,7 @@ class ExtendedASTTransformationEngine:
             
             if not Config.GEMINI_API_KEY:
                 logger.warning("GEMINI_API_KEY not set, falling back to regex")
+                self._used_fallback = True
                 return self._fallback_regex_transform(code, recipe)
             
             genai.configure(api_key=Config.GEMINI_API_KEY)
@@ -395,6 +548,7 @@ class ExtendedASTTransformationEngine:
             
         except Exception as e:
             logger.warning(f"Gemini transformation failed: {e}, falling back to regex")
+            self._used_fallback = True
             fallback_result = self._fallback_regex_transform(code, recipe)
             # Ensure fallback result is valid
             if fallback_result is None or not isinstance(fallback_result, str):
@@ -415,15 +569,15 @@ class ExtendedASTTransformationEngine:
         
         # Detect services from code
         services_detected = []
-        if re.search(r'boto3\.(client|resource)\([\'\"]s3[\'\"]', code, re.IGNORECASE) or re.search(r'\.(get_object|put_object|upload_file|download_file)', code):
+        if _S3_CLIENT_CALL_RE.search(code) or _S3_DATA_CALL_RE.search(code):
             services_detected.append('S3')
-        if re.search(r'boto3\.(client|resource)\([\'\"]dynamodb[\'\"]', code, re.IGNORECASE) or re.search(r'\.(put_item|get_item|batch_write)', code):
+        if _DYNAMODB_CLIENT_CALL_RE.search(code) or _DYNAMODB_DATA_CALL_RE.search(code):
             services_detected.append('DynamoDB')
-        if re.search(r'boto3\.(client|resource)\([\'\"]sqs[\'\"]', code, re.IGNORECASE) or re.search(r'\.send_message', code):
+        if _SQS_CLIENT_CALL_RE.search(code) or _SQS_SEND_MESSAGE_CALL_RE.search(code):
             services_detected.append('SQS')
-        if re.search(r'boto3\.(client|resource)\([\'\"]sns[\'\"]', code, re.IGNORECASE) or re.search(r'\.publish.*TopicArn', code):
+        if _SNS_CLIENT_CALL_RE.search(code) or _SNS_TOPIC_PUBLISH_RE.search(code):
             services_detected.append('SNS')
-        if re.search(r'lambda_handler\s*\(', code, re.IGNORECASE) or re.search(r'event\[[\'"]Records[\'"]\]', code):
+        if _LAMBDA_HANDLER_NAME_CALL_RE.search(code) or _EVENT_RECORDS_INDEX_RE.search(code):
             services_detected.append('Lambda')
         
         services_str = ', '.join(services_detected) if services_detected else 'AWS services'
@@ -562,15 +716,15 @@ When generating the refactored code, you MUST follow Clean Architecture principl
         
         # Detect services from Java code
         services_detected = []
-        if re.search(r'com\.amazonaws\.services\.s3|AmazonS3|S3Client', code, re.IGNORECASE):
+        if _JAVA_S3_USAGE_RE.search(code):
             services_detected.append('S3')
-        if re.search(r'com\.amazonaws\.services\.dynamodb|AmazonDynamoDB|DynamoDB', code, re.IGNORECASE):
+        if _JAVA_DYNAMODB_USAGE_RE.search(code):
             services_detected.append('DynamoDB')
-        if re.search(r'com\.amazonaws\.services\.sqs|AmazonSQS|SQS', code, re.IGNORECASE):
+        if _JAVA_SQS_USAGE_RE.search(code):
             services_detected.append('SQS')
-        if re.search(r'com\.amazonaws\.services\.sns|AmazonSNS|SNS', code, re.IGNORECASE):
+        if _JAVA_SNS_USAGE_RE.search(code):
             services_detected.append('SNS')
-        if re.search(r'RequestHandler|lambda\.runtime|Lambda', code, re.IGNORECASE):
+        if _JAVA_LAMBDA_USAGE_RE.search(code):
             services_detected.append('Lambda')
         
         services_str = ', '.join(services_detected) if services_detected else 'AWS services'
@@ -699,15 +853,15 @@ When generating the refactored code, you MUST follow Clean Architecture principl
         
         # Detect services from C# code
         services_detected = []
-        if re.search(r'Amazon\.S3|AmazonS3|S3Client|AWSSDK\.S3', code, re.IGNORECASE):
+        if _CSHARP_S3_USAGE_RE.search(code):
             services_detected.append('S3')
-        if re.search(r'Amazon\.DynamoDB|AmazonDynamoDB|DynamoDBClient|AWSSDK\.DynamoDB', code, re.IGNORECASE):
+        if _CSHARP_DYNAMODB_USAGE_RE.search(code):
             services_detected.append('DynamoDB')
-        if re.search(r'Amazon\.SQS|AmazonSQS|SQSClient|AWSSDK\.SQS', code, re.IGNORECASE):
+        if _CSHARP_SQS_USAGE_RE.search(code):
             services_detected.append('SQS')
-        if re.search(r'Amazon\.SNS|AmazonSNS|SNSClient|AWSSDK\.SNS', code, re.IGNORECASE):
+        if _CSHARP_SNS_USAGE_RE.search(code):
             services_detected.append('SNS')
-        if re.search(r'Amazon\.Lambda|ILambdaContext|LambdaFunction|APIGatewayProxy|AWSSDK\.Lambda', code, re.IGNORECASE):
+        if _CSHARP_LAMBDA_USAGE_RE.search(code):
             services_detected.append('Lambda')
         
         services_str = ', '.join(services_detected) if services_detected else 'AWS services'
@@ -853,15 +1007,15 @@ When generating the refactored code, you MUST follow Clean Architecture principl
         
         # Detect services from JavaScript code
         services_detected = []
-        if re.search(r'aws-sdk|AWS\.S3|S3Client|@aws-sdk/client-s3', code, re.IGNORECASE):
+        if _JAVASCRIPT_S3_USAGE_RE.search(code):
             services_detected.append('S3')
-        if re.search(r'AWS\.DynamoDB|DynamoDBClient|@aws-sdk/client-dynamodb', code, re.IGNORECASE):
+        if _JAVASCRIPT_DYNAMODB_USAGE_RE.search(code):
             services_detected.append('DynamoDB')
-        if re.search(r'AWS\.Lambda|LambdaClient|@aws-sdk/client-lambda|exports\.handler', code, re.IGNORECASE):
+        if _JAVASCRIPT_LAMBDA_USAGE_RE.search(code):
             services_detected.append('Lambda')
-        if re.search(r'AWS\.SQS|SQSClient|@aws-sdk/client-sqs', code, re.IGNORECASE):
+        if _JAVASCRIPT_SQS_USAGE_RE.search(code):
             services_detected.append('SQS')
-        if re.search(r'AWS\.SNS|SNSClient|@aws-sdk/client-sns', code, re.IGNORECASE):
+        if _JAVASCRIPT_SNS_USAGE_RE.search(code):
             services_detected.append('SNS')
         
         services_str = ', '.join(services_detected) if services_detected else 'AWS services'
@@ -983,15 +1137,15 @@ When generating the refactored code, you MUST follow Clean Architecture principl
         
         # Detect services from Go code
         services_detected = []
-        if re.search(r'github\.com/aws/aws-sdk-go.*s3|s3\.New|s3iface', code, re.IGNORECASE):
+        if _GO_S3_USAGE_RE.search(code):
             services_detected.append('S3')
-        if re.search(r'github\.com/aws/aws-sdk-go.*dynamodb|dynamodb\.New|dynamodbiface', code, re.IGNORECASE):
+        if _GO_DYNAMODB_USAGE_RE.search(code):
             services_detected.append('DynamoDB')
-        if re.search(r'github\.com/aws/aws-sdk-go.*lambda|lambda\.New', code, re.IGNORECASE):
+        if _GO_LAMBDA_USAGE_RE.search(code):
             services_detected.append('Lambda')
-        if re.search(r'github\.com/aws/aws-sdk-go.*sqs|sqs\.New', code, re.IGNORECASE):
+        if _GO_SQS_USAGE_RE.search(code):
             services_detected.append('SQS')
-        if re.search(r'github\.com/aws/aws-sdk-go.*sns|sns\.New', code, re.IGNORECASE):
+        if _GO_SNS_USAGE_RE.search(code):
             services_detected.append('SNS')
         
         services_str = ', '.join(services_detected) if services_detected else 'AWS services'
@@ -1225,146 +1379,16 @@ When generating the refactored code, you MUST follow Clean Architecture principl
             return False
         
         if language == 'java':
-            aws_patterns = [
-                r'com\.amazonaws',
-                r'software\.amazon\.awssdk',  # AWS SDK v2
-                r'AmazonS3',
-                r'AmazonDynamoDB',
-                r'AmazonSQS',
-                r'AmazonSNS',
-                r'RequestHandler',
-                r'AWS.*Client',
-                r'\bS3Client\b',  # Word boundary to avoid false positives
-                r'DynamoDBClient',
-                r'SQSClient',
-                r'SNSClient',
-                r'AmazonS3ClientBuilder',
-                r'S3ClientBuilder',
-            ]
+            aws_marker = _JAVA_AWS_MARKER_RE
         elif language == 'csharp':
-            aws_patterns = [
-                r'Amazon\.',
-                r'AWSSDK\.',
-                r'\bIAmazonS3\b',  # Word boundary to avoid false positives
-                r'\bAmazonS3Client\b',
-                r'\bIAmazonDynamoDB\b',
-                r'\bAmazonDynamoDBClient\b',
-                r'\bIAmazonSQS\b',
-                r'\bAmazonSQSClient\b',
-                r'\bIAmazonSNS\b',
-                r'\bAmazonSNSClient\b',
-                r'\bILambdaContext\b',
-                r'\bAPIGatewayProxyRequest\b',
-                r'\bAPIGatewayProxyResponse\b',
-            ]
+            aws_marker = _CSHARP_AWS_MARKER_RE
         elif language in ['go', 'golang']:
-            aws_patterns = [
-                r'github\.com/aws/aws-sdk-go',
-                r'github\.com/aws/aws-sdk-go-v2',
-                r's3\.New\(',
-                r'dynamodb\.New\(',
-                r'lambda\.New\(',
-                r'sqs\.New\(',
-                r'sns\.New\(',
-                r's3iface\.',
-                r'dynamodbiface\.',
-                r'\.S3\(',
-                r'\.DynamoDB\(',
-                r'\.Lambda\(',
-                r'\.SQS\(',
-                r'\.SNS\(',
-                r'AWS_ACCESS_KEY_ID',
-                r'AWS_SECRET_ACCESS_KEY',
-                r'AWS_DEFAULT_REGION',
-            ]
+            aws_marker = _GO_AWS_MARKER_RE
         elif language in ['javascript', 'js', 'nodejs', 'node']:
-            aws_patterns = [
-                r'aws-sdk',
-                r'@aws-sdk',
-                r'AWS\.S3',
-                r'AWS\.DynamoDB',
-                r'AWS\.Lambda',
-                r'AWS\.SQS',
-                r'AWS\.SNS',
-                r'aws-sdk/clients/s3',
-                r'aws-sdk/clients/dynamodb',
-                r'\.s3\(\)',
-                r'\.dynamodb\(\)',
-                r'\.lambda\(\)',
-                r'\.sqs\(\)',
-                r'\.sns\(\)',
-                r'S3Client',
-                r'DynamoDBClient',
-                r'LambdaClient',
-                r'SQSClient',
-                r'SNSClient',
-            ]
-        elif language in ['go', 'golang']:
-            aws_patterns = [
-                r'github\.com/aws/aws-sdk-go',
-                r'github\.com/aws/aws-sdk-go-v2',
-                r's3\.New',
-                r'dynamodb\.New',
-                r'lambda\.New',
-                r'sqs\.New',
-                r'sns\.New',
-                r's3iface\.S3API',
-                r'dynamodbiface\.DynamoDBAPI',
-                r'\.S3\(',
-                r'\.DynamoDB\(',
-                r'\.Lambda\(',
-                r'\.SQS\(',
-                r'\.SNS\(',
-            ]
+            aws_marker = _JAVASCRIPT_AWS_MARKER_RE
         else:
-            aws_patterns = [
-                r'\bboto3\b',
-                r'\bdynamodb_client\b',
-                r'\bsqs_client\b',
-                r'\bsns_client\b',
-                r'\bs3_client\b',
-                r'\blambda_handler\s*\(',
-                r'event\[[\'"]Records[\'"]\]',
-                r'\.get_object\s*\(',
-            r'\.batch_write_item\s*\(',
-            r'\.send_message\s*\(',
-            r'Bucket\s*=',
-            r'Key\s*=',
-            r'QueueUrl\s*=',
-            r'TopicArn\s*=',
-            r'DYNAMODB_TABLE_NAME',
-            r'SQS_DLQ_URL',
-            r'SNS_TOPIC_ARN',
-            r'return\s+\{\s*[\'"]statusCode[\'"]',
-            r'https://sqs\.',  # SQS URLs
-            r'arn:aws:sns:',  # SNS ARNs
-            r's3://',  # S3 URLs
-            r'\'s3_key\'',  # Dictionary keys
-            r'"s3_key"',
-            r'batch_write_to_dynamodb',  # Function names
-            r'publish_sns_summary',  # Function names
-            r'send_to_dlq',  # Function names
-            r'storage_client\.exceptions\.NoSuchKey',  # Wrong exception
-            r'response\s*=\s*batch\s*=\s*',  # Broken syntax
-            r'FIRESTORE_COLLECTION_NAME:\s*batch',  # Invalid syntax
-            r'Subject\s*=',  # SNS Subject parameter
-            r'json\.dumps\(json\.dumps',  # Double encoding
-            r'CreateBucketConfiguration',  # AWS S3 parameter
-            r'LocationConstraint',  # AWS S3 parameter
-            r'get_paginator',  # AWS pagination
-            r'wait_until_exists',  # AWS S3 resource method (doesn't exist in GCP)
-            r'\.meta\.client\.meta\.region_name',  # AWS-specific meta access
-            r'\.meta\.client',  # AWS resource meta access
-        ]
-        
-        for pattern in aws_patterns:
-            try:
-                if code and isinstance(code, str) and re.search(pattern, code, re.IGNORECASE):
-                    return True
-            except Exception:
-                # Skip this pattern if it causes an error
-                continue
-        return False
+            aws_marker = _PYTHON_AWS_MARKER_RE
+        return aws_marker.search(code) is not None
     
     def _apply_simple_regex_fixes(self, code: str) -> str:
         """Apply only simple, unambiguous regex fixes (imports, basic patterns)."""
@@ -1378,12 +1402,7 @@ When generating the refactored code, you MUST follow Clean Architecture principl
         
         try:
             # Only fix imports - these are unambiguous
-            code = re.sub(r'^import boto3\s*$', '', code, flags=re.MULTILINE)
-            if code is None:
-                code = ""
-            code = re.sub(r'^from boto3.*$', '', code, flags=re.MULTILINE)
-            if code is None:
-                code = ""
+            code = _BOTO3_IMPORT_LINE_RE.sub('', code)
             
             # Ensure code is still valid
             if code is None or not isinstance(code, str):
@@ -1410,12 +1429,7 @@ When generating the refactored code, you MUST follow Clean Architecture principl
     
     def _is_valid_syntax(self, code: str) -> bool:
         """Check if code has valid Python syntax."""
-        try:
-            import ast
-            ast.parse(code)
-            return True
-        except SyntaxError:
-            return False
+        return _is_valid_python(code)
     
     def _fallback_regex_transform(self, code: str, recipe: Dict[str, Any]) -> str:
         """Fallback regex transformation if Gemini is unavailable."""
@@ -1462,1352 +1476,205 @@ When generating the refactored code, you MUST follow Clean Architecture principl
         
         result = code
         
-        # Ensure result is always a string after each operation
-        def safe_re_sub(pattern, repl, string, **kwargs):
-            """Safe regex substitution that always returns a string"""
-            if string is None:
-                return ""
-            try:
-                result = re.sub(pattern, repl, string, **kwargs)
-                return result if result is not None else string
-            except Exception:
-                return string
-        
         # STEP 1: Replace ALL boto3.client() calls FIRST - be EXTREMELY aggressive
         # Match ANY whitespace, any quotes, any parameters
-        # Use safe_re_sub wrapper to ensure we always get a string back
-        # Ensure result is valid before starting
-        if result is None or not isinstance(result, str):
-            result = code
+        result = _apply_call_rewrites(result, _AWS_CLEANUP_CLIENT_REWRITES)
         
-        try:
-            result = safe_re_sub(
-                r'(\w+)\s*=\s*boto3\s*\.\s*client\s*\(\s*[\'\"]dynamodb[\'\"][^\)]*\)',
-                r'\1 = firestore.Client()',
-                result,
-                flags=re.DOTALL | re.IGNORECASE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            result = code
-        
-        # Ensure result is valid before continuing
-        if result is None or not isinstance(result, str):
-            result = code
+        # STEP 2: Fix variable names IMMEDIATELY after client replacement
+        # Be aggressive - replace ALL occurrences
+        result = _apply_call_rewrites(result, _AWS_CLEANUP_CLIENT_VARIABLE_RENAMES)
         
-        # Wrap all boto3.client() replacements in try-except
-        # Ensure result is valid before each replacement
-        if result is None or not isinstance(result, str):
-            result = code
+        # Ensure result is valid before STEP 3
+        # STEP 3: Fix AWS API method calls - S3 operations
+        # Handle paginators FIRST before other operations
+        # Replace paginator creation - match any variable name
+        result = _apply_call_rewrites(result, _AWS_CLEANUP_PAGINATOR_REWRITES)
+        # CRITICAL: Handle nested loop pattern - replace "for page in X:" followed by "for bucket in page['Buckets']:"
+        # First, replace the nested pattern: "for bucket in page['Buckets']:" -> just remove (we'll iterate buckets directly)
+        result = _apply_call_rewrites(result, _AWS_CLEANUP_BUCKET_PAGE_REWRITES)
+        # s3_client.upload_file(file_name, bucket, object_name) -> GCS upload_from_filename
+        result = _apply_call_rewrites(result, _AWS_CLEANUP_S3_CALL_REWRITES)
+        # Handle paginators - get_paginator('list_buckets') -> list_buckets()
+        # CRITICAL: Replace paginator patterns
+        # Replace paginator creation - match any variable name
+        result = _apply_call_rewrites(result, _AWS_CLEANUP_PAGINATOR_SECOND_PASS_REWRITES)
         
+        # Remove paginator and response_iterator variable assignments completely
         try:
-            result = safe_re_sub(
-                r'(\w+)\s*=\s*boto3\s*\.\s*client\s*\(\s*[\'\"]sqs[\'\"][^\)]*\)',
-                r'\1 = pubsub_v1.PublisherClient()',
-                result,
-                flags=re.DOTALL | re.IGNORECASE
-            )
+            if result and isinstance(result, str):
+                lines = result.split('\n')
+                cleaned_lines = []
+                skip_next = False
+                for i, line in enumerate(lines):
+                    # Skip lines that assign paginator or response_iterator
+                    if _PAGINATOR_ASSIGNMENT_RE.search(line):
+                        # Check if it's a multi-line assignment
+                        if '(' in line and line.count('(') > line.count(')'):
+                            skip_next = True
+                        continue
+                    if _RESPONSE_ITERATOR_ASSIGNMENT_RE.search(line):
+                        # Check if it's a multi-line assignment
+                        if '(' in line and line.count('(') > line.count(')'):
+                            skip_next = True
+                        continue
+                    if skip_next:
+                        # Skip until we find the closing paren
+                        if ')' in line and line.count(')') >= line.count('('):
+                            skip_next = False
+                        continue
+                    cleaned_lines.append(line)
+                result = '\n'.join(cleaned_lines)
+                if result is None or not isinstance(result, str):
+                    result = code
+            else:
+                result = code
+        except Exception as e:
+            import logging
+            logging.warning(f"Error in paginator cleanup: {e}")
             if result is None or not isinstance(result, str):
                 result = code
-        except Exception:
-            pass
         
-        if result is None or not isinstance(result, str):
-            result = code
+        # Ensure result is valid
+        # Also remove any remaining get_paginator calls
+        result = _apply_call_rewrites(result, _AWS_CLEANUP_S3_RESOURCE_REWRITES)
         
+        # Remove AWS-specific exceptions
         try:
-            result = safe_re_sub(
-                r'(\w+)\s*=\s*boto3\s*\.\s*client\s*\(\s*[\'\"]sns[\'\"][^\)]*\)',
-                r'\1 = pubsub_v1.PublisherClient()',
-                result,
-                flags=re.DOTALL | re.IGNORECASE
+            result = _S3_UPLOAD_FAILED_ERROR_IMPORT_RE.sub(
+                '',
+                result
             )
-            if result is None or not isinstance(result, str):
+            if result is None:
                 result = code
         except Exception:
             pass
         
-        if result is None or not isinstance(result, str):
-            result = code
-        
         try:
-            result = safe_re_sub(
-                r'(\w+)\s*=\s*boto3\s*\.\s*client\s*\(\s*[\'\"]s3[\'\"][^\)]*\)',
-                r'\1 = storage.Client()',
-                result,
-                flags=re.DOTALL | re.IGNORECASE
+            result = _BOTOCORE_CLIENT_ERROR_IMPORT_RE.sub(
+                'from google.api_core import exceptions',
+                result
             )
-            if result is None or not isinstance(result, str):
+            if result is None:
                 result = code
         except Exception:
             pass
         
-        if result is None or not isinstance(result, str):
-            result = code
-        
         try:
-            result = safe_re_sub(
-                r'(\w+)\s*=\s*boto3\s*\.\s*client\s*\(\s*[\'\"]rds[\'\"][^\)]*\)',
-                r'\1 = None  # RDS management replaced with Cloud SQL Admin API',
-                result,
-                flags=re.DOTALL | re.IGNORECASE
-            )
-            if result is None or not isinstance(result, str):
+            result = result.replace('S3UploadFailedError', 'exceptions.GoogleAPIError')
+            if result is None:
                 result = code
         except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        if result is None or not isinstance(result, str):
-            result = code
+            pass
         
         try:
-            result = safe_re_sub(
-                r'(\w+)\s*=\s*boto3\s*\.\s*client\s*\(\s*[\'\"]ec2[\'\"][^\)]*\)',
-                r'\1 = compute_v1.InstancesClient()',
-                result,
-                flags=re.DOTALL | re.IGNORECASE
-            )
-            if result is None or not isinstance(result, str):
+            result = result.replace('ClientError', 'exceptions.GoogleAPIError')
+            if result is None:
                 result = code
         except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
+            pass
         
-        if result is None or not isinstance(result, str):
-            result = code
+        # Final pass: Remove any remaining boto3 references (but be careful not to break strings/comments)
+        # Only remove standalone boto3 references
+        result = _BOTO3_STANDALONE_NAME_RE.sub('', result)
         
+        # STEP 4: Fix lambda_handler
         try:
-            result = safe_re_sub(
-                r'(\w+)\s*=\s*boto3\s*\.\s*client\s*\(\s*[\'\"]cloudwatch[\'\"][^\)]*\)',
-                r'\1 = monitoring_v3.MetricServiceClient()',
-                result,
-                flags=re.DOTALL | re.IGNORECASE
+            result = _LAMBDA_HANDLER_DEF_RE.sub(
+                'def process_gcs_file(data, context):\n    """\n    Background Cloud Function triggered by a new file in Cloud Storage.\n    The \'data\' parameter contains the bucket and file information.\n    The \'context\' parameter provides event metadata.\n    """',
+                result
             )
-            if result is None or not isinstance(result, str):
+            if result is None:
                 result = code
         except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        if result is None or not isinstance(result, str):
-            result = code
+            pass
         
+        # STEP 5: Fix event['Records'] patterns
         try:
-            result = safe_re_sub(
-                r'(\w+)\s*=\s*boto3\s*\.\s*client\s*\(\s*[\'\"]apigateway[\'\"][^\)]*\)',
-                r'\1 = None  # API Gateway replaced with Apigee API',
-                result,
-                flags=re.DOTALL | re.IGNORECASE
+            result = _RECORD_EVENT_LOOP_RE.sub(
+                '# GCS background function receives single file event\n    # Process the single file event',
+                result
             )
-            if result is None or not isinstance(result, str):
+            if result is None:
                 result = code
         except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        if result is None or not isinstance(result, str):
-            result = code
+            pass
         
         try:
-            result = safe_re_sub(
-                r'(\w+)\s*=\s*boto3\s*\.\s*client\s*\(\s*[\'\"]eks[\'\"][^\)]*\)',
-                r'\1 = container_v1.ClusterManagerClient()',
-                result,
-                flags=re.DOTALL | re.IGNORECASE
+            result = _EVENT_RECORDS_MISSING_CHECK_RE.sub(
+                'if not data.get(\'bucket\') or not data.get(\'name\'):',
+                result
             )
-            if result is None or not isinstance(result, str):
+            if result is None:
                 result = code
         except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        if result is None or not isinstance(result, str):
-            result = code
+            pass
         
         try:
-            result = safe_re_sub(
-                r'(\w+)\s*=\s*boto3\s*\.\s*client\s*\(\s*[\'\"]ecs[\'\"][^\)]*\)',
-                r'\1 = run_v2.ServicesClient()  # ECS/Fargate replaced with Cloud Run',
-                result,
-                flags=re.DOTALL | re.IGNORECASE
+            result = _RECORD_EVENT_BUCKET_NAME_RE.sub(
+                'data.get(\'bucket\')',
+                result
             )
-            if result is None or not isinstance(result, str):
+            if result is None:
                 result = code
         except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        if result is None or not isinstance(result, str):
-            result = code
+            pass
         
         try:
-            result = safe_re_sub(
-                r'(\w+)\s*=\s*boto3\s*\.\s*client\s*\(\s*[\'\"]lambda[\'\"][^\)]*\)',
-                r'\1 = functions_v1.CloudFunctionsServiceClient()',
-                result,
-                flags=re.DOTALL | re.IGNORECASE
+            result = _RECORD_EVENT_OBJECT_KEY_RE.sub(
+                'data.get(\'name\')',
+                result
             )
-            if result is None or not isinstance(result, str):
+            if result is None:
                 result = code
         except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
+            pass
         
         # Ensure result is still valid
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        # STEP 1.5: Also catch boto3.client() without variable assignment
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        try:
-            result = safe_re_sub(
-                r'boto3\s*\.\s*client\s*\(\s*[\'\"]dynamodb[\'\"][^\)]*\)',
-                r'firestore.Client()',
-                result,
-                flags=re.DOTALL | re.IGNORECASE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        if result is None or not isinstance(result, str):
-            result = code
+        # STEP 6: Fix environment variables
+        result = _apply_call_rewrites(result, _AWS_CLEANUP_ENVIRONMENT_REWRITES)
         
+        # STEP 7: Fix AWS API calls
+        # dynamodb_client.batch_write_item() -> Firestore batch
         try:
-            result = safe_re_sub(
-                r'boto3\s*\.\s*client\s*\(\s*[\'\"]sqs[\'\"][^\)]*\)',
-                r'pubsub_v1.PublisherClient()',
-                result,
-                flags=re.DOTALL | re.IGNORECASE
+            result = _BATCH_WRITE_ITEM_CALL_RE.sub(
+                r'batch = firestore_db.batch()\n    collection_ref = firestore_db.collection(\2)\n    for item in items:\n        doc_ref = collection_ref.document()\n        batch.set(doc_ref, item)\n    batch.commit()',
+                result
             )
-            if result is None or not isinstance(result, str):
+            if result is None:
                 result = code
         except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        if result is None or not isinstance(result, str):
-            result = code
+            pass
         
+        # sqs_client.send_message() -> Pub/Sub publish
         try:
-            result = safe_re_sub(
-                r'boto3\s*\.\s*client\s*\(\s*[\'\"]sns[\'\"][^\)]*\)',
-                r'pubsub_v1.PublisherClient()',
-                result,
-                flags=re.DOTALL | re.IGNORECASE
+            result = _SEND_MESSAGE_CALL_RE.sub(
+                r'import os\n    topic_path = pubsub_publisher.topic_path(os.getenv("GCP_PROJECT_ID", "your-project-id"), os.getenv("GCP_PUBSUB_TOPIC_ID", "error-topic"))\n    future = pubsub_publisher.publish(topic_path, json.dumps(\3).encode("utf-8"))',
+                result
             )
-            if result is None or not isinstance(result, str):
+            if result is None:
                 result = code
         except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        if result is None or not isinstance(result, str):
-            result = code
+            pass
         
+        # sns_client.publish() -> Pub/Sub publish
         try:
-            result = safe_re_sub(
-                r'boto3\s*\.\s*client\s*\(\s*[\'\"]s3[\'\"][^\)]*\)',
-                r'storage.Client()',
-                result,
-                flags=re.DOTALL | re.IGNORECASE
+            result = _SNS_PUBLISH_CALL_RE.sub(
+                r'import os\n    topic_path = pubsub_publisher.topic_path(os.getenv("GCP_PROJECT_ID", "your-project-id"), os.getenv("GCP_PUBSUB_TOPIC_ID", "summary-topic"))\n    future = pubsub_publisher.publish(topic_path, \3.encode("utf-8"))',
+                result
             )
-            if result is None or not isinstance(result, str):
+            if result is None:
                 result = code
         except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
+            pass
         
         # Ensure result is still valid
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        # STEP 2: Fix variable names IMMEDIATELY after client replacement
-        # Be aggressive - replace ALL occurrences
-        # Ensure result is valid before variable replacement
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        try:
-            result = safe_re_sub(r'\bdynamodb_client\b', 'firestore_db', result)
-            if result is None or not isinstance(result, str):
-                result = code
-            result = safe_re_sub(r'\bsqs_client\b', 'pubsub_publisher', result)
-            if result is None or not isinstance(result, str):
-                result = code
-            result = safe_re_sub(r'\bsns_client\b', 'pubsub_publisher', result)
-            if result is None or not isinstance(result, str):
-                result = code
-            result = safe_re_sub(r'\bs3_client\b', 'storage_client', result)
-            if result is None or not isinstance(result, str):
-                result = code
-            result = safe_re_sub(r'\brds_client\b', 'cloud_sql_client', result)
-            if result is None or not isinstance(result, str):
-                result = code
-            result = safe_re_sub(r'\bec2_client\b', 'compute_client', result)
-            if result is None or not isinstance(result, str):
-                result = code
-            result = safe_re_sub(r'\bcloudwatch_client\b', 'monitoring_client', result)
-            if result is None or not isinstance(result, str):
-                result = code
-            result = safe_re_sub(r'\bapigateway_client\b', 'apigee_client', result)
-            if result is None or not isinstance(result, str):
-                result = code
-            result = safe_re_sub(r'\beks_client\b', 'gke_client', result)
-            if result is None or not isinstance(result, str):
-                result = code
-            result = safe_re_sub(r'\becs_client\b', 'cloud_run_client', result)
-            if result is None or not isinstance(result, str):
-                result = code
-            result = safe_re_sub(r'\blambda_client\b', 'functions_client', result)
-            if result is None or not isinstance(result, str):
-                result = code
-            # Ensure result is still valid after replacements
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception as e:
-            import logging
-            logging.error(f"Error in variable name replacement: {e}")
-            # Continue with result as-is
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        # Ensure result is valid before STEP 3
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        # STEP 3: Fix AWS API method calls - S3 operations
-        # Handle paginators FIRST before other operations
-        # Ensure result is valid before paginator handling
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        # Replace paginator creation - match any variable name
-        try:
-            result = safe_re_sub(
-                r'(\w+)\s*=\s*(\w+)\.get_paginator\s*\([\'"]list_buckets[\'"]\s*\)',
-                r'# Pagination not needed - GCS list_buckets() returns all buckets directly',
-                result
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        try:
-            # Replace paginator.paginate() calls - handle multiline with PaginationConfig
-            # Match multiline patterns with DOTALL - this handles cases like:
-            # response_iterator = paginator.paginate(
-            #     PaginationConfig={
-            #         "PageSize": 50,
-            #         "StartingToken": None,
-            #     }
-            # )
-            result = safe_re_sub(
-                r'(\w+)\s*=\s*(\w+)\.paginate\s*\(\s*PaginationConfig\s*=\s*\{[^}]*\}\s*\)',
-                r'\1 = storage_client.list_buckets()',
-                result,
-                flags=re.DOTALL | re.MULTILINE
-            )
-            # Also handle multiline paginate calls without explicit PaginationConfig
-            result = safe_re_sub(
-                r'(\w+)\s*=\s*(\w+)\.paginate\s*\(\s*(?:[^)]|\n)*?\)',
-                r'\1 = storage_client.list_buckets()',
-                result,
-                flags=re.DOTALL | re.MULTILINE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        try:
-            # Replace any paginate() call with assignment
-            result = safe_re_sub(
-                r'(\w+)\s*=\s*(\w+)\.paginate\s*\([^)]*\)',
-                r'\1 = storage_client.list_buckets()',
-                result,
-                flags=re.DOTALL | re.MULTILINE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        try:
-            # Replace paginate() without assignment
-            result = safe_re_sub(
-                r'(\w+)\.paginate\s*\([^)]*\)',
-                r'storage_client.list_buckets()',
-                result,
-                flags=re.DOTALL | re.MULTILINE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        # CRITICAL: Handle nested loop pattern - replace "for page in X:" followed by "for bucket in page['Buckets']:"
-        # First, replace the nested pattern: "for bucket in page['Buckets']:" -> just remove (we'll iterate buckets directly)
-        try:
-            result = safe_re_sub(
-                r"for\s+(\w+)\s+in\s+page\[['\"]Buckets['\"]\]\s*:",
-                r'# Iterating buckets directly',
-                result,
-                flags=re.MULTILINE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        try:
-            # Replace "if 'Buckets' in page and page['Buckets']:" -> remove (not needed)
-            result = safe_re_sub(
-                r"if\s+['\"]Buckets['\"]\s+in\s+page\s+and\s+page\[['\"]Buckets['\"]\]\s*:",
-                r'if True:  # Always true when iterating buckets',
-                result,
-                flags=re.MULTILINE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        try:
-            # Replace iteration over pages -> iterate over buckets directly
-            result = safe_re_sub(
-                r'for\s+page\s+in\s+(\w+)\s*:',
-                r'for bucket in storage_client.list_buckets():',
-                result,
-                flags=re.MULTILINE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        try:
-            result = safe_re_sub(
-                r"(\w+)\[['\"]Name['\"]\]",
-                r'\1.name',
-                result
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        # Ensure result is still valid
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        # s3_client.upload_file(file_name, bucket, object_name) -> GCS upload_from_filename
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        try:
-            result = safe_re_sub(
-                r'(s3_client|s3|storage_client)\s*\.\s*upload_file\s*\(\s*([^,]+),\s*([^,]+),\s*([^\)]+)\s*\)',
-                r'storage_client = storage.Client()\n    bucket = storage_client.bucket(\3)\n    blob = bucket.blob(\4)\n    blob.upload_from_filename(\2)',
-                result,
-                flags=re.DOTALL | re.IGNORECASE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        # s3_client.download_file(bucket, key, local_file) -> GCS download_to_filename
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        try:
-            result = safe_re_sub(
-                r'(s3_client|s3|storage_client)\s*\.\s*download_file\s*\(\s*([^,]+),\s*([^,]+),\s*([^\)]+)\s*\)',
-                r'storage_client = storage.Client()\n    bucket = storage_client.bucket(\2)\n    blob = bucket.blob(\3)\n    blob.download_to_filename(\4)',
-                result,
-                flags=re.DOTALL | re.IGNORECASE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        # s3_client.get_object(Bucket=..., Key=...) -> bucket.blob pattern
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        try:
-            result = safe_re_sub(
-                r'(\w+)\s*=\s*(\w+)\.get_object\s*\(\s*Bucket\s*=\s*([^,]+),\s*Key\s*=\s*([^,\)]+)\s*\)',
-                r'bucket = storage_client.bucket(\3)\n    blob = bucket.blob(\4)\n    \1 = blob.download_as_bytes()',
-                result,
-                flags=re.DOTALL
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        try:
-            result = safe_re_sub(r"response\['Body'\]\.read\(\)\.decode\(['\"]utf-8['\"]\)", 'blob.download_as_text()', result)
-            if result is None or not isinstance(result, str):
-                result = code
-            result = safe_re_sub(r'response\["Body"\]\.read\(\)\.decode\(["\']utf-8["\']\)', 'blob.download_as_text()', result)
-            if result is None or not isinstance(result, str):
-                result = code
-            result = safe_re_sub(r"response\['Body'\]\.read\(\)", 'blob.download_as_bytes()', result)
-            if result is None or not isinstance(result, str):
-                result = code
-            result = safe_re_sub(r'response\["Body"\]\.read\(\)', 'blob.download_as_bytes()', result)
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        # s3_client.put_object(Bucket=..., Key=..., Body=...) -> blob.upload_from_string
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        try:
-            result = safe_re_sub(
-                r'(\w+)\.put_object\s*\(\s*Bucket\s*=\s*([^,]+),\s*Key\s*=\s*([^,]+),\s*Body\s*=\s*([^\)]+)\s*\)',
-                r'bucket = storage_client.bucket(\2)\n    blob = bucket.blob(\3)\n    blob.upload_from_string(\4)',
-                result,
-                flags=re.DOTALL
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        # s3_client.delete_object(Bucket=..., Key=...) -> blob.delete()
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        try:
-            result = safe_re_sub(
-                r'(\w+)\.delete_object\s*\(\s*Bucket\s*=\s*([^,]+),\s*Key\s*=\s*([^\)]+)\s*\)',
-                r'bucket = storage_client.bucket(\2)\n    blob = bucket.blob(\3)\n    blob.delete()',
-                result,
-                flags=re.DOTALL
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        # s3_client.list_objects_v2(Bucket=...) -> bucket.list_blobs()
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        try:
-            result = safe_re_sub(
-                r'(\w+)\s*=\s*(\w+)\.list_objects_v2\s*\(\s*Bucket\s*=\s*([^\)]+)\s*\)',
-                r'bucket = storage_client.bucket(\3)\n    \1 = list(bucket.list_blobs())',
-                result,
-                flags=re.DOTALL
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        try:
-            result = safe_re_sub(
-                r'(\w+)\.list_objects_v2\s*\(\s*Bucket\s*=\s*([^\)]+)\s*\)',
-                r'bucket = storage_client.bucket(\2)\n    blobs = list(bucket.list_blobs())',
-                result,
-                flags=re.DOTALL
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        # Ensure result is valid before continuing
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        # Handle response['Contents'] -> iterate over blobs directly
-        try:
-            result = safe_re_sub(
-                r"if\s+['\"]Contents['\"]\s+in\s+(\w+)\s*:",
-                r'if \1:',
-                result
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        try:
-            result = safe_re_sub(
-                r"for\s+(\w+)\s+in\s+(\w+)\[['\"]Contents['\"]\]\s*:",
-                r'for \1 in \2:',
-                result
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        try:
-            result = safe_re_sub(
-                r"(\w+)\[['\"]Contents['\"]\]",
-                r'\1',
-                result
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        try:
-            result = safe_re_sub(
-                r"(\w+)\[['\"]Key['\"]\]",
-                r'\1.name',
-                result
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        try:
-            result = safe_re_sub(
-                r"(\w+)\[['\"]Size['\"]\]",
-                r'\1.size',
-                result
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        # Ensure result is still valid
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        # s3_client.head_object(Bucket=..., Key=...) -> blob.reload()
-        try:
-            result = safe_re_sub(
-                r'(\w+)\s*=\s*(\w+)\.head_object\s*\(\s*Bucket\s*=\s*([^,]+),\s*Key\s*=\s*([^\)]+)\s*\)',
-                r'bucket = storage_client.bucket(\3)\n    blob = bucket.blob(\4)\n    blob.reload()\n    \1 = blob',
-                result,
-                flags=re.DOTALL
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        try:
-            result = safe_re_sub(
-                r"(\w+)\[['\"]ContentLength['\"]\]",
-                r'\1.size',
-                result
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        # Ensure result is still valid
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        # s3_client.copy_object(CopySource={...}, Bucket=..., Key=...) -> blob.copy_to()
-        try:
-            result = safe_re_sub(
-                r'(\w+)\.copy_object\s*\(\s*CopySource\s*=\s*\{[^}]*Bucket\s*:\s*([^,}]+),\s*Key\s*:\s*([^}]+)\},\s*Bucket\s*=\s*([^,]+),\s*Key\s*=\s*([^\)]+)\s*\)',
-                r'source_bucket = storage_client.bucket(\2)\n    source_blob = source_bucket.blob(\3)\n    dest_bucket = storage_client.bucket(\4)\n    dest_blob = dest_bucket.blob(\5)\n    dest_blob.rewrite(source_blob)',
-                result,
-                flags=re.DOTALL
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        # s3_client.generate_presigned_url(...) -> blob.generate_signed_url()
-        try:
-            result = safe_re_sub(
-                r'(\w+)\s*=\s*(\w+)\.generate_presigned_url\s*\([^)]+\)',
-                r'bucket = storage_client.bucket(bucket_name)\n    blob = bucket.blob(key)\n    \1 = blob.generate_signed_url(expiration=datetime.utcnow() + timedelta(hours=1), method="GET")',
-                result,
-                flags=re.DOTALL
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        # Ensure result is still valid before paginator handling
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        # Handle paginators - get_paginator('list_buckets') -> list_buckets()
-        # CRITICAL: Replace paginator patterns
-        try:
-            # Replace paginator creation - match any variable name
-            result = safe_re_sub(
-                r'(\w+)\s*=\s*(\w+)\.get_paginator\s*\([\'"]list_buckets[\'"]\s*\)',
-                r'# Pagination not needed - GCS list_buckets() returns all buckets directly',
-                result
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        try:
-            # Replace paginator.paginate() calls - handle multiline with PaginationConfig
-            # Match multiline patterns with DOTALL - this handles cases like:
-            # response_iterator = paginator.paginate(
-            #     PaginationConfig={
-            #         "PageSize": 50,
-            #         "StartingToken": None,
-            #     }
-            # )
-            result = safe_re_sub(
-                r'(\w+)\s*=\s*(\w+)\.paginate\s*\(\s*PaginationConfig\s*=\s*\{[^}]*\}\s*\)',
-                r'\1 = storage_client.list_buckets()',
-                result,
-                flags=re.DOTALL | re.MULTILINE
-            )
-            # Also handle multiline paginate calls without explicit PaginationConfig
-            result = safe_re_sub(
-                r'(\w+)\s*=\s*(\w+)\.paginate\s*\(\s*(?:[^)]|\n)*?\)',
-                r'\1 = storage_client.list_buckets()',
-                result,
-                flags=re.DOTALL | re.MULTILINE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        try:
-            # Fallback for single-line paginate calls
-            result = safe_re_sub(
-                r'(\w+)\s*=\s*(\w+)\.paginate\s*\([^)]*\)',
-                r'\1 = storage_client.list_buckets()',
-                result,
-                flags=re.DOTALL
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        try:
-            # Replace paginate() without assignment
-            result = safe_re_sub(
-                r'(\w+)\.paginate\s*\([^)]*\)',
-                r'list(storage_client.list_buckets())',
-                result,
-                flags=re.DOTALL
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        try:
-            # Replace iteration over pages -> iterate over buckets directly
-            result = safe_re_sub(
-                r'for\s+page\s+in\s+(\w+)\s*:',
-                r'for bucket in storage_client.list_buckets():',
-                result
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        try:
-            result = safe_re_sub(
-                r"if\s+['\"]Buckets['\"]\s+in\s+page\s+and\s+page\[['\"]Buckets['\"]\]\s*:",
-                r'if bucket:',
-                result
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        try:
-            # Remove nested loop over page["Buckets"] - we're already iterating buckets directly
-            result = safe_re_sub(
-                r"for\s+(\w+)\s+in\s+page\[['\"]Buckets['\"]\]\s*:",
-                r'# Already iterating over buckets',
-                result
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        try:
-            # Replace bucket['Name'] with bucket.name
-            result = safe_re_sub(
-                r"(\w+)\[['\"]Name['\"]\]",
-                r'\1.name',
-                result
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        # Ensure result is valid before line processing
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        # Remove paginator and response_iterator variable assignments completely
-        try:
-            if result and isinstance(result, str):
-                lines = result.split('\n')
-                cleaned_lines = []
-                skip_next = False
-                for i, line in enumerate(lines):
-                    # Skip lines that assign paginator or response_iterator
-                    if re.search(r'paginator\s*=\s*.*get_paginator', line, re.IGNORECASE):
-                        # Check if it's a multi-line assignment
-                        if '(' in line and line.count('(') > line.count(')'):
-                            skip_next = True
-                        continue
-                    if re.search(r'response_iterator\s*=\s*.*paginate', line, re.IGNORECASE):
-                        # Check if it's a multi-line assignment
-                        if '(' in line and line.count('(') > line.count(')'):
-                            skip_next = True
-                        continue
-                    if skip_next:
-                        # Skip until we find the closing paren
-                        if ')' in line and line.count(')') >= line.count('('):
-                            skip_next = False
-                        continue
-                    cleaned_lines.append(line)
-                result = '\n'.join(cleaned_lines)
-                if result is None or not isinstance(result, str):
-                    result = code
-            else:
-                result = code
-        except Exception as e:
-            import logging
-            logging.warning(f"Error in paginator cleanup: {e}")
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        # Ensure result is valid
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        # Ensure result is still valid
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        # Also remove any remaining get_paginator calls
-        try:
-            result = safe_re_sub(
-                r'\.get_paginator\s*\([^)]+\)',
-                '',
-                result
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        # Ensure result is valid before continuing
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        # Handle boto3.resource('s3') -> storage.Client()
-        try:
-            result = safe_re_sub(
-                r'boto3\s*\.\s*resource\s*\(\s*[\'\"]s3[\'\"][^\)]*\)',
-                r'storage.Client()',
-                result,
-                flags=re.IGNORECASE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        try:
-            result = safe_re_sub(
-                r'(\w+)\s*=\s*boto3\s*\.\s*resource\s*\(\s*[\'\"]s3[\'\"][^\)]*\)',
-                r'\1 = storage.Client()',
-                result,
-                flags=re.IGNORECASE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        # Ensure result is still valid
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        # Handle s3_resource.Bucket(...) -> storage_client.bucket(...)
-        try:
-            result = safe_re_sub(
-                r'(\w+)\.Bucket\s*\(([^)]+)\)',
-                r'\1.bucket(\2)',
-                result
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        # Handle bucket.Object(...) -> bucket.blob(...)
-        try:
-            result = safe_re_sub(
-                r'(\w+)\.Object\s*\(([^)]+)\)',
-                r'\1.blob(\2)',
-                result
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        # Handle obj.upload_file(...) -> blob.upload_from_filename(...)
-        try:
-            result = safe_re_sub(
-                r'(\w+)\.upload_file\s*\(([^)]+)\)',
-                r'\1.upload_from_filename(\2)',
-                result
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        # Handle obj.download_fileobj(...) -> blob.download_to_file(...)
-        try:
-            result = safe_re_sub(
-                r'(\w+)\.download_fileobj\s*\(([^)]+)\)',
-                r'\1.download_to_file(\2)',
-                result
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        # Handle bucket.objects.all() -> bucket.list_blobs()
-        try:
-            result = safe_re_sub(
-                r'(\w+)\.objects\.all\s*\(\)',
-                r'\1.list_blobs()',
-                result
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        try:
-            result = safe_re_sub(
-                r'(\w+)\.objects\.delete\s*\(\)',
-                r'# Delete all blobs in bucket\n    for blob in \1.list_blobs():\n        blob.delete()',
-                result
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        # Handle obj.copy(...) -> blob.copy_to(...)
-        try:
-            result = safe_re_sub(
-                r'(\w+)\.copy\s*\(\s*\{[^}]*Bucket\s*:\s*([^,}]+),\s*Key\s*:\s*([^}]+)\}\s*\)',
-                r'source_blob = bucket.blob(\3)\n    \1.rewrite(source_blob)',
-                result,
-                flags=re.DOTALL
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        # Handle bucket.delete() - keep as is, but ensure bucket exists
-        try:
-            result = safe_re_sub(
-                r'(\w+)\.delete\s*\(\s*\)',
-                r'\1.delete(force=True)',
-                result
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        # Ensure result is still valid
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        # Remove AWS-specific exceptions
-        try:
-            result = re.sub(
-                r'from\s+boto3\.s3\.transfer\s+import\s+S3UploadFailedError',
-                '',
-                result
-            )
-            if result is None:
-                result = code
-        except Exception:
-            pass
-        
-        try:
-            result = re.sub(
-                r'from\s+botocore\.exceptions\s+import\s+ClientError',
-                'from google.api_core import exceptions',
-                result
-            )
-            if result is None:
-                result = code
-        except Exception:
-            pass
-        
-        try:
-            result = re.sub(
-                r'S3UploadFailedError',
-                'exceptions.GoogleAPIError',
-                result
-            )
-            if result is None:
-                result = code
-        except Exception:
-            pass
-        
-        try:
-            result = re.sub(
-                r'ClientError',
-                'exceptions.GoogleAPIError',
-                result
-            )
-            if result is None:
-                result = code
-        except Exception:
-            pass
-        
-        # Ensure result is still valid
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        # Ensure result is still valid
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        # Final pass: Remove any remaining boto3 references (but be careful not to break strings/comments)
-        # Only remove standalone boto3 references
-        try:
-            result = safe_re_sub(r'\bboto3\b(?!\w)', '', result)
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        # Ensure result is always a string before final steps
-        if result is None:
-            result = code
-        if not isinstance(result, str):
-            result = str(result) if result else code
-        
-        # STEP 4: Fix lambda_handler
-        try:
-            result = re.sub(
-                r'def\s+lambda_handler\s*\(\s*event\s*,\s*context\s*\)\s*:',
-                'def process_gcs_file(data, context):\n    """\n    Background Cloud Function triggered by a new file in Cloud Storage.\n    The \'data\' parameter contains the bucket and file information.\n    The \'context\' parameter provides event metadata.\n    """',
-                result,
-                flags=re.IGNORECASE
-            )
-            if result is None:
-                result = code
-        except Exception:
-            pass
-        
-        # STEP 5: Fix event['Records'] patterns
-        try:
-            result = re.sub(
-                r'for\s+record_event\s+in\s+event\[[\'"]Records[\'"]\]\s*:',
-                '# GCS background function receives single file event\n    # Process the single file event',
-                result
-            )
-            if result is None:
-                result = code
-        except Exception:
-            pass
-        
-        try:
-            result = re.sub(
-                r'if\s+not\s+event\.get\([\'"]Records[\'"]\)\s*:',
-                'if not data.get(\'bucket\') or not data.get(\'name\'):',
-                result
-            )
-            if result is None:
-                result = code
-        except Exception:
-            pass
-        
-        try:
-            result = re.sub(
-                r'record_event\[[\'"]s3[\'"]\]\[[\'"]bucket[\'"]\]\[[\'"]name[\'"]\]',
-                'data.get(\'bucket\')',
-                result
-            )
-            if result is None:
-                result = code
-        except Exception:
-            pass
-        
-        try:
-            result = re.sub(
-                r'record_event\[[\'"]s3[\'"]\]\[[\'"]object[\'"]\]\[[\'"]key[\'"]\]',
-                'data.get(\'name\')',
-                result
-            )
-            if result is None:
-                result = code
-        except Exception:
-            pass
-        
-        # Ensure result is still valid
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        # STEP 6: Fix environment variables
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        try:
-            result = safe_re_sub(r'DYNAMODB_TABLE_NAME', 'FIRESTORE_COLLECTION_NAME', result)
-            if result is None or not isinstance(result, str):
-                result = code
-            result = safe_re_sub(r'SQS_DLQ_URL', 'PUB_SUB_ERROR_TOPIC', result)
-            if result is None or not isinstance(result, str):
-                result = code
-            result = safe_re_sub(r'SNS_TOPIC_ARN', 'PUB_SUB_SUMMARY_TOPIC', result)
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        # Ensure result is still valid
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        # STEP 7: Fix AWS API calls
-        # dynamodb_client.batch_write_item() -> Firestore batch
-        try:
-            result = re.sub(
-                r'(\w+)\.batch_write_item\s*\(\s*RequestItems\s*=\s*\{([^}]+)\}\s*\)',
-                r'batch = firestore_db.batch()\n    collection_ref = firestore_db.collection(\2)\n    for item in items:\n        doc_ref = collection_ref.document()\n        batch.set(doc_ref, item)\n    batch.commit()',
-                result,
-                flags=re.DOTALL
-            )
-            if result is None:
-                result = code
-        except Exception:
-            pass
-        
-        # sqs_client.send_message() -> Pub/Sub publish
-        try:
-            result = re.sub(
-                r'(\w+)\.send_message\s*\(\s*QueueUrl\s*=\s*([^,]+),\s*MessageBody\s*=\s*([^,\)]+)\s*\)',
-                r'import os\n    topic_path = pubsub_publisher.topic_path(os.getenv("GCP_PROJECT_ID", "your-project-id"), os.getenv("GCP_PUBSUB_TOPIC_ID", "error-topic"))\n    future = pubsub_publisher.publish(topic_path, json.dumps(\3).encode("utf-8"))',
-                result,
-                flags=re.DOTALL
-            )
-            if result is None:
-                result = code
-        except Exception:
-            pass
-        
-        # sns_client.publish() -> Pub/Sub publish
-        try:
-            result = re.sub(
-                r'(\w+)\.publish\s*\(\s*TopicArn\s*=\s*([^,]+),\s*Message\s*=\s*([^,\)]+)',
-                r'import os\n    topic_path = pubsub_publisher.topic_path(os.getenv("GCP_PROJECT_ID", "your-project-id"), os.getenv("GCP_PUBSUB_TOPIC_ID", "summary-topic"))\n    future = pubsub_publisher.publish(topic_path, \3.encode("utf-8"))',
-                result,
-                flags=re.DOTALL
-            )
-            if result is None:
-                result = code
-        except Exception:
-            pass
-        
-        # Ensure result is still valid
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        # STEP 7.5: Remove AWS-specific parameter patterns BEFORE other cleanup
-        # This must run BEFORE create_bucket transformation to catch Bucket= parameters
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        try:
-            # Remove Bucket= parameter pattern - convert to positional argument
-            # Pattern: Bucket=bucket_name -> just bucket_name
-            result = safe_re_sub(
-                r'Bucket\s*=\s*([^,)]+)',
-                r'\1',
-                result,
-                flags=re.MULTILINE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-            
-            # Remove Key= parameter pattern - convert to positional argument
-            result = safe_re_sub(
-                r'Key\s*=\s*([^,)]+)',
-                r'\1',
-                result,
-                flags=re.MULTILINE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-            
-            # Remove other AWS parameter patterns
-            result = safe_re_sub(
-                r'QueueUrl\s*=\s*([^,)]+)',
-                r'\1',
-                result,
-                flags=re.MULTILINE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-            
-            result = safe_re_sub(
-                r'TopicArn\s*=\s*([^,)]+)',
-                r'\1',
-                result,
-                flags=re.MULTILINE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
-        
-        # STEP 8: Remove AWS-specific parameters and configurations - AGGRESSIVE
-        if result is None or not isinstance(result, str):
-            result = code
+        # STEP 7.5: Remove AWS-specific parameter patterns BEFORE other cleanup
+        # This must run BEFORE create_bucket transformation to catch Bucket= parameters
+        # Remove Bucket= parameter pattern - convert to positional argument
+        # Pattern: Bucket=bucket_name -> just bucket_name
+        result = _apply_call_rewrites(result, _AWS_CLEANUP_KEYWORD_ARGUMENT_REWRITES)
         
+        # STEP 8: Remove AWS-specific parameters and configurations - AGGRESSIVE
         try:
             # Remove CreateBucketConfiguration parameter completely - handle multiline with balanced braces
             # This handles patterns like:
@@ -2850,216 +1717,19 @@ When generating the refactored code, you MUST follow Clean Architecture principl
             if result is None or not isinstance(result, str):
                 result = code
             
-            # Also try regex-based removal for single-line cases
-            result = safe_re_sub(
-                r',\s*CreateBucketConfiguration\s*=\s*\{[^}]*\}',
-                '',
-                result,
-                flags=re.DOTALL | re.MULTILINE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-            
-            result = safe_re_sub(
-                r'CreateBucketConfiguration\s*=\s*\{[^}]*\}',
-                '',
-                result,
-                flags=re.DOTALL | re.MULTILINE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-            
-            # Remove LocationConstraint references (standalone)
-            result = safe_re_sub(r'\bLocationConstraint\s*:', '', result)
-            if result is None or not isinstance(result, str):
-                result = code
-            
-            # Remove any remaining AWS-specific parameters
-            result = safe_re_sub(r',\s*ACL\s*=\s*[\'"][^\'"]*[\'"]', '', result)
-            if result is None or not isinstance(result, str):
-                result = code
-            
-            # FINAL PASS: Remove any remaining Bucket=, Key= patterns
-            result = safe_re_sub(r'Bucket\s*=\s*', '', result)
-            if result is None or not isinstance(result, str):
-                result = code
-            result = safe_re_sub(r'Key\s*=\s*', '', result)
-            if result is None or not isinstance(result, str):
-                result = code
+            # Also try regex-based removal for single-line cases, then any
+            # remaining LocationConstraint, ACL, Bucket= and Key= parameters
+            result = _apply_call_rewrites(result, _AWS_CLEANUP_PARAMETER_REMOVALS)
             
             # Clean up double commas or trailing commas before closing parens
-            result = safe_re_sub(r',\s*,', ',', result)  # Double commas
-            result = safe_re_sub(r'\(\s*,', '(', result)  # Comma after opening paren
-            result = safe_re_sub(r',\s*\)', ')', result)  # Comma before closing paren
-            if result is None or not isinstance(result, str):
-                result = code
+            result = _apply_call_rewrites(result, _AWS_CLEANUP_DANGLING_COMMA_REWRITES)
         except Exception:
             if result is None or not isinstance(result, str):
                 result = code
         
         # STEP 8.5: Fix AWS comments and docstrings - COMPREHENSIVE
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        try:
-            # Fix comments
-            result = safe_re_sub(r'#\s*AWS\s+Clients?\s*', '# Google Cloud Clients', result, flags=re.IGNORECASE)
-            if result is None or not isinstance(result, str):
-                result = code
-            
-            # Fix docstrings - replace AWS/S3 references with GCP equivalents
-            # Pattern: """...Amazon S3...""" -> """...Google Cloud Storage..."""
-            result = safe_re_sub(
-                r'Amazon\s+S3',
-                'Google Cloud Storage',
-                result,
-                flags=re.IGNORECASE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-            
-            result = safe_re_sub(
-                r'\bS3\b',
-                'Cloud Storage',
-                result,
-                flags=re.IGNORECASE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-            
-            result = safe_re_sub(
-                r'AWS\s+SDK',
-                'Google Cloud SDK',
-                result,
-                flags=re.IGNORECASE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-            
-            result = safe_re_sub(
-                r'shared\s+credentials',
-                'Google Application Default Credentials',
-                result,
-                flags=re.IGNORECASE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-            
-            result = safe_re_sub(
-                r'config\s+files',
-                'Application Default Credentials',
-                result,
-                flags=re.IGNORECASE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-            
-            result = safe_re_sub(
-                r'Region\s+configured',
-                'Location configured',
-                result,
-                flags=re.IGNORECASE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-            
-            result = safe_re_sub(
-                r'AWS\s+region',
-                'GCP location',
-                result,
-                flags=re.IGNORECASE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-            
-            result = safe_re_sub(
-                r'default\s+region',
-                'default location',
-                result,
-                flags=re.IGNORECASE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-            
-            result = safe_re_sub(
-                r'region\s+for\s+the\s+project',
-                'location for the project',
-                result,
-                flags=re.IGNORECASE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-            
-            # Fix grammar: "an Google" -> "a Google"
-            result = safe_re_sub(
-                r'\ban\s+Google\s+Cloud',
-                'a Google Cloud',
-                result,
-                flags=re.IGNORECASE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-            
-            # Replace "region" with "location" in logger messages and code
-            result = safe_re_sub(
-                r'region[:\'"]',
-                'location:',
-                result,
-                flags=re.IGNORECASE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-            
-            result = safe_re_sub(
-                r'in\s+region[:\'"]',
-                'in location:',
-                result,
-                flags=re.IGNORECASE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-            
-            # Remove wait_until_exists() calls - GCP doesn't have this
-            result = safe_re_sub(
-                r'\.wait_until_exists\s*\([^)]*\)',
-                '',
-                result,
-                flags=re.MULTILINE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-            
-            # Remove meta.client.meta.region_name patterns - AWS-specific
-            result = safe_re_sub(
-                r'\.meta\.client\.meta\.region_name',
-                '',
-                result,
-                flags=re.MULTILINE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-            
-            # Remove .meta. patterns (AWS resource meta access)
-            result = safe_re_sub(
-                r'\.meta\.client',
-                '',
-                result,
-                flags=re.MULTILINE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-            
-            result = safe_re_sub(
-                r'\.meta\.',
-                '',
-                result,
-                flags=re.MULTILINE
-            )
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
+        # Fix comments
+        result = _apply_call_rewrites(result, _AWS_CLEANUP_COMMENT_AND_DOCSTRING_REWRITES)
         
         # STEP 9: Ensure required imports
         try:
@@ -3126,39 +1796,10 @@ When generating the refactored code, you MUST follow Clean Architecture principl
                 result = code
         
         # STEP 10: Remove boto3 imports - AGGRESSIVE removal
-        if result is None or not isinstance(result, str):
-            result = code
-        
-        try:
-            # Remove all boto3 import variations
-            result = safe_re_sub(r'^import\s+boto3\s*$', '', result, flags=re.MULTILINE)
-            if result is None or not isinstance(result, str):
-                result = code
-            result = safe_re_sub(r'^from\s+boto3\s+import.*$', '', result, flags=re.MULTILINE)
-            if result is None or not isinstance(result, str):
-                result = code
-            result = safe_re_sub(r'^from\s+boto3\..*$', '', result, flags=re.MULTILINE)
-            if result is None or not isinstance(result, str):
-                result = code
-            # Also remove any line containing "import boto3" anywhere
-            result = safe_re_sub(r'.*import\s+boto3.*', '', result, flags=re.MULTILINE)
-            if result is None or not isinstance(result, str):
-                result = code
-            result = safe_re_sub(r'.*from\s+boto3.*', '', result, flags=re.MULTILINE)
-            if result is None or not isinstance(result, str):
-                result = code
-            # Clean up any empty lines left behind
-            result = safe_re_sub(r'\n\s*\n\s*\n', '\n\n', result)
-            if result is None or not isinstance(result, str):
-                result = code
-        except Exception:
-            if result is None or not isinstance(result, str):
-                result = code
+        # Remove all boto3 import variations
+        result = _apply_call_rewrites(result, _AWS_CLEANUP_BOTO3_IMPORT_REMOVALS)
         
         # FINAL PASS: Ensure boto3 and CreateBucketConfiguration are completely removed
-        if result is None or not isinstance(result, str):
-            result = code
-        
         try:
             # FINAL AGGRESSIVE PASS: Remove CreateBucketConfiguration - catch ALL cases
             # This is the last chance to remove it before validation
@@ -3186,8 +1827,8 @@ When generating the refactored code, you MUST follow Clean Architecture principl
                 new_result = '\n'.join(cleaned_lines)
                 if new_result == result:  # No change, break to avoid infinite loop
                     # Try regex removal as fallback
-                    new_result = safe_re_sub(r',\s*CreateBucketConfiguration\s*=\s*\{[^}]*\}', '', result, flags=re.DOTALL)
-                    new_result = safe_re_sub(r'CreateBucketConfiguration\s*=\s*\{[^}]*\}', '', new_result, flags=re.DOTALL)
+                    new_result = _CREATE_BUCKET_CONFIGURATION_ARGUMENT_RE.sub('', result)
+                    new_result = _CREATE_BUCKET_CONFIGURATION_BLOCK_RE.sub('', new_result)
                     if new_result == result:
                         break
                 result = new_result
@@ -3195,36 +1836,10 @@ When generating the refactored code, you MUST follow Clean Architecture principl
                     result = code
                     break
             
-            # Remove LocationConstraint
-            result = safe_re_sub(r'\bLocationConstraint\b', '', result)
-            if result is None or not isinstance(result, str):
-                result = code
-            
-            # Remove wait_until_exists() calls - GCP doesn't have this method
-            result = safe_re_sub(r'\.wait_until_exists\s*\([^)]*\)', '', result)
-            if result is None or not isinstance(result, str):
-                result = code
-            
-            # Remove meta.client.meta.region_name patterns - AWS-specific
-            result = safe_re_sub(r'\.meta\.client\.meta\.region_name', '', result)
-            if result is None or not isinstance(result, str):
-                result = code
-            
-            # Remove .meta.client patterns
-            result = safe_re_sub(r'\.meta\.client', '', result)
-            if result is None or not isinstance(result, str):
-                result = code
-            
-            # Remove any remaining .meta. patterns
-            result = safe_re_sub(r'\.meta\.', '', result)
-            if result is None or not isinstance(result, str):
-                result = code
-            
-            # Final aggressive boto3 removal - catch any remaining references
-            # Remove boto3 variable assignments and method calls
-            result = safe_re_sub(r'\bboto3\s*\.\s*\w+', '', result)
-            if result is None or not isinstance(result, str):
-                result = code
+            # Remove LocationConstraint, wait_until_exists() calls (GCP doesn't
+            # have this method), AWS-specific .meta. patterns and any remaining
+            # boto3 variable assignments and method calls
+            result = _apply_call_rewrites(result, _AWS_CLEANUP_LEFTOVER_REMOVALS)
             # Remove any standalone boto3 references (not in comments)
             lines = result.split('\n')
             cleaned_lines = []
@@ -3244,11 +1859,7 @@ When generating the refactored code, you MUST follow Clean Architecture principl
                 result = code
             
             # Clean up syntax issues
-            result = safe_re_sub(r',\s*,', ',', result)  # Double commas
-            result = safe_re_sub(r'\(\s*,', '(', result)  # Comma after opening paren
-            result = safe_re_sub(r',\s*\)', ')', result)  # Comma before closing paren
-            if result is None or not isinstance(result, str):
-                result = code
+            result = _apply_call_rewrites(result, _AWS_CLEANUP_DANGLING_COMMA_REWRITES)
         except Exception:
             if result is None or not isinstance(result, str):
                 result = code
@@ -3267,49 +1878,15 @@ When generating the refactored code, you MUST follow Clean Architecture principl
         Also validates that output code contains no AWS references.
         Returns syntactically correct code or raises SyntaxError.
         """
-        import ast
         import logging
         logger = logging.getLogger(__name__)
         
-        # Validate no AWS references in output code
-        # Note: We exclude Python's 'lambda' keyword and variable names that happen to match
-        # We check for actual AWS service usage, not just variable names
-        aws_patterns = [
-            r'\bboto3\b', r'\bAWS\b(?!\w)', r'\baws\b(?!\w)', 
-            r'\bS3\b(?!\w)(?!\s*[:=])', r'\bs3\b(?!\w)(?!\s*[:=])',  # S3 but not variable assignments
-            r'\bLambda\b(?!\s*[:=])', r'\bDynamoDB\b(?!\s*[:=])', r'\bdynamodb\b(?!\s*[:=])',
-            r'\bSQS\b(?!\s*[:=])', r'\bsqs\b(?!\s*[:=])', r'\bSNS\b(?!\s*[:=])', r'\bsns\b(?!\s*[:=])', 
-            r'\bRDS\b(?!\s*[:=])', r'\brds\b(?!\s*[:=])',
-            r'\bEC2\b', r'\bec2\b', r'\bCloudWatch\b', r'\bcloudwatch\b',
-            r'\bAPI Gateway\b', r'\bapigateway\b', r'\bEKS\b', r'\beks\b',
-            r'\bFargate\b', r'\bfargate\b', r'\bECS\b', r'\becs\b',
-            r'\bAWS_ACCESS_KEY_ID\b', r'\bAWS_SECRET_ACCESS_KEY\b', r'\bAWS_REGION\b',
-            r'\bAWS_LAMBDA_FUNCTION_NAME\b', r'\bS3_BUCKET_NAME\b',
-            r'https://sqs\.', r'https://s3\.', r'\.amazonaws\.com'
-        ]
-        
         # Apply aggressive fallback replacements BEFORE validation
         # This ensures we catch patterns even if main transformation failed
         # Check for boto3 usage
-        if re.search(r'\bboto3\b', code, re.IGNORECASE):
+        if _BOTO3_NAME_RE.search(code):
             # Replace imports
-            code = re.sub(r'^import boto3\s*$', '', code, flags=re.MULTILINE)
-            # First, remove region_name parameters to simplify patterns
-            code = re.sub(r',\s*region_name\s*=\s*[\'"][^\'"]+[\'"]', '', code)
-            code = re.sub(r'region_name\s*=\s*[\'"][^\'"]+[\'\"]\s*,', '', code)
-            code = re.sub(r'region_name\s*=\s*[\'"][^\'"]+[\'"]', '', code)
-            # Replace client calls with region_name/config parameters - handle multiline
-            code = re.sub(r'boto3\.client\s*\(\s*[\'\"]s3[\'\"][^\)]*\)', 'storage.Client()', code, flags=re.DOTALL)
-            code = re.sub(r'boto3\.resource\s*\(\s*[\'\"]s3[\'\"][^\)]*\)', 'storage.Client()', code, flags=re.DOTALL)
-            code = re.sub(r'boto3\.client\s*\(\s*[\'\"]dynamodb[\'\"][^\)]*\)', 'firestore.Client()', code, flags=re.DOTALL)
-            code = re.sub(r'boto3\.client\s*\(\s*[\'\"]sqs[\'\"][^\)]*\)', 'pubsub_v1.PublisherClient()', code, flags=re.DOTALL)
-            code = re.sub(r'boto3\.client\s*\(\s*[\'\"]lambda[\'\"][^\)]*\)', 'functions_v2.FunctionServiceClient()', code, flags=re.DOTALL)
-            # Also handle variable assignments - be more aggressive
-            code = re.sub(r'(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]s3[\'\"][^\)]*\)', r'\1 = storage.Client()', code, flags=re.DOTALL)
-            code = re.sub(r'(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]sqs[\'\"][^\)]*\)', r'\1 = pubsub_v1.PublisherClient()', code, flags=re.DOTALL)
-            code = re.sub(r'(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]dynamodb[\'\"][^\)]*\)', r'\1 = firestore.Client()', code, flags=re.DOTALL)
-            code = re.sub(r'(\w+)\s*=\s*boto3\.resource\s*\(\s*[\'\"]s3[\'\"][^\)]*\)', r'\1 = storage.Client()', code, flags=re.DOTALL)
-            code = re.sub(r'(\w+)\s*=\s*boto3\.resource\s*\(\s*[\'\"]dynamodb[\'\"][^\)]*\)', r'\1 = firestore.Client()', code, flags=re.DOTALL)
+            code = _apply_rewrites(code, _SYNTAX_VALIDATION_BOTO3_REWRITES)
             # Ensure imports are present
             if 'storage.Client()' in code and 'from google.cloud import storage' not in code:
                 code = 'from google.cloud import storage\n' + code
@@ -3336,9 +1913,9 @@ When generating the refactored code, you MUST follow Clean Architecture principl
                 # Could be start/end of multi-line string, skip for now
                 continue
             
-            for pattern in aws_patterns:
+            for pattern in _OUTPUT_AWS_REFERENCE_PATTERNS:
                 try:
-                    if re.search(pattern, line, re.IGNORECASE):
+                    if pattern.search(line):
                         # Make sure it's not in a string literal (check for balanced quotes)
                         # If quotes are balanced, it's likely code, not a string
                         quote_count_double = line.count('"')
@@ -3346,7 +1923,7 @@ When generating the refactored code, you MUST follow Clean Architecture principl
                         # Skip if odd number of quotes (likely inside a string)
                         if quote_count_double % 2 == 1 or quote_count_single % 2 == 1:
                             continue
-                        violations.append(f"Line {i}: Found AWS reference: {pattern} in '{line.strip()}'")
+                        violations.append(f"Line {i}: Found AWS reference: {pattern.pattern} in '{line.strip()}'")
                         break
                 except Exception:
                     # Skip this pattern if it causes an error
@@ -3357,108 +1934,79 @@ When generating the refactored code, you MUST follow Clean Architecture principl
             for violation in violations:
                 logger.warning(violation)
             # Try to clean up common violations
-            for pattern in aws_patterns:
+            for pattern in _OUTPUT_AWS_REFERENCE_PATTERNS:
                 # Only replace if not in strings
                 code = self._safe_replace_pattern(code, pattern, '')
     
     def _aggressive_javascript_aws_cleanup(self, code: str) -> str:
         """Aggressive cleanup of AWS patterns in JavaScript/Node.js code"""
         # Remove AWS SDK imports
-        code = re.sub(r'const\s+aws\s*=\s*require\([\'"]aws-sdk[\'"]\)', '', code)
-        code = re.sub(r'import\s+aws\s+from\s+[\'"]aws-sdk[\'"]', '', code)
-        code = re.sub(r'require\([\'"]aws-sdk[\'"]\)', '', code)
-        code = re.sub(r'from\s+[\'"]aws-sdk[\'"]', '', code)
-        code = re.sub(r'@aws-sdk/client-s3', '@google-cloud/storage', code)
-        code = re.sub(r'@aws-sdk/client-dynamodb', '@google-cloud/firestore', code)
-        code = re.sub(r'@aws-sdk/client-lambda', '@google-cloud/functions-framework', code)
-        code = re.sub(r'@aws-sdk/client-sqs', '@google-cloud/pubsub', code)
-        code = re.sub(r'@aws-sdk/client-sns', '@google-cloud/pubsub', code)
+        code = _apply_rewrites(code, _JAVASCRIPT_AWS_SDK_IMPORT_REMOVALS)
+        code = code.replace('@aws-sdk/client-s3', '@google-cloud/storage')
+        code = code.replace('@aws-sdk/client-dynamodb', '@google-cloud/firestore')
+        code = code.replace('@aws-sdk/client-lambda', '@google-cloud/functions-framework')
+        code = code.replace('@aws-sdk/client-sqs', '@google-cloud/pubsub')
+        code = code.replace('@aws-sdk/client-sns', '@google-cloud/pubsub')
         
         # Replace AWS client instantiation
-        code = re.sub(r'new\s+aws\.S3\(\)', 'new Storage()', code)
-        code = re.sub(r'new\s+aws\.DynamoDB\.DocumentClient\(\)', 'admin.firestore()', code)
-        code = re.sub(r'new\s+aws\.Lambda\(\)', 'functions-framework', code)
-        code = re.sub(r'new\s+aws\.SQS\(\)', 'new PubSub()', code)
-        code = re.sub(r'new\s+aws\.SNS\(\)', 'new PubSub()', code)
-        
-        # Replace AWS SDK v3 clients
-        code = re.sub(r'new\s+S3Client\(\)', 'new Storage()', code)
-        code = re.sub(r'new\s+DynamoDBClient\(\)', 'admin.firestore()', code)
-        code = re.sub(r'new\s+LambdaClient\(\)', 'functions-framework', code)
-        code = re.sub(r'new\s+SQSClient\(\)', 'new PubSub()', code)
-        code = re.sub(r'new\s+SNSClient\(\)', 'new PubSub()', code)
-        
-        # Replace AWS variable names and method calls
-        code = re.sub(r'\bs3\s*=\s*new\s+', 'storage = new ', code, flags=re.IGNORECASE)
-        code = re.sub(r'\bs3\.putObject\b', 'storage.bucket(bucketName).file(key).save', code, flags=re.IGNORECASE)
-        code = re.sub(r'\bs3\.getObject\b', 'storage.bucket(bucketName).file(key).download', code, flags=re.IGNORECASE)
-        code = re.sub(r'\bs3\.listObjects\b', 'storage.bucket(bucketName).getFiles', code, flags=re.IGNORECASE)
-        code = re.sub(r'\bs3\.deleteObject\b', 'storage.bucket(bucketName).file(key).delete', code, flags=re.IGNORECASE)
-        code = re.sub(r'\bdynamodb\.put\b', 'db.collection(tableName).doc().set', code, flags=re.IGNORECASE)
-        code = re.sub(r'\bdynamodb\.get\b', 'db.collection(tableName).doc(key).get', code, flags=re.IGNORECASE)
-        code = re.sub(r'\bdynamodb\.query\b', 'db.collection(tableName).where', code, flags=re.IGNORECASE)
-        code = re.sub(r'\bdynamodb\.scan\b', 'db.collection(tableName).get', code, flags=re.IGNORECASE)
-        code = re.sub(r'\bsqs\.sendMessage\b', 'pubsub.topic(topicName).publishMessage', code, flags=re.IGNORECASE)
-        code = re.sub(r'\bsqs\.receiveMessage\b', 'pubsub.subscription(subscriptionName).on', code, flags=re.IGNORECASE)
-        code = re.sub(r'\bsns\.publish\b', 'pubsub.topic(topicName).publishMessage', code, flags=re.IGNORECASE)
+        code = _apply_rewrites(code, _JAVASCRIPT_AWS_CLIENT_REWRITES)
         
         # Replace AWS method calls
-        code = re.sub(r'\.s3\(\)', '.storage()', code)
-        code = re.sub(r'\.dynamodb\(\)', '.firestore()', code)
-        code = re.sub(r'\.lambda\(\)', '.functions()', code)
-        code = re.sub(r'\.sqs\(\)', '.pubsub()', code)
-        code = re.sub(r'\.sns\(\)', '.pubsub()', code)
+        code = code.replace('.s3()', '.storage()')
+        code = code.replace('.dynamodb()', '.firestore()')
+        code = code.replace('.lambda()', '.functions()')
+        code = code.replace('.sqs()', '.pubsub()')
+        code = code.replace('.sns()', '.pubsub()')
         
         # Replace AWS namespace
-        code = re.sub(r'\bAWS\.', 'GCP.', code)
-        code = re.sub(r'\baws-sdk\b', 'google-cloud', code)
+        code = _apply_rewrites(code, _JAVASCRIPT_AWS_NAMESPACE_REWRITES)
         
         return code
     
     def _aggressive_go_aws_cleanup(self, code: str) -> str:
         """Aggressive cleanup of AWS patterns in Go code"""
         # Remove AWS SDK imports
-        code = re.sub(r'github\.com/aws/aws-sdk-go/service/s3', 'cloud.google.com/go/storage', code)
-        code = re.sub(r'github\.com/aws/aws-sdk-go/service/dynamodb', 'cloud.google.com/go/firestore', code)
-        code = re.sub(r'github\.com/aws/aws-sdk-go/service/lambda', 'cloud.google.com/go/functions', code)
-        code = re.sub(r'github\.com/aws/aws-sdk-go/service/sqs', 'cloud.google.com/go/pubsub', code)
-        code = re.sub(r'github\.com/aws/aws-sdk-go/service/sns', 'cloud.google.com/go/pubsub', code)
-        code = re.sub(r'github\.com/aws/aws-sdk-go-v2', 'cloud.google.com/go', code)
-        code = re.sub(r'github\.com/aws/aws-sdk-go/aws', 'cloud.google.com/go', code)
-        code = re.sub(r'github\.com/aws/aws-sdk-go/aws/session', 'cloud.google.com/go', code)
+        code = code.replace('github.com/aws/aws-sdk-go/service/s3', 'cloud.google.com/go/storage')
+        code = code.replace('github.com/aws/aws-sdk-go/service/dynamodb', 'cloud.google.com/go/firestore')
+        code = code.replace('github.com/aws/aws-sdk-go/service/lambda', 'cloud.google.com/go/functions')
+        code = code.replace('github.com/aws/aws-sdk-go/service/sqs', 'cloud.google.com/go/pubsub')
+        code = code.replace('github.com/aws/aws-sdk-go/service/sns', 'cloud.google.com/go/pubsub')
+        code = code.replace('github.com/aws/aws-sdk-go-v2', 'cloud.google.com/go')
+        code = code.replace('github.com/aws/aws-sdk-go/aws', 'cloud.google.com/go')
+        code = code.replace('github.com/aws/aws-sdk-go/aws/session', 'cloud.google.com/go')
         
         # Replace AWS client creation
-        code = re.sub(r's3\.New\(', 'storage.NewClient(', code)
-        code = re.sub(r'dynamodb\.New\(', 'firestore.NewClient(', code)
-        code = re.sub(r'lambda\.New\(', 'functions.NewClient(', code)
-        code = re.sub(r'sqs\.New\(', 'pubsub.NewClient(', code)
-        code = re.sub(r'sns\.New\(', 'pubsub.NewClient(', code)
+        code = code.replace('s3.New(', 'storage.NewClient(')
+        code = code.replace('dynamodb.New(', 'firestore.NewClient(')
+        code = code.replace('lambda.New(', 'functions.NewClient(')
+        code = code.replace('sqs.New(', 'pubsub.NewClient(')
+        code = code.replace('sns.New(', 'pubsub.NewClient(')
         
         # Replace AWS method calls and types
-        code = re.sub(r's3\.PutObjectInput', 'storage.WriterOptions', code)
-        code = re.sub(r's3\.GetObjectInput', 'storage.ReaderOptions', code)
-        code = re.sub(r's3\.DeleteObjectInput', 'storage.DeleteOptions', code)
-        code = re.sub(r's3\.PutObjectWithContext', 'bucket.Object(key).NewWriter', code)
-        code = re.sub(r's3\.GetObjectWithContext', 'bucket.Object(key).NewReader', code)
-        code = re.sub(r's3\.DeleteObjectWithContext', 'bucket.Object(key).Delete', code)
-        code = re.sub(r'dynamodb\.PutItemInput', 'firestore.SetOptions', code)
-        code = re.sub(r'dynamodb\.GetItemInput', 'firestore.GetOptions', code)
-        code = re.sub(r'dynamodb\.PutItemWithContext', 'client.Collection(tableName).Doc(key).Set', code)
-        code = re.sub(r'dynamodb\.GetItemWithContext', 'client.Collection(tableName).Doc(key).Get', code)
+        code = code.replace('s3.PutObjectInput', 'storage.WriterOptions')
+        code = code.replace('s3.GetObjectInput', 'storage.ReaderOptions')
+        code = code.replace('s3.DeleteObjectInput', 'storage.DeleteOptions')
+        code = code.replace('s3.PutObjectWithContext', 'bucket.Object(key).NewWriter')
+        code = code.replace('s3.GetObjectWithContext', 'bucket.Object(key).NewReader')
+        code = code.replace('s3.DeleteObjectWithContext', 'bucket.Object(key).Delete')
+        code = code.replace('dynamodb.PutItemInput', 'firestore.SetOptions')
+        code = code.replace('dynamodb.GetItemInput', 'firestore.GetOptions')
+        code = code.replace('dynamodb.PutItemWithContext', 'client.Collection(tableName).Doc(key).Set')
+        code = code.replace('dynamodb.GetItemWithContext', 'client.Collection(tableName).Doc(key).Get')
         
         # Replace AWS interfaces
-        code = re.sub(r's3iface\.S3API', 'storage.Client', code)
-        code = re.sub(r'dynamodbiface\.DynamoDBAPI', 'firestore.Client', code)
+        code = code.replace('s3iface.S3API', 'storage.Client')
+        code = code.replace('dynamodbiface.DynamoDBAPI', 'firestore.Client')
         
         # Replace AWS service calls
-        code = re.sub(r'\.S3\(', '.Storage(', code)
-        code = re.sub(r'\.DynamoDB\(', '.Firestore(', code)
-        code = re.sub(r'\.Lambda\(', '.Functions(', code)
-        code = re.sub(r'\.SQS\(', '.PubSub(', code)
-        code = re.sub(r'\.SNS\(', '.PubSub(', code)
+        code = code.replace('.S3(', '.Storage(')
+        code = code.replace('.DynamoDB(', '.Firestore(')
+        code = code.replace('.Lambda(', '.Functions(')
+        code = code.replace('.SQS(', '.PubSub(')
+        code = code.replace('.SNS(', '.PubSub(')
         
         # Remove s3:// URLs in comments/strings (common pattern)
-        code = re.sub(r's3://[^\s\)]+', 'gs://bucket-name/path', code)
+        code = _S3_URL_RE.sub('gs://bucket-name/path', code)
         
         return code
         
@@ -3486,12 +2034,8 @@ When generating the refactored code, you MUST follow Clean Architecture principl
                 
                 # Apply fallback: at least replace boto3 imports and client calls
                 fallback_code = code
-                fallback_code = re.sub(r'import boto3', 'from google.cloud import storage', fallback_code)
-                fallback_code = re.sub(r'boto3\.client\([\'\"]s3[\'\"]\)', 'storage.Client()', fallback_code)
-                fallback_code = re.sub(r'boto3\.resource\([\'\"]s3[\'\"]\)', 'storage.Client()', fallback_code)
-                fallback_code = re.sub(r'boto3\.client\([\'\"]dynamodb[\'\"]\)', 'firestore.Client()', fallback_code)
-                fallback_code = re.sub(r'boto3\.client\([\'\"]sqs[\'\"]\)', 'pubsub_v1.PublisherClient()', fallback_code)
-                fallback_code = re.sub(r'boto3\.client\([\'\"]lambda[\'\"]\)', 'functions_v2.FunctionServiceClient()', fallback_code)
+                fallback_code = fallback_code.replace('import boto3', 'from google.cloud import storage')
+                fallback_code = _apply_rewrites(fallback_code, _SYNTAX_FALLBACK_BOTO3_CLIENT_REWRITES)
                 
                 # Try to parse fallback
                 try:
@@ -3506,8 +2050,8 @@ When generating the refactored code, you MUST follow Clean Architecture principl
                     logger.warning("Returning original code due to transformation syntax errors - manual review needed")
                     # Still try to do basic replacements even on original code
                     basic_fixed = original_code
-                    basic_fixed = re.sub(r'import boto3', 'from google.cloud import storage', basic_fixed)
-                    basic_fixed = re.sub(r'boto3\.client\([\'\"]s3[\'\"]\)', 'storage.Client()', basic_fixed)
+                    basic_fixed = basic_fixed.replace('import boto3', 'from google.cloud import storage')
+                    basic_fixed = _BOTO3_S3_CLIENT_CALL_RE.sub('storage.Client()', basic_fixed)
                     return basic_fixed
                 else:
                     # If no original code, raise error
@@ -3517,94 +2061,57 @@ When generating the refactored code, you MUST follow Clean Architecture principl
         """
         Attempt to fix common syntax errors in transformed code.
         """
-        fixed = code
-        
-        # Fix common indentation issues
-        lines = fixed.split('\n')
+        # Fix common indentation issues and drop duplicate client initializations
+        # in one pass over the lines
         fixed_lines = []
-        indent_level = 0
         in_multiline_string = False
-        string_char = None
+        seen_client_init = set()
+        # Last non-empty, non-comment source line and its indentation
+        prev_non_empty = None
+        prev_indent = ''
         
-        for i, line in enumerate(lines):
+        for line in code.split('\n'):
             stripped = line.strip()
+            fixed_line = line
             
             # Track multiline strings
             if '"""' in line or "'''" in line:
                 in_multiline_string = not in_multiline_string
-                string_char = '"""' if '"""' in line else "'''"
-            
-            # Skip empty lines and comments
-            if not stripped or stripped.startswith('#'):
-                fixed_lines.append(line)
-                continue
-            
-            # Skip lines inside multiline strings
-            if in_multiline_string:
-                fixed_lines.append(line)
-                continue
             
-            # Fix indentation for code blocks that were inserted
+            is_code = bool(stripped) and not stripped.startswith('#')
+            # Fix indentation for code blocks that were inserted (outside multiline strings)
             # Check if this looks like a standalone code block that should be indented
-            if stripped.startswith(('import ', 'from ', 'bucket =', 'blob =', 'topic_path =', 'subscriber =', 'storage_client =', 'gcs_client =')):
-                # Check if we're inside a function (previous non-empty line ends with :)
-                if i > 0:
-                    prev_non_empty = None
-                    prev_indent = ''
-                    for j in range(i-1, -1, -1):
-                        if lines[j].strip() and not lines[j].strip().startswith('#'):
-                            prev_non_empty = lines[j]
-                            prev_indent = lines[j][:len(lines[j]) - len(lines[j].lstrip())]
-                            break
-                    if prev_non_empty and prev_non_empty.rstrip().endswith(':'):
-                        # Should be indented - use the same indentation as previous line + 4 spaces
-                        expected_indent = prev_indent + '    '
-                        if not line.startswith(expected_indent):
-                            fixed_lines.append(expected_indent + stripped)
-                            continue
-                    elif prev_non_empty:
-                        # Use same indentation as previous non-empty line
-                        if not line.startswith(prev_indent):
-                            fixed_lines.append(prev_indent + stripped)
-                            continue
-            
-            fixed_lines.append(line)
-        
-        fixed = '\n'.join(fixed_lines)
-        
-        # Remove duplicate client initializations with incorrect indentation
-        # Pattern: line with excessive indentation followed by same line with correct indentation
-        lines = fixed.split('\n')
-        cleaned_lines = []
-        seen_client_init = set()
-        for i, line in enumerate(lines):
-            stripped = line.strip()
-            # Check if this is a duplicate client initialization
+            if is_code and not in_multiline_string and prev_non_empty is not None and \
+               stripped.startswith(('import ', 'from ', 'bucket =', 'blob =', 'topic_path =', 'subscriber =', 'storage_client =', 'gcs_client =')):
+                if prev_non_empty.rstrip().endswith(':'):
+                    # Inside a block - use the previous line's indentation + 4 spaces
+                    expected_indent = prev_indent + '    '
+                    if not line.startswith(expected_indent):
+                        fixed_line = expected_indent + stripped
+                elif not line.startswith(prev_indent):
+                    # Use same indentation as previous non-empty line
+                    fixed_line = prev_indent + stripped
+            if is_code:
+                prev_non_empty = line
+                prev_indent = line[:len(line) - len(line.lstrip())]
+            
+            # Remove duplicate client initializations with incorrect indentation
             if stripped.startswith(('gcs_client = storage.Client()', 'storage_client = storage.Client()')):
-                # Check if we've seen this before
+                # Skip duplicates and excessively indented (more than 12 spaces) copies
                 if stripped in seen_client_init:
-                    # Skip this duplicate
                     continue
-                # Check if indentation is wrong (more than 12 spaces)
-                indent = line[:len(line) - len(line.lstrip())]
-                if len(indent) > 12:
-                    # Skip this incorrectly indented duplicate
+                if len(fixed_line) - len(fixed_line.lstrip()) > 12:
                     continue
                 seen_client_init.add(stripped)
-            cleaned_lines.append(line)
-        fixed = '\n'.join(cleaned_lines)
-        
-        # Fix double assignments (e.g., "response = bucket = ...")
-        fixed = re.sub(r'(\w+)\s*=\s*(\w+)\s*=\s*', r'\1 = ', fixed)
+            fixed_lines.append(fixed_line)
         
-        # Fix malformed function calls with extra commas
-        fixed = re.sub(r',\s*,', ',', fixed)
-        fixed = re.sub(r'\(\s*,', '(', fixed)
-        fixed = re.sub(r',\s*\)', ')', fixed)
-        
-        return fixed
+        # Fix double assignments and malformed calls with extra commas
+        code = '\n'.join(fixed_lines)
+        for pattern, replacement in _SYNTAX_FIX_REWRITES:
+            code = pattern.sub(replacement, code)
+        return code
     
-    def _safe_replace_pattern(self, code: str, pattern: str, replacement: str) -> str:
+    def _safe_replace_pattern(self, code: str, pattern: re.Pattern, replacement: str) -> str:
         """
         Safely replace a pattern in code, avoiding string literals and comments.
         """
@@ -3619,7 +2126,7 @@ When generating the refactored code, you MUST follow Clean Architecture principl
             # This is a heuristic and may not catch all cases
             if line.count('"') % 2 == 0 and line.count("'") % 2 == 0:
                 # Safe to replace
-                result_lines.append(re.sub(pattern, replacement, line, flags=re.IGNORECASE))
+                result_lines.append(pattern.sub(replacement, line))
             else:
                 # Might be in a string, skip
                 result_lines.append(line)
@@ -3629,8 +2136,15 @@ When generating the refactored code, you MUST follow Clean Architecture principl
 class BaseExtendedTransformer(ABC):
     """Base class for language-specific extended transformers"""
     
+    # service_type -> name of the migration method that handles it
+    _migration_methods: Dict[str, str] = {}
+    
     def __init__(self, service_mapper):
         self.service_mapper = service_mapper
+        self._migrations = {
+            service_type: getattr(self, method_name)
+            for service_type, method_name in self._migration_methods.items()
+        }
     
     @abstractmethod
     def transform(self, code: str, recipe: Dict[str, Any]) -> str:
@@ -3638,14 +2152,2279 @@ class BaseExtendedTransformer(ABC):
         pass
 
 
+# The ASCII characters \s matches only under Unicode rules
+_UNICODE_ONLY_ASCII_SPACE_RE = re.compile('[\x1c-\x1f]')
+
+
+def _is_plain_ascii(text: str) -> bool:
+    """Whether word, digit, space and boundary escapes match the same in text under re.ASCII and Unicode rules"""
+    return text.isascii() and not _UNICODE_ONLY_ASCII_SPACE_RE.search(text)
+
+
+@lru_cache(maxsize=None)
+def _ascii_pattern(pattern):
+    """Return a str pattern recompiled with re.ASCII, which scans plain ASCII code faster"""
+    return re.compile(pattern.pattern, pattern.flags & ~re.UNICODE | re.ASCII)
+
+
+def _keeps_plain_ascii(replacement) -> bool:
+    """Whether substituting replacement into plain ASCII code leaves it plain ASCII"""
+    return type(replacement) is str and _is_plain_ascii(replacement)
+
+
+def _apply_rewrites(code: str, rewrites) -> str:
+    """Apply (compiled pattern, replacement) rewrites to code in order"""
+    plain_ascii = _is_plain_ascii(code)
+    for pattern, replacement in rewrites:
+        if plain_ascii:
+            code = _ascii_pattern(pattern).sub(replacement, code)
+            plain_ascii = _keeps_plain_ascii(replacement) or _is_plain_ascii(code)
+        else:
+            code = pattern.sub(replacement, code)
+    return code
+
+
+def _apply_call_rewrites(code: str, rewrites) -> str:
+    """Apply (call literal, compiled pattern, replacement) rewrites in order, skipping rules whose call the code lacks"""
+    plain_ascii = _is_plain_ascii(code)
+    for literal, pattern, replacement in rewrites:
+        if literal in code:
+            if plain_ascii:
+                code = _ascii_pattern(pattern).sub(replacement, code)
+                plain_ascii = _keeps_plain_ascii(replacement) or _is_plain_ascii(code)
+            else:
+                code = pattern.sub(replacement, code)
+    return code
+
+
+# Characters with a meaning of their own in a pattern, and the quantifiers among them
+_PATTERN_METACHARACTERS = frozenset('.^$*+?{}[]()|\\')
+_PATTERN_QUANTIFIERS = frozenset('*+?{')
+
+
+def _skip_class(source: str, i: int) -> int:
+    """Return the index just past the character class starting at i"""
+    i += 1
+    if source[i] == '^':
+        i += 1
+    if source[i] == ']':
+        i += 1
+    while source[i] != ']':
+        i += 2 if source[i] == '\\' else 1
+    return i + 1
+
+
+def _skip_group(source: str, i: int) -> int:
+    """Return the index just past the group starting at i"""
+    depth = 0
+    while True:
+        char = source[i]
+        if char == '\\':
+            i += 2
+            continue
+        if char == '[':
+            i = _skip_class(source, i)
+            continue
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if not depth:
+                return i + 1
+        i += 1
+
+
+def _skip_quantifier(source: str, i: int) -> int:
+    """Return the index just past the quantifier (with any lazy or possessive suffix) at i, if any"""
+    if i < len(source) and source[i] in _PATTERN_QUANTIFIERS:
+        i = source.index('}', i) + 1 if source[i] == '{' else i + 1
+        if i < len(source) and source[i] in '?+':
+            i += 1
+    return i
+
+
+def _required_literal(pattern) -> str:
+    """
+    Return the longest literal text every match of a compiled pattern contains
+
+    Only unquantified characters outside groups and classes are read, so the
+    result is conservative; it is '' for case-insensitive or verbose patterns
+    and for patterns with a top-level alternation.
+    """
+    if pattern.flags & (re.IGNORECASE | re.VERBOSE):
+        return ''
+    source = pattern.pattern
+    runs = ['']
+    i = 0
+    while i < len(source):
+        char = source[i]
+        if char == '|':
+            return ''
+        if char in '([':
+            # A group or class may match optional or varying text
+            end = _skip_group(source, i) if char == '(' else _skip_class(source, i)
+            atom = None
+        elif char == '\\':
+            end = i + 2
+            atom = None if source[i + 1].isalnum() else source[i + 1]
+        else:
+            end = i + 1
+            atom = None if char in _PATTERN_METACHARACTERS else char
+        if atom is None or (end < len(source) and source[end] in _PATTERN_QUANTIFIERS):
+            i = _skip_quantifier(source, end)
+            runs.append('')
+            continue
+        runs[-1] += atom
+        i = end
+    return max(runs, key=len)
+
+
+def _with_required_literals(rewrites) -> tuple:
+    """
+    Turn (compiled pattern, replacement) rewrites into _apply_call_rewrites rules
+
+    Each rule is gated on the literal its pattern requires, so a substring check
+    skips the regex scan for code that cannot match; rules with no such literal
+    get '' and always run. The check runs on the code as earlier rules left it.
+    """
+    return tuple((_required_literal(pattern), pattern, replacement) for pattern, replacement in rewrites)
+
+
+# The "receiver." start shared by method call patterns; group 1 is the receiver
+_CALL_RECEIVER_PREFIX = r'\b(\w+)\.'
+# A group reference in a replacement template (\1, \g<1>), or an escaped backslash
+_TEMPLATE_GROUP_REFERENCE_RE = re.compile(r'\\(?:(\\)|g<(\d+)>|([1-9]\d?))')
+# Matches once in an empty string, so sub expands a template's escapes
+_EMPTY_RE = re.compile('')
+
+
+def _format_template(replacement: str, offset: int) -> str:
+    """
+    Turn a replacement template into a str.format string over a match's groups()
+
+    The rule's group 1 (the receiver) stays group 1 and its group N >= 2 becomes
+    group N + offset; escapes are expanded as sub would expand them.
+    """
+    pieces = []
+    start = 0
+    for m in _TEMPLATE_GROUP_REFERENCE_RE.finditer(replacement):
+        if m.group(1):
+            continue
+        pieces.append(_EMPTY_RE.sub(replacement[start:m.start()], '').replace('{', '{{').replace('}', '}}'))
+        number = int(m.group(2) or m.group(3))
+        if number == 0:
+            raise ValueError(f"Cannot fuse a template using the whole match: {replacement!r}")
+        pieces.append(f'{{{(number + offset if number > 1 else 1) - 1}}}')
+        start = m.end()
+    pieces.append(_EMPTY_RE.sub(replacement[start:], '').replace('{', '{{').replace('}', '}}'))
+    return ''.join(pieces)
+
+
+def _fuse_call_rewrites(rewrites) -> tuple:
+    """
+    Fuse (call literal, compiled pattern, replacement) rewrites into one alternation
+
+    Every pattern must start with _CALL_RECEIVER_PREFIX; the fused pattern
+    matches the receiver once and then one named branch per rule. This only
+    matches applying the rules in order when no replacement produces a call a
+    later rule rewrites and no two rules' matches overlap.
+    """
+    branches = []
+    templates = {}
+    group = 2
+    for index, (_, pattern, replacement) in enumerate(rewrites):
+        if not pattern.pattern.startswith(_CALL_RECEIVER_PREFIX) or pattern.flags & ~re.UNICODE or pattern.groupindex:
+            raise ValueError(f"Cannot fuse call rewrite {pattern.pattern!r}")
+        name = f'rule{index}'
+        branches.append(f'(?P<{name}>{pattern.pattern[len(_CALL_RECEIVER_PREFIX):]})')
+        # The rule's group N >= 2 is group N - 1 inside its branch
+        templates[name] = _format_template(replacement, group - 1)
+        group += pattern.groups
+    literals = tuple(literal for literal, _, _ in rewrites)
+    fused = re.compile(_CALL_RECEIVER_PREFIX + '(?:' + '|'.join(branches) + ')')
+    return literals, fused, MappingProxyType(templates)
+
+
+def _apply_fused_call_rewrites(code: str, fused) -> str:
+    """Apply call rewrites fused by _fuse_call_rewrites in one pass, if the code makes any of the calls"""
+    literals, pattern, templates = fused
+    if not any(literal in code for literal in literals):
+        return code
+    if _is_plain_ascii(code):
+        pattern = _ascii_pattern(pattern)
+    return pattern.sub(lambda m: templates[m.lastgroup].format(*m.groups('')), code)
+
+
+def _apply_edits(code, edits):
+    """
+    Apply (start, end, replacement) edits, sorted by start, to str or bytes code
+
+    The untouched stretches and replacements are joined once instead of the
+    code being rebuilt for every edit; an edit starting inside the previous
+    one starts where that one ends.
+    """
+    pieces = []
+    position = 0
+    for start, end, replacement in edits:
+        start = max(start, position)
+        pieces.append(code[position:start])
+        pieces.append(replacement)
+        position = max(start, end)
+    pieces.append(code[position:])
+    return code[:0].join(pieces)
+
+
+def _insert_imports(code: str, imports: List[str]) -> str:
+    """Insert import lines, in order, after the leading import block of code"""
+    lines = code.split('\n')
+    import_idx = 0
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if stripped.startswith('import') or stripped.startswith('from'):
+            import_idx = i + 1
+        elif stripped and not stripped.startswith('#'):
+            break
+    lines[import_idx:import_idx] = imports
+    return '\n'.join(lines)
+
+
+def _strip_boto3_call_arguments(code: str, service: str) -> str:
+    """
+    Reduce boto3.client(service, ...) and boto3.resource(service, ...) calls
+    to boto3.client(service) / boto3.resource(service)
+
+    The client rewrites drop these arguments anyway, but match the call with
+    [^)]*, which stops at the first nested parenthesis (config=Config(...)).
+    Locating the calls on the AST handles any argument list while leaving the
+    rest of the source, comments included, untouched. Code that does not parse
+    is returned unchanged for the regex rewrites to handle.
+    """
+    tree = _parse_python(code)
+    if tree is None:
+        return code
+    calls = [
+        node for node in ast.walk(tree)
+        if isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and node.func.attr in ('client', 'resource')
+        and isinstance(node.func.value, ast.Name)
+        and node.func.value.id == 'boto3'
+        and node.args
+        and isinstance(node.args[0], ast.Constant)
+        and node.args[0].value == service
+        and (len(node.args) > 1 or node.keywords)
+    ]
+    if not calls:
+        return code
+    # AST column offsets count UTF-8 bytes, so splice the encoded source
+    source = code.encode('utf-8')
+    line_starts = [0]
+    for line in source.split(b'\n'):
+        line_starts.append(line_starts[-1] + len(line) + 1)
+    end = len(source)
+    edits = []
+    # Walk the calls from the end, skipping any call that encloses one
+    # already edited
+    for node in sorted(calls, key=lambda n: (n.lineno, n.col_offset), reverse=True):
+        call_end = line_starts[node.end_lineno - 1] + node.end_col_offset
+        if call_end > end:
+            continue
+        first_arg = node.args[0]
+        arg_end = line_starts[first_arg.end_lineno - 1] + first_arg.end_col_offset
+        edits.append((arg_end, call_end, b')'))
+        end = line_starts[node.lineno - 1] + node.col_offset
+    return _apply_edits(source, reversed(edits)).decode('utf-8')
+
+# Attribute calls (".name(") made by a source file, collected in one pass so
+# the per-method rewrites below only run for methods the code calls
+_ATTRIBUTE_CALL_RE = re.compile(r'\.(\w+)\s*\(')
+
+
+# A bare "import boto3" line or the "from boto3" prefix of an import, matched in
+# one scan by the per-service import rewrites
+_BOTO3_IMPORT_RE = re.compile(r'^(?:import boto3\s*$|from boto3)', re.MULTILINE)
+# Whole boto3 import lines
+_BOTO3_IMPORT_LINE_RE = re.compile(r'^(?:import boto3\s*$|from boto3.*$)', re.MULTILINE)
+
+# boto3 import lines left behind once every AWS client has been migrated
+_BOTO3_IMPORT_REMOVALS = (
+    (_BOTO3_IMPORT_LINE_RE, ''),
+)
+# Lines still using boto3 after migration, skipping comment lines and lines
+# with docstring quotes; the second form also skips import lines
+_BOTO3_USAGE_LINE_RE = re.compile(r'^(?![^\S\n]*#)(?!.*(?:"""|\'\'\')).*\bboto3\b', re.MULTILINE)
+_BOTO3_NON_IMPORT_USAGE_LINE_RE = re.compile(
+    r'^(?![^\S\n]*(?:#|import))(?!.*(?:"""|\'\'\')).*\bboto3\b', re.MULTILINE
+)
+# Any-case "boto3", found without lowering a copy of the code
+_BOTO3_ANY_CASE_RE = re.compile('boto3', re.IGNORECASE)
+_EXCESS_BLANK_LINES_RE = re.compile(r'\n{3,}')
+
+# Service detection for auto-migration: boto3 client/resource creation and
+# characteristic API calls per service
+_AUTO_DETECT_SERVICES = ('s3', 'lambda', 'dynamodb', 'sqs', 'sns')
+_BOTO3_SERVICE_CLIENT_RES = {
+    service: re.compile(rf'boto3\.(client|resource)\([\'\"]{service}[\'\"]', re.IGNORECASE)
+    for service in _AUTO_DETECT_SERVICES
+}
+# One scan for every service: group 1 captures the boto3 client/resource name,
+# groups 2-6 are the characteristic API calls of _AUTO_DETECT_SERVICES in order
+# and group 7 is a Lambda handler definition or reference
+_AWS_SERVICE_USAGE_RE = re.compile(
+    r'(?i:boto3\.(?:client|resource)\([\'\"](s3|lambda|dynamodb|sqs|sns)[\'\"])'
+    r'|\.(?:(upload_file|download_file|put_object|get_object|delete_object|list_objects)'
+    r'|(invoke\()'
+    r'|(put_item|get_item|query|scan|batch_writer)'
+    r'|(send_message|receive_message|delete_message)'
+    r'|(publish|subscribe))'
+    r'|(lambda_handler)'
+)
+# Service named by each of the groups 2-7 above
+_AWS_SERVICE_USAGE_GROUP_SERVICES = (None, None) + _AUTO_DETECT_SERVICES + ('lambda',)
+_S3_OBJECT_CALL_RE = re.compile(r'\.(upload_file|download_file|put_object|get_object|delete_object)')
+
+# Auto-detection first pass: boto3 clients, AWS variable names, handler and env var patterns
+_AUTO_DETECT_FIRST_PASS_REWRITES = _with_required_literals((
+    # This ensures we catch patterns like dynamodb_client = boto3.client('dynamodb')
+    # BEFORE they get into the refactored code
+    # Pattern: dynamodb_client = boto3.client('dynamodb')
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]dynamodb[\'\"][^\)]*\)', re.DOTALL | re.IGNORECASE), r'\1 = firestore.Client()'),
+    # Pattern: sqs_client = boto3.client('sqs')
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]sqs[\'\"][^\)]*\)', re.DOTALL | re.IGNORECASE), r'\1 = pubsub_v1.PublisherClient()'),
+    # Pattern: sns_client = boto3.client('sns')
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]sns[\'\"][^\)]*\)', re.DOTALL | re.IGNORECASE), r'\1 = pubsub_v1.PublisherClient()'),
+    # Pattern: s3_client = boto3.client('s3') or s3 = boto3.client('s3')
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]s3[\'\"][^\)]*\)', re.DOTALL | re.IGNORECASE), r'\1 = storage.Client()'),
+    # Pattern: lambda_client = boto3.client('lambda')
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]lambda[\'\"][^\)]*\)', re.DOTALL | re.IGNORECASE), r'\1 = functions_v2.FunctionServiceClient()'),
+    # CRITICAL: Fix variable names AFTER client replacement
+    # Pattern: dynamodb_client = ... -> firestore_db = ...
+    (re.compile(r'\bdynamodb_client\s*=\s*'), 'firestore_db = '),
+    (re.compile(r'\bdynamodb_client\.'), 'firestore_db.'),
+    # Pattern: sqs_client = ... -> pubsub_publisher = ...
+    (re.compile(r'\bsqs_client\s*=\s*'), 'pubsub_publisher = '),
+    (re.compile(r'\bsqs_client\.'), 'pubsub_publisher.'),
+    # Pattern: sns_client = ... -> pubsub_publisher = ...
+    (re.compile(r'\bsns_client\s*=\s*'), 'pubsub_publisher = '),
+    (re.compile(r'\bsns_client\.'), 'pubsub_publisher.'),
+    # Pattern: s3_client = storage.Client() -> storage_client = storage.Client()
+    (re.compile(r'\bs3_client\s*=\s*storage\.Client\(\)'), 'storage_client = storage.Client()'),
+    (re.compile(r'\bs3_client\.'), 'storage_client.'),
+    # CRITICAL: Fix AWS API method calls
+    # Pattern: s3_client.get_object(Bucket=..., Key=...) -> bucket.blob pattern
+    (re.compile(r'\b(\w+)\s*=\s*(\w+)\.get_object\s*\(\s*Bucket\s*=\s*([^,]+),\s*Key\s*=\s*([^,\)]+)\s*\)', re.DOTALL), r'bucket = storage_client.bucket(\3)\n    blob = bucket.blob(\4)\n    csv_content = blob.download_as_text()'),
+    # Pattern: response['Body'].read().decode('utf-8') -> csv_content
+    (re.compile(r"response\['Body'\]\.read\(\)\.decode\(['\"]utf-8['\"]\)"), 'csv_content'),
+    (re.compile(r'response\["Body"\]\.read\(\)\.decode\(["\']utf-8["\']\)'), 'csv_content'),
+    # CRITICAL: Fix lambda_handler
+    (re.compile(r'def\s+lambda_handler\s*\(\s*event\s*,\s*context\s*\)\s*:', re.IGNORECASE), 'def process_gcs_file(data, context):\n    """\n    Background Cloud Function triggered by a new file in Cloud Storage.\n    The \'data\' parameter contains the bucket and file information.\n    The \'context\' parameter provides event metadata.\n    """'),
+    # CRITICAL: Fix event['Records'] patterns
+    (re.compile(r'for\s+record_event\s+in\s+event\[[\'"]Records[\'"]\]\s*:'), '# GCS background function receives single file event, not a list\n    # Process the single file event'),
+    (re.compile(r'if\s+not\s+event\.get\([\'"]Records[\'"]\)\s*:'), 'if not data.get(\'bucket\') or not data.get(\'name\'):'),
+    # CRITICAL: Fix environment variables
+    (re.compile(r"DYNAMODB_TABLE_NAME"), 'FIRESTORE_COLLECTION_NAME'),
+    (re.compile(r"SQS_DLQ_URL"), 'PUB_SUB_ERROR_TOPIC'),
+    (re.compile(r"SNS_TOPIC_ARN"), 'PUB_SUB_SUMMARY_TOPIC'),
+))
+
+# Auto-detection cleanup after the per-service migrations
+_AUTO_DETECT_CLEANUP_REWRITES = _with_required_literals((
+    # Handle with and without region_name parameter
+    # Replace standalone calls
+    (re.compile(r'boto3\.client\s*\(\s*[\'\"]s3[\'\"][^\)]*\)'), 'storage.Client()'),
+    (re.compile(r'boto3\.resource\s*\(\s*[\'\"]s3[\'\"][^\)]*\)'), 'storage.Client()'),
+    (re.compile(r'boto3\.client\s*\(\s*[\'\"]dynamodb[\'\"][^\)]*\)'), 'firestore.Client()'),
+    (re.compile(r'boto3\.resource\s*\(\s*[\'\"]dynamodb[\'\"][^\)]*\)'), 'firestore.Client()'),
+    (re.compile(r'boto3\.client\s*\(\s*[\'\"]sqs[\'\"][^\)]*\)'), 'pubsub_v1.PublisherClient()'),
+    (re.compile(r'boto3\.client\s*\(\s*[\'\"]lambda[\'\"][^\)]*\)'), 'functions_v2.FunctionServiceClient()'),
+    # Replace with variable assignments
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]s3[\'\"][^\)]*\)'), r'\1 = storage.Client()'),
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]sqs[\'\"][^\)]*\)'), r'\1 = pubsub_v1.PublisherClient()'),
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]dynamodb[\'\"][^\)]*\)'), r'\1 = firestore.Client()'),
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.resource\s*\(\s*[\'\"]s3[\'\"][^\)]*\)'), r'\1 = storage.Client()'),
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.resource\s*\(\s*[\'\"]dynamodb[\'\"][^\)]*\)'), r'\1 = firestore.Client()'),
+    # AGGRESSIVE CLEANUP: Fix variable names that were incorrectly assigned
+    # Pattern: s3_client = storage.Client() -> storage_client = storage.Client()
+    (re.compile(r'\bs3_client\s*=\s*storage\.Client\(\)'), 'storage_client = storage.Client()'),
+    # Pattern: s3_client.get_object(...) -> Fix to use bucket.blob pattern
+    # This should have been caught by S3 migration, but ensure it's fixed
+    (re.compile(r'\b(\w+)\s*=\s*s3_client\.get_object\(Bucket=([^,]+),\s*Key=([^,\)]+)\)'), r'bucket = storage_client.bucket(\2)\n    blob = bucket.blob(\3)\n    csv_content = blob.download_as_text()'),
+    # Pattern: response = s3_client.get_object(...) -> Fix
+    (re.compile(r'response\s*=\s*s3_client\.get_object\(Bucket=([^,]+),\s*Key=([^,\)]+)\)'), r'bucket = storage_client.bucket(\1)\n    blob = bucket.blob(\2)\n    csv_content = blob.download_as_text()'),
+    # Pattern: Replace s3_client. method calls with storage_client.
+    (re.compile(r'\bs3_client\.'), 'storage_client.'),
+    # AGGRESSIVE: Fix DynamoDB client assignments that weren't caught
+    # Pattern: dynamodb_client = boto3.client('dynamodb') -> firestore_db = firestore.Client()
+    (re.compile(r'dynamodb_client\s*=\s*boto3\.client\([\'\"]dynamodb[\'\"][^\)]*\)', re.DOTALL), 'firestore_db = firestore.Client()'),
+    # Pattern: dynamodb_client = ... -> firestore_db = ...
+    (re.compile(r'\bdynamodb_client\s*=\s*'), 'firestore_db = '),
+    # Pattern: dynamodb_client. method calls -> firestore_db.
+    (re.compile(r'\bdynamodb_client\.'), 'firestore_db.'),
+    # AGGRESSIVE: Fix SQS client assignments
+    # Pattern: sqs_client = boto3.client('sqs') -> pubsub_publisher = pubsub_v1.PublisherClient()
+    (re.compile(r'sqs_client\s*=\s*boto3\.client\([\'\"]sqs[\'\"][^\)]*\)', re.DOTALL), 'pubsub_publisher = pubsub_v1.PublisherClient()'),
+    # Pattern: sqs_client = ... -> pubsub_publisher = ...
+    (re.compile(r'\bsqs_client\s*=\s*'), 'pubsub_publisher = '),
+    # Pattern: sqs_client. method calls -> pubsub_publisher.
+    (re.compile(r'\bsqs_client\.'), 'pubsub_publisher.'),
+    # AGGRESSIVE: Fix SNS client assignments
+    # Pattern: sns_client = boto3.client('sns') -> pubsub_publisher = pubsub_v1.PublisherClient()
+    (re.compile(r'sns_client\s*=\s*boto3\.client\([\'\"]sns[\'\"][^\)]*\)', re.DOTALL), 'pubsub_publisher = pubsub_v1.PublisherClient()'),
+    # Pattern: sns_client = ... -> pubsub_publisher = ...
+    (re.compile(r'\bsns_client\s*=\s*'), 'pubsub_publisher = '),
+    # Pattern: sns_client. method calls -> pubsub_publisher.
+    (re.compile(r'\bsns_client\.'), 'pubsub_publisher.'),
+    # AGGRESSIVE: Fix environment variable names
+    (re.compile(r"DYNAMODB_TABLE_NAME"), 'FIRESTORE_COLLECTION_NAME'),
+    (re.compile(r"SQS_DLQ_URL"), 'PUB_SUB_ERROR_TOPIC'),
+    (re.compile(r"SNS_TOPIC_ARN"), 'PUB_SUB_SUMMARY_TOPIC'),
+    # AGGRESSIVE: Fix AWS API method calls that weren't caught
+    # Pattern: s3_client.get_object(Bucket=..., Key=...) -> bucket.blob pattern
+    (re.compile(r'\b(\w+)\s*=\s*(\w+)\.get_object\(Bucket=([^,]+),\s*Key=([^,\)]+)\)'), r'bucket = storage_client.bucket(\3)\n    blob = bucket.blob(\4)\n    csv_content = blob.download_as_text()'),
+    # Pattern: response['Body'].read().decode('utf-8') -> csv_content
+    (re.compile(r"response\['Body'\]\.read\(\)\.decode\(['\"]utf-8['\"]\)"), 'csv_content'),
+    (re.compile(r'response\["Body"\]\.read\(\)\.decode\(["\']utf-8["\']\)'), 'csv_content'),
+    # AGGRESSIVE: Fix lambda_handler if still present
+    (re.compile(r'def\s+lambda_handler\s*\(\s*event\s*,\s*context\s*\)\s*:', re.IGNORECASE), 'def process_gcs_file(data, context):\n    """\n    Background Cloud Function triggered by a new file in Cloud Storage.\n    The \'data\' parameter contains the bucket and file information.\n    The \'context\' parameter provides event metadata.\n    """'),
+    # AGGRESSIVE: Fix event['Records'] patterns
+    (re.compile(r'for\s+record_event\s+in\s+event\[[\'"]Records[\'"]\]\s*:'), '# GCS background function receives single file event, not a list\n    # Process the single file event'),
+    (re.compile(r'if\s+not\s+event\.get\([\'"]Records[\'"]\)\s*:'), 'if not data.get(\'bucket\') or not data.get(\'name\'):'),
+    # AGGRESSIVE: Remove AWS comments
+    (re.compile(r'#\s*AWS\s+Clients?\s*', re.IGNORECASE), '# Google Cloud Clients'),
+    (re.compile(r'#\s*AWS\s+.*', re.IGNORECASE), ''),
+))
+
+# Auto-detection safety net for anything still left before Gemini validation
+_AUTO_DETECT_FINAL_REWRITES = _with_required_literals((
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]dynamodb[\'\"][^\)]*\)', re.DOTALL | re.IGNORECASE), r'\1 = firestore.Client()'),
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]sqs[\'\"][^\)]*\)', re.DOTALL | re.IGNORECASE), r'\1 = pubsub_v1.PublisherClient()'),
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]sns[\'\"][^\)]*\)', re.DOTALL | re.IGNORECASE), r'\1 = pubsub_v1.PublisherClient()'),
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]s3[\'\"][^\)]*\)', re.DOTALL | re.IGNORECASE), r'\1 = storage.Client()'),
+    # Catch any remaining AWS variable names
+    (re.compile(r'\bdynamodb_client\b'), 'firestore_db'),
+    (re.compile(r'\bsqs_client\b'), 'pubsub_publisher'),
+    (re.compile(r'\bsns_client\b'), 'pubsub_publisher'),
+    (re.compile(r'\bs3_client\b'), 'storage_client'),
+    # Catch any remaining AWS API calls
+    (re.compile(r'\b(\w+)\.get_object\s*\(\s*Bucket\s*=\s*([^,]+),\s*Key\s*=\s*([^,\)]+)\s*\)', re.DOTALL), r'bucket = storage_client.bucket(\2)\n    blob = bucket.blob(\3)\n    csv_content = blob.download_as_text()'),
+    # Catch any remaining lambda_handler
+    (re.compile(r'def\s+lambda_handler\s*\(\s*event\s*,\s*context\s*\)\s*:', re.IGNORECASE), 'def process_gcs_file(data, context):\n    """\n    Background Cloud Function triggered by a new file in Cloud Storage.\n    The \'data\' parameter contains the bucket and file information.\n    The \'context\' parameter provides event metadata.\n    """'),
+))
+
+
+def _without_boto3_rules(rewrites):
+    """Drop the rules whose pattern can only match code that mentions boto3"""
+    return tuple(rule for rule in rewrites if 'boto3' not in rule[1].pattern)
+
+
+# Auto-detection tables for source that never mentions boto3
+_AUTO_DETECT_FIRST_PASS_NON_BOTO3_REWRITES = _without_boto3_rules(_AUTO_DETECT_FIRST_PASS_REWRITES)
+_AUTO_DETECT_CLEANUP_NON_BOTO3_REWRITES = _without_boto3_rules(_AUTO_DETECT_CLEANUP_REWRITES)
+_AUTO_DETECT_FINAL_NON_BOTO3_REWRITES = _without_boto3_rules(_AUTO_DETECT_FINAL_REWRITES)
+
+# SQS client, variable name and import rewrites applied before the call rewrites
+_SQS_FIRST_PASS_REWRITES = (
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]sqs[\'\"][^\)]*\)', re.DOTALL | re.IGNORECASE), r'\1 = pubsub_v1.PublisherClient()'),
+    (re.compile(r'\bsqs_client\s*=\s*'), 'pubsub_publisher = '),
+    (re.compile(r'\bsqs_client\.'), 'pubsub_publisher.'),
+    (re.compile(r'\bsqs_client\b'), 'pubsub_publisher'),
+    # Replace SQS imports FIRST
+    (_BOTO3_IMPORT_RE, 'import os\nfrom google.cloud import pubsub_v1'),
+)
+
+# SQS FIFO parameters with no direct Pub/Sub equivalent
+_SQS_FIFO_PARAMETER_REWRITES = (
+    # Pub/Sub doesn't have exact FIFO equivalent, but we can use ordering keys
+    # Remove these parameters from function calls
+    (re.compile(r',\s*MessageGroupId=([^,]+)'), r'  # MessageGroupId -> Use ordering_key in Pub/Sub for message ordering'),
+    (re.compile(r'MessageGroupId=([^,]+),'), r'# MessageGroupId -> Use ordering_key in Pub/Sub for message ordering\n    '),
+    (re.compile(r',\s*MessageDeduplicationId=([^,]+)'), r'  # MessageDeduplicationId -> Pub/Sub handles deduplication automatically'),
+    (re.compile(r'MessageDeduplicationId=([^,]+),'), r'# MessageDeduplicationId -> Pub/Sub handles deduplication automatically\n    '),
+)
+
+# SQS calls still using the default client name
+_SQS_LEFTOVER_CALL_REWRITES = (
+    (re.compile(r'sqs\.send_message'), 'publisher.publish'),
+    (re.compile(r'sqs\.receive_message'), 'subscriber.pull'),
+)
+
+# SNS client and import rewrites
+_SNS_TO_PUBSUB_REWRITES = (
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]sns[\'\"][^\)]*\)', re.DOTALL | re.IGNORECASE), r'\1 = pubsub_v1.PublisherClient()'),
+    (re.compile(r'\bsns_client\s*=\s*'), 'pubsub_publisher = '),
+    (re.compile(r'\bsns_client\.'), 'pubsub_publisher.'),
+    (re.compile(r'\bsns_client\b'), 'pubsub_publisher'),
+    # Replace SNS imports
+    (_BOTO3_IMPORT_RE, 'from google.cloud import pubsub_v1'),
+)
+
+# (call literal, pattern, replacement) for SNS calls
+_SNS_CALL_REWRITES = (
+    # Replace SNS publish -> Pub/Sub publish
+    ('.publish(', re.compile(r'\b(\w+)\.publish\(TopicArn=([^,]+),\s*Message=([^,\)]+)\)'), r'import os\n    topic_path = \1.topic_path(os.getenv("GCP_PROJECT_ID", "your-project-id"), os.getenv("GCP_PUBSUB_TOPIC_ID", "topic-name"))\n    future = \1.publish(topic_path, \3.encode("utf-8"))'),
+    # Replace create_topic
+    ('.create_topic(', re.compile(r'\b(\w+)\.create_topic\(Name=([^,\)]+)\)'), r'topic_path = \1.topic_path(os.getenv("GCP_PROJECT_ID", "your-project-id"), \2)\n    topic = \1.create_topic(request={"name": topic_path})'),
+)
+
+# (call literal, pattern, replacement) for S3 object copy/metadata/stream/delete calls
+_S3_OBJECT_CALL_REWRITES = (
+    # copy_object -> blob rewrite
+    ('.copy_object', re.compile(r'\b(\w+)\.copy_object\s*\(\s*CopySource\s*=\s*\{[\'"]Bucket[\'"]:\s*([^,]+),\s*[\'"]Key[\'"]:\s*([^\)]+)\},\s*Bucket\s*=\s*([^,]+),\s*Key\s*=\s*([^\)]+)\s*\)'), r'# Copy blob in GCS\n    source_bucket = storage_client.bucket(\2)\n    source_blob = source_bucket.blob(\3)\n    dest_bucket = storage_client.bucket(\4)\n    dest_blob = dest_bucket.blob(\5)\n    dest_blob.rewrite(source_blob)'),
+    # head_object -> blob metadata
+    ('.head_object(', re.compile(r'\b(\w+)\s*=\s*(\w+)\.head_object\(Bucket=([^,]+),\s*Key=([^,\)]+)\)'), r'bucket = storage_client.bucket(\3)\n    blob = bucket.blob(\4)\n    blob.reload()  # Fetch blob metadata\n    \1 = {\'ContentLength\': blob.size, \'ContentType\': blob.content_type, \'ETag\': blob.etag}'),
+    # Bucket resource - bucket.objects.all() / .filter(Prefix=...)
+    ('.all(', re.compile(r'\b(\w+)\.objects\.all\(\)'), r'storage_client.list_blobs(\1.name)'),
+    ('.filter(', re.compile(r'\b(\w+)\.objects\.filter\(Prefix=([^\)]+)\)'), r'storage_client.list_blobs(\1.name, prefix=\2)'),
+    # Object resource - obj.copy() / obj.delete()
+    ('.copy(', re.compile(r'\b(\w+)\.copy\(\{[\'"]Bucket[\'"]:\s*([^,]+),\s*[\'"]Key[\'"]:\s*([^\)]+)\}\)'), r'# Copy blob in GCS\n    source_bucket = storage_client.bucket(\2)\n    source_blob = source_bucket.blob(\3)\n    dest_bucket = storage_client.bucket(\1.bucket.name)\n    dest_blob = dest_bucket.blob(\1.name)\n    dest_blob.rewrite(source_blob)'),
+    ('.delete(', re.compile(r'\b(\w+)\.delete\(\)'), r'\1.delete()  # GCS blob.delete() works the same way'),
+    # upload_fileobj / download_fileobj
+    ('.upload_fileobj(', re.compile(r'\b(\w+)\.upload_fileobj\(([^,]+),\s*([^,]+),\s*([^\)]+)\)'), r'bucket = storage_client.bucket(\3)\n    blob = bucket.blob(\4)\n    blob.upload_from_file(\2, rewind=True)'),
+    ('.download_fileobj(', re.compile(r'\b(\w+)\.download_fileobj\(([^\)]+)\)'), r'\1.download_to_file(\2)'),
+    # delete_object
+    ('.delete_object(', re.compile(r'\b(\w+)\.delete_object\(Bucket=([^,]+),\s*Key=([^,\)]+)\)'), r'bucket = storage_client.bucket(\2)\n    blob = bucket.blob(\3)\n    blob.delete()'),
+)
+
+# (call literal, pattern, replacement) for S3 presigned URL, multipart upload and versioning calls
+_S3_SIGNED_URL_CALL_REWRITES = (
+    # generate_presigned_url -> signed URL (assignment form first)
+    ('.generate_presigned_url(', re.compile(r'\b(\w+)\s*=\s*(\w+)\.generate_presigned_url\([\'"]get_object[\'"],\s*Params=\{[\'"]Bucket[\'"]:\s*([^,]+),\s*[\'"]Key[\'"]:\s*([^}]+)\},\s*ExpiresIn=([^\)]+)\)'), r'from datetime import datetime, timedelta\nbucket = gcs_client.bucket(\3)\nblob = bucket.blob(\4)\n\1 = blob.generate_signed_url(expiration=datetime.utcnow() + timedelta(seconds=\5), method="GET")'),
+    ('.generate_presigned_url(', re.compile(r'\b(\w+)\.generate_presigned_url\([\'"]get_object[\'"],\s*Params=\{[\'"]Bucket[\'"]:\s*([^,]+),\s*[\'"]Key[\'"]:\s*([^}]+)\},\s*ExpiresIn=([^\)]+)\)'), r'from datetime import datetime, timedelta\nbucket = gcs_client.bucket(\2)\nblob = bucket.blob(\3)\nurl = blob.generate_signed_url(expiration=datetime.utcnow() + timedelta(seconds=\4), method="GET")'),
+    # create_multipart_upload -> resumable upload
+    ('.create_multipart_upload(', re.compile(r'\b(\w+)\s*=\s*(\w+)\.create_multipart_upload\(Bucket=([^,]+),\s*Key=([^\)]+)\)'), r'# GCS uses resumable uploads instead of multipart\n# Use blob.upload_from_filename() for large files - it handles resumable uploads automatically\nbucket = gcs_client.bucket(\3)\nblob = bucket.blob(\4)\n# For resumable upload: blob.upload_from_filename("file.zip", resumable=True)'),
+    ('.create_multipart_upload(', re.compile(r'\b(\w+)\.create_multipart_upload\(Bucket=([^,]+),\s*Key=([^\)]+)\)'), r'# GCS uses resumable uploads instead of multipart\n# Use blob.upload_from_filename() for large files - it handles resumable uploads automatically\nbucket = gcs_client.bucket(\2)\nblob = bucket.blob(\3)\n# For resumable upload: blob.upload_from_filename("file.zip", resumable=True)'),
+    # list_object_versions -> versioned blob listing
+    ('.list_object_versions(', re.compile(r'\b(\w+)\s*=\s*(\w+)\.list_object_versions\(Bucket=([^,]+),\s*Prefix=([^\)]+)\)'), r'bucket = gcs_client.bucket(\3)\nblobs = bucket.list_blobs(prefix=\4, versions=True)\n\1 = [{"VersionId": blob.generation, "Name": blob.name} for blob in blobs]'),
+    ('.list_object_versions(', re.compile(r'\b(\w+)\.list_object_versions\(Bucket=([^,]+),\s*Prefix=([^\)]+)\)'), r'bucket = gcs_client.bucket(\2)\nblobs = bucket.list_blobs(prefix=\3, versions=True)\nversions = [{"VersionId": blob.generation, "Name": blob.name} for blob in blobs]'),
+)
+
+# RDS boto3 import and client removal
+_RDS_CLIENT_REWRITES = (
+    (_BOTO3_IMPORT_RE, ''),
+    # Replace RDS client instantiation (remove it, not needed for Cloud SQL)
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.client\([\'\"]rds[\'\"][^\)]*\)'), r'# RDS management operations replaced with Cloud SQL Admin API if needed'),
+)
+
+# Cloud SQL connector rewrites for RDS code using pymysql
+_RDS_PYMYSQL_REWRITES = (
+    (re.compile(r'import pymysql'), 'from google.cloud.sql.connector import Connector\nimport pymysql'),
+    (re.compile(r'connection\s*=\s*pymysql\.connect\(host=([^,]+),\s*user=([^,]+),\s*password=([^,]+),\s*database=([^,\)]+)\)'), r'import os\n    from google.cloud.sql.connector import Connector\n    connector = Connector()\n    connection_name = os.getenv("GCP_CLOUD_SQL_INSTANCE_CONNECTION_NAME", f\'{os.getenv("GCP_PROJECT_ID", "your-project-id")}:{os.getenv("GCP_REGION", "us-central1")}:INSTANCE\')\n    connection = connector.connect(\n        connection_name,\n        "pymysql",\n        user=\2,\n        password=\3,\n        db=\4\n    )'),
+)
+
+# Cloud SQL connector rewrites for RDS code using psycopg2
+_RDS_PSYCOPG2_REWRITES = (
+    (re.compile(r'import psycopg2'), 'from google.cloud.sql.connector import Connector\nimport psycopg2'),
+    (re.compile(r'connection\s*=\s*psycopg2\.connect\(host=([^,]+),\s*user=([^,]+),\s*password=([^,]+),\s*database=([^,\)]+)\)'), r'import os\n    from google.cloud.sql.connector import Connector\n    connector = Connector()\n    connection_name = os.getenv("GCP_CLOUD_SQL_INSTANCE_CONNECTION_NAME", f\'{os.getenv("GCP_PROJECT_ID", "your-project-id")}:{os.getenv("GCP_REGION", "us-central1")}:INSTANCE\')\n    connection = connector.connect(\n        connection_name,\n        "psycopg2",\n        user=\2,\n        password=\3,\n        db=\4\n    )'),
+)
+
+# CloudWatch client and import rewrites
+_CLOUDWATCH_TO_MONITORING_REWRITES = (
+    (_BOTO3_IMPORT_RE, 'from google.cloud import monitoring_v3'),
+    # Replace CloudWatch client instantiation
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.client\([\'\"]cloudwatch[\'\"][^\)]*\)'), r'\1 = monitoring_v3.MetricServiceClient()'),
+)
+
+# (call literal, pattern, replacement) for CloudWatch calls
+_CLOUDWATCH_CALL_REWRITES = (
+    # Replace put_metric_data
+    ('.put_metric_data(', re.compile(r'\b(\w+)\.put_metric_data\(Namespace=([^,]+),\s*MetricData=\[([^,\)]+)\]\)'), r'import os\n    project_id = os.getenv("GCP_PROJECT_ID", "your-project-id")\n    project_name = f"projects/{project_id}"\n    series = monitoring_v3.TimeSeries()\n    series.metric.type = os.getenv("GCP_MONITORING_METRIC_TYPE", "custom.googleapis.com/metric")\n    # Add metric data points'),
+    # Replace get_metric_statistics
+    ('.get_metric_statistics(', re.compile(r'\b(\w+)\.get_metric_statistics\(Namespace=([^,]+),\s*MetricName=([^,]+),\s*StartTime=([^,]+),\s*EndTime=([^,]+),\s*Period=([^,]+),\s*Statistics=\[([^,\)]+)\]\)'), r'import os\n    project_id = os.getenv("GCP_PROJECT_ID", "your-project-id")\n    project_name = f"projects/{project_id}"\n    interval = monitoring_v3.TimeInterval({\n        "end_time": {\5},\n        "start_time": {\4}\n    })\n    filter = f\'metric.type = "\2/\3"\'\n    results = \1.list_time_series(request={"name": project_name, "filter": filter, "interval": interval})'),
+)
+# The CloudWatch call rewrites in one pass: no replacement makes a call another rewrites
+_CLOUDWATCH_CALL_FUSED = _fuse_call_rewrites(_CLOUDWATCH_CALL_REWRITES)
+
+# API Gateway client and import rewrites
+_APIGATEWAY_TO_APIGEE_REWRITES = (
+    (_BOTO3_IMPORT_RE, 'from google.cloud import apigee_registry_v1'),
+    # Replace API Gateway client instantiation
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.client\([\'\"]apigateway[\'\"][^\)]*\)'), r'\1 = apigee_registry_v1.RegistryClient()'),
+)
+
+# (call literal, pattern, replacement) for API Gateway calls
+_APIGATEWAY_CALL_REWRITES = (
+    # Replace API creation operations
+    ('.create_rest_api(', re.compile(r'\b(\w+)\.create_rest_api\(name=([^,\)]+)\)'), r'import os\n    project_id = os.getenv("GCP_PROJECT_ID", "your-project-id")\n    parent = f"projects/{project_id}/locations/global"\n    api = apigee_registry_v1.Api(display_name=\2)\n    response = \1.create_api(parent=parent, api=api, api_id=\2.lower().replace(" ", "-"))'),
+    # Replace get_rest_apis
+    ('.get_rest_apis(', re.compile(r'\b(\w+)\.get_rest_apis\(\)'), r'import os\n    project_id = os.getenv("GCP_PROJECT_ID", "your-project-id")\n    parent = f"projects/{project_id}/locations/global"\n    response = \1.list_apis(parent=parent)'),
+    # Replace deployment operations
+    ('.create_deployment(', re.compile(r'\b(\w+)\.create_deployment\(restApiId=([^,]+),\s*stageName=([^,\)]+)\)'), r'import os\n    project_id = os.getenv("GCP_PROJECT_ID", "your-project-id")\n    parent = f"projects/{project_id}/locations/global/apis/\2"\n    deployment = apigee_registry_v1.Deployment(name=\3)\n    response = \1.create_deployment(parent=parent, deployment=deployment, deployment_id=\3)'),
+)
+# The API Gateway call rewrites in one pass: no replacement makes a call another rewrites
+_APIGATEWAY_CALL_FUSED = _fuse_call_rewrites(_APIGATEWAY_CALL_REWRITES)
+
+# EKS client and import rewrites
+_EKS_TO_GKE_REWRITES = (
+    (_BOTO3_IMPORT_RE, 'from google.cloud import container_v1'),
+    # Replace EKS client instantiation
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.client\([\'\"]eks[\'\"][^\)]*\)'), r'\1 = container_v1.ClusterManagerClient()'),
+)
+
+# (call literal, pattern, replacement) for EKS calls
+_EKS_CALL_REWRITES = (
+    # Replace cluster operations
+    ('.create_cluster(', re.compile(r'\b(\w+)\.create_cluster\(name=([^,]+),\s*roleArn=([^,]+),\s*resourcesVpcConfig=([^,\)]+)\)'), r'import os\n    project_id = os.getenv("GCP_PROJECT_ID", "your-project-id")\n    region = os.getenv("GCP_REGION", "us-central1")\n    parent = f"projects/{project_id}/locations/{region}"\n    cluster = container_v1.Cluster({\n        "name": \2,\n        "initial_node_count": 1,\n        "node_config": container_v1.NodeConfig({\n            "oauth_scopes": ["https://www.googleapis.com/auth/cloud-platform"]\n        })\n    })\n    request = container_v1.CreateClusterRequest(parent=parent, cluster=cluster)\n    response = \1.create_cluster(request=request)'),
+    # Replace list_clusters
+    ('.list_clusters(', re.compile(r'\b(\w+)\.list_clusters\(\)'), r'import os\n    project_id = os.getenv("GCP_PROJECT_ID", "your-project-id")\n    parent = f"projects/{project_id}/locations/-"\n    response = \1.list_clusters(parent=parent)'),
+    # Replace describe cluster
+    ('.describe_cluster(', re.compile(r'\b(\w+)\.describe_cluster\(name=([^,\)]+)\)'), r'import os\n    project_id = os.getenv("GCP_PROJECT_ID", "your-project-id")\n    region = os.getenv("GCP_REGION", "us-central1")\n    name = f"projects/{project_id}/locations/{region}/clusters/\2"\n    response = \1.get_cluster(name=name)'),
+    # Replace delete cluster
+    ('.delete_cluster(', re.compile(r'\b(\w+)\.delete_cluster\(name=([^,\)]+)\)'), r'import os\n    project_id = os.getenv("GCP_PROJECT_ID", "your-project-id")\n    region = os.getenv("GCP_REGION", "us-central1")\n    name = f"projects/{project_id}/locations/{region}/clusters/\2"\n    \1.delete_cluster(name=name)'),
+)
+# The EKS call rewrites in one pass: no replacement makes a call another rewrites
+_EKS_CALL_FUSED = _fuse_call_rewrites(_EKS_CALL_REWRITES)
+
+# ECS/Fargate client and import rewrites
+_FARGATE_TO_CLOUDRUN_REWRITES = (
+    (_BOTO3_IMPORT_RE, 'from google.cloud import run_v2\nfrom google.cloud.run_v2.types import Service'),
+    # Replace ECS client instantiation (which handles Fargate)
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.client\([\'\"]ecs[\'\"][^\)]*\)'), r'\1 = run_v2.ServicesClient()'),
+)
+
+# (call literal, pattern, replacement) for ECS/Fargate calls
+_FARGATE_CALL_REWRITES = (
+    # Replace ECS run_task which is used for Fargate -> Cloud Run Job
+    ('.run_task(', re.compile(r'\b(\w+)\.run_task\(cluster=([^,]+),\s*taskDefinition=([^,]+),\s*count=([^,\)]+)\)'), r'import os\n    project_id = os.getenv("GCP_PROJECT_ID", "your-project-id")\n    region = os.getenv("GCP_REGION", "us-central1")\n    parent = f"projects/{project_id}/locations/{region}"\n    job = run_v2.Job({\n        "template": run_v2.ExecutionTemplate({\n            "containers": [run_v2.Container({"image": os.getenv("GCP_CLOUD_RUN_IMAGE", "IMAGE_URL")})]\n        })\n    })\n    request = run_v2.CreateJobRequest(parent=parent, job=job, job_id=\3)\n    response = \1.create_job(request=request)'),
+    # Replace ECS register_task_definition -> Cloud Run Service
+    ('.register_task_definition(', re.compile(r'\b(\w+)\.register_task_definition\(family=([^,]+),\s*containerDefinitions=([^,\)]+)\)'), r'import os\n    project_id = os.getenv("GCP_PROJECT_ID", "your-project-id")\n    region = os.getenv("GCP_REGION", "us-central1")\n    parent = f"projects/{project_id}/locations/{region}"\n    service = run_v2.Service({\n        "template": run_v2.RevisionTemplate({\n            "containers": [run_v2.Container({"image": os.getenv("GCP_CLOUD_RUN_IMAGE", "IMAGE_URL")})]\n        })\n    })\n    request = run_v2.CreateServiceRequest(parent=parent, service=service, service_id=\2)\n    response = \1.create_service(request=request)'),
+    # Replace ECS start_task -> Cloud Run Job execution
+    ('.start_task(', re.compile(r'\b(\w+)\.start_task\(cluster=([^,]+),\s*taskDefinition=([^,\)]+)\)'), r'import os\n    project_id = os.getenv("GCP_PROJECT_ID", "your-project-id")\n    region = os.getenv("GCP_REGION", "us-central1")\n    name = f"projects/{project_id}/locations/{region}/jobs/\3"\n    request = run_v2.RunJobRequest(name=name)\n    response = \1.run_job(request=request)'),
+    # Replace list_tasks
+    ('.list_tasks(', re.compile(r'\b(\w+)\.list_tasks\(cluster=([^,\)]+)\)'), r'import os\n    project_id = os.getenv("GCP_PROJECT_ID", "your-project-id")\n    region = os.getenv("GCP_REGION", "us-central1")\n    parent = f"projects/{project_id}/locations/{region}"\n    response = \1.list_jobs(parent=parent)'),
+)
+# The ECS/Fargate call rewrites in one pass: no replacement makes a call another rewrites
+_FARGATE_CALL_FUSED = _fuse_call_rewrites(_FARGATE_CALL_REWRITES)
+
+
+# Cleanups applied by _attempt_syntax_fix once its line pass has fixed indentation
+_SYNTAX_FIX_REWRITES = (
+    # Fix double assignments (e.g., "response = bucket = ...")
+    (re.compile(r'\b(\w+)\s*=\s*(\w+)\s*=\s*'), r'\1 = '),
+    # Fix malformed function calls with extra commas
+    (re.compile(r',\s*,'), ','),
+    (re.compile(r'\(\s*,'), '('),
+    (re.compile(r',\s*\)'), ')'),
+)
+
+# JavaScript fallback migration rewrites
+_JAVASCRIPT_S3_TO_GCS_REWRITES = (
+    # Replace AWS SDK imports
+    (re.compile(r'const\s+aws\s*=\s*require\([\'"]aws-sdk[\'"]\)'), 'const { Storage } = require(\'@google-cloud/storage\');'),
+    (re.compile(r'import\s+aws\s+from\s+[\'"]aws-sdk[\'"]'), 'import { Storage } from \'@google-cloud/storage\';'),
+    (re.compile(r'const\s+.*\s*=\s*new\s+aws\.S3\(\)'), 'const storage = new Storage();'),
+)
+_JAVASCRIPT_LAMBDA_TO_CLOUD_FUNCTIONS_REWRITES = (
+    # Replace Lambda handler exports
+    (re.compile(r'exports\.handler\s*='), 'exports.helloWorld ='),
+)
+_JAVASCRIPT_DYNAMODB_TO_FIRESTORE_REWRITES = (
+    # Replace DynamoDB imports
+    (re.compile(r'const\s+.*\s*=\s*new\s+aws\.DynamoDB\.DocumentClient\(\)'), 'const admin = require(\'firebase-admin\');\nconst db = admin.firestore();'),
+)
+
+# Go fallback migration rewrites
+_GO_LAMBDA_TO_CLOUD_FUNCTIONS_REWRITES = (
+    # Replace Lambda handler signature
+    (re.compile(r'func\s+Handler\('), 'func HelloWorld('),
+)
+
+# C# fallback migration rewrites
+_CSHARP_S3_TO_GCS_REWRITES = (
+    # Basic import replacement
+    (re.compile(r'using\s+Amazon\.S3[^;]*;'), 'using Google.Cloud.Storage.V1;'),
+    (re.compile(r'IAmazonS3\s+(\w+)\s*='), r'StorageClient \1 ='),
+)
+_CSHARP_LAMBDA_TO_CLOUD_FUNCTIONS_REWRITES = (
+    (re.compile(r'using\s+Amazon\.Lambda[^;]*;'), 'using Google.Cloud.Functions.Framework;'),
+)
+_CSHARP_DYNAMODB_TO_FIRESTORE_REWRITES = (
+    (re.compile(r'using\s+Amazon\.DynamoDBv2[^;]*;'), 'using Google.Cloud.Firestore;'),
+)
+
+# boto3 client setup rewritten by _validate_and_fix_syntax before it parses the code
+_SYNTAX_VALIDATION_BOTO3_REWRITES = (
+    (re.compile(r'^import boto3\s*$', re.MULTILINE), ''),
+    # First, remove region_name parameters to simplify patterns
+    (re.compile(r',\s*region_name\s*=\s*[\'"][^\'"]+[\'"]'), ''),
+    (re.compile(r'region_name\s*=\s*[\'"][^\'"]+[\'\"]\s*,'), ''),
+    (re.compile(r'region_name\s*=\s*[\'"][^\'"]+[\'"]'), ''),
+    # Replace client calls with region_name/config parameters - handle multiline
+    (re.compile(r'boto3\.client\s*\(\s*[\'\"]s3[\'\"][^\)]*\)', re.DOTALL), 'storage.Client()'),
+    (re.compile(r'boto3\.resource\s*\(\s*[\'\"]s3[\'\"][^\)]*\)', re.DOTALL), 'storage.Client()'),
+    (re.compile(r'boto3\.client\s*\(\s*[\'\"]dynamodb[\'\"][^\)]*\)', re.DOTALL), 'firestore.Client()'),
+    (re.compile(r'boto3\.client\s*\(\s*[\'\"]sqs[\'\"][^\)]*\)', re.DOTALL), 'pubsub_v1.PublisherClient()'),
+    (re.compile(r'boto3\.client\s*\(\s*[\'\"]lambda[\'\"][^\)]*\)', re.DOTALL), 'functions_v2.FunctionServiceClient()'),
+    # Also handle variable assignments - be more aggressive
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]s3[\'\"][^\)]*\)', re.DOTALL), r'\1 = storage.Client()'),
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]sqs[\'\"][^\)]*\)', re.DOTALL), r'\1 = pubsub_v1.PublisherClient()'),
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]dynamodb[\'\"][^\)]*\)', re.DOTALL), r'\1 = firestore.Client()'),
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.resource\s*\(\s*[\'\"]s3[\'\"][^\)]*\)', re.DOTALL), r'\1 = storage.Client()'),
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.resource\s*\(\s*[\'\"]dynamodb[\'\"][^\)]*\)', re.DOTALL), r'\1 = firestore.Client()'),
+)
+
+# boto3 clients replaced when _validate_and_fix_syntax falls back to the unfixed code
+_SYNTAX_FALLBACK_BOTO3_CLIENT_REWRITES = (
+    (re.compile(r'boto3\.client\([\'\"]s3[\'\"]\)'), 'storage.Client()'),
+    (re.compile(r'boto3\.resource\([\'\"]s3[\'\"]\)'), 'storage.Client()'),
+    (re.compile(r'boto3\.client\([\'\"]dynamodb[\'\"]\)'), 'firestore.Client()'),
+    (re.compile(r'boto3\.client\([\'\"]sqs[\'\"]\)'), 'pubsub_v1.PublisherClient()'),
+    (re.compile(r'boto3\.client\([\'\"]lambda[\'\"]\)'), 'functions_v2.FunctionServiceClient()'),
+)
+
+# AWS SDK imports removed by _aggressive_javascript_aws_cleanup
+_JAVASCRIPT_AWS_SDK_IMPORT_REMOVALS = (
+    (re.compile(r'const\s+aws\s*=\s*require\([\'"]aws-sdk[\'"]\)'), ''),
+    (re.compile(r'import\s+aws\s+from\s+[\'"]aws-sdk[\'"]'), ''),
+    (re.compile(r'require\([\'"]aws-sdk[\'"]\)'), ''),
+    (re.compile(r'from\s+[\'"]aws-sdk[\'"]'), ''),
+)
+
+# AWS SDK clients and calls renamed by _aggressive_javascript_aws_cleanup
+_JAVASCRIPT_AWS_CLIENT_REWRITES = (
+    (re.compile(r'new\s+aws\.S3\(\)'), 'new Storage()'),
+    (re.compile(r'new\s+aws\.DynamoDB\.DocumentClient\(\)'), 'admin.firestore()'),
+    (re.compile(r'new\s+aws\.Lambda\(\)'), 'functions-framework'),
+    (re.compile(r'new\s+aws\.SQS\(\)'), 'new PubSub()'),
+    (re.compile(r'new\s+aws\.SNS\(\)'), 'new PubSub()'),
+    # Replace AWS SDK v3 clients
+    (re.compile(r'new\s+S3Client\(\)'), 'new Storage()'),
+    (re.compile(r'new\s+DynamoDBClient\(\)'), 'admin.firestore()'),
+    (re.compile(r'new\s+LambdaClient\(\)'), 'functions-framework'),
+    (re.compile(r'new\s+SQSClient\(\)'), 'new PubSub()'),
+    (re.compile(r'new\s+SNSClient\(\)'), 'new PubSub()'),
+    # Replace AWS variable names and method calls
+    (re.compile(r'\bs3\s*=\s*new\s+', re.IGNORECASE), 'storage = new '),
+    (re.compile(r'\bs3\.putObject\b', re.IGNORECASE), 'storage.bucket(bucketName).file(key).save'),
+    (re.compile(r'\bs3\.getObject\b', re.IGNORECASE), 'storage.bucket(bucketName).file(key).download'),
+    (re.compile(r'\bs3\.listObjects\b', re.IGNORECASE), 'storage.bucket(bucketName).getFiles'),
+    (re.compile(r'\bs3\.deleteObject\b', re.IGNORECASE), 'storage.bucket(bucketName).file(key).delete'),
+    (re.compile(r'\bdynamodb\.put\b', re.IGNORECASE), 'db.collection(tableName).doc().set'),
+    (re.compile(r'\bdynamodb\.get\b', re.IGNORECASE), 'db.collection(tableName).doc(key).get'),
+    (re.compile(r'\bdynamodb\.query\b', re.IGNORECASE), 'db.collection(tableName).where'),
+    (re.compile(r'\bdynamodb\.scan\b', re.IGNORECASE), 'db.collection(tableName).get'),
+    (re.compile(r'\bsqs\.sendMessage\b', re.IGNORECASE), 'pubsub.topic(topicName).publishMessage'),
+    (re.compile(r'\bsqs\.receiveMessage\b', re.IGNORECASE), 'pubsub.subscription(subscriptionName).on'),
+    (re.compile(r'\bsns\.publish\b', re.IGNORECASE), 'pubsub.topic(topicName).publishMessage'),
+)
+
+# Leftover AWS namespace references removed by _aggressive_javascript_aws_cleanup
+_JAVASCRIPT_AWS_NAMESPACE_REWRITES = (
+    (re.compile(r'\bAWS\.'), 'GCP.'),
+    (re.compile(r'\baws-sdk\b'), 'google-cloud'),
+)
+
+# Java S3 migration rewrites
+_JAVA_S3_TO_GCS_REWRITES = (
+    (re.compile(r'import com\.amazonaws\.services\.s3\..*;'), 'import com.google.cloud.storage.Storage;\nimport com.google.cloud.storage.StorageOptions;\nimport com.google.cloud.storage.BlobId;\nimport com.google.cloud.storage.BlobInfo;'),
+    # Replace S3 client type declarations (all variations)
+    (re.compile(r'AmazonS3\s+(\w+)\s*='), r'Storage \1 ='),
+    (re.compile(r'private\s+AmazonS3\s+(\w+);'), r'private Storage \1;'),
+    (re.compile(r'public\s+AmazonS3\s+(\w+);'), r'public Storage \1;'),
+    (re.compile(r'protected\s+AmazonS3\s+(\w+);'), r'protected Storage \1;'),
+    # Replace S3Client (AWS SDK v2)
+    (re.compile(r'S3Client\s+(\w+)\s*='), r'Storage \1 ='),
+    (re.compile(r'private\s+S3Client\s+(\w+);'), r'private Storage \1;'),
+    (re.compile(r'public\s+S3Client\s+(\w+);'), r'public Storage \1;'),
+    # Replace S3 client instantiation
+    (re.compile(r'AmazonS3ClientBuilder\.standard\(\)[^;]*\.build\(\)'), 'StorageOptions.getDefaultInstance().getService()'),
+    # Replace S3ClientBuilder (AWS SDK v2)
+    (re.compile(r'S3Client\.builder\(\)[^;]*\.build\(\)'), 'StorageOptions.getDefaultInstance().getService()'),
+    # Replace variable names containing s3Client or s3_client
+    (re.compile(r'\bs3Client\b', re.IGNORECASE), r'storage'),
+    (re.compile(r'\bs3_client\b', re.IGNORECASE), r'storage'),
+    # Replace putObject calls
+    (re.compile(r'\b(\w+)\.putObject\(([^)]+)\)'), r'\1.create(BlobInfo.newBuilder(BlobId.of(\2)).build())'),
+    # Remove any remaining S3 references in comments (optional cleanup)
+    # This is aggressive but ensures no S3 patterns remain
+    (re.compile(r'//.*[Ss]3.*'), r'// Cloud Storage operation'),
+)
+
+# Java Lambda migration rewrites
+_JAVA_LAMBDA_TO_CLOUD_FUNCTIONS_REWRITES = (
+    (re.compile(r'import com\.amazonaws\.services\.lambda\..*;'), 'import com.google.cloud.functions.HttpFunction;\nimport com.google.cloud.functions.HttpRequest;\nimport com.google.cloud.functions.HttpResponse;'),
+    # Replace RequestHandler interface
+    (re.compile(r'implements\s+RequestHandler<[^>]+>'), 'implements HttpFunction'),
+    # Replace handleRequest method - preserve class structure
+    (re.compile(r'public\s+([^\(]+)\s+handleRequest\s*\(\s*([^,]+)\s+input\s*,\s*Context\s+context\s*\)'), r'@Override\n    public void service(HttpRequest request, HttpResponse response) throws Exception'),
+)
+
+# Java DynamoDB migration rewrites
+_JAVA_DYNAMODB_TO_FIRESTORE_REWRITES = (
+    (re.compile(r'import com\.amazonaws\.services\.dynamodbv2\..*;'), 'import com.google.cloud.firestore.Firestore;\nimport com.google.cloud.firestore.FirestoreOptions;\nimport com.google.cloud.firestore.DocumentReference;\nimport com.google.cloud.firestore.WriteBatch;'),
+    # Replace DynamoDB client type declarations
+    (re.compile(r'AmazonDynamoDB\s+(\w+)\s*='), r'Firestore \1 ='),
+    (re.compile(r'private\s+AmazonDynamoDB\s+(\w+);'), r'private Firestore \1;'),
+    # Replace DynamoDB client instantiation
+    (re.compile(r'AmazonDynamoDBClientBuilder\.standard\(\)[^;]*\.build\(\)'), 'FirestoreOptions.getDefaultInstance().getService()'),
+    # Replace putItem calls
+    (re.compile(r'\b(\w+)\.putItem\(([^)]+)\)'), r'\1.collection(tableName).document().set(item)'),
+)
+
+# AWS imports removed by _aggressive_java_aws_cleanup
+_JAVA_AWS_IMPORT_REMOVALS = (
+    (re.compile(r'import\s+com\.amazonaws\.[^;]*;', re.MULTILINE), ''),
+    (re.compile(r'import\s+software\.amazon\.awssdk\.[^;]*;', re.MULTILINE), ''),
+    # Remove specific service imports
+    (re.compile(r'import\s+com\.amazonaws\.services\.s3\.[^;]*;', re.MULTILINE), ''),
+    (re.compile(r'import\s+com\.amazonaws\.services\.lambda\.[^;]*;', re.MULTILINE), ''),
+    (re.compile(r'import\s+com\.amazonaws\.services\.dynamodbv2\.[^;]*;', re.MULTILINE), ''),
+    (re.compile(r'import\s+com\.amazonaws\.services\.sqs\.[^;]*;', re.MULTILINE), ''),
+    (re.compile(r'import\s+com\.amazonaws\.services\.sns\.[^;]*;', re.MULTILINE), ''),
+    (re.compile(r'import\s+software\.amazon\.awssdk\.services\.s3\.[^;]*;', re.MULTILINE), ''),
+    (re.compile(r'import\s+software\.amazon\.awssdk\.services\.lambda\.[^;]*;', re.MULTILINE), ''),
+    (re.compile(r'import\s+software\.amazon\.awssdk\.services\.dynamodb\.[^;]*;', re.MULTILINE), ''),
+    (re.compile(r'import\s+software\.amazon\.awssdk\.services\.sqs\.[^;]*;', re.MULTILINE), ''),
+    (re.compile(r'import\s+software\.amazon\.awssdk\.services\.sns\.[^;]*;', re.MULTILINE), ''),
+)
+
+# Java S3 class and variable names replaced by _aggressive_java_aws_cleanup
+_JAVA_S3_NAME_REWRITES = (
+    (re.compile(r'\bAmazonS3\b'), 'Storage'),
+    (re.compile(r'\bS3Client\b'), 'Storage'),
+    (re.compile(r'\bs3Client\b', re.IGNORECASE), 'storage'),
+    (re.compile(r'\bs3_client\b', re.IGNORECASE), 'storage'),
+    (re.compile(r'\.s3\.AmazonS3', re.IGNORECASE), '.storage.Storage'),
+    (re.compile(r'\.s3\.', re.IGNORECASE), '.storage.'),
+    (re.compile(r'services\.s3\.', re.IGNORECASE), 'storage.'),
+    (re.compile(r'\bAmazonS3ClientBuilder\b'), 'StorageOptions'),
+    (re.compile(r'\bS3ClientBuilder\b'), 'StorageOptions'),
+    (re.compile(r'\bPutObjectRequest\b'), 'BlobInfo'),
+    (re.compile(r'\bGetObjectRequest\b'), 'BlobId'),
+    # AWS SDK v2 specific patterns
+    # Remove Region enum references (GCP doesn't use Region enum in the same way)
+    (re.compile(r'\.region\(Region\.\w+\)', re.IGNORECASE), ''),  # Remove .region(Region.US_EAST_1)
+    (re.compile(r'\.region\([^)]+\)', re.IGNORECASE), ''),  # Remove any .region() calls
+    (re.compile(r'\bRegion\.\w+\b'), ''),  # Remove standalone Region enum references
+    # Handle RequestBody (AWS SDK v2) -> Java InputStream
+    (re.compile(r'\bRequestBody\b'), 'ByteArrayInputStream'),
+)
+
+# Java Lambda class names replaced by _aggressive_java_aws_cleanup
+_JAVA_LAMBDA_NAME_REWRITES = (
+    (re.compile(r'\bRequestHandler\b'), 'HttpFunction'),
+    (re.compile(r'\bILambdaContext\b'), 'HttpRequest'),
+    # Replace Context when it's clearly AWS Lambda Context
+    # Pattern: RequestHandler<..., Context> or handleRequest(..., Context context)
+    (re.compile(r'RequestHandler<[^>]*,\s*Context\s*>'), 'HttpFunction<HttpRequest, HttpResponse>'),
+    (re.compile(r'implements\s+RequestHandler<[^>]*,\s*Context\s*>'), 'implements HttpFunction<HttpRequest, HttpResponse>'),
+    # Replace Context parameter in handleRequest methods - most specific pattern first
+    (re.compile(r'handleRequest\(([^,)]+),\s*Context\s+(\w+)\)'), r'handleRequest(\1, HttpRequest \2)'),
+    # Replace Context when it appears as a parameter type (after imports are removed, remaining Context is likely Lambda Context)
+    # Only replace if it's followed by a variable name (parameter declaration)
+    (re.compile(r'\([^)]*\bContext\s+(\w+)\s*\)'), r'(HttpRequest \1)'),  # (..., Context context) -> (..., HttpRequest context)
+    (re.compile(r',\s*Context\s+(\w+)'), r', HttpRequest \1'),  # , Context context -> , HttpRequest context
+)
+
+# Java DynamoDB class and variable names replaced by _aggressive_java_aws_cleanup
+_JAVA_DYNAMODB_NAME_REWRITES = (
+    (re.compile(r'\bAmazonDynamoDB\b'), 'Firestore'),
+    (re.compile(r'\bDynamoDBClient\b'), 'Firestore'),
+    (re.compile(r'\bdynamoDB\b', re.IGNORECASE), 'firestore'),
+    (re.compile(r'\bdynamo_db\b', re.IGNORECASE), 'firestore'),
+    (re.compile(r'\bAmazonDynamoDBClientBuilder\b'), 'FirestoreOptions'),
+    (re.compile(r'\bDynamoDBClientBuilder\b'), 'FirestoreOptions'),
+    (re.compile(r'\bPutItemRequest\b'), 'WriteBatch'),
+    (re.compile(r'\bGetItemRequest\b'), 'DocumentReference'),
+    (re.compile(r'\bAttributeValue\b'), 'Object'),  # Firestore uses Object, not AttributeValue
+)
+
+# Java SQS class and variable names replaced by _aggressive_java_aws_cleanup
+_JAVA_SQS_NAME_REWRITES = (
+    (re.compile(r'\bAmazonSQS\b'), 'Publisher'),
+    (re.compile(r'\bSQSClient\b'), 'Publisher'),
+    (re.compile(r'\bsqsClient\b', re.IGNORECASE), 'publisher'),
+    (re.compile(r'\bsqs_client\b', re.IGNORECASE), 'publisher'),
+    (re.compile(r'\bAmazonSQSClientBuilder\b'), 'Publisher'),
+    (re.compile(r'\bSQSClientBuilder\b'), 'Publisher'),
+    (re.compile(r'\bSendMessageRequest\b'), 'PubsubMessage'),
+)
+
+# Java SNS class and variable names replaced by _aggressive_java_aws_cleanup
+_JAVA_SNS_NAME_REWRITES = (
+    (re.compile(r'\bAmazonSNS\b'), 'Publisher'),
+    (re.compile(r'\bSNSClient\b'), 'Publisher'),
+    (re.compile(r'\bsnsClient\b', re.IGNORECASE), 'publisher'),
+    (re.compile(r'\bsns_client\b', re.IGNORECASE), 'publisher'),
+    (re.compile(r'\bAmazonSNSClientBuilder\b'), 'Publisher'),
+    (re.compile(r'\bSNSClientBuilder\b'), 'Publisher'),
+    (re.compile(r'\bPublishRequest\b'), 'PubsubMessage'),
+)
+
+# AWS service names in Java comments replaced by _aggressive_java_aws_cleanup
+_JAVA_AWS_COMMENT_REWRITES = (
+    (re.compile(r'AmazonS3', re.IGNORECASE), 'Cloud Storage'),
+    (re.compile(r'S3Client', re.IGNORECASE), 'Storage'),
+    (re.compile(r'AmazonDynamoDB', re.IGNORECASE), 'Firestore'),
+    (re.compile(r'DynamoDB', re.IGNORECASE), 'Firestore'),
+    (re.compile(r'AmazonSQS', re.IGNORECASE), 'Pub/Sub'),
+    (re.compile(r'AmazonSNS', re.IGNORECASE), 'Pub/Sub'),
+    (re.compile(r'Lambda', re.IGNORECASE), 'Cloud Functions'),
+    (re.compile(r'RequestHandler', re.IGNORECASE), 'HttpFunction'),
+)
+
+# Standalone AWS package names removed by _aggressive_java_aws_cleanup
+_JAVA_AWS_LEFTOVER_REMOVALS = (
+    (re.compile(r'\bcom\.amazonaws\b'), 'com.google.cloud'),
+    (re.compile(r'\bamazonaws\b', re.IGNORECASE), 'google.cloud'),
+    # Remove any remaining AWS SDK v2 patterns
+    (re.compile(r'\bsoftware\.amazon\b'), 'com.google.cloud'),
+    (re.compile(r'\bawssdk\b', re.IGNORECASE), 'google.cloud'),
+)
+
+# AWS using directives removed by _aggressive_csharp_aws_cleanup
+_CSHARP_AWS_USING_REMOVALS = (
+    (re.compile(r'using\s+Amazon\.S3[^;]*;', re.MULTILINE), ''),
+    (re.compile(r'using\s+Amazon\.S3\.Model[^;]*;', re.MULTILINE), ''),
+    (re.compile(r'using\s+Amazon\.DynamoDBv2[^;]*;', re.MULTILINE), ''),
+    (re.compile(r'using\s+Amazon\.DynamoDBv2\.Model[^;]*;', re.MULTILINE), ''),
+    (re.compile(r'using\s+Amazon\.Lambda[^;]*;', re.MULTILINE), ''),
+    (re.compile(r'using\s+Amazon\.Lambda\.Core[^;]*;', re.MULTILINE), ''),
+    (re.compile(r'using\s+Amazon\.Lambda\.APIGatewayEvents[^;]*;', re.MULTILINE), ''),
+    (re.compile(r'using\s+Amazon\.SQS[^;]*;', re.MULTILINE), ''),
+    (re.compile(r'using\s+Amazon\.SQS\.Model[^;]*;', re.MULTILINE), ''),
+    (re.compile(r'using\s+Amazon\.SNS[^;]*;', re.MULTILINE), ''),
+    (re.compile(r'using\s+Amazon\.SNS\.Model[^;]*;', re.MULTILINE), ''),
+    (re.compile(r'using\s+Amazon[^;]*;', re.MULTILINE), ''),  # Catch any remaining Amazon.*
+    (re.compile(r'using\s+AWSSDK[^;]*;', re.MULTILINE), ''),
+)
+
+# C# AWS class and variable names replaced by _aggressive_csharp_aws_cleanup
+_CSHARP_AWS_NAME_REWRITES = (
+    (re.compile(r'\bIAmazonS3\b'), 'StorageClient'),
+    (re.compile(r'\bAmazonS3Client\b'), 'StorageClient'),
+    (re.compile(r'\bs3Client\b', re.IGNORECASE), 'storageClient'),
+    (re.compile(r'\bs3_client\b', re.IGNORECASE), 'storageClient'),
+    (re.compile(r'\bAmazonS3Config\b'), 'StorageClient'),
+    (re.compile(r'\bRegionEndpoint\b'), ''),  # Remove RegionEndpoint (GCP doesn't use this)
+    (re.compile(r'RegionEndpoint\.\w+'), ''),  # Remove RegionEndpoint.USEast1 etc.
+    (re.compile(r'\bPutObjectRequest\b'), 'UploadObjectOptions'),
+    (re.compile(r'\bGetObjectRequest\b'), 'DownloadObjectOptions'),
+    (re.compile(r'\bListObjectsRequest\b'), 'ListObjectsOptions'),
+    (re.compile(r'\bListBucketsAsync\b'), 'ListBucketsAsync'),  # Keep method name, Gemini will fix
+    # ===== LAMBDA PATTERNS =====
+    (re.compile(r'\bILambdaContext\b'), 'HttpContext'),
+    (re.compile(r'\bAPIGatewayProxyRequest\b'), 'HttpRequest'),
+    (re.compile(r'\bAPIGatewayProxyResponse\b'), 'HttpResponse'),
+    (re.compile(r'\bLambdaFunction\b'), 'IHttpFunction'),
+    (re.compile(r'\bFunctionHandler\b'), 'HandleAsync'),
+    # ===== DYNAMODB PATTERNS =====
+    (re.compile(r'\bIAmazonDynamoDB\b'), 'FirestoreDb'),
+    (re.compile(r'\bAmazonDynamoDBClient\b'), 'FirestoreDb'),
+    (re.compile(r'\bdynamoDB\b', re.IGNORECASE), 'firestoreDb'),
+    (re.compile(r'\bdynamo_db\b', re.IGNORECASE), 'firestoreDb'),
+    (re.compile(r'\bPutItemRequest\b'), 'WriteBatch'),
+    (re.compile(r'\bGetItemRequest\b'), 'DocumentReference'),
+    (re.compile(r'\bAttributeValue\b'), 'Value'),  # Firestore uses Value, not AttributeValue
+    # ===== SQS PATTERNS =====
+    (re.compile(r'\bIAmazonSQS\b'), 'PublisherClient'),
+    (re.compile(r'\bAmazonSQSClient\b'), 'PublisherClient'),
+    (re.compile(r'\bsqsClient\b', re.IGNORECASE), 'publisherClient'),
+    (re.compile(r'\bSendMessageRequest\b'), 'PubsubMessage'),
+    (re.compile(r'\bReceiveMessageRequest\b'), 'PullRequest'),
+    # Note: Message class might conflict with System.Net.Http, but AWS Message -> PubsubMessage
+    # ===== SNS PATTERNS =====
+    (re.compile(r'\bIAmazonSNS\b'), 'PublisherClient'),
+    (re.compile(r'\bAmazonSNSClient\b'), 'PublisherClient'),
+    (re.compile(r'\bsnsClient\b', re.IGNORECASE), 'publisherClient'),
+    (re.compile(r'\bPublishRequest\b'), 'PubsubMessage'),
+)
+
+# AWS service names in C# comments replaced by _aggressive_csharp_aws_cleanup
+_CSHARP_AWS_COMMENT_REWRITES = (
+    (re.compile(r'[Aa]mazon\.?[Dd]ynamoDB', re.IGNORECASE), 'Firestore'),
+    (re.compile(r'[Aa]mazon\.?[Ss]QS', re.IGNORECASE), 'Pub/Sub'),
+    (re.compile(r'[Aa]mazon\.?[Ss]NS', re.IGNORECASE), 'Pub/Sub'),
+    (re.compile(r'[Aa]mazon\.?[Ll]ambda', re.IGNORECASE), 'Cloud Functions'),
+    (re.compile(r'[Aa]WS', re.IGNORECASE), 'GCP'),
+    (re.compile(r'\b[Ss]3\b', re.IGNORECASE), 'Cloud Storage'),
+    (re.compile(r'\b[Dd]ynamoDB\b', re.IGNORECASE), 'Firestore'),
+    (re.compile(r'\b[Ll]ambda\b', re.IGNORECASE), 'Cloud Functions'),
+    (re.compile(r'\bIAmazon\w+\b'), 'GCP Client'),
+    (re.compile(r'\bAPIGatewayProxy\w+\b'), 'Http'),
+)
+
+# Standalone AWS namespaces removed by _aggressive_csharp_aws_cleanup
+_CSHARP_AWS_LEFTOVER_REMOVALS = (
+    (re.compile(r'\bAmazon\.'), 'Google.Cloud.'),
+    (re.compile(r'\bAWSSDK\.'), 'Google.Cloud.'),
+)
+
+# Java and C# comment and response rewrites
+_JAVA_LAMBDA_RESPONSE_MAP_RE = re.compile(r'return\s+Map\.of\("statusCode",\s*(\d+),\s*"body",\s*"([^"]+)"\);')
+_JAVA_S3_COMMENT_NAME_RE = re.compile(r'[Ss]3', re.IGNORECASE)
+_AMAZONAWS_NAME_RE = re.compile(r'amazonaws', re.IGNORECASE)
+_CSHARP_S3_COMMENT_NAME_RE = re.compile(r'[Aa]mazon\.?[Ss]3', re.IGNORECASE)
+
+
+# The usage patterns above, one per service, for the Hyperscan database: it
+# reports which pattern matched rather than capture groups
+_AWS_SERVICE_USAGE_HS_PATTERNS = tuple(
+    (rf'boto3\.(?:client|resource)\([\'\"]{service}[\'\"]', service, True)
+    for service in _AUTO_DETECT_SERVICES
+) + (
+    (r'\.(?:upload_file|download_file|put_object|get_object|delete_object|list_objects)', 's3', False),
+    (r'\.invoke\(', 'lambda', False),
+    (r'\.(?:put_item|get_item|query|scan|batch_writer)', 'dynamodb', False),
+    (r'\.(?:send_message|receive_message|delete_message)', 'sqs', False),
+    (r'\.(?:publish|subscribe)', 'sns', False),
+    (r'lambda_handler', 'lambda', False),
+)
+
+
+@lru_cache(maxsize=1)
+def _aws_service_usage_database():
+    """Compile the Hyperscan database of service usage patterns, or None without Hyperscan"""
+    if hyperscan is None:
+        return None
+    database = hyperscan.Database()
+    database.compile(
+        expressions=[pattern.encode() for pattern, _, _ in _AWS_SERVICE_USAGE_HS_PATTERNS],
+        ids=list(range(len(_AWS_SERVICE_USAGE_HS_PATTERNS))),
+        elements=len(_AWS_SERVICE_USAGE_HS_PATTERNS),
+        flags=[hyperscan.HS_FLAG_CASELESS if caseless else 0
+               for _, _, caseless in _AWS_SERVICE_USAGE_HS_PATTERNS],
+    )
+    return database
+
+
+def _scan_aws_services(database, code: str) -> FrozenSet[str]:
+    """Collect the services whose usage patterns match code with a Hyperscan database"""
+    found = set()
+
+    def on_match(pattern_id, start, end, flags, context):
+        found.add(_AWS_SERVICE_USAGE_HS_PATTERNS[pattern_id][1])
+        # A true return stops the scan once every service is found
+        return len(found) == len(_AUTO_DETECT_SERVICES)
+
+    try:
+        database.scan(code.encode('utf-8', 'surrogatepass'), match_event_handler=on_match)
+    except hyperscan.ScanTerminated:
+        pass
+    return frozenset(found)
+
+
+def _detect_aws_services(code: str) -> FrozenSet[str]:
+    """Collect the auto-migratable AWS services used in code in a single scan"""
+    database = _aws_service_usage_database()
+    if database is not None:
+        try:
+            return _scan_aws_services(database, code)
+        except hyperscan.error:
+            # e.g. the scratch space is in use by another thread's scan
+            pass
+    found = set()
+    for match in _AWS_SERVICE_USAGE_RE.finditer(code):
+        if match.lastindex == 1:
+            found.add(match.group(1).lower())
+        else:
+            found.add(_AWS_SERVICE_USAGE_GROUP_SERVICES[match.lastindex])
+        if len(found) == len(_AUTO_DETECT_SERVICES):
+            break
+    return frozenset(found)
+
+
+@lru_cache(maxsize=256)
+def _rename_pattern(old_vars: tuple) -> re.Pattern:
+    """Compiled alternation of old_vars, matched where a variable is used as a name"""
+    alternation = '|'.join(map(re.escape, old_vars))
+    return re.compile(rf'\b(?:{alternation})\b(?=\s*[.=\(\)\[\],:]|\s*$)', re.MULTILINE)
+
+
+# Tokens after a name that end its line, and the first characters of the
+# operators after a name that _rename_pattern's lookahead accepts
+_RENAME_LINE_END_TOKENS = frozenset({tokenize.NEWLINE, tokenize.NL, tokenize.ENDMARKER})
+_RENAME_FOLLOWING_OPERATORS = frozenset('.=()[],:')
+
+
+def _is_f_string(token: tokenize.TokenInfo) -> bool:
+    """Whether a STRING token is an f-string, whose replacement fields hold code"""
+    text = token.string
+    return 'f' in text[:text.index(text[-1])].lower()
+
+
+def _rename_variables_in_text(code: str, renames: Dict[str, str]) -> str:
+    """Rename variables with _rename_pattern over the raw text, leaving comment lines untouched"""
+
+    def replace(match):
+        start = match.start()
+        # Only the text before the name can make its line a comment line
+        if code[code.rfind('\n', 0, start) + 1:start].lstrip().startswith('#'):
+            return match.group(0)
+        return renames[match.group(0)]
+
+    return _rename_pattern(tuple(renames)).sub(replace, code)
+
+
+def _rename_variables(code: str, renames: Dict[str, str]) -> str:
+    """
+    Rename variables where they are used as names, leaving comments and strings untouched
+    
+    The source is tokenized once and NAME tokens followed by what
+    _rename_pattern's lookahead accepts are renamed in place; f-string tokens
+    are renamed as text, since their replacement fields hold code. Code that
+    does not tokenize is renamed over its text instead. A rename whose new name
+    is itself renamed depends on the order they run in, so such mappings are
+    applied one variable at a time.
+    """
+    renames = {old_var: new_var for old_var, new_var in renames.items() if old_var != new_var}
+    if not renames:
+        return code
+    if not renames.keys().isdisjoint(renames.values()):
+        for old_var, new_var in renames.items():
+            code = _rename_variables(code, {old_var: new_var})
+        return code
+    pattern = _rename_pattern(tuple(renames))
+    if not pattern.search(code):
+        return code
+    lines = io.StringIO(code).readlines()
+    try:
+        tokens = list(tokenize.generate_tokens(iter(lines).__next__))
+    except (tokenize.TokenError, SyntaxError):
+        return _rename_variables_in_text(code, renames)
+
+    line_offsets = [0, 0]
+    for line in lines:
+        line_offsets.append(line_offsets[-1] + len(line))
+
+    def offset(position):
+        return line_offsets[position[0]] + position[1]
+
+    replace = lambda match: renames[match.group(0)]
+    edits = []
+    for token, following in zip(tokens, tokens[1:]):
+        if token.type == tokenize.NAME:
+            new_var = renames.get(token.string)
+            if new_var is not None and (
+                    following.type in _RENAME_LINE_END_TOKENS or
+                    (following.type == tokenize.OP and following.string[0] in _RENAME_FOLLOWING_OPERATORS)):
+                edits.append((offset(token.start), offset(token.end), new_var))
+        elif token.type == tokenize.STRING and _is_f_string(token):
+            renamed = pattern.sub(replace, token.string)
+            if renamed != token.string:
+                edits.append((offset(token.start), offset(token.end), renamed))
+    return _apply_edits(code, edits)
+
+
+def _apply_line_rewrites(code: str, rewrites) -> str:
+    """Apply (compiled pattern, replacement) rewrites to each line whose quotes are balanced"""
+    subs = [(pattern.sub, replacement) for pattern, replacement in rewrites]
+    result_lines = []
+    append = result_lines.append
+    for line in code.split('\n'):
+        if line.count('"') % 2 == 0 and line.count("'") % 2 == 0:
+            for sub, replacement in subs:
+                line = sub(replacement, line)
+        append(line)
+    return '\n'.join(result_lines)
+
+
+# Exception classes rewritten by the Python _add_exception_handling
+_BOTO_EXCEPTION_NAME_RE = re.compile(r'\b(?:NoCredentialsError|ClientError|BotoCoreError)\b')
+
+# Per-line renames of a leftover "s3" client variable to gcs_client
+_S3_VAR_STORAGE_CLIENT_RE = re.compile(r'\bs3\s*=\s*storage\.Client\(\)')
+_S3_VAR_ASSIGNMENT_RE = re.compile(r'\bs3\s*=\s*')
+_S3_VAR_ATTRIBUTE_RE = re.compile(r'\bs3\s*\.')
+_S3_VAR_STORAGE_CLIENT_REWRITE = (_S3_VAR_STORAGE_CLIENT_RE, 'gcs_client = storage.Client()')
+_S3_VAR_ASSIGNMENT_REWRITE = (_S3_VAR_ASSIGNMENT_RE, 'gcs_client = ')
+_S3_VAR_ATTRIBUTE_REWRITE = (_S3_VAR_ATTRIBUTE_RE, 'gcs_client.')
+# Well-known AWS region names, matched in one alternation: region variable
+# assignments get commented out and region_name arguments are dropped
+_AWS_REGIONS = (
+    'us-east-1', 'us-east-2', 'us-west-1', 'us-west-2',
+    'eu-west-1', 'eu-west-2', 'eu-west-3', 'eu-central-1',
+    'ap-southeast-1', 'ap-southeast-2', 'ap-northeast-1', 'ap-northeast-2',
+    'ap-south-1', 'sa-east-1', 'ca-central-1'
+)
+_AWS_REGION_ALTERNATION = '|'.join(map(re.escape, _AWS_REGIONS))
+# Only indented variable assignments, not function parameter defaults or module-level constants
+_AWS_REGION_ASSIGNMENT_RE = re.compile(rf'^([ \t]+)(\w+)\s*=\s*[\'"]({_AWS_REGION_ALTERNATION})[\'"]', re.MULTILINE)
+_AWS_REGION_NAME_ARGUMENT_RE = re.compile(rf',\s*region_name=[\'"]?(?:{_AWS_REGION_ALTERNATION})[\'"]?')
+_AWS_REGION_NAME_LEADING_ARGUMENT_RE = re.compile(rf'region_name=[\'"]?(?:{_AWS_REGION_ALTERNATION})[\'"]?\s*,')
+_AWS_REGION_SET = frozenset(_AWS_REGIONS)
+# Quoted region anywhere in the code; without one there is nothing to tokenize
+_AWS_REGION_LITERAL_RE = re.compile(rf'[\'"](?:{_AWS_REGION_ALTERNATION})[\'"]')
+_AWS_REGION_ASSIGNMENT_COMMENT = '  # Region not needed for GCP (uses GCP_REGION env var)'
+# Tokens that, outside brackets and with NL tokens dropped, precede the first token of a statement
+_STATEMENT_START_TOKENS = frozenset({tokenize.NEWLINE, tokenize.INDENT, tokenize.DEDENT, tokenize.COMMENT})
+
+
+def _aws_region_literal(token: tokenize.TokenInfo) -> Optional[str]:
+    """The well-known AWS region a plain single-quoted or double-quoted string token holds, if any"""
+    text = token.string
+    if token.type != tokenize.STRING or text[:1] not in ('"', "'") or text[-1:] != text[:1]:
+        return None
+    region = text[1:-1]
+    return region if region in _AWS_REGION_SET else None
+
+
+def _drop_aws_regions(code: str) -> str:
+    """
+    Comment out region variable assignments and drop region_name arguments naming a well-known AWS region
+
+    Region strings are recognised by set membership while walking the tokens
+    once, so regions mentioned in comments and docstrings are left alone. Code
+    that does not tokenize goes through the region regexes instead.
+    """
+    if not _AWS_REGION_LITERAL_RE.search(code):
+        return code
+    lines = io.StringIO(code).readlines()
+    try:
+        tokens = [token for token in tokenize.generate_tokens(iter(lines).__next__)
+                  if token.type != tokenize.NL]
+    except (tokenize.TokenError, SyntaxError):
+        code = _AWS_REGION_ASSIGNMENT_RE.sub(r"\1# \2 = '\3'" + _AWS_REGION_ASSIGNMENT_COMMENT, code)
+        code = _AWS_REGION_NAME_ARGUMENT_RE.sub('', code)
+        return _AWS_REGION_NAME_LEADING_ARGUMENT_RE.sub('', code)
+
+    line_offsets = [0, 0]
+    for line in lines:
+        line_offsets.append(line_offsets[-1] + len(line))
+
+    def offset(position):
+        return line_offsets[position[0]] + position[1]
+
+    def only_space_between(first, second):
+        return not code[offset(first.end):offset(second.start)].strip()
+
+    # Bracket nesting depth at each token, so keyword arguments are not taken for assignments
+    depths = []
+    depth = 0
+    for token in tokens:
+        depths.append(depth)
+        if token.type == tokenize.OP:
+            if token.string in '([{':
+                depth += 1
+            elif token.string in ')]}':
+                depth -= 1
+
+    edits = []
+    for index in range(2, len(tokens)):
+        value = tokens[index]
+        region = _aws_region_literal(value)
+        if region is None:
+            continue
+        name, equals = tokens[index - 2], tokens[index - 1]
+        if name.type != tokenize.NAME or equals.string != '=':
+            continue
+        before = tokens[index - 3] if index >= 3 else None
+        after = tokens[index + 1] if index + 1 < len(tokens) else None
+        if depths[index] == 0 and name.start[1] > 0 and \
+                (before is None or before.type in _STATEMENT_START_TOKENS) and \
+                after is not None and after.type in (tokenize.NEWLINE, tokenize.COMMENT):
+            # Variable assignment in an indented block: comment it out. Module-level
+            # constants stay, since later code may still refer to them
+            edits.append((offset(name.start), offset(value.end),
+                          f"# {name.string} = '{region}'{_AWS_REGION_ASSIGNMENT_COMMENT}"))
+        elif name.string == 'region_name' and name.end == equals.start and equals.end == value.start:
+            # region_name argument: drop it with the comma separating it from its neighbour
+            if before is not None and before.string == ',' and only_space_between(before, name):
+                edits.append((offset(before.start), offset(value.end), ''))
+            elif after is not None and after.string == ',' and only_space_between(value, after):
+                edits.append((offset(name.start), offset(after.end), ''))
+
+    return _apply_edits(code, edits)
+_S3_BOTO3_CLIENT_RE = re.compile(r'\bs3\s*=\s*boto3\.client\([\'\"]s3[\'\"][^\)]*\)', re.DOTALL)
+_S3_SUBSCRIPT_LINE_REWRITES = (
+    (re.compile(r'\[[\'"]s3[\'"]\]'), r'["bucket"]'),
+)
+_AWS_LAMBDA_COMMENT_LINE_RE = re.compile(r'^\s*#.*?AWS.*?Lambda.*?$', re.IGNORECASE)
+_LAMBDA_COMMENT_LINE_RE = re.compile(r'^\s*#.*?Lambda.*?$', re.IGNORECASE)
+_SQS_URL_RE = re.compile(r'[\'"]https://sqs\.[^\'"]+[\'"]')
+_QUEUE_URL_ARGUMENT_LINE_REWRITES = (
+    (re.compile(r'\bqueue_url\b(?=\s*[,\)])'), 'topic_path'),
+)
+
+# Fallback client rewrites used by auto-detection when a service migration fails
+_BOTO3_S3_CLIENT_CALL_RE = re.compile(r'boto3\.client\([\'\"]s3[\'\"]\)')
+_BOTO3_S3_RESOURCE_CALL_RE = re.compile(r'boto3\.resource\([\'\"]s3[\'\"]\)')
+_BOTO3_DYNAMODB_CLIENT_CALL_RE = re.compile(r'boto3\.client\([\'\"]dynamodb[\'\"]\)')
+_BOTO3_DYNAMODB_RESOURCE_CALL_RE = re.compile(r'boto3\.resource\([\'\"]dynamodb[\'\"]\)')
+_BOTO3_SQS_CLIENT_CALL_RE = re.compile(r'boto3\.client\([\'\"]sqs[\'\"]\)')
+_BOTO3_SNS_CLIENT_CALL_RE = re.compile(r'boto3\.client\([\'\"]sns[\'\"]\)')
+
+# AWS service usage selecting the service notes of the Python transformation prompt
+_S3_CLIENT_CALL_RE = re.compile(r'boto3\.(client|resource)\([\'\"]s3[\'\"]', re.IGNORECASE)
+_S3_DATA_CALL_RE = re.compile(r'\.(get_object|put_object|upload_file|download_file)')
+_DYNAMODB_CLIENT_CALL_RE = re.compile(r'boto3\.(client|resource)\([\'\"]dynamodb[\'\"]', re.IGNORECASE)
+_DYNAMODB_DATA_CALL_RE = re.compile(r'\.(put_item|get_item|batch_write)')
+_SQS_CLIENT_CALL_RE = re.compile(r'boto3\.(client|resource)\([\'\"]sqs[\'\"]', re.IGNORECASE)
+_SQS_SEND_MESSAGE_CALL_RE = re.compile(r'\.send_message')
+_SNS_CLIENT_CALL_RE = re.compile(r'boto3\.(client|resource)\([\'\"]sns[\'\"]', re.IGNORECASE)
+_SNS_TOPIC_PUBLISH_RE = re.compile(r'\.publish.*TopicArn')
+_LAMBDA_HANDLER_NAME_CALL_RE = re.compile(r'lambda_handler\s*\(', re.IGNORECASE)
+_EVENT_RECORDS_INDEX_RE = re.compile(r'event\[[\'"]Records[\'"]\]')
+
+# AWS service usage selecting the service notes of the Java, C#, JavaScript and Go prompts
+_JAVA_S3_USAGE_RE = re.compile(r'com\.amazonaws\.services\.s3|AmazonS3|S3Client', re.IGNORECASE)
+_JAVA_DYNAMODB_USAGE_RE = re.compile(r'com\.amazonaws\.services\.dynamodb|AmazonDynamoDB|DynamoDB', re.IGNORECASE)
+_JAVA_SQS_USAGE_RE = re.compile(r'com\.amazonaws\.services\.sqs|AmazonSQS|SQS', re.IGNORECASE)
+_JAVA_SNS_USAGE_RE = re.compile(r'com\.amazonaws\.services\.sns|AmazonSNS|SNS', re.IGNORECASE)
+_JAVA_LAMBDA_USAGE_RE = re.compile(r'RequestHandler|lambda\.runtime|Lambda', re.IGNORECASE)
+_CSHARP_S3_USAGE_RE = re.compile(r'Amazon\.S3|AmazonS3|S3Client|AWSSDK\.S3', re.IGNORECASE)
+_CSHARP_DYNAMODB_USAGE_RE = re.compile(r'Amazon\.DynamoDB|AmazonDynamoDB|DynamoDBClient|AWSSDK\.DynamoDB', re.IGNORECASE)
+_CSHARP_SQS_USAGE_RE = re.compile(r'Amazon\.SQS|AmazonSQS|SQSClient|AWSSDK\.SQS', re.IGNORECASE)
+_CSHARP_SNS_USAGE_RE = re.compile(r'Amazon\.SNS|AmazonSNS|SNSClient|AWSSDK\.SNS', re.IGNORECASE)
+_CSHARP_LAMBDA_USAGE_RE = re.compile(r'Amazon\.Lambda|ILambdaContext|LambdaFunction|APIGatewayProxy|AWSSDK\.Lambda', re.IGNORECASE)
+_JAVASCRIPT_S3_USAGE_RE = re.compile(r'aws-sdk|AWS\.S3|S3Client|@aws-sdk/client-s3', re.IGNORECASE)
+_JAVASCRIPT_DYNAMODB_USAGE_RE = re.compile(r'AWS\.DynamoDB|DynamoDBClient|@aws-sdk/client-dynamodb', re.IGNORECASE)
+_JAVASCRIPT_LAMBDA_USAGE_RE = re.compile(r'AWS\.Lambda|LambdaClient|@aws-sdk/client-lambda|exports\.handler', re.IGNORECASE)
+_JAVASCRIPT_SQS_USAGE_RE = re.compile(r'AWS\.SQS|SQSClient|@aws-sdk/client-sqs', re.IGNORECASE)
+_JAVASCRIPT_SNS_USAGE_RE = re.compile(r'AWS\.SNS|SNSClient|@aws-sdk/client-sns', re.IGNORECASE)
+_GO_S3_USAGE_RE = re.compile(r'github\.com/aws/aws-sdk-go.*s3|s3\.New|s3iface', re.IGNORECASE)
+_GO_DYNAMODB_USAGE_RE = re.compile(r'github\.com/aws/aws-sdk-go.*dynamodb|dynamodb\.New|dynamodbiface', re.IGNORECASE)
+_GO_LAMBDA_USAGE_RE = re.compile(r'github\.com/aws/aws-sdk-go.*lambda|lambda\.New', re.IGNORECASE)
+_GO_SQS_USAGE_RE = re.compile(r'github\.com/aws/aws-sdk-go.*sqs|sqs\.New', re.IGNORECASE)
+_GO_SNS_USAGE_RE = re.compile(r'github\.com/aws/aws-sdk-go.*sns|sns\.New', re.IGNORECASE)
+
+# boto3 clients replaced by _aggressive_aws_cleanup, assigned ones first
+_AWS_CLEANUP_CLIENT_REWRITES = _with_required_literals((
+    (re.compile(r'\b(\w+)\s*=\s*boto3\s*\.\s*client\s*\(\s*[\'\"]dynamodb[\'\"][^\)]*\)', re.DOTALL | re.IGNORECASE), r'\1 = firestore.Client()'),
+    (re.compile(r'\b(\w+)\s*=\s*boto3\s*\.\s*client\s*\(\s*[\'\"]sqs[\'\"][^\)]*\)', re.DOTALL | re.IGNORECASE), r'\1 = pubsub_v1.PublisherClient()'),
+    (re.compile(r'\b(\w+)\s*=\s*boto3\s*\.\s*client\s*\(\s*[\'\"]sns[\'\"][^\)]*\)', re.DOTALL | re.IGNORECASE), r'\1 = pubsub_v1.PublisherClient()'),
+    (re.compile(r'\b(\w+)\s*=\s*boto3\s*\.\s*client\s*\(\s*[\'\"]s3[\'\"][^\)]*\)', re.DOTALL | re.IGNORECASE), r'\1 = storage.Client()'),
+    (re.compile(r'\b(\w+)\s*=\s*boto3\s*\.\s*client\s*\(\s*[\'\"]rds[\'\"][^\)]*\)', re.DOTALL | re.IGNORECASE), r'\1 = None  # RDS management replaced with Cloud SQL Admin API'),
+    (re.compile(r'\b(\w+)\s*=\s*boto3\s*\.\s*client\s*\(\s*[\'\"]ec2[\'\"][^\)]*\)', re.DOTALL | re.IGNORECASE), r'\1 = compute_v1.InstancesClient()'),
+    (re.compile(r'\b(\w+)\s*=\s*boto3\s*\.\s*client\s*\(\s*[\'\"]cloudwatch[\'\"][^\)]*\)', re.DOTALL | re.IGNORECASE), r'\1 = monitoring_v3.MetricServiceClient()'),
+    (re.compile(r'\b(\w+)\s*=\s*boto3\s*\.\s*client\s*\(\s*[\'\"]apigateway[\'\"][^\)]*\)', re.DOTALL | re.IGNORECASE), r'\1 = None  # API Gateway replaced with Apigee API'),
+    (re.compile(r'\b(\w+)\s*=\s*boto3\s*\.\s*client\s*\(\s*[\'\"]eks[\'\"][^\)]*\)', re.DOTALL | re.IGNORECASE), r'\1 = container_v1.ClusterManagerClient()'),
+    (re.compile(r'\b(\w+)\s*=\s*boto3\s*\.\s*client\s*\(\s*[\'\"]ecs[\'\"][^\)]*\)', re.DOTALL | re.IGNORECASE), r'\1 = run_v2.ServicesClient()  # ECS/Fargate replaced with Cloud Run'),
+    (re.compile(r'\b(\w+)\s*=\s*boto3\s*\.\s*client\s*\(\s*[\'\"]lambda[\'\"][^\)]*\)', re.DOTALL | re.IGNORECASE), r'\1 = functions_v1.CloudFunctionsServiceClient()'),
+    # STEP 1.5: Also catch boto3.client() without variable assignment
+    (re.compile(r'boto3\s*\.\s*client\s*\(\s*[\'\"]dynamodb[\'\"][^\)]*\)', re.DOTALL | re.IGNORECASE), r'firestore.Client()'),
+    (re.compile(r'boto3\s*\.\s*client\s*\(\s*[\'\"]sqs[\'\"][^\)]*\)', re.DOTALL | re.IGNORECASE), r'pubsub_v1.PublisherClient()'),
+    (re.compile(r'boto3\s*\.\s*client\s*\(\s*[\'\"]sns[\'\"][^\)]*\)', re.DOTALL | re.IGNORECASE), r'pubsub_v1.PublisherClient()'),
+    (re.compile(r'boto3\s*\.\s*client\s*\(\s*[\'\"]s3[\'\"][^\)]*\)', re.DOTALL | re.IGNORECASE), r'storage.Client()'),
+))
+
+# Client variables renamed after their boto3 clients were replaced
+_AWS_CLEANUP_CLIENT_VARIABLE_RENAMES = _with_required_literals((
+    (re.compile(r'\bdynamodb_client\b'), 'firestore_db'),
+    (re.compile(r'\bsqs_client\b'), 'pubsub_publisher'),
+    (re.compile(r'\bsns_client\b'), 'pubsub_publisher'),
+    (re.compile(r'\bs3_client\b'), 'storage_client'),
+    (re.compile(r'\brds_client\b'), 'cloud_sql_client'),
+    (re.compile(r'\bec2_client\b'), 'compute_client'),
+    (re.compile(r'\bcloudwatch_client\b'), 'monitoring_client'),
+    (re.compile(r'\bapigateway_client\b'), 'apigee_client'),
+    (re.compile(r'\beks_client\b'), 'gke_client'),
+    (re.compile(r'\becs_client\b'), 'cloud_run_client'),
+    (re.compile(r'\blambda_client\b'), 'functions_client'),
+))
+
+# list_buckets paginators replaced by a direct list_buckets() call
+_AWS_CLEANUP_PAGINATOR_REWRITES = _with_required_literals((
+    (re.compile(r'\b(\w+)\s*=\s*(\w+)\.get_paginator\s*\([\'"]list_buckets[\'"]\s*\)'), r'# Pagination not needed - GCS list_buckets() returns all buckets directly'),
+    # Replace paginator.paginate() calls - handle multiline with PaginationConfig
+    # Match multiline patterns with DOTALL - this handles cases like:
+    # response_iterator = paginator.paginate(
+    #     PaginationConfig={
+    #         "PageSize": 50,
+    #         "StartingToken": None,
+    #     }
+    # )
+    (re.compile(r'\b(\w+)\s*=\s*(\w+)\.paginate\s*\(\s*PaginationConfig\s*=\s*\{[^}]*\}\s*\)', re.DOTALL | re.MULTILINE), r'\1 = storage_client.list_buckets()'),
+    # Also handle multiline paginate calls without explicit PaginationConfig
+    (re.compile(r'\b(\w+)\s*=\s*(\w+)\.paginate\s*\(\s*(?:[^)]|\n)*?\)', re.DOTALL | re.MULTILINE), r'\1 = storage_client.list_buckets()'),
+    # Replace any paginate() call with assignment
+    (re.compile(r'\b(\w+)\s*=\s*(\w+)\.paginate\s*\([^)]*\)', re.DOTALL | re.MULTILINE), r'\1 = storage_client.list_buckets()'),
+    # Replace paginate() without assignment
+    (re.compile(r'\b(\w+)\.paginate\s*\([^)]*\)', re.DOTALL | re.MULTILINE), r'storage_client.list_buckets()'),
+))
+
+# Loops over list_buckets pages flattened to one loop over buckets
+_AWS_CLEANUP_BUCKET_PAGE_REWRITES = _with_required_literals((
+    (re.compile(r"for\s+(\w+)\s+in\s+page\[['\"]Buckets['\"]\]\s*:", re.MULTILINE), r'# Iterating buckets directly'),
+    # Replace "if 'Buckets' in page and page['Buckets']:" -> remove (not needed)
+    (re.compile(r"if\s+['\"]Buckets['\"]\s+in\s+page\s+and\s+page\[['\"]Buckets['\"]\]\s*:", re.MULTILINE), r'if True:  # Always true when iterating buckets'),
+    # Replace iteration over pages -> iterate over buckets directly
+    (re.compile(r'for\s+page\s+in\s+(\w+)\s*:', re.MULTILINE), r'for bucket in storage_client.list_buckets():'),
+    (re.compile(r"\b(\w+)\[['\"]Name['\"]\]"), r'\1.name'),
+))
+
+# S3 client calls and response fields rewritten to GCS blob operations
+_AWS_CLEANUP_S3_CALL_REWRITES = _with_required_literals((
+    (re.compile(r'(s3_client|s3|storage_client)\s*\.\s*upload_file\s*\(\s*([^,]+),\s*([^,]+),\s*([^\)]+)\s*\)', re.DOTALL | re.IGNORECASE), r'storage_client = storage.Client()\n    bucket = storage_client.bucket(\3)\n    blob = bucket.blob(\4)\n    blob.upload_from_filename(\2)'),
+    # s3_client.download_file(bucket, key, local_file) -> GCS download_to_filename
+    (re.compile(r'(s3_client|s3|storage_client)\s*\.\s*download_file\s*\(\s*([^,]+),\s*([^,]+),\s*([^\)]+)\s*\)', re.DOTALL | re.IGNORECASE), r'storage_client = storage.Client()\n    bucket = storage_client.bucket(\2)\n    blob = bucket.blob(\3)\n    blob.download_to_filename(\4)'),
+    # s3_client.get_object(Bucket=..., Key=...) -> bucket.blob pattern
+    (re.compile(r'\b(\w+)\s*=\s*(\w+)\.get_object\s*\(\s*Bucket\s*=\s*([^,]+),\s*Key\s*=\s*([^,\)]+)\s*\)', re.DOTALL), r'bucket = storage_client.bucket(\3)\n    blob = bucket.blob(\4)\n    \1 = blob.download_as_bytes()'),
+    (re.compile(r"response\['Body'\]\.read\(\)\.decode\(['\"]utf-8['\"]\)"), 'blob.download_as_text()'),
+    (re.compile(r'response\["Body"\]\.read\(\)\.decode\(["\']utf-8["\']\)'), 'blob.download_as_text()'),
+    (re.compile(r"response\['Body'\]\.read\(\)"), 'blob.download_as_bytes()'),
+    (re.compile(r'response\["Body"\]\.read\(\)'), 'blob.download_as_bytes()'),
+    # s3_client.put_object(Bucket=..., Key=..., Body=...) -> blob.upload_from_string
+    (re.compile(r'\b(\w+)\.put_object\s*\(\s*Bucket\s*=\s*([^,]+),\s*Key\s*=\s*([^,]+),\s*Body\s*=\s*([^\)]+)\s*\)', re.DOTALL), r'bucket = storage_client.bucket(\2)\n    blob = bucket.blob(\3)\n    blob.upload_from_string(\4)'),
+    # s3_client.delete_object(Bucket=..., Key=...) -> blob.delete()
+    (re.compile(r'\b(\w+)\.delete_object\s*\(\s*Bucket\s*=\s*([^,]+),\s*Key\s*=\s*([^\)]+)\s*\)', re.DOTALL), r'bucket = storage_client.bucket(\2)\n    blob = bucket.blob(\3)\n    blob.delete()'),
+    # s3_client.list_objects_v2(Bucket=...) -> bucket.list_blobs()
+    (re.compile(r'\b(\w+)\s*=\s*(\w+)\.list_objects_v2\s*\(\s*Bucket\s*=\s*([^\)]+)\s*\)', re.DOTALL), r'bucket = storage_client.bucket(\3)\n    \1 = list(bucket.list_blobs())'),
+    (re.compile(r'\b(\w+)\.list_objects_v2\s*\(\s*Bucket\s*=\s*([^\)]+)\s*\)', re.DOTALL), r'bucket = storage_client.bucket(\2)\n    blobs = list(bucket.list_blobs())'),
+    # Handle response['Contents'] -> iterate over blobs directly
+    (re.compile(r"if\s+['\"]Contents['\"]\s+in\s+(\w+)\s*:"), r'if \1:'),
+    (re.compile(r"for\s+(\w+)\s+in\s+(\w+)\[['\"]Contents['\"]\]\s*:"), r'for \1 in \2:'),
+    (re.compile(r"\b(\w+)\[['\"]Contents['\"]\]"), r'\1'),
+    (re.compile(r"\b(\w+)\[['\"]Key['\"]\]"), r'\1.name'),
+    (re.compile(r"\b(\w+)\[['\"]Size['\"]\]"), r'\1.size'),
+    # s3_client.head_object(Bucket=..., Key=...) -> blob.reload()
+    (re.compile(r'\b(\w+)\s*=\s*(\w+)\.head_object\s*\(\s*Bucket\s*=\s*([^,]+),\s*Key\s*=\s*([^\)]+)\s*\)', re.DOTALL), r'bucket = storage_client.bucket(\3)\n    blob = bucket.blob(\4)\n    blob.reload()\n    \1 = blob'),
+    (re.compile(r"\b(\w+)\[['\"]ContentLength['\"]\]"), r'\1.size'),
+    # s3_client.copy_object(CopySource={...}, Bucket=..., Key=...) -> blob.copy_to()
+    (re.compile(r'\b(\w+)\.copy_object\s*\(\s*CopySource\s*=\s*\{[^}]*Bucket\s*:\s*([^,}]+),\s*Key\s*:\s*([^}]+)\},\s*Bucket\s*=\s*([^,]+),\s*Key\s*=\s*([^\)]+)\s*\)', re.DOTALL), r'source_bucket = storage_client.bucket(\2)\n    source_blob = source_bucket.blob(\3)\n    dest_bucket = storage_client.bucket(\4)\n    dest_blob = dest_bucket.blob(\5)\n    dest_blob.rewrite(source_blob)'),
+    # s3_client.generate_presigned_url(...) -> blob.generate_signed_url()
+    (re.compile(r'\b(\w+)\s*=\s*(\w+)\.generate_presigned_url\s*\([^)]+\)', re.DOTALL), r'bucket = storage_client.bucket(bucket_name)\n    blob = bucket.blob(key)\n    \1 = blob.generate_signed_url(expiration=datetime.utcnow() + timedelta(hours=1), method="GET")'),
+))
+
+# Paginators and bucket pages left after the S3 call rewrites
+_AWS_CLEANUP_PAGINATOR_SECOND_PASS_REWRITES = _with_required_literals((
+    (re.compile(r'\b(\w+)\s*=\s*(\w+)\.get_paginator\s*\([\'"]list_buckets[\'"]\s*\)'), r'# Pagination not needed - GCS list_buckets() returns all buckets directly'),
+    # Replace paginator.paginate() calls - handle multiline with PaginationConfig
+    # Match multiline patterns with DOTALL - this handles cases like:
+    # response_iterator = paginator.paginate(
+    #     PaginationConfig={
+    #         "PageSize": 50,
+    #         "StartingToken": None,
+    #     }
+    # )
+    (re.compile(r'\b(\w+)\s*=\s*(\w+)\.paginate\s*\(\s*PaginationConfig\s*=\s*\{[^}]*\}\s*\)', re.DOTALL | re.MULTILINE), r'\1 = storage_client.list_buckets()'),
+    # Also handle multiline paginate calls without explicit PaginationConfig
+    (re.compile(r'\b(\w+)\s*=\s*(\w+)\.paginate\s*\(\s*(?:[^)]|\n)*?\)', re.DOTALL | re.MULTILINE), r'\1 = storage_client.list_buckets()'),
+    # Fallback for single-line paginate calls
+    (re.compile(r'\b(\w+)\s*=\s*(\w+)\.paginate\s*\([^)]*\)', re.DOTALL), r'\1 = storage_client.list_buckets()'),
+    # Replace paginate() without assignment
+    (re.compile(r'\b(\w+)\.paginate\s*\([^)]*\)', re.DOTALL), r'list(storage_client.list_buckets())'),
+    # Replace iteration over pages -> iterate over buckets directly
+    (re.compile(r'for\s+page\s+in\s+(\w+)\s*:'), r'for bucket in storage_client.list_buckets():'),
+    (re.compile(r"if\s+['\"]Buckets['\"]\s+in\s+page\s+and\s+page\[['\"]Buckets['\"]\]\s*:"), r'if bucket:'),
+    # Remove nested loop over page["Buckets"] - we're already iterating buckets directly
+    (re.compile(r"for\s+(\w+)\s+in\s+page\[['\"]Buckets['\"]\]\s*:"), r'# Already iterating over buckets'),
+    # Replace bucket['Name'] with bucket.name
+    (re.compile(r"\b(\w+)\[['\"]Name['\"]\]"), r'\1.name'),
+))
+
+# get_paginator leftovers and boto3 S3 resource calls rewritten to GCS
+_AWS_CLEANUP_S3_RESOURCE_REWRITES = _with_required_literals((
+    (re.compile(r'\.get_paginator\s*\([^)]+\)'), ''),
+    # Handle boto3.resource('s3') -> storage.Client()
+    (re.compile(r'boto3\s*\.\s*resource\s*\(\s*[\'\"]s3[\'\"][^\)]*\)', re.IGNORECASE), r'storage.Client()'),
+    (re.compile(r'\b(\w+)\s*=\s*boto3\s*\.\s*resource\s*\(\s*[\'\"]s3[\'\"][^\)]*\)', re.IGNORECASE), r'\1 = storage.Client()'),
+    # Handle s3_resource.Bucket(...) -> storage_client.bucket(...)
+    (re.compile(r'\b(\w+)\.Bucket\s*\(([^)]+)\)'), r'\1.bucket(\2)'),
+    # Handle bucket.Object(...) -> bucket.blob(...)
+    (re.compile(r'\b(\w+)\.Object\s*\(([^)]+)\)'), r'\1.blob(\2)'),
+    # Handle obj.upload_file(...) -> blob.upload_from_filename(...)
+    (re.compile(r'\b(\w+)\.upload_file\s*\(([^)]+)\)'), r'\1.upload_from_filename(\2)'),
+    # Handle obj.download_fileobj(...) -> blob.download_to_file(...)
+    (re.compile(r'\b(\w+)\.download_fileobj\s*\(([^)]+)\)'), r'\1.download_to_file(\2)'),
+    # Handle bucket.objects.all() -> bucket.list_blobs()
+    (re.compile(r'\b(\w+)\.objects\.all\s*\(\)'), r'\1.list_blobs()'),
+    (re.compile(r'\b(\w+)\.objects\.delete\s*\(\)'), r'# Delete all blobs in bucket\n    for blob in \1.list_blobs():\n        blob.delete()'),
+    # Handle obj.copy(...) -> blob.copy_to(...)
+    (re.compile(r'\b(\w+)\.copy\s*\(\s*\{[^}]*Bucket\s*:\s*([^,}]+),\s*Key\s*:\s*([^}]+)\}\s*\)', re.DOTALL), r'source_blob = bucket.blob(\3)\n    \1.rewrite(source_blob)'),
+    # Handle bucket.delete() - keep as is, but ensure bucket exists
+    (re.compile(r'\b(\w+)\.delete\s*\(\s*\)'), r'\1.delete(force=True)'),
+))
+
+# Standalone boto3 names left once the S3 resource calls are rewritten
+_BOTO3_STANDALONE_NAME_RE = re.compile(r'\bboto3\b(?!\w)')
+
+# AWS environment variable names replaced with their GCP counterparts
+_AWS_CLEANUP_ENVIRONMENT_REWRITES = _with_required_literals((
+    (re.compile(r'DYNAMODB_TABLE_NAME'), 'FIRESTORE_COLLECTION_NAME'),
+    (re.compile(r'SQS_DLQ_URL'), 'PUB_SUB_ERROR_TOPIC'),
+    (re.compile(r'SNS_TOPIC_ARN'), 'PUB_SUB_SUMMARY_TOPIC'),
+))
+
+# AWS keyword arguments turned into positional ones
+_AWS_CLEANUP_KEYWORD_ARGUMENT_REWRITES = _with_required_literals((
+    (re.compile(r'Bucket\s*=\s*([^,)]+)', re.MULTILINE), r'\1'),
+    # Remove Key= parameter pattern - convert to positional argument
+    (re.compile(r'Key\s*=\s*([^,)]+)', re.MULTILINE), r'\1'),
+    # Remove other AWS parameter patterns
+    (re.compile(r'QueueUrl\s*=\s*([^,)]+)', re.MULTILINE), r'\1'),
+    (re.compile(r'TopicArn\s*=\s*([^,)]+)', re.MULTILINE), r'\1'),
+))
+
+# AWS wording in comments, docstrings and messages, and AWS-only resource calls
+_AWS_CLEANUP_COMMENT_AND_DOCSTRING_REWRITES = _with_required_literals((
+    (re.compile(r'#\s*AWS\s+Clients?\s*', re.IGNORECASE), '# Google Cloud Clients'),
+    # Fix docstrings - replace AWS/S3 references with GCP equivalents
+    # Pattern: """...Amazon S3...""" -> """...Google Cloud Storage..."""
+    (re.compile(r'Amazon\s+S3', re.IGNORECASE), 'Google Cloud Storage'),
+    (re.compile(r'\bS3\b', re.IGNORECASE), 'Cloud Storage'),
+    (re.compile(r'AWS\s+SDK', re.IGNORECASE), 'Google Cloud SDK'),
+    (re.compile(r'shared\s+credentials', re.IGNORECASE), 'Google Application Default Credentials'),
+    (re.compile(r'config\s+files', re.IGNORECASE), 'Application Default Credentials'),
+    (re.compile(r'Region\s+configured', re.IGNORECASE), 'Location configured'),
+    (re.compile(r'AWS\s+region', re.IGNORECASE), 'GCP location'),
+    (re.compile(r'default\s+region', re.IGNORECASE), 'default location'),
+    (re.compile(r'region\s+for\s+the\s+project', re.IGNORECASE), 'location for the project'),
+    # Fix grammar: "an Google" -> "a Google"
+    (re.compile(r'\ban\s+Google\s+Cloud', re.IGNORECASE), 'a Google Cloud'),
+    # Replace "region" with "location" in logger messages and code
+    (re.compile(r'region[:\'"]', re.IGNORECASE), 'location:'),
+    (re.compile(r'in\s+region[:\'"]', re.IGNORECASE), 'in location:'),
+    # Remove wait_until_exists() calls - GCP doesn't have this
+    (re.compile(r'\.wait_until_exists\s*\([^)]*\)', re.MULTILINE), ''),
+    # Remove meta.client.meta.region_name patterns - AWS-specific
+    (re.compile(r'\.meta\.client\.meta\.region_name', re.MULTILINE), ''),
+    # Remove .meta. patterns (AWS resource meta access)
+    (re.compile(r'\.meta\.client', re.MULTILINE), ''),
+    (re.compile(r'\.meta\.', re.MULTILINE), ''),
+))
+
+# boto3 imports removed by _aggressive_aws_cleanup
+_AWS_CLEANUP_BOTO3_IMPORT_REMOVALS = _with_required_literals((
+    (re.compile(r'^import\s+boto3\s*$', re.MULTILINE), ''),
+    (re.compile(r'^from\s+boto3\s+import.*$', re.MULTILINE), ''),
+    (re.compile(r'^from\s+boto3\..*$', re.MULTILINE), ''),
+    # Also remove any line containing "import boto3" anywhere
+    (re.compile(r'.*import\s+boto3.*', re.MULTILINE), ''),
+    (re.compile(r'.*from\s+boto3.*', re.MULTILINE), ''),
+    # Clean up any empty lines left behind
+    (re.compile(r'\n\s*\n\s*\n'), '\n\n'),
+))
+
+# CreateBucketConfiguration arguments, with and without their leading comma
+_CREATE_BUCKET_CONFIGURATION_ARGUMENT_RE = re.compile(r',\s*CreateBucketConfiguration\s*=\s*\{[^}]*\}', re.DOTALL)
+_CREATE_BUCKET_CONFIGURATION_BLOCK_RE = re.compile(r'CreateBucketConfiguration\s*=\s*\{[^}]*\}', re.DOTALL)
+
+# AWS-specific parameters removed by _aggressive_aws_cleanup
+_AWS_CLEANUP_PARAMETER_REMOVALS = _with_required_literals((
+    (_CREATE_BUCKET_CONFIGURATION_ARGUMENT_RE, ''),
+    (_CREATE_BUCKET_CONFIGURATION_BLOCK_RE, ''),
+    # Remove LocationConstraint references (standalone)
+    (re.compile(r'\bLocationConstraint\s*:'), ''),
+    # Remove any remaining AWS-specific parameters
+    (re.compile(r',\s*ACL\s*=\s*[\'"][^\'"]*[\'"]'), ''),
+    # FINAL PASS: Remove any remaining Bucket=, Key= patterns
+    (re.compile(r'Bucket\s*=\s*'), ''),
+    (re.compile(r'Key\s*=\s*'), ''),
+))
+
+# Region lookups, waiters and boto3 references left for the final pass of _aggressive_aws_cleanup
+_AWS_CLEANUP_LEFTOVER_REMOVALS = _with_required_literals((
+    (re.compile(r'\bLocationConstraint\b'), ''),
+    (re.compile(r'\.wait_until_exists\s*\([^)]*\)'), ''),
+    (re.compile(r'\.meta\.client\.meta\.region_name'), ''),
+    (re.compile(r'\.meta\.client'), ''),
+    (re.compile(r'\.meta\.'), ''),
+    (re.compile(r'\bboto3\s*\.\s*\w+'), ''),
+))
+
+# Commas left behind by the parameter removals above
+_AWS_CLEANUP_DANGLING_COMMA_REWRITES = _with_required_literals((
+    (re.compile(r',\s*,'), ','),  # Double commas
+    (re.compile(r'\(\s*,'), '('),  # Comma after opening paren
+    (re.compile(r',\s*\)'), ')'),  # Comma before closing paren
+))
+
+# Paginator assignments, exception imports and Lambda/SNS/SQS/DynamoDB calls rewritten by _aggressive_aws_cleanup
+_PAGINATOR_ASSIGNMENT_RE = re.compile(r'paginator\s*=\s*.*get_paginator', re.IGNORECASE)
+_RESPONSE_ITERATOR_ASSIGNMENT_RE = re.compile(r'response_iterator\s*=\s*.*paginate', re.IGNORECASE)
+_S3_UPLOAD_FAILED_ERROR_IMPORT_RE = re.compile(r'from\s+boto3\.s3\.transfer\s+import\s+S3UploadFailedError')
+_BOTOCORE_CLIENT_ERROR_IMPORT_RE = re.compile(r'from\s+botocore\.exceptions\s+import\s+ClientError')
+_LAMBDA_HANDLER_DEF_RE = re.compile(r'def\s+lambda_handler\s*\(\s*event\s*,\s*context\s*\)\s*:', re.IGNORECASE)
+_RECORD_EVENT_LOOP_RE = re.compile(r'for\s+record_event\s+in\s+event\[[\'"]Records[\'"]\]\s*:')
+_EVENT_RECORDS_MISSING_CHECK_RE = re.compile(r'if\s+not\s+event\.get\([\'"]Records[\'"]\)\s*:')
+_RECORD_EVENT_BUCKET_NAME_RE = re.compile(r'record_event\[[\'"]s3[\'"]\]\[[\'"]bucket[\'"]\]\[[\'"]name[\'"]\]')
+_RECORD_EVENT_OBJECT_KEY_RE = re.compile(r'record_event\[[\'"]s3[\'"]\]\[[\'"]object[\'"]\]\[[\'"]key[\'"]\]')
+_BATCH_WRITE_ITEM_CALL_RE = re.compile(r'\b(\w+)\.batch_write_item\s*\(\s*RequestItems\s*=\s*\{([^}]+)\}\s*\)', re.DOTALL)
+_SEND_MESSAGE_CALL_RE = re.compile(r'\b(\w+)\.send_message\s*\(\s*QueueUrl\s*=\s*([^,]+),\s*MessageBody\s*=\s*([^,\)]+)\s*\)', re.DOTALL)
+_SNS_PUBLISH_CALL_RE = re.compile(r'\b(\w+)\.publish\s*\(\s*TopicArn\s*=\s*([^,]+),\s*Message\s*=\s*([^,\)]+)', re.DOTALL)
+
+# Syntax validation and Go cleanup markers
+_BOTO3_NAME_RE = re.compile(r'\bboto3\b', re.IGNORECASE)
+_S3_URL_RE = re.compile(r's3://[^\s\)]+')
+
+# AWS references reported and stripped by _validate_and_fix_syntax. Python's
+# 'lambda' keyword and variable names that happen to match are excluded: these
+# look for actual AWS service usage, not just variable names
+_OUTPUT_AWS_REFERENCE_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'\bboto3\b', r'\bAWS\b(?!\w)', r'\baws\b(?!\w)',
+    r'\bS3\b(?!\w)(?!\s*[:=])', r'\bs3\b(?!\w)(?!\s*[:=])',  # S3 but not variable assignments
+    r'\bLambda\b(?!\s*[:=])', r'\bDynamoDB\b(?!\s*[:=])', r'\bdynamodb\b(?!\s*[:=])',
+    r'\bSQS\b(?!\s*[:=])', r'\bsqs\b(?!\s*[:=])', r'\bSNS\b(?!\s*[:=])', r'\bsns\b(?!\s*[:=])',
+    r'\bRDS\b(?!\s*[:=])', r'\brds\b(?!\s*[:=])',
+    r'\bEC2\b', r'\bec2\b', r'\bCloudWatch\b', r'\bcloudwatch\b',
+    r'\bAPI Gateway\b', r'\bapigateway\b', r'\bEKS\b', r'\beks\b',
+    r'\bFargate\b', r'\bfargate\b', r'\bECS\b', r'\becs\b',
+    r'\bAWS_ACCESS_KEY_ID\b', r'\bAWS_SECRET_ACCESS_KEY\b', r'\bAWS_REGION\b',
+    r'\bAWS_LAMBDA_FUNCTION_NAME\b', r'\bS3_BUCKET_NAME\b',
+    r'https://sqs\.', r'https://s3\.', r'\.amazonaws\.com',
+))
+
+# AWS SDK usage left in migrated code, one alternation per language so
+# _has_aws_patterns scans the code once
+_JAVA_AWS_MARKER_RE = re.compile('|'.join((
+    r'com\.amazonaws',
+    r'software\.amazon\.awssdk',  # AWS SDK v2
+    r'AmazonS3',
+    r'AmazonDynamoDB',
+    r'AmazonSQS',
+    r'AmazonSNS',
+    r'RequestHandler',
+    r'AWS.*Client',
+    r'\bS3Client\b',  # Word boundary to avoid false positives
+    r'DynamoDBClient',
+    r'SQSClient',
+    r'SNSClient',
+    r'AmazonS3ClientBuilder',
+    r'S3ClientBuilder',
+)), re.IGNORECASE)
+_CSHARP_AWS_MARKER_RE = re.compile('|'.join((
+    r'Amazon\.',
+    r'AWSSDK\.',
+    r'\bIAmazonS3\b',  # Word boundary to avoid false positives
+    r'\bAmazonS3Client\b',
+    r'\bIAmazonDynamoDB\b',
+    r'\bAmazonDynamoDBClient\b',
+    r'\bIAmazonSQS\b',
+    r'\bAmazonSQSClient\b',
+    r'\bIAmazonSNS\b',
+    r'\bAmazonSNSClient\b',
+    r'\bILambdaContext\b',
+    r'\bAPIGatewayProxyRequest\b',
+    r'\bAPIGatewayProxyResponse\b',
+)), re.IGNORECASE)
+_GO_AWS_MARKER_RE = re.compile('|'.join((
+    r'github\.com/aws/aws-sdk-go',
+    r'github\.com/aws/aws-sdk-go-v2',
+    r's3\.New\(',
+    r'dynamodb\.New\(',
+    r'lambda\.New\(',
+    r'sqs\.New\(',
+    r'sns\.New\(',
+    r's3iface\.',
+    r'dynamodbiface\.',
+    r'\.S3\(',
+    r'\.DynamoDB\(',
+    r'\.Lambda\(',
+    r'\.SQS\(',
+    r'\.SNS\(',
+    r'AWS_ACCESS_KEY_ID',
+    r'AWS_SECRET_ACCESS_KEY',
+    r'AWS_DEFAULT_REGION',
+)), re.IGNORECASE)
+_JAVASCRIPT_AWS_MARKER_RE = re.compile('|'.join((
+    r'aws-sdk',
+    r'@aws-sdk',
+    r'AWS\.S3',
+    r'AWS\.DynamoDB',
+    r'AWS\.Lambda',
+    r'AWS\.SQS',
+    r'AWS\.SNS',
+    r'aws-sdk/clients/s3',
+    r'aws-sdk/clients/dynamodb',
+    r'\.s3\(\)',
+    r'\.dynamodb\(\)',
+    r'\.lambda\(\)',
+    r'\.sqs\(\)',
+    r'\.sns\(\)',
+    r'S3Client',
+    r'DynamoDBClient',
+    r'LambdaClient',
+    r'SQSClient',
+    r'SNSClient',
+)), re.IGNORECASE)
+_PYTHON_AWS_MARKER_RE = re.compile('|'.join((
+    r'\bboto3\b',
+    r'\bdynamodb_client\b',
+    r'\bsqs_client\b',
+    r'\bsns_client\b',
+    r'\bs3_client\b',
+    r'\blambda_handler\s*\(',
+    r'event\[[\'"]Records[\'"]\]',
+    r'\.get_object\s*\(',
+    r'\.batch_write_item\s*\(',
+    r'\.send_message\s*\(',
+    r'Bucket\s*=',
+    r'Key\s*=',
+    r'QueueUrl\s*=',
+    r'TopicArn\s*=',
+    r'DYNAMODB_TABLE_NAME',
+    r'SQS_DLQ_URL',
+    r'SNS_TOPIC_ARN',
+    r'return\s+\{\s*[\'"]statusCode[\'"]',
+    r'https://sqs\.',  # SQS URLs
+    r'arn:aws:sns:',  # SNS ARNs
+    r's3://',  # S3 URLs
+    r'\'s3_key\'',  # Dictionary keys
+    r'"s3_key"',
+    r'batch_write_to_dynamodb',  # Function names
+    r'publish_sns_summary',  # Function names
+    r'send_to_dlq',  # Function names
+    r'storage_client\.exceptions\.NoSuchKey',  # Wrong exception
+    r'response\s*=\s*batch\s*=\s*',  # Broken syntax
+    r'FIRESTORE_COLLECTION_NAME:\s*batch',  # Invalid syntax
+    r'Subject\s*=',  # SNS Subject parameter
+    r'json\.dumps\(json\.dumps',  # Double encoding
+    r'CreateBucketConfiguration',  # AWS S3 parameter
+    r'LocationConstraint',  # AWS S3 parameter
+    r'get_paginator',  # AWS pagination
+    r'wait_until_exists',  # AWS S3 resource method (doesn't exist in GCP)
+    r'\.meta\.client\.meta\.region_name',  # AWS-specific meta access
+    r'\.meta\.client',  # AWS resource meta access
+)), re.IGNORECASE)
+
+# Markers deciding whether refactored code still needs Gemini validation
+_AWS_METHOD_CALL_MARKER_RE = re.compile('|'.join((
+    r'\bboto3\s*\.\s*(client|resource)\s*\(',
+    r'\bs3\s*\.\s*\w+',  # s3.something
+    r'\w+\s*\.\s*create_bucket\s*\(',
+    r'\w+\s*\.\s*upload_file\s*\(',
+    r'\w+\s*\.\s*download_file\s*\(',
+    r'\w+\s*\.\s*list_objects',
+    r'\w+\s*\.\s*delete_object\s*\(',
+    r'\w+\s*\.\s*put_object\s*\(',
+    r'\w+\s*\.\s*get_object\s*\(',
+    r'\w+\s*\.\s*batch_write_item\s*\(',
+    r'\w+\s*\.\s*send_message\s*\(',
+    r'\w+\s*\.\s*publish\s*\([^)]*TopicArn',
+    r'lambda_handler\s*\(',
+    r'event\s*\[\s*[\'"]Records[\'"]\s*\]',
+    r'record_event\s*\[\s*[\'"]s3[\'"]\s*\]',
+)), re.IGNORECASE)
+_AWS_AGGRESSIVE_MARKER_RE = re.compile('|'.join((
+    r'boto3',
+    r'\.get_object\s*\(',
+    r'\.batch_write_item\s*\(',
+    r'\.send_message\s*\(',
+    r'Bucket\s*=',
+    r'Key\s*=',
+    r'QueueUrl\s*=',
+    r'TopicArn\s*=',
+    r'RequestItems\s*=',
+    r'DYNAMODB',
+    r'SQS_',
+    r'SNS_',
+    r'lambda_handler',
+)), re.IGNORECASE)
+_LAMBDA_HANDLER_CALL_RE = re.compile(r'\blambda_handler\s*\(', re.IGNORECASE)
+_PROCESS_GCS_FILE_CALL_RE = re.compile(r'\bprocess_gcs_file\s*\(', re.IGNORECASE)
+_EVENT_RECORDS_RE = re.compile(r'event\s*\[\s*[\'"]Records[\'"]\s*\]')
+_AWS_DATA_CALL_RE = re.compile(r'\b(get_object|batch_write|send_message|publish)\s*\(')
+_GCP_CLIENT_NAME_RE = re.compile(r'\b(storage|firestore|pubsub)\b')
+_AWS_LEFTOVER_NAME_RE = re.compile(r'\b(boto3|dynamodb|sqs|sns|lambda_handler|get_object|batch_write|send_message|QueueUrl|TopicArn|s3_client|dynamodb_client|sqs_client|sns_client)\b', re.IGNORECASE)
+
+# botocore exception imports and names mapped to their Google equivalents
+_BOTOCORE_IMPORTS_BOTH_RE = re.compile(r'from botocore\.exceptions import.*NoCredentialsError.*ClientError')
+_BOTOCORE_IMPORTS_BOTH_REVERSED_RE = re.compile(r'from botocore\.exceptions import.*ClientError.*NoCredentialsError')
+_BOTOCORE_IMPORT_BOTH_RE = re.compile(r'from botocore\.exceptions import\s+NoCredentialsError,\s*ClientError')
+_BOTOCORE_IMPORT_BOTH_REVERSED_RE = re.compile(r'from botocore\.exceptions import\s+ClientError,\s*NoCredentialsError')
+_BOTOCORE_IMPORT_NO_CREDENTIALS_RE = re.compile(r'from botocore\.exceptions import\s+NoCredentialsError\b')
+_BOTOCORE_IMPORT_CLIENT_ERROR_RE = re.compile(r'from botocore\.exceptions import\s+ClientError\b')
+_BOTOCORE_IMPORT_ANY_RE = re.compile(r'from botocore\.exceptions import\s+.*')
+_EXCEPT_BOTO_EXCEPTION_RE = re.compile(r'except\s+(NoCredentialsError|ClientError|BotoCoreError)', re.IGNORECASE)
+_NO_CREDENTIALS_ERROR_RE = re.compile(r'\bNoCredentialsError\b')
+_CLIENT_ERROR_RE = re.compile(r'\bClientError\b')
+_BOTO_CORE_ERROR_RE = re.compile(r'\bBotoCoreError\b')
+
+# DynamoDB client setup and table/item calls rewritten to Firestore
+_DYNAMODB_READ_CALL_RE = re.compile(r'\.(scan|get_item|query)\(', re.IGNORECASE)
+_DYNAMODB_WRITE_CALL_RE = re.compile(r'\.(put_item|batch_write_item)\(', re.IGNORECASE)
+_DYNAMODB_CLIENT_INIT_RE = re.compile(r'\b(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]dynamodb[\'\"][^\)]*\)', re.DOTALL | re.IGNORECASE)
+_DYNAMODB_CLIENT_NAME_ASSIGNMENT_RE = re.compile(r'\bdynamodb_client\s*=\s*')
+_DYNAMODB_CLIENT_NAME_ATTRIBUTE_RE = re.compile(r'\bdynamodb_client\.')
+_DYNAMODB_CLIENT_NAME_RE = re.compile(r'\bdynamodb_client\b')
+_DYNAMODB_INIT_CALL_RE = re.compile(r'\b(\w+)\s*=\s*boto3\.(resource|client)\([\'\"]dynamodb[\'\"][^\)]*\)')
+_DYNAMODB_INIT_VAR_RE = re.compile(r'\b(\w+)\s*=\s*boto3\.(resource|client)\([\'\"]dynamodb[\'\"]')
+_DYNAMODB_RESOURCE_INIT_CALL_RE = re.compile(r'\b(\w+)\s*=\s*boto3\.resource\([\'\"]dynamodb[\'\"][^\)]*\)')
+_DYNAMODB_CLIENT_INIT_CALL_RE = re.compile(r'\b(\w+)\s*=\s*boto3\.client\([\'\"]dynamodb[\'\"][^\)]*\)')
+_DYNAMODB_TABLE_ASSIGNMENT_RE = re.compile(r'\btable\s*=\s*(\w+)\.Table')
+_DYNAMODB_TABLE_PUT_ITEM_RE = re.compile(r'\btable\.put_item')
+_DYNAMODB_TABLE_GET_ITEM_RE = re.compile(r'\btable\.get_item')
+_DYNAMODB_PUT_ITEM_RE = re.compile(r'\b(\w+)\.put_item\(Item=([^,\)]+)\)')
+_DYNAMODB_PUT_ITEM_TABLE_NAME_RE = re.compile(r'\b(\w+)\.put_item\(TableName=([^,]+),\s*Item=([^,\)]+)\)')
+_DYNAMODB_GET_ITEM_RE = re.compile(r'\b(\w+)\.get_item\(Key=([^,\)]+)\)')
+_DYNAMODB_GET_ITEM_TABLE_NAME_RE = re.compile(r'\b(\w+)\.get_item\(TableName=([^,]+),\s*Key=([^,\)]+)\)')
+_DYNAMODB_QUERY_RE = re.compile(r'\b(\w+)\.query\(KeyConditionExpression=([^,\)]+)\)')
+_DYNAMODB_QUERY_TABLE_NAME_RE = re.compile(r'\b(\w+)\.query\(TableName=([^,]+),\s*KeyConditionExpression=([^,\)]+)\)')
+_DYNAMODB_DELETE_ITEM_RE = re.compile(r'\b(\w+)\.delete_item\(Key=([^,\)]+)\)')
+_DYNAMODB_BATCH_WRITER_RE = re.compile(r'with\s+(\w+)\.batch_writer\(\)\s+as\s+(\w+):')
+_DYNAMODB_BATCH_PUT_ITEM_RE = re.compile(r'\b(\w+)\.put_item\(Item=([^\)]+)\)')
+_DYNAMODB_BATCH_WRITE_ITEM_LIST_RE = re.compile(r'\b(\w+)\.batch_write_item\(\s*RequestItems\s*=\s*\{([^:]+):\s*\[([^\]]+)\]\}\s*\)', re.DOTALL)
+_DYNAMODB_BATCH_WRITE_ITEM_RE = re.compile(r'\b(\w+)\.batch_write_item\(\s*RequestItems\s*=\s*\{([^}]+)\}\s*\)', re.DOTALL)
+_DYNAMODB_STRING_ATTRIBUTE_RE = re.compile(r'\{\s*[\'"]S[\'"]\s*:\s*([^}]+)\s*\}')
+_DYNAMODB_NUMBER_ATTRIBUTE_RE = re.compile(r'\{\s*[\'"]N[\'"]\s*:\s*([^}]+)\s*\}')
+_DYNAMODB_SCAN_RE = re.compile(r'\b(\w+)\.scan\(\)')
+
+# DynamoDB export scripts keep their reads and write to Firestore instead
+_DYNAMODB_RESOURCE_VAR_RE = re.compile(r'\b(\w+)\s*=\s*boto3\.resource\([\'\"]dynamodb[\'\"][^\)]*\)')
+_DYNAMODB_CLIENT_VAR_RE = re.compile(r'\b(\w+)\s*=\s*boto3\.client\([\'\"]dynamodb[\'\"][^\)]*\)')
+_DYNAMODB_PUT_ITEM_KEYWORD_RE = re.compile(r'\b(\w+)\.put_item\(\s*Item\s*=\s*([^\)]+)\)', re.DOTALL)
+_DYNAMODB_BATCH_WRITE_ITEM_CALL_RE = re.compile(r'\b(\w+)\.batch_write_item\(\s*RequestItems\s*=\s*\{[^}]+\}\s*\)', re.DOTALL)
+
+# SQS client setup and queue calls rewritten to Pub/Sub
+_SQS_CLIENT_VAR_RE = re.compile(r'\b(\w+)\s*=\s*boto3\.client\([\'\"]sqs[\'\"][^\)]*\)')
+_SQS_CLIENT_INIT_RE = re.compile(r'\b(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]sqs[\'\"][^\)]*\)', re.DOTALL)
+_SQS_URL_ASSIGNMENT_RE = re.compile(r'\b(\w+)\s*=\s*[\'"]https://sqs\.[^\'"]+[\'"]')
+_SQS_QUEUE_URL_ARGUMENT_RE = re.compile(r'QueueUrl=[\'"]https://sqs\.[^\'"]+[\'"]')
+_QUEUE_NAME_RE = re.compile(r'/([^/]+)(?:\.fifo)?$')
+_SQS_SEND_MESSAGE_RE = re.compile(r'\b(\w+)\.send_message\(QueueUrl=([^,]+),\s*MessageBody=([^,\)]+)\)')
+_SQS_SEND_FIFO_MESSAGE_RE = re.compile(r'\b(\w+)\.send_message\(\s*QueueUrl=([^,]+),\s*MessageBody=([^,]+),\s*MessageGroupId=([^,]+),\s*MessageDeduplicationId=([^\)]+)\)')
+_SQS_RECEIVE_MESSAGE_RE = re.compile(r'\b(\w+)\.receive_message\(QueueUrl=([^,\)]+)\)')
+_SQS_DELETE_MESSAGE_RE = re.compile(r'\b(\w+)\.delete_message\(QueueUrl=([^,]+),\s*ReceiptHandle=([^,\)]+)\)')
+
+# boto3 imports replaced by the Python _migrate_s3_to_gcs
+_S3_BOTO3_IMPORT_REWRITES = (
+    (re.compile(r'^(?:import\s+boto3\s*$|from\s+boto3\s+)', re.MULTILINE), 'from google.cloud import storage'),
+)
+
+# Indented boto3 imports replaced by the Python _migrate_s3_to_gcs
+_S3_INLINE_BOTO3_IMPORT_REWRITES = (
+    (re.compile(r'\nimport\s+boto3\s*\n'), '\nfrom google.cloud import storage\n'),
+    (re.compile(r'\nfrom\s+boto3\s+'), '\nfrom google.cloud import storage '),
+)
+
+# S3 client and resource setup rewritten by the Python _migrate_s3_to_gcs
+_S3_BOTO3_CLIENT_REWRITES = (
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.resource\([\'\"]s3[\'\"][^\)]*\)', re.DOTALL), r'\1 = storage.Client()'),
+    # Replace boto3.client('s3') pattern - handle with region_name and config too
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.client\([\'\"]s3[\'\"][^\)]*\)', re.DOTALL), r'\1 = storage.Client()'),
+)
+
+# boto3 S3 resource Bucket/Object calls rewritten to GCS
+_S3_RESOURCE_REWRITES = (
+    (re.compile(r'\bs3\s*=\s*boto3\.resource\([\'\"]s3[\'\"][^\)]*\)', re.DOTALL), r'gcs_client = storage.Client()'),
+    # Then handle other variable names
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.resource\([\'\"]s3[\'\"][^\)]*\)', re.DOTALL), r'\1 = storage.Client()'),
+    # Replace S3 resource Bucket pattern: s3.Bucket('name')
+    # But only if s3 is a storage.Client(), not if it's already gcs_client
+    (re.compile(r'\b(\w+)\.Bucket\(([^\)]+)\)'), r'gcs_client.bucket(\2)'),
+    # Also handle: bucket = s3.Bucket('name') -> bucket = gcs_client.bucket('name')
+    (re.compile(r'\b(\w+)\s*=\s*(\w+)\.Bucket\(([^\)]+)\)'), r'\1 = gcs_client.bucket(\3)'),
+    # Also replace common S3 variable names (do this after specific replacement)
+    (re.compile(r'\bs3_client\b'), 'gcs_client'),
+)
+
+# S3 paginators and list_objects responses rewritten to GCS blob listings
+_S3_PAGINATION_REWRITES = (
+    (re.compile(r'\b(\w+)\s*=\s*(\w+)\.get_paginator\([\'"]list_buckets[\'"]\)'), r'# GCS list_buckets returns all buckets directly - no pagination needed\n    buckets = \2.list_buckets()'),
+    (re.compile(r'\b(\w+)\.paginate\([^)]*PaginationConfig[^)]*\)'), r'buckets'),
+    (re.compile(r'for\s+page\s+in\s+(\w+)\s*:'), r'for bucket in buckets:'),
+    (re.compile(r'if\s+[\'"]Buckets[\'"]\s+in\s+page'), r'if bucket'),
+    (re.compile(r'for\s+bucket\s+in\s+page\[[\'"]Buckets[\'"]\]'), r'for bucket in buckets'),
+    (re.compile(r'bucket\[[\'"]Name[\'"]\]'), r'bucket.name'),
+    # Pattern: list_objects_v2
+    (re.compile(r'\b(\w+)\s*=\s*(\w+)\.list_objects_v2\(Bucket=([^,\)]+)\)'), r'bucket = storage_client.bucket(\3)\n    \1 = list(bucket.list_blobs())'),
+    (re.compile(r'if\s+[\'"]Contents[\'"]\s+in\s+(\w+)'), r'if \1'),
+    (re.compile(r'for\s+obj\s+in\s+(\w+)\[[\'"]Contents[\'"]\]'), r'for blob in \1'),
+    (re.compile(r'obj\[[\'"]Key[\'"]\]'), r'blob.name'),
+)
+
+# S3 get_object Body reads rewritten to GCS downloads
+_S3_BODY_READ_REWRITES = (
+    (re.compile(r'\b(\w+)\[\'Body\'\]\.read\(\)\.decode\([\'"]utf-8[\'"]\)'), r'csv_content'),
+    (re.compile(r'\b(\w+)\["Body"\]\.read\(\)\.decode\([\'"]utf-8[\'"]\)'), r'csv_content'),
+    (re.compile(r'\b(\w+)\[\'Body\'\]\.read\(\)'), r'csv_content'),
+    (re.compile(r'\b(\w+)\["Body"\]\.read\(\)'), r'csv_content'),
+)
+
+# boto3 transfer and client config arguments dropped for GCS
+_S3_CONFIG_ARGUMENT_REWRITES = (
+    (re.compile(r'boto3\.client\s*\(\s*[\'\"]s3[\'\"],\s*config\s*=\s*Config\([^)]+\)\s*\)', re.DOTALL), 'storage.Client()'),
+    # Handle: s3_client = boto3.client('s3', config=Config(...))
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]s3[\'\"],\s*config\s*=\s*Config\([^)]+\)\s*\)', re.DOTALL), r'\1 = storage.Client()'),
+    # Remove config parameter from boto3.client calls - handle multiline (fallback)
+    (re.compile(r',\s*config\s*=\s*Config\([^)]+\)', re.DOTALL), ''),
+    (re.compile(r'config\s*=\s*Config\([^)]+\),\s*', re.DOTALL), ''),
+    (re.compile(r'config\s*=\s*Config\([^)]+\)', re.DOTALL), ''),
+)
+
+# S3 object version listings rewritten to GCS versioned blob listings
+_S3_VERSION_LISTING_REWRITES = (
+    (re.compile(r'versions\.get\([\'"]Versions[\'"],\s*\[\]\)'), r'versions'),
+    # Handle version['VersionId'] pattern
+    (re.compile(r'version\[[\'"]VersionId[\'"]\]'), r'version["VersionId"]'),
+    # Fix loops that use response.get('Contents', []) pattern
+    # Pattern: for obj in response.get('Contents', []): print(obj['Key'])
+    # Should become: for blob in blobs: print(blob.name)
+    (re.compile(r'for\s+obj\s+in\s+(\w+)\.get\([\'"]Contents[\'"],\s*\[\]\):'), r'for blob in blobs:\n    # Use blob.name to get the object key/path'),
+    (re.compile(r'for\s+(\w+)\s+in\s+(\w+)\.get\([\'"]Contents[\'"],\s*\[\]\):'), r'for blob in blobs:\n    # Use blob.name to get the object key/path'),
+)
+
+# S3 comments replaced or removed by the Python _migrate_s3_to_gcs
+_S3_COMMENT_REWRITES = (
+    (re.compile(r'#\s*AWS\s+S3\s+example', re.IGNORECASE), '# 🌟 GCP Cloud Storage Example'),
+    (re.compile(r'#\s*Upload\s+file\s+to\s+S3', re.IGNORECASE), ''),
+    (re.compile(r'#\s*Download\s+file\s+from\s+S3', re.IGNORECASE), ''),
+    (re.compile(r'#\s*List\s+objects\s+in\s+bucket', re.IGNORECASE), ''),
+    (re.compile(r'#\s*AWS.*?S3.*?', re.IGNORECASE), ''),
+    # Remove any remaining S3 references in comments
+    (re.compile(r'#.*?S3.*?', re.IGNORECASE), ''),
+    (re.compile(r'#.*?s3.*?', re.IGNORECASE), ''),
+    # Remove AWS region comments that mention S3
+    (re.compile(r'#.*?AWS.*?region.*?S3.*?', re.IGNORECASE), ''),
+)
+# A line from its first "#" on, which _S3_COMMENT_REWRITES is applied to on its own
+_COMMENT_TAIL_RE = re.compile(r'#[^\n]*')
+
+
+def _rewrite_s3_comment(match) -> str:
+    """Apply _S3_COMMENT_REWRITES to one _COMMENT_TAIL_RE match"""
+    return _apply_rewrites(match.group(0), _S3_COMMENT_REWRITES)
+
+# S3 list_buckets calls rewritten to GCS list_buckets
+_S3_LIST_BUCKETS_REWRITES = (
+    (re.compile(r'\b(\w+)\s*=\s*(\w+)\.list_buckets\(\)'), r'\1 = list(\2.list_buckets())'),
+    # Handle direct call pattern: s3.list_buckets() (but not if already wrapped in list())
+    (re.compile(r'\b(\w+)\.list_buckets\(\)(?!\s*\))'), r'list(\1.list_buckets())'),
+)
+
+# region_name arguments dropped and boto3 clients replaced once they are gone
+_S3_REGION_ARGUMENT_REWRITES = (
+    (re.compile(r',\s*region_name\s*=\s*[\'"][^\'"]+[\'"]'), ''),
+    (re.compile(r'region_name\s*=\s*[\'"][^\'"]+[\'"]\s*,'), ''),
+    (re.compile(r'region_name\s*=\s*[\'"][^\'"]+[\'"]'), ''),
+    # Then handle region_name without quotes
+    (re.compile(r',\s*region_name\s*=\s*[^\s,\)]+'), ''),
+    (re.compile(r'region_name\s*=\s*[^\s,\)]+\s*,'), ''),
+    (re.compile(r'region_name\s*=\s*[^\s,\)]+'), ''),
+    # Also handle region_name in boto3.client/resource calls specifically
+    # Match: boto3.client('s3', region_name='us-west-2')
+    (re.compile(r'boto3\.(client|resource)\s*\(\s*([^,]+),\s*region_name\s*=\s*[^\)]+\)'), r'boto3.\1(\2)'),
+    # Match: boto3.client('s3', region_name='us-west-2', ...)
+    (re.compile(r'boto3\.(client|resource)\s*\(\s*([^,]+),\s*region_name\s*=\s*[^,]+\s*,\s*([^\)]+)\)'), r'boto3.\1(\2, \3)'),
+    # Match: s3_client = boto3.client('s3', region_name='us-west-2')
+    # This should remove region_name and then the final pass will replace boto3.client
+    # Handle with quotes: region_name='value' or region_name="value"
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.(client|resource)\s*\(\s*([^,]+),\s*region_name\s*=\s*[\'"][^\'"]+[\'"]\s*\)'), r'\1 = boto3.\2(\3)'),
+    # Match: dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.(client|resource)\s*\(\s*[\'"](\w+)[\'"],\s*region_name\s*=\s*[\'"]([^\'"]+)[\'"]\s*\)'), r'\1 = boto3.\2(\'\3\')'),
+    # Also handle without quotes (variable): region_name=var_name
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.(client|resource)\s*\(\s*([^,]+),\s*region_name\s*=\s*[^,\)]+\s*\)'), r'\1 = boto3.\2(\3)'),
+    # After removing region_name, replace boto3.client/resource calls
+    # This ensures we catch cases where region_name was removed but boto3 call remains
+    # Handle all services, not just S3
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]s3[\'\"][^\)]*\)', re.DOTALL), r'\1 = storage.Client()'),
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]sqs[\'\"][^\)]*\)', re.DOTALL), r'\1 = pubsub_v1.PublisherClient()'),
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]dynamodb[\'\"][^\)]*\)', re.DOTALL), r'\1 = firestore.Client()'),
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.resource\s*\(\s*[\'\"]s3[\'\"][^\)]*\)', re.DOTALL), r'\1 = storage.Client()'),
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.resource\s*\(\s*[\'\"]dynamodb[\'\"][^\)]*\)', re.DOTALL), r'\1 = firestore.Client()'),
+)
+
+# Commas and spaces left behind by dropped arguments
+_S3_DANGLING_COMMA_REWRITES = (
+    (re.compile(r',\s*,'), ','),
+    (re.compile(r'\(\s*,'), '('),
+    (re.compile(r',\s*\)'), ')'),
+    # Clean up empty function calls
+    (re.compile(r'\(\s*\)'), '()'),
+    # Clean up spaces before closing paren
+    (re.compile(r'\s+\)'), ')'),
+)
+
+# Lambda client and S3 event record access rewritten for Cloud Functions
+_LAMBDA_CLIENT_AND_EVENT_REWRITES = (
+    (re.compile(r'\b(\w+)\s*=\s*boto3\.client\([\'\"]lambda[\'\"][^\)]*\)'), r'\1 = functions_v2.FunctionServiceClient()  # GCP Cloud Functions client'),
+    # Also replace any remaining lambda_client references that weren't caught
+    (re.compile(r'\blambda_client\b'), 'gcf_client'),
+    # Handle S3 event trigger patterns FIRST (before handler transformation)
+    # Pattern: event['Records'][0]['s3']['bucket']['name']
+    # Replace nested patterns first
+    (re.compile(r'event\[[\'"]Records[\'"]\]\[(\d+)\]\[[\'"]s3[\'"]\]\[[\'"]bucket[\'"]\]\[[\'"]name[\'"]\]'), r'event["Records"][\1]["bucket"]["name"]  # Updated for Cloud Storage event format'),
+    (re.compile(r'record\[[\'"]s3[\'"]\]\[[\'"]bucket[\'"]\]\[[\'"]name[\'"]\]'), r'record["bucket"]["name"]'),
+    (re.compile(r'record\[[\'"]s3[\'"]\]\[[\'"]object[\'"]\]\[[\'"]key[\'"]\]'), r'record["name"]  # Cloud Storage event uses "name" instead of "key"'),
+    # Replace record['s3']['bucket'] -> record['bucket']
+    (re.compile(r'record\[[\'"]s3[\'"]\]\[[\'"]bucket[\'"]\]'), r'record["bucket"]'),
+    (re.compile(r'record\[[\'"]s3[\'"]\]\[[\'"]object[\'"]\]'), r'record["object"]'),
+    # Also replace any remaining ['s3'] references in event records - be more aggressive
+    # Replace record['s3'] -> record['bucket']
+    (re.compile(r'record\[[\'"]s3[\'"]\]'), r'record["bucket"]'),
+    # Replace event['Records'][i]['s3'] -> event['Records'][i]['bucket']
+    (re.compile(r'event\[[\'"]Records[\'"]\]\[(\d+)\]\[[\'"]s3[\'"]\]'), r'event["Records"][\1]["bucket"]'),
+)
+
+# S3-triggered Lambda handlers rewritten to GCS background functions
+_LAMBDA_GCS_HANDLER_REWRITES = (
+    (re.compile(r'def\s+lambda_handler\s*\(\s*event\s*,\s*context\s*\)\s*:', re.IGNORECASE), 'def process_gcs_file(data, context):\n    """\n    Background Cloud Function triggered by a new file in Cloud Storage.\n    The \'data\' parameter contains the bucket and file information.\n    The \'context\' parameter provides event metadata.\n    """'),
+    # Replace event['Records'] loop with GCS event structure
+    # Pattern: for record_event in event['Records']:
+    (re.compile(r'for\s+record_event\s+in\s+event\[[\'"]Records[\'"]\]\s*:'), '# GCS background function receives single file event, not a list\n    # Process the single file event'),
+    # Replace event['Records'] access with direct data access
+    # Pattern: if not event.get('Records'):
+    (re.compile(r'if\s+not\s+event\.get\([\'"]Records[\'"]\)\s*:'), 'if not data.get(\'bucket\') or not data.get(\'name\'):'),
+    # Replace record_event['s3']['bucket']['name'] -> data['bucket']
+    (re.compile(r'record_event\[[\'"]s3[\'"]\]\[[\'"]bucket[\'"]\]\[[\'"]name[\'"]\]'), 'data.get(\'bucket\')'),
+    (re.compile(r'record_event\[[\'"]s3[\'"]\]\[[\'"]object[\'"]\]\[[\'"]key[\'"]\]'), 'data.get(\'name\')'),
+    # Replace bucket_name = record_event['s3']['bucket']['name']
+    (re.compile(r'bucket_name\s*=\s*record_event\[[\'"]s3[\'"]\]\[[\'"]bucket[\'"]\]\[[\'"]name[\'"]\]'), 'bucket_name = data.get(\'bucket\')'),
+    (re.compile(r'object_key\s*=\s*record_event\[[\'"]s3[\'"]\]\[[\'"]object[\'"]\]\[[\'"]key[\'"]\]'), 'object_key = data.get(\'name\')'),
+)
+
+# AWS environment variables renamed for Cloud Functions
+_LAMBDA_ENVIRONMENT_REWRITES = (
+    (re.compile(r"os\.environ\.get\(['\"]S3_BUCKET_NAME['\"](?:,\s*[^)]+)?\)"), "os.getenv('GCS_BUCKET_NAME')"),
+    (re.compile(r"os\.environ\[['\"]S3_BUCKET_NAME['\"]\]"), "os.getenv('GCS_BUCKET_NAME')"),
+    (re.compile(r"os\.environ\.get\(['\"]AWS_REGION['\"](?:,\s*[^)]+)?\)"), "os.getenv('GCP_REGION')"),
+    (re.compile(r"os\.environ\[['\"]AWS_REGION['\"]\]"), "os.getenv('GCP_REGION')"),
+    (re.compile(r"os\.environ\.get\(['\"]AWS_LAMBDA_FUNCTION_NAME['\"](?:,\s*[^)]+)?\)"), "os.getenv('GCP_FUNCTION_NAME')"),
+    (re.compile(r"os\.environ\[['\"]AWS_LAMBDA_FUNCTION_NAME['\"]\]"), "os.getenv('GCP_FUNCTION_NAME')"),
+    # Also replace S3_BUCKET_NAME in any context (not just os.environ)
+    (re.compile(r"['\"]S3_BUCKET_NAME['\"]"), "'GCS_BUCKET_NAME'"),
+)
+
+# S3 clients replaced when the S3 migration of a Lambda handler fails
+_LAMBDA_S3_CLIENT_FALLBACK_REWRITES = (
+    (re.compile(r'boto3\.client\([\'\"]s3[\'\"][^\)]*\)'), 'storage.Client()'),
+    (re.compile(r'boto3\.resource\([\'\"]s3[\'\"][^\)]*\)'), 'storage.Client()'),
+)
+
+# S3 calls and client variables rewritten when the S3 migration of a Lambda handler fails
+_LAMBDA_S3_OPERATION_FALLBACK_REWRITES = (
+    (re.compile(r'\b(\w+)\.get_object\(Bucket=([^,]+),\s*Key=([^\)]+)\)'), r'bucket = gcs_client.bucket(\2)\n    blob = bucket.blob(\3)\n    content = blob.download_as_text()'),
+    # Replace s3 variable references - be more aggressive
+    # First replace s3 = storage.Client() -> gcs_client = storage.Client()
+    (re.compile(r'\bs3\s*=\s*storage\.Client\(\)'), 'gcs_client = storage.Client()'),
+    # Replace s3 = boto3.client('s3') -> gcs_client = storage.Client()
+    (re.compile(r'\bs3\s*=\s*boto3\.client\([\'\"]s3[\'\"][^\)]*\)'), 'gcs_client = storage.Client()'),
+    # Replace s3 = boto3.resource('s3') -> gcs_client = storage.Client()
+    (re.compile(r'\bs3\s*=\s*boto3\.resource\([\'\"]s3[\'\"][^\)]*\)'), 'gcs_client = storage.Client()'),
+)
+
+# S3 bucket environment variables and s3 client names left in a migrated Lambda handler
+_LAMBDA_HANDLER_ENVIRONMENT_REWRITES = (
+    (re.compile(r"os\.environ\.get\(['\"]S3_BUCKET_NAME['\"](?:,\s*[^)]+)?\)"), "os.getenv('GCS_BUCKET_NAME')"),
+    (re.compile(r"os\.environ\[['\"]S3_BUCKET_NAME['\"]\]"), "os.getenv('GCS_BUCKET_NAME')"),
+    # Final pass: ensure s3 variables are replaced with gcs_client
+    # Replace s3 = storage.Client() -> gcs_client = storage.Client()
+    (re.compile(r'\bs3\s*=\s*storage\.Client\(\)'), 'gcs_client = storage.Client()'),
+    # Replace s3. method calls with gcs_client.
+    (re.compile(r'\bs3\s*\.'), 'gcs_client.'),
+)
+
+
+# S3 variable names tracked for renaming by the Python _migrate_s3_to_gcs
+_S3_BUCKET_NAME_RE = re.compile(r'\bs3_bucket\b')
+_S3_KEY_NAME_RE = re.compile(r'\bs3_key\b')
+_S3_OBJECT_NAME_RE = re.compile(r'\bs3_object\b')
+_S3_CLIENT_NAME_RE = re.compile(r'\bs3_client\b')
+_S3_CLIENT_ATTRIBUTE_RE = re.compile(r'\bs3\b(?=\s*\.)')
+_S3_CLIENT_ASSIGNMENT_RE = re.compile(r'\b(\w+)\s*=\s*boto3\.client\([\'\"]s3[\'\"][^\)]*\)')
+_S3_LIST_OBJECTS_RESPONSE_RE = re.compile(r'\b(\w+)\s*=\s*(\w+)\.list_objects(?:_v2)?\(')
+_OBJ_LOOP_RE = re.compile(r'for\s+obj\s+in')
+_OBJ_NAME_RE = re.compile(r'\bobj\b')
+
+# create_bucket arguments read to pick the GCS bucket location
+_CREATE_BUCKET_LOCATION_CONSTRAINT_RE = re.compile(r'CreateBucketConfiguration\s*=\s*\{[^}]*LocationConstraint[^}]*:\s*([^,}]+)')
+_CREATE_BUCKET_LOCATION_CONSTRAINT_LITERAL_RE = re.compile(r'CreateBucketConfiguration\s*=\s*\{[^}]*LocationConstraint[^}]*:\s*[\'"]([^\'"]+)[\'"]')
+_CREATE_BUCKET_CONFIGURATION_RE = re.compile(r'CreateBucketConfiguration\s*=\s*\{([^}]+)\}')
+_CREATE_BUCKET_FIRST_ARGUMENT_RE = re.compile(r'create_bucket\(\s*([^,)]+)')
+_BUCKET_ARGUMENT_RE = re.compile(r'Bucket\s*=\s*([^,)]+)')
+_LOCATION_CONSTRAINT_RE = re.compile(r'LocationConstraint\s*:\s*([^,}]+)')
+_REGION_ASSIGNMENT_VALUE_RE = re.compile(r'region\s*=\s*[\'"]([^\'"]+)[\'"]')
+
+# S3 client calls rewritten by the Python _migrate_s3_to_gcs
+_S3_CLIENT_VAR_INIT_RE = re.compile(r'\b(\w+)\s*=\s*boto3\.client\([\'\"]s3[\'\"][^\)]*\)', re.DOTALL)
+_GCS_CLIENT_NAME_COMMENT_RE = re.compile(r'gcs_client = storage\.Client\(\)\s*# Use a better name for the GCS client')
+_GCS_STORAGE_IMPORT_RE = re.compile(r'(from google\.cloud import storage)')
+_S3_CREATE_BUCKET_CALL_RE = re.compile(r'\b(\w+)\.create_bucket\(')
+_S3_CREATE_BUCKET_KEYWORD_RE = re.compile(r'\b(\w+)\.create_bucket\(\s*Bucket\s*=\s*([^,]+)(?:,\s*CreateBucketConfiguration\s*=\s*\{[^}]+\})?\s*\)', re.DOTALL)
+_S3_CREATE_BUCKET_POSITIONAL_RE = re.compile(r'\b(\w+)\.create_bucket\(\s*([^,\)]+)\s*\)')
+_S3_DELETE_BUCKET_RE = re.compile(r'\b(\w+)\.delete_bucket\(Bucket=([^,\)]+)\)')
+_S3_UPLOAD_FILE_LITERAL_RE = re.compile(r'\b(\w+)\.upload_file\([\'\"]([^\'\"]+)[\'\"],\s*[\'\"]([^\'\"]+)[\'\"],\s*[\'\"]([^\'\"]+)[\'\"]\)')
+_S3_DOWNLOAD_FILE_LITERAL_RE = re.compile(r'\b(\w+)\.download_file\([\'\"]([^\'\"]+)[\'\"],\s*[\'\"]([^\'\"]+)[\'\"],\s*[\'\"]([^\'\"]+)[\'\"]\)')
+_S3_CONTENT_LENGTH_RE = re.compile(r'\b(\w+)\[[\'"]ContentLength[\'"]\]')
+_S3_PUT_OBJECT_RE = re.compile(r'\b(\w+)\.put_object\(Bucket=([^,]+),\s*Key=([^,]+),\s*Body=([^\)]+)\)')
+_S3_GET_OBJECT_ASSIGNMENT_RE = re.compile(r'\b(\w+)\s*=\s*(\w+)\.get_object\(Bucket=([^,]+),\s*Key=([^,\)]+)[^\)]*\)')
+_S3_GET_OBJECT_RE = re.compile(r'\b(\w+)\.get_object\(Bucket=([^,]+),\s*Key=([^,\)]+)[^\)]*\)')
+_S3_DELETE_OBJECT_RE = re.compile(r'\b(\w+)\.delete_object\(Bucket=([^,]+),\s*Key=([^,\)]+)\)')
+_S3_LIST_OBJECTS_V2_ASSIGNMENT_RE = re.compile(r'\b(\w+)\s*=\s*(\w+)\.list_objects_v2\(Bucket=([^,\)]+)\)')
+_S3_LIST_OBJECTS_V2_RE = re.compile(r'\b(\w+)\.list_objects_v2\(Bucket=([^,\)]+)\)')
+_S3_LIST_OBJECTS_ASSIGNMENT_RE = re.compile(r'\b(\w+)\s*=\s*(\w+)\.list_objects\(Bucket=([^,\)]+)\)')
+_S3_LIST_OBJECTS_RE = re.compile(r'\b(\w+)\.list_objects\(Bucket=([^,\)]+)\)')
+
+# Bucket and file names the Python _migrate_s3_to_gcs reads from S3 calls with literal arguments
+_S3_UPLOAD_FILE_NAMES_RE = re.compile(r'\.upload_file\([\'\"]([^\'\"]+)[\'\"],\s*[\'\"]([^\'\"]+)[\'\"],\s*[\'\"]([^\'\"]+)[\'\"]\)')
+_S3_DOWNLOAD_FILE_NAMES_RE = re.compile(r'\.download_file\([\'\"]([^\'\"]+)[\'\"],\s*[\'\"]([^\'\"]+)[\'\"],\s*[\'\"]([^\'\"]+)[\'\"]\)')
+_S3_PUT_OBJECT_NAMES_RE = re.compile(r'\.put_object\(Bucket=([^,]+),\s*Key=([^,]+)')
+_S3_GET_OBJECT_NAMES_RE = re.compile(r'\.get_object\(Bucket=([^,]+),\s*Key=([^,\)]+)')
+_S3_DELETE_OBJECT_NAMES_RE = re.compile(r'\.delete_object\(Bucket=([^,]+),\s*Key=([^,\)]+)')
+_S3_LIST_OBJECTS_BUCKET_NAME_RE = re.compile(r'\.list_objects(?:_v2)?\(Bucket=([^,\)]+)')
+_S3_BUCKET_CALL_NAME_RE = re.compile(r'\.(?:create|delete)_bucket\(Bucket=([^,\)]+)')
+
+# Lambda names, handlers and S3 usage checked by the Python _migrate_lambda_to_cloud_functions
+_LAMBDA_CLIENT_ASSIGNMENT_RE = re.compile(r'\b(\w+)\s*=\s*boto3\.client\([\'\"]lambda[\'\"][^\)]*\)')
+_LAMBDA_CLIENT_NAME_RE = re.compile(r'\blambda_client\b')
+_LAMBDA_FUNCTION_NAME_RE = re.compile(r'\blambda_function\b')
+_RECORD_EVENT_S3_RE = re.compile(r'record_event\[[\'"]s3[\'"]\]')
+_RECORD_S3_INDEX_RE = re.compile(r'record\[[\'"]s3[\'"]\]')
+_BUCKET_KEYWORD_RE = re.compile(r'Bucket=')
+_KEY_KEYWORD_RE = re.compile(r'Key=')
+_OS_ENVIRONMENT_USE_RE = re.compile(r'os\.(getenv|environ)')
+_GCP_IMPORT_LINE_RE = re.compile(r'(from google\.cloud import[^\n]+)')
+_AWS_LAMBDA_EXAMPLE_COMMENT_RE = re.compile(r'#\s*AWS\s+Lambda\s+example.*?\n', re.IGNORECASE)
+
+# Lambda invoke and create_function calls rewritten by the Python _migrate_lambda_to_cloud_functions
+_LAMBDA_INVOKE_ASSIGNMENT_RE = re.compile(r'\b(\w+)\s*=\s*(\w+)\.invoke\s*\(\s*FunctionName\s*=\s*([^,]+)\s*,\s*InvocationType\s*=\s*([^,]+)?\s*,\s*Payload\s*=\s*([^\)]+)\s*\)', re.DOTALL)
+_LAMBDA_INVOKE_RE = re.compile(r'\b(\w+)\.invoke\s*\(\s*FunctionName\s*=\s*([^,]+)\s*,\s*InvocationType\s*=\s*([^,]+)?\s*,\s*Payload\s*=\s*([^\)]+)\s*\)', re.DOTALL)
+_LAMBDA_CREATE_FUNCTION_RE = re.compile(r'\b(\w+)\.create_function\s*\(\s*FunctionName\s*=\s*([^,]+)\s*,\s*Runtime\s*=\s*([^,]+)\s*,\s*Role\s*=\s*([^,]+)\s*,\s*Handler\s*=\s*([^,]+)\s*,\s*Code\s*=\s*([^\)]+)\s*\)', re.DOTALL)
+
+# Python migrations that return (code, variable mapping) instead of just code
+_VARIABLE_MAPPING_SERVICE_TYPES = frozenset({'s3_to_gcs', 'lambda_to_cloud_functions'})
+
+# GCP module imported by a Python service migration's output
+_MIGRATED_SERVICE_MODULES = MappingProxyType({
+    's3_to_gcs': 'google.cloud.storage',
+    'dynamodb_to_firestore': 'google.cloud.firestore',
+    'sqs_to_pubsub': 'google.cloud.pubsub_v1',
+    'sns_to_pubsub': 'google.cloud.pubsub_v1',
+    'cloudwatch_to_monitoring': 'google.cloud.monitoring_v3',
+    'apigateway_to_apigee': 'google.cloud.apigee_registry_v1',
+    'eks_to_gke': 'google.cloud.container_v1',
+    'fargate_to_cloudrun': 'google.cloud.run_v2',
+})
+
+# boto3 client methods whose calls a Python service migration rewrites; names
+# the GCP client libraries share (e.g. create_bucket, publish) are left out
+_BOTO3_SERVICE_CALLS = MappingProxyType({
+    's3_to_gcs': frozenset({
+        'put_object', 'get_object', 'delete_object', 'delete_objects', 'head_object',
+        'copy_object', 'list_objects', 'list_objects_v2', 'upload_file', 'download_file',
+        'upload_fileobj', 'download_fileobj', 'generate_presigned_url',
+    }),
+    'dynamodb_to_firestore': frozenset({
+        'put_item', 'get_item', 'update_item', 'delete_item', 'query', 'scan',
+        'batch_writer', 'batch_write_item', 'batch_get_item',
+    }),
+    'sqs_to_pubsub': frozenset({
+        'send_message', 'send_message_batch', 'receive_message', 'delete_message',
+        'delete_message_batch', 'get_queue_url', 'create_queue', 'purge_queue',
+        'change_message_visibility',
+    }),
+    'sns_to_pubsub': frozenset({
+        'publish_batch', 'create_platform_endpoint', 'get_topic_attributes',
+        'set_topic_attributes', 'list_subscriptions_by_topic',
+    }),
+    'cloudwatch_to_monitoring': frozenset({
+        'put_metric_data', 'get_metric_data', 'get_metric_statistics', 'put_metric_alarm',
+        'describe_alarms', 'list_metrics',
+    }),
+    'apigateway_to_apigee': frozenset({
+        'create_rest_api', 'get_rest_apis', 'get_resources', 'create_resource',
+        'put_method', 'put_integration', 'create_deployment', 'delete_rest_api',
+    }),
+    'eks_to_gke': frozenset({
+        'describe_cluster', 'create_nodegroup', 'describe_nodegroup', 'list_nodegroups',
+        'update_cluster_config',
+    }),
+    'fargate_to_cloudrun': frozenset({
+        'run_task', 'stop_task', 'describe_tasks', 'list_tasks', 'register_task_definition',
+        'describe_services',
+    }),
+})
+
+
+def _top_level_imports(code: str) -> FrozenSet[str]:
+    """Modules imported at the top level of Python code ('from a import b' yields 'a' and 'a.b')"""
+    tree = _parse_python(code)
+    if tree is None:
+        return frozenset()
+    modules = set()
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.add(node.module)
+            modules.update(f'{node.module}.{alias.name}' for alias in node.names)
+    return frozenset(modules)
+
+
+def _is_already_migrated(code: str, service_type: str) -> bool:
+    """Whether code already imports a migration's GCP module and no longer uses boto or its calls"""
+    module = _MIGRATED_SERVICE_MODULES.get(service_type)
+    if module is None or 'boto' in code or module.rpartition('.')[2] not in code:
+        return False
+    if not _BOTO3_SERVICE_CALLS[service_type].isdisjoint(_ATTRIBUTE_CALL_RE.findall(code)):
+        return False
+    return module in _top_level_imports(code)
+
+
+# AWS region -> closest GCP Cloud Storage location, with a 'default' fallback
+_AWS_REGION_TO_GCS_LOCATION = MappingProxyType({
+    # US Regions
+    'us-east-1': 'US-EAST1',      # N. Virginia -> US East (South Carolina)
+    'us-east-2': 'US-EAST4',      # Ohio -> US East (N. Virginia)
+    'us-west-1': 'US-WEST1',      # N. California -> US West (Oregon)
+    'us-west-2': 'US-WEST1',      # Oregon -> US West (Oregon) - closest match
+    
+    # Europe Regions
+    'eu-west-1': 'EUROPE-WEST1',  # Ireland -> Europe West (Belgium)
+    'eu-west-2': 'EUROPE-WEST2',  # London -> Europe West (London)
+    'eu-west-3': 'EUROPE-WEST3',  # Paris -> Europe West (Frankfurt)
+    'eu-central-1': 'EUROPE-WEST3',  # Frankfurt -> Europe West (Frankfurt)
+    'eu-central-2': 'EUROPE-CENTRAL2',  # Zurich -> Europe Central (Warsaw)
+    'eu-north-1': 'EUROPE-NORTH1',  # Stockholm -> Europe North (Finland)
+    'eu-south-1': 'EUROPE-WEST4',  # Milan -> Europe West (Netherlands)
+    'eu-south-2': 'EUROPE-WEST4',  # Spain -> Europe West (Netherlands)
+    
+    # Asia Pacific Regions
+    'ap-southeast-1': 'ASIA-SOUTHEAST1',  # Singapore -> Asia Southeast (Singapore)
+    'ap-southeast-2': 'AUSTRALIA-SOUTHEAST1',  # Sydney -> Australia Southeast (Sydney)
+    'ap-southeast-3': 'ASIA-SOUTHEAST2',  # Jakarta -> Asia Southeast (Jakarta)
+    'ap-southeast-4': 'AUSTRALIA-SOUTHEAST2',  # Melbourne -> Australia Southeast (Melbourne)
+    'ap-southeast-5': 'ASIA-SOUTHEAST1',  # Bangkok -> Asia Southeast (Singapore) - closest
+    'ap-northeast-1': 'ASIA-NORTHEAST1',  # Tokyo -> Asia Northeast (Tokyo)
+    'ap-northeast-2': 'ASIA-NORTHEAST2',  # Seoul -> Asia Northeast (Osaka)
+    'ap-northeast-3': 'ASIA-NORTHEAST3',  # Osaka -> Asia Northeast (Seoul)
+    'ap-south-1': 'ASIA-SOUTH1',  # Mumbai -> Asia South (Mumbai)
+    'ap-south-2': 'ASIA-SOUTH1',  # Hyderabad -> Asia South (Mumbai) - closest
+    'ap-east-1': 'ASIA-EAST1',    # Hong Kong -> Asia East (Taiwan)
+    
+    # Middle East Regions
+    'me-south-1': 'ASIA-SOUTH1',     # Bahrain -> Asia South (Mumbai) - closest
+    'me-central-1': 'ASIA-SOUTH1',   # UAE -> Asia South (Mumbai) - closest
+    'me-central-2': 'ASIA-SOUTH1',   # UAE -> Asia South (Mumbai) - closest
+    
+    # South America Regions
+    'sa-east-1': 'SOUTHAMERICA-EAST1',  # São Paulo -> South America East (São Paulo)
+    
+    # Canada Regions
+    'ca-central-1': 'US-EAST1',      # Montreal -> US East (South Carolina) - closest
+    'ca-west-1': 'US-WEST1',      # Calgary -> US West (Oregon) - closest
+    
+    # Africa Regions
+    'af-south-1': 'EUROPE-WEST1',  # Cape Town -> Europe West (Belgium) - closest geographically
+    
+    # China Regions (special handling - may need different credentials)
+    'cn-north-1': 'ASIA-NORTHEAST1',  # Beijing -> Asia Northeast (Tokyo) - closest
+    'cn-northwest-1': 'ASIA-NORTHEAST1',  # Ningxia -> Asia Northeast (Tokyo) - closest
+    
+    # Israel Regions
+    'il-central-1': 'EUROPE-WEST1',  # Tel Aviv -> Europe West (Belgium) - closest
+    
+    # Default fallback
+    'default': 'US',  # Default to US multi-region
+})
+
+
 class ExtendedPythonTransformer(BaseExtendedTransformer):
     """Extended transformer for Python code using AST manipulation"""
     
+    # Most recent variable mappings kept for transform_code to look up
+    VARIABLE_MAPPING_CACHE_SIZE = 1024
+    
+    _migration_methods = {
+        's3_to_gcs': '_migrate_s3_to_gcs',
+        'lambda_to_cloud_functions': '_migrate_lambda_to_cloud_functions',
+        'dynamodb_to_firestore': '_migrate_dynamodb_to_firestore',
+        'sqs_to_pubsub': '_migrate_sqs_to_pubsub',
+        'sns_to_pubsub': '_migrate_sns_to_pubsub',
+        'rds_to_cloud_sql': '_migrate_rds_to_cloud_sql',
+        'cloudwatch_to_monitoring': '_migrate_cloudwatch_to_monitoring',
+        'apigateway_to_apigee': '_migrate_apigateway_to_apigee',
+        'eks_to_gke': '_migrate_eks_to_gke',
+        'fargate_to_cloudrun': '_migrate_fargate_to_cloudrun',
+    }
+    
     def __init__(self, service_mapper):
         super().__init__(service_mapper)
         from config import config
         self.gcp_project_id = config.GCP_PROJECT_ID
         self.gcp_region = config.GCP_REGION
+        # Source digest -> variable mapping of the migration that produced or consumed it
+        self._variable_mappings = LRUCache(self.VARIABLE_MAPPING_CACHE_SIZE)
     
     def _get_aws_to_gcp_region_mapping(self) -> dict:
         """Get comprehensive mapping of AWS regions to Google Cloud Storage locations.
@@ -3653,61 +4432,7 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
         Returns:
             dict: Mapping of AWS region names to GCP location names
         """
-        return {
-            # US Regions
-            'us-east-1': 'US-EAST1',      # N. Virginia -> US East (South Carolina)
-            'us-east-2': 'US-EAST4',      # Ohio -> US East (N. Virginia)
-            'us-west-1': 'US-WEST1',      # N. California -> US West (Oregon)
-            'us-west-2': 'US-WEST1',      # Oregon -> US West (Oregon) - closest match
-            
-            # Europe Regions
-            'eu-west-1': 'EUROPE-WEST1',  # Ireland -> Europe West (Belgium)
-            'eu-west-2': 'EUROPE-WEST2',  # London -> Europe West (London)
-            'eu-west-3': 'EUROPE-WEST3',  # Paris -> Europe West (Frankfurt)
-            'eu-central-1': 'EUROPE-WEST3',  # Frankfurt -> Europe West (Frankfurt)
-            'eu-central-2': 'EUROPE-CENTRAL2',  # Zurich -> Europe Central (Warsaw)
-            'eu-north-1': 'EUROPE-NORTH1',  # Stockholm -> Europe North (Finland)
-            'eu-south-1': 'EUROPE-WEST4',  # Milan -> Europe West (Netherlands)
-            'eu-south-2': 'EUROPE-WEST4',  # Spain -> Europe West (Netherlands)
-            
-            # Asia Pacific Regions
-            'ap-southeast-1': 'ASIA-SOUTHEAST1',  # Singapore -> Asia Southeast (Singapore)
-            'ap-southeast-2': 'AUSTRALIA-SOUTHEAST1',  # Sydney -> Australia Southeast (Sydney)
-            'ap-southeast-3': 'ASIA-SOUTHEAST2',  # Jakarta -> Asia Southeast (Jakarta)
-            'ap-southeast-4': 'AUSTRALIA-SOUTHEAST2',  # Melbourne -> Australia Southeast (Melbourne)
-            'ap-southeast-5': 'ASIA-SOUTHEAST1',  # Bangkok -> Asia Southeast (Singapore) - closest
-            'ap-northeast-1': 'ASIA-NORTHEAST1',  # Tokyo -> Asia Northeast (Tokyo)
-            'ap-northeast-2': 'ASIA-NORTHEAST2',  # Seoul -> Asia Northeast (Osaka)
-            'ap-northeast-3': 'ASIA-NORTHEAST3',  # Osaka -> Asia Northeast (Seoul)
-            'ap-south-1': 'ASIA-SOUTH1',  # Mumbai -> Asia South (Mumbai)
-            'ap-south-2': 'ASIA-SOUTH1',  # Hyderabad -> Asia South (Mumbai) - closest
-            'ap-east-1': 'ASIA-EAST1',    # Hong Kong -> Asia East (Taiwan)
-            
-            # Middle East Regions
-            'me-south-1': 'ASIA-SOUTH1',     # Bahrain -> Asia South (Mumbai) - closest
-            'me-central-1': 'ASIA-SOUTH1',   # UAE -> Asia South (Mumbai) - closest
-            'me-central-2': 'ASIA-SOUTH1',   # UAE -> Asia South (Mumbai) - closest
-            
-            # South America Regions
-            'sa-east-1': 'SOUTHAMERICA-EAST1',  # São Paulo -> South America East (São Paulo)
-            
-            # Canada Regions
-            'ca-central-1': 'US-EAST1',      # Montreal -> US East (South Carolina) - closest
-            'ca-west-1': 'US-WEST1',      # Calgary -> US West (Oregon) - closest
-            
-            # Africa Regions
-            'af-south-1': 'EUROPE-WEST1',  # Cape Town -> Europe West (Belgium) - closest geographically
-            
-            # China Regions (special handling - may need different credentials)
-            'cn-north-1': 'ASIA-NORTHEAST1',  # Beijing -> Asia Northeast (Tokyo) - closest
-            'cn-northwest-1': 'ASIA-NORTHEAST1',  # Ningxia -> Asia Northeast (Tokyo) - closest
-            
-            # Israel Regions
-            'il-central-1': 'EUROPE-WEST1',  # Tel Aviv -> Europe West (Belgium) - closest
-            
-            # Default fallback
-            'default': 'US',  # Default to US multi-region
-        }
+        return dict(_AWS_REGION_TO_GCS_LOCATION)
     
     def _map_aws_region_to_gcp_location(self, aws_region: str) -> str:
         """Map an AWS region to the closest GCP Cloud Storage location.
@@ -3721,10 +4446,8 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
         # Normalize the AWS region (remove quotes, whitespace)
         aws_region = aws_region.strip().strip('\'"').lower()
         
-        # Get the mapping
-        region_map = self._get_aws_to_gcp_region_mapping()
-        
         # Standard mapping
+        region_map = _AWS_REGION_TO_GCS_LOCATION
         return region_map.get(aws_region, region_map.get('default', 'US'))
     
     def transform(self, code: str, recipe: Dict[str, Any]) -> str:
@@ -3734,36 +4457,16 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
         
         if operation == 'service_migration' and service_type:
             # Handle specific service migration
-            if service_type == 's3_to_gcs':
-                transformed_code, var_mapping = self._migrate_s3_to_gcs(code)
+            migrate = self._migrations.get(service_type)
+            if migrate is not None:
+                # Re-running a migration on its own output would only rework it
+                already_migrated = _is_already_migrated(code, service_type)
+                if service_type not in _VARIABLE_MAPPING_SERVICE_TYPES:
+                    return code if already_migrated else migrate(code)
+                transformed_code, var_mapping = (code, {}) if already_migrated else migrate(code)
                 # Store variable mapping for later retrieval
-                if not hasattr(self, '_variable_mappings'):
-                    self._variable_mappings = {}
-                self._variable_mappings[id(code)] = var_mapping
-                return transformed_code
-            elif service_type == 'lambda_to_cloud_functions':
-                transformed_code, var_mapping = self._migrate_lambda_to_cloud_functions(code)
-                # Store variable mapping
-                if not hasattr(self, '_variable_mappings'):
-                    self._variable_mappings = {}
-                self._variable_mappings[id(code)] = var_mapping
+                self._variable_mappings.put(_source_digest(code), var_mapping)
                 return transformed_code
-            elif service_type == 'dynamodb_to_firestore':
-                return self._migrate_dynamodb_to_firestore(code)
-            elif service_type == 'sqs_to_pubsub':
-                return self._migrate_sqs_to_pubsub(code)
-            elif service_type == 'sns_to_pubsub':
-                return self._migrate_sns_to_pubsub(code)
-            elif service_type == 'rds_to_cloud_sql':
-                return self._migrate_rds_to_cloud_sql(code)
-            elif service_type == 'cloudwatch_to_monitoring':
-                return self._migrate_cloudwatch_to_monitoring(code)
-            elif service_type == 'apigateway_to_apigee':
-                return self._migrate_apigateway_to_apigee(code)
-            elif service_type == 'eks_to_gke':
-                return self._migrate_eks_to_gke(code)
-            elif service_type == 'fargate_to_cloudrun':
-                return self._migrate_fargate_to_cloudrun(code)
 
         # If no specific service migration, try to detect and migrate automatically
         return self._auto_detect_and_migrate(code)
@@ -3773,165 +4476,36 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
         # This would analyze the code to identify which AWS services are being used
         # and apply appropriate transformations
         result_code = code
+        # Most rewrite rules only match code that mentions boto3; skip them for
+        # code that never does
+        has_boto3 = _BOTO3_ANY_CASE_RE.search(code) is not None
         
         # CRITICAL FIRST PASS: Catch ALL boto3.client() patterns BEFORE anything else
-        # This ensures we catch patterns like dynamodb_client = boto3.client('dynamodb')
-        # BEFORE they get into the refactored code
-        
-        # Pattern: dynamodb_client = boto3.client('dynamodb')
-        result_code = re.sub(
-            r'(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]dynamodb[\'\"][^\)]*\)',
-            r'\1 = firestore.Client()',
-            result_code,
-            flags=re.DOTALL | re.IGNORECASE
-        )
-        
-        # Pattern: sqs_client = boto3.client('sqs')
-        result_code = re.sub(
-            r'(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]sqs[\'\"][^\)]*\)',
-            r'\1 = pubsub_v1.PublisherClient()',
-            result_code,
-            flags=re.DOTALL | re.IGNORECASE
-        )
-        
-        # Pattern: sns_client = boto3.client('sns')
-        result_code = re.sub(
-            r'(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]sns[\'\"][^\)]*\)',
-            r'\1 = pubsub_v1.PublisherClient()',
-            result_code,
-            flags=re.DOTALL | re.IGNORECASE
-        )
-        
-        # Pattern: s3_client = boto3.client('s3') or s3 = boto3.client('s3')
-        result_code = re.sub(
-            r'(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]s3[\'\"][^\)]*\)',
-            r'\1 = storage.Client()',
-            result_code,
-            flags=re.DOTALL | re.IGNORECASE
-        )
-        
-        # Pattern: lambda_client = boto3.client('lambda')
-        result_code = re.sub(
-            r'(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]lambda[\'\"][^\)]*\)',
-            r'\1 = functions_v2.FunctionServiceClient()',
-            result_code,
-            flags=re.DOTALL | re.IGNORECASE
-        )
-        
-        # CRITICAL: Fix variable names AFTER client replacement
-        # Pattern: dynamodb_client = ... -> firestore_db = ...
-        result_code = re.sub(r'\bdynamodb_client\s*=\s*', 'firestore_db = ', result_code)
-        result_code = re.sub(r'\bdynamodb_client\.', 'firestore_db.', result_code)
-        
-        # Pattern: sqs_client = ... -> pubsub_publisher = ...
-        result_code = re.sub(r'\bsqs_client\s*=\s*', 'pubsub_publisher = ', result_code)
-        result_code = re.sub(r'\bsqs_client\.', 'pubsub_publisher.', result_code)
-        
-        # Pattern: sns_client = ... -> pubsub_publisher = ...
-        result_code = re.sub(r'\bsns_client\s*=\s*', 'pubsub_publisher = ', result_code)
-        result_code = re.sub(r'\bsns_client\.', 'pubsub_publisher.', result_code)
-        
-        # Pattern: s3_client = storage.Client() -> storage_client = storage.Client()
-        result_code = re.sub(r'\bs3_client\s*=\s*storage\.Client\(\)', 'storage_client = storage.Client()', result_code)
-        result_code = re.sub(r'\bs3_client\.', 'storage_client.', result_code)
-        
-        # CRITICAL: Fix AWS API method calls
-        # Pattern: s3_client.get_object(Bucket=..., Key=...) -> bucket.blob pattern
-        result_code = re.sub(
-            r'(\w+)\s*=\s*(\w+)\.get_object\s*\(\s*Bucket\s*=\s*([^,]+),\s*Key\s*=\s*([^,\)]+)\s*\)',
-            r'bucket = storage_client.bucket(\3)\n    blob = bucket.blob(\4)\n    csv_content = blob.download_as_text()',
-            result_code,
-            flags=re.DOTALL
-        )
-        
-        # Pattern: response['Body'].read().decode('utf-8') -> csv_content
-        result_code = re.sub(r"response\['Body'\]\.read\(\)\.decode\(['\"]utf-8['\"]\)", 'csv_content', result_code)
-        result_code = re.sub(r'response\["Body"\]\.read\(\)\.decode\(["\']utf-8["\']\)', 'csv_content', result_code)
-        
-        # CRITICAL: Fix lambda_handler
-        result_code = re.sub(
-            r'def\s+lambda_handler\s*\(\s*event\s*,\s*context\s*\)\s*:',
-            'def process_gcs_file(data, context):\n    """\n    Background Cloud Function triggered by a new file in Cloud Storage.\n    The \'data\' parameter contains the bucket and file information.\n    The \'context\' parameter provides event metadata.\n    """',
-            result_code,
-            flags=re.IGNORECASE
-        )
-        
-        # CRITICAL: Fix event['Records'] patterns
-        result_code = re.sub(
-            r'for\s+record_event\s+in\s+event\[[\'"]Records[\'"]\]\s*:',
-            '# GCS background function receives single file event, not a list\n    # Process the single file event',
-            result_code
-        )
-        result_code = re.sub(
-            r'if\s+not\s+event\.get\([\'"]Records[\'"]\)\s*:',
-            'if not data.get(\'bucket\') or not data.get(\'name\'):',
-            result_code
-        )
-        
-        # CRITICAL: Fix environment variables
-        result_code = re.sub(r"DYNAMODB_TABLE_NAME", 'FIRESTORE_COLLECTION_NAME', result_code)
-        result_code = re.sub(r"SQS_DLQ_URL", 'PUB_SUB_ERROR_TOPIC', result_code)
-        result_code = re.sub(r"SNS_TOPIC_ARN", 'PUB_SUB_SUMMARY_TOPIC', result_code)
+        if has_boto3:
+            result_code = _apply_call_rewrites(result_code, _AUTO_DETECT_FIRST_PASS_REWRITES)
+        else:
+            result_code = _apply_call_rewrites(result_code, _AUTO_DETECT_FIRST_PASS_NON_BOTO3_REWRITES)
         
         # CRITICAL: Ensure imports are present
+        missing_imports = []
         if 'firestore.Client()' in result_code or 'firestore_db' in result_code:
             if 'from google.cloud import firestore' not in result_code:
-                lines = result_code.split('\n')
-                import_idx = 0
-                for i, line in enumerate(lines):
-                    if line.strip().startswith('import') or line.strip().startswith('from'):
-                        import_idx = i + 1
-                    elif line.strip() and not line.strip().startswith('#'):
-                        break
-                lines.insert(import_idx, 'from google.cloud import firestore')
-                result_code = '\n'.join(lines)
-        
+                missing_imports.append('from google.cloud import firestore')
         if 'pubsub_v1.PublisherClient()' in result_code or 'pubsub_publisher' in result_code:
             if 'from google.cloud import pubsub_v1' not in result_code:
-                lines = result_code.split('\n')
-                import_idx = 0
-                for i, line in enumerate(lines):
-                    if line.strip().startswith('import') or line.strip().startswith('from'):
-                        import_idx = i + 1
-                    elif line.strip() and not line.strip().startswith('#'):
-                        break
-                lines.insert(import_idx, 'from google.cloud import pubsub_v1')
-                result_code = '\n'.join(lines)
-        
+                missing_imports.append('from google.cloud import pubsub_v1')
         if 'storage.Client()' in result_code or 'storage_client' in result_code:
             if 'from google.cloud import storage' not in result_code:
-                lines = result_code.split('\n')
-                import_idx = 0
-                for i, line in enumerate(lines):
-                    if line.strip().startswith('import') or line.strip().startswith('from'):
-                        import_idx = i + 1
-                    elif line.strip() and not line.strip().startswith('#'):
-                        break
-                lines.insert(import_idx, 'from google.cloud import storage')
-                result_code = '\n'.join(lines)
+                missing_imports.append('from google.cloud import storage')
+        if missing_imports:
+            result_code = _insert_imports(result_code, missing_imports)
         
         # CRITICAL: Remove boto3 import if present
-        result_code = re.sub(r'^import boto3\s*$', '', result_code, flags=re.MULTILINE)
-        result_code = re.sub(r'^from boto3.*$', '', result_code, flags=re.MULTILINE)
-        
-        services_found = []
+        if has_boto3:
+            result_code = _apply_rewrites(result_code, _BOTO3_IMPORT_REMOVALS)
         
         # Detect which services are present - check for actual usage patterns
-        if re.search(r'boto3\.(client|resource)\([\'\"]s3[\'\"]', result_code, re.IGNORECASE) or \
-           re.search(r'\.(upload_file|download_file|put_object|get_object|delete_object|list_objects)', result_code):
-            services_found.append('s3')
-        if re.search(r'boto3\.(client|resource)\([\'\"]lambda[\'\"]', result_code, re.IGNORECASE) or \
-           'lambda_handler' in result_code or re.search(r'\.invoke\(', result_code):
-            services_found.append('lambda')
-        if re.search(r'boto3\.(client|resource)\([\'\"]dynamodb[\'\"]', result_code, re.IGNORECASE) or \
-           re.search(r'\.(put_item|get_item|query|scan|batch_writer)', result_code):
-            services_found.append('dynamodb')
-        if re.search(r'boto3\.(client|resource)\([\'\"]sqs[\'\"]', result_code, re.IGNORECASE) or \
-           re.search(r'\.(send_message|receive_message|delete_message)', result_code):
-            services_found.append('sqs')
-        if re.search(r'boto3\.(client|resource)\([\'\"]sns[\'\"]', result_code, re.IGNORECASE) or \
-           re.search(r'\.(publish|subscribe)', result_code):
-            services_found.append('sns')
+        services_found = _detect_aws_services(result_code)
         
         # Process in order: Lambda first (may contain S3), then S3, then others
         # Lambda handlers often contain S3 code, so process Lambda first
@@ -3939,300 +4513,103 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
             try:
                 result_code, var_mapping = self._migrate_lambda_to_cloud_functions(result_code)
                 # Store variable mapping
-                if not hasattr(self, '_variable_mappings'):
-                    self._variable_mappings = {}
-                self._variable_mappings[id(result_code)] = var_mapping
+                self._variable_mappings.put(_source_digest(result_code), var_mapping)
             except Exception as e:
                 import logging
                 logging.warning(f"Lambda migration failed: {e}")
         
         # Then process S3 (most common standalone service)
         # Check again after Lambda transformation - be more aggressive
-        if 's3' in services_found or re.search(r'boto3\.(client|resource)\([\'\"]s3[\'\"]', result_code, re.IGNORECASE) or \
-           re.search(r'\.(upload_file|download_file|put_object|get_object|delete_object)', result_code):
+        if 's3' in services_found or _BOTO3_SERVICE_CLIENT_RES['s3'].search(result_code) or \
+           _S3_OBJECT_CALL_RE.search(result_code):
             try:
                 result_code, var_mapping = self._migrate_s3_to_gcs(result_code)
                 # Store variable mapping
-                if not hasattr(self, '_variable_mappings'):
-                    self._variable_mappings = {}
-                self._variable_mappings[id(result_code)] = var_mapping
+                self._variable_mappings.put(_source_digest(result_code), var_mapping)
             except Exception as e:
                 import logging
                 logging.warning(f"S3 migration failed: {e}")
                 # Fallback: at least replace boto3.client('s3')
-                result_code = re.sub(r'boto3\.client\([\'\"]s3[\'\"]\)', 'storage.Client()', result_code)
-                result_code = re.sub(r'boto3\.resource\([\'\"]s3[\'\"]\)', 'storage.Client()', result_code)
+                result_code = _BOTO3_S3_CLIENT_CALL_RE.sub('storage.Client()', result_code)
+                result_code = _BOTO3_S3_RESOURCE_CALL_RE.sub('storage.Client()', result_code)
         
         # Process other services - check again after previous transformations
-        if 'dynamodb' in services_found or re.search(r'boto3\.(client|resource)\([\'\"]dynamodb[\'\"]', result_code, re.IGNORECASE):
+        if 'dynamodb' in services_found or _BOTO3_SERVICE_CLIENT_RES['dynamodb'].search(result_code):
             try:
                 result_code = self._migrate_dynamodb_to_firestore(result_code)
             except Exception as e:
                 import logging
                 logging.warning(f"DynamoDB migration failed: {e}")
                 # Fallback
-                result_code = re.sub(r'boto3\.client\([\'\"]dynamodb[\'\"]\)', 'firestore.Client()', result_code)
-                result_code = re.sub(r'boto3\.resource\([\'\"]dynamodb[\'\"]\)', 'firestore.Client()', result_code)
+                result_code = _BOTO3_DYNAMODB_CLIENT_CALL_RE.sub('firestore.Client()', result_code)
+                result_code = _BOTO3_DYNAMODB_RESOURCE_CALL_RE.sub('firestore.Client()', result_code)
         
-        if 'sqs' in services_found or re.search(r'boto3\.(client|resource)\([\'\"]sqs[\'\"]', result_code, re.IGNORECASE):
+        if 'sqs' in services_found or _BOTO3_SERVICE_CLIENT_RES['sqs'].search(result_code):
             try:
                 result_code = self._migrate_sqs_to_pubsub(result_code)
             except Exception as e:
                 import logging
                 logging.warning(f"SQS migration failed: {e}")
                 # Fallback
-                result_code = re.sub(r'boto3\.client\([\'\"]sqs[\'\"]\)', 'pubsub_v1.PublisherClient()', result_code)
+                result_code = _BOTO3_SQS_CLIENT_CALL_RE.sub('pubsub_v1.PublisherClient()', result_code)
         
-        if 'sns' in services_found or re.search(r'boto3\.(client|resource)\([\'\"]sns[\'\"]', result_code, re.IGNORECASE):
+        if 'sns' in services_found or _BOTO3_SERVICE_CLIENT_RES['sns'].search(result_code):
             try:
                 result_code = self._migrate_sns_to_pubsub(result_code)
             except Exception as e:
                 import logging
                 logging.warning(f"SNS migration failed: {e}")
                 # Fallback
-                result_code = re.sub(r'boto3\.client\([\'\"]sns[\'\"]\)', 'pubsub_v1.PublisherClient()', result_code)
+                result_code = _BOTO3_SNS_CLIENT_CALL_RE.sub('pubsub_v1.PublisherClient()', result_code)
+        
+        # Migration templates (e.g. the DynamoDB export script) may add boto3
+        has_boto3 = _BOTO3_ANY_CASE_RE.search(result_code) is not None
         
         # Final cleanup: remove any remaining boto3 imports if all services migrated
         # Check if boto3 is still used (not just in comments/strings)
-        lines = result_code.split('\n')
-        has_boto3_usage = False
-        for line in lines:
-            stripped = line.strip()
-            if stripped.startswith('#'):
-                continue
-            if '"""' in line or "'''" in line:
-                continue
-            if re.search(r'\bboto3\b', line):
-                has_boto3_usage = True
-                break
+        has_boto3_usage = has_boto3 and _BOTO3_USAGE_LINE_RE.search(result_code) is not None
         
-        if not has_boto3_usage:
+        if has_boto3 and not has_boto3_usage:
             # Remove empty import lines
-            result_code = re.sub(r'^import boto3\s*$', '', result_code, flags=re.MULTILINE)
-            result_code = re.sub(r'^from boto3.*$', '', result_code, flags=re.MULTILINE)
+            result_code = _apply_rewrites(result_code, _BOTO3_IMPORT_REMOVALS)
         
         # Clean up multiple blank lines
-        result_code = re.sub(r'\n{3,}', '\n\n', result_code)
+        result_code = _EXCESS_BLANK_LINES_RE.sub('\n\n', result_code)
         
         # Final pass: ensure no boto3.client/resource calls remain
-        # Handle with and without region_name parameter
-        # Replace standalone calls
-        result_code = re.sub(r'boto3\.client\s*\(\s*[\'\"]s3[\'\"][^\)]*\)', 'storage.Client()', result_code)
-        result_code = re.sub(r'boto3\.resource\s*\(\s*[\'\"]s3[\'\"][^\)]*\)', 'storage.Client()', result_code)
-        result_code = re.sub(r'boto3\.client\s*\(\s*[\'\"]dynamodb[\'\"][^\)]*\)', 'firestore.Client()', result_code)
-        result_code = re.sub(r'boto3\.resource\s*\(\s*[\'\"]dynamodb[\'\"][^\)]*\)', 'firestore.Client()', result_code)
-        result_code = re.sub(r'boto3\.client\s*\(\s*[\'\"]sqs[\'\"][^\)]*\)', 'pubsub_v1.PublisherClient()', result_code)
-        result_code = re.sub(r'boto3\.client\s*\(\s*[\'\"]lambda[\'\"][^\)]*\)', 'functions_v2.FunctionServiceClient()', result_code)
-        # Replace with variable assignments
-        result_code = re.sub(r'(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]s3[\'\"][^\)]*\)', r'\1 = storage.Client()', result_code)
-        result_code = re.sub(r'(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]sqs[\'\"][^\)]*\)', r'\1 = pubsub_v1.PublisherClient()', result_code)
-        result_code = re.sub(r'(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]dynamodb[\'\"][^\)]*\)', r'\1 = firestore.Client()', result_code)
-        result_code = re.sub(r'(\w+)\s*=\s*boto3\.resource\s*\(\s*[\'\"]s3[\'\"][^\)]*\)', r'\1 = storage.Client()', result_code)
-        result_code = re.sub(r'(\w+)\s*=\s*boto3\.resource\s*\(\s*[\'\"]dynamodb[\'\"][^\)]*\)', r'\1 = firestore.Client()', result_code)
-        
-        # AGGRESSIVE CLEANUP: Fix variable names that were incorrectly assigned
-        # Pattern: s3_client = storage.Client() -> storage_client = storage.Client()
-        result_code = re.sub(r'\bs3_client\s*=\s*storage\.Client\(\)', 'storage_client = storage.Client()', result_code)
-        # Pattern: s3_client.get_object(...) -> Fix to use bucket.blob pattern
-        # This should have been caught by S3 migration, but ensure it's fixed
-        result_code = re.sub(
-            r'(\w+)\s*=\s*s3_client\.get_object\(Bucket=([^,]+),\s*Key=([^,\)]+)\)',
-            r'bucket = storage_client.bucket(\2)\n    blob = bucket.blob(\3)\n    csv_content = blob.download_as_text()',
-            result_code
-        )
-        # Pattern: response = s3_client.get_object(...) -> Fix
-        result_code = re.sub(
-            r'response\s*=\s*s3_client\.get_object\(Bucket=([^,]+),\s*Key=([^,\)]+)\)',
-            r'bucket = storage_client.bucket(\1)\n    blob = bucket.blob(\2)\n    csv_content = blob.download_as_text()',
-            result_code
-        )
-        # Pattern: Replace s3_client. method calls with storage_client.
-        result_code = re.sub(r'\bs3_client\.', 'storage_client.', result_code)
-        
-        # AGGRESSIVE: Fix DynamoDB client assignments that weren't caught
-        # Pattern: dynamodb_client = boto3.client('dynamodb') -> firestore_db = firestore.Client()
-        result_code = re.sub(
-            r'dynamodb_client\s*=\s*boto3\.client\([\'\"]dynamodb[\'\"][^\)]*\)',
-            'firestore_db = firestore.Client()',
-            result_code,
-            flags=re.DOTALL
-        )
-        # Pattern: dynamodb_client = ... -> firestore_db = ...
-        result_code = re.sub(r'\bdynamodb_client\s*=\s*', 'firestore_db = ', result_code)
-        # Pattern: dynamodb_client. method calls -> firestore_db.
-        result_code = re.sub(r'\bdynamodb_client\.', 'firestore_db.', result_code)
-        
-        # AGGRESSIVE: Fix SQS client assignments
-        # Pattern: sqs_client = boto3.client('sqs') -> pubsub_publisher = pubsub_v1.PublisherClient()
-        result_code = re.sub(
-            r'sqs_client\s*=\s*boto3\.client\([\'\"]sqs[\'\"][^\)]*\)',
-            'pubsub_publisher = pubsub_v1.PublisherClient()',
-            result_code,
-            flags=re.DOTALL
-        )
-        # Pattern: sqs_client = ... -> pubsub_publisher = ...
-        result_code = re.sub(r'\bsqs_client\s*=\s*', 'pubsub_publisher = ', result_code)
-        # Pattern: sqs_client. method calls -> pubsub_publisher.
-        result_code = re.sub(r'\bsqs_client\.', 'pubsub_publisher.', result_code)
-        
-        # AGGRESSIVE: Fix SNS client assignments
-        # Pattern: sns_client = boto3.client('sns') -> pubsub_publisher = pubsub_v1.PublisherClient()
-        result_code = re.sub(
-            r'sns_client\s*=\s*boto3\.client\([\'\"]sns[\'\"][^\)]*\)',
-            'pubsub_publisher = pubsub_v1.PublisherClient()',
-            result_code,
-            flags=re.DOTALL
-        )
-        # Pattern: sns_client = ... -> pubsub_publisher = ...
-        result_code = re.sub(r'\bsns_client\s*=\s*', 'pubsub_publisher = ', result_code)
-        # Pattern: sns_client. method calls -> pubsub_publisher.
-        result_code = re.sub(r'\bsns_client\.', 'pubsub_publisher.', result_code)
-        
-        # AGGRESSIVE: Fix environment variable names
-        result_code = re.sub(r"DYNAMODB_TABLE_NAME", 'FIRESTORE_COLLECTION_NAME', result_code)
-        result_code = re.sub(r"SQS_DLQ_URL", 'PUB_SUB_ERROR_TOPIC', result_code)
-        result_code = re.sub(r"SNS_TOPIC_ARN", 'PUB_SUB_SUMMARY_TOPIC', result_code)
-        
-        # AGGRESSIVE: Fix AWS API method calls that weren't caught
-        # Pattern: s3_client.get_object(Bucket=..., Key=...) -> bucket.blob pattern
-        result_code = re.sub(
-            r'(\w+)\s*=\s*(\w+)\.get_object\(Bucket=([^,]+),\s*Key=([^,\)]+)\)',
-            r'bucket = storage_client.bucket(\3)\n    blob = bucket.blob(\4)\n    csv_content = blob.download_as_text()',
-            result_code
-        )
-        # Pattern: response['Body'].read().decode('utf-8') -> csv_content
-        result_code = re.sub(r"response\['Body'\]\.read\(\)\.decode\(['\"]utf-8['\"]\)", 'csv_content', result_code)
-        result_code = re.sub(r'response\["Body"\]\.read\(\)\.decode\(["\']utf-8["\']\)', 'csv_content', result_code)
-        
-        # AGGRESSIVE: Fix lambda_handler if still present
-        result_code = re.sub(
-            r'def\s+lambda_handler\s*\(\s*event\s*,\s*context\s*\)\s*:',
-            'def process_gcs_file(data, context):\n    """\n    Background Cloud Function triggered by a new file in Cloud Storage.\n    The \'data\' parameter contains the bucket and file information.\n    The \'context\' parameter provides event metadata.\n    """',
-            result_code,
-            flags=re.IGNORECASE
-        )
-        
-        # AGGRESSIVE: Fix event['Records'] patterns
-        result_code = re.sub(
-            r'for\s+record_event\s+in\s+event\[[\'"]Records[\'"]\]\s*:',
-            '# GCS background function receives single file event, not a list\n    # Process the single file event',
-            result_code
-        )
-        result_code = re.sub(
-            r'if\s+not\s+event\.get\([\'"]Records[\'"]\)\s*:',
-            'if not data.get(\'bucket\') or not data.get(\'name\'):',
-            result_code
-        )
-        
-        # AGGRESSIVE: Remove AWS comments
-        result_code = re.sub(r'#\s*AWS\s+Clients?\s*', '# Google Cloud Clients', result_code, flags=re.IGNORECASE)
-        result_code = re.sub(r'#\s*AWS\s+.*', '', result_code, flags=re.IGNORECASE)
+        if has_boto3:
+            result_code = _apply_call_rewrites(result_code, _AUTO_DETECT_CLEANUP_REWRITES)
+        else:
+            result_code = _apply_call_rewrites(result_code, _AUTO_DETECT_CLEANUP_NON_BOTO3_REWRITES)
         
         # AGGRESSIVE: Ensure required imports are present
+        missing_imports = []
         if 'storage_client' in result_code or 'storage.Client()' in result_code:
             if 'from google.cloud import storage' not in result_code:
-                # Add import at the top
-                lines = result_code.split('\n')
-                import_idx = 0
-                for i, line in enumerate(lines):
-                    if line.strip().startswith('import') or line.strip().startswith('from'):
-                        import_idx = i + 1
-                    elif line.strip() and not line.strip().startswith('#'):
-                        break
-                lines.insert(import_idx, 'from google.cloud import storage')
-                result_code = '\n'.join(lines)
-        
+                missing_imports.append('from google.cloud import storage')
         if 'firestore_db' in result_code or 'firestore.Client()' in result_code:
             if 'from google.cloud import firestore' not in result_code:
-                lines = result_code.split('\n')
-                import_idx = 0
-                for i, line in enumerate(lines):
-                    if line.strip().startswith('import') or line.strip().startswith('from'):
-                        import_idx = i + 1
-                    elif line.strip() and not line.strip().startswith('#'):
-                        break
-                lines.insert(import_idx, 'from google.cloud import firestore')
-                result_code = '\n'.join(lines)
-        
+                missing_imports.append('from google.cloud import firestore')
         if 'pubsub_publisher' in result_code or 'pubsub_v1' in result_code:
             if 'from google.cloud import pubsub_v1' not in result_code:
-                lines = result_code.split('\n')
-                import_idx = 0
-                for i, line in enumerate(lines):
-                    if line.strip().startswith('import') or line.strip().startswith('from'):
-                        import_idx = i + 1
-                    elif line.strip() and not line.strip().startswith('#'):
-                        break
-                lines.insert(import_idx, 'from google.cloud import pubsub_v1')
-                result_code = '\n'.join(lines)
+                missing_imports.append('from google.cloud import pubsub_v1')
+        if missing_imports:
+            result_code = _insert_imports(result_code, missing_imports)
         
         # Final cleanup: remove boto3 import if no boto3 usage remains
-        lines = result_code.split('\n')
-        has_boto3_usage = False
-        for line in lines:
-            stripped = line.strip()
-            if stripped.startswith('#'):
-                continue
-            if '"""' in line or "'''" in line:
-                continue
-            if re.search(r'\bboto3\b', line) and not stripped.startswith('import'):
-                has_boto3_usage = True
-                break
+        has_boto3_usage = has_boto3 and _BOTO3_NON_IMPORT_USAGE_LINE_RE.search(result_code) is not None
         
-        if not has_boto3_usage:
-            result_code = re.sub(r'^import boto3\s*$', '', result_code, flags=re.MULTILINE)
-            result_code = re.sub(r'^from boto3.*$', '', result_code, flags=re.MULTILINE)
+        if has_boto3 and not has_boto3_usage:
+            result_code = _apply_rewrites(result_code, _BOTO3_IMPORT_REMOVALS)
         
         # FINAL AGGRESSIVE PASS: Catch ANY remaining AWS patterns before Gemini
         # This is a safety net to ensure we catch everything
         
         # Catch any remaining boto3.client() calls
-        result_code = re.sub(
-            r'(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]dynamodb[\'\"][^\)]*\)',
-            r'\1 = firestore.Client()',
-            result_code,
-            flags=re.DOTALL | re.IGNORECASE
-        )
-        result_code = re.sub(
-            r'(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]sqs[\'\"][^\)]*\)',
-            r'\1 = pubsub_v1.PublisherClient()',
-            result_code,
-            flags=re.DOTALL | re.IGNORECASE
-        )
-        result_code = re.sub(
-            r'(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]sns[\'\"][^\)]*\)',
-            r'\1 = pubsub_v1.PublisherClient()',
-            result_code,
-            flags=re.DOTALL | re.IGNORECASE
-        )
-        result_code = re.sub(
-            r'(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]s3[\'\"][^\)]*\)',
-            r'\1 = storage.Client()',
-            result_code,
-            flags=re.DOTALL | re.IGNORECASE
-        )
-        
-        # Catch any remaining AWS variable names
-        result_code = re.sub(r'\bdynamodb_client\b', 'firestore_db', result_code)
-        result_code = re.sub(r'\bsqs_client\b', 'pubsub_publisher', result_code)
-        result_code = re.sub(r'\bsns_client\b', 'pubsub_publisher', result_code)
-        result_code = re.sub(r'\bs3_client\b', 'storage_client', result_code)
-        
-        # Catch any remaining AWS API calls
-        result_code = re.sub(
-            r'(\w+)\.get_object\s*\(\s*Bucket\s*=\s*([^,]+),\s*Key\s*=\s*([^,\)]+)\s*\)',
-            r'bucket = storage_client.bucket(\2)\n    blob = bucket.blob(\3)\n    csv_content = blob.download_as_text()',
-            result_code,
-            flags=re.DOTALL
-        )
-        
-        # Catch any remaining lambda_handler
-        result_code = re.sub(
-            r'def\s+lambda_handler\s*\(\s*event\s*,\s*context\s*\)\s*:',
-            'def process_gcs_file(data, context):\n    """\n    Background Cloud Function triggered by a new file in Cloud Storage.\n    The \'data\' parameter contains the bucket and file information.\n    The \'context\' parameter provides event metadata.\n    """',
-            result_code,
-            flags=re.IGNORECASE
-        )
+        if has_boto3:
+            result_code = _apply_call_rewrites(result_code, _AUTO_DETECT_FINAL_REWRITES)
+        else:
+            result_code = _apply_call_rewrites(result_code, _AUTO_DETECT_FINAL_NON_BOTO3_REWRITES)
         
         # IMPORTANT: After all service migrations, use Gemini to validate and fix any remaining AWS patterns
         # This ensures complete transformation for multi-service code
@@ -4241,86 +4618,6 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
 
         return result_code
     
-    def _get_aws_to_gcp_region_mapping(self) -> dict:
-        """Get comprehensive mapping of AWS regions to Google Cloud Storage locations.
-        
-        Returns:
-            dict: Mapping of AWS region names to GCP location names
-        """
-        return {
-            # US Regions
-            'us-east-1': 'US-EAST1',      # N. Virginia -> US East (South Carolina)
-            'us-east-2': 'US-EAST4',      # Ohio -> US East (N. Virginia)
-            'us-west-1': 'US-WEST1',      # N. California -> US West (Oregon)
-            'us-west-2': 'US-WEST1',      # Oregon -> US West (Oregon) - closest match
-            
-            # Europe Regions
-            'eu-west-1': 'EUROPE-WEST1',  # Ireland -> Europe West (Belgium)
-            'eu-west-2': 'EUROPE-WEST2',  # London -> Europe West (London)
-            'eu-west-3': 'EUROPE-WEST3',  # Paris -> Europe West (Frankfurt)
-            'eu-central-1': 'EUROPE-WEST3',  # Frankfurt -> Europe West (Frankfurt)
-            'eu-central-2': 'EUROPE-CENTRAL2',  # Zurich -> Europe Central (Warsaw)
-            'eu-north-1': 'EUROPE-NORTH1',  # Stockholm -> Europe North (Finland)
-            'eu-south-1': 'EUROPE-WEST4',  # Milan -> Europe West (Netherlands)
-            'eu-south-2': 'EUROPE-WEST4',  # Spain -> Europe West (Netherlands)
-            
-            # Asia Pacific Regions
-            'ap-southeast-1': 'ASIA-SOUTHEAST1',  # Singapore -> Asia Southeast (Singapore)
-            'ap-southeast-2': 'AUSTRALIA-SOUTHEAST1',  # Sydney -> Australia Southeast (Sydney)
-            'ap-southeast-3': 'ASIA-SOUTHEAST2',  # Jakarta -> Asia Southeast (Jakarta)
-            'ap-southeast-4': 'AUSTRALIA-SOUTHEAST2',  # Melbourne -> Australia Southeast (Melbourne)
-            'ap-southeast-5': 'ASIA-SOUTHEAST1',  # Bangkok -> Asia Southeast (Singapore) - closest
-            'ap-northeast-1': 'ASIA-NORTHEAST1',  # Tokyo -> Asia Northeast (Tokyo)
-            'ap-northeast-2': 'ASIA-NORTHEAST2',  # Seoul -> Asia Northeast (Osaka)
-            'ap-northeast-3': 'ASIA-NORTHEAST3',  # Osaka -> Asia Northeast (Seoul)
-            'ap-south-1': 'ASIA-SOUTH1',  # Mumbai -> Asia South (Mumbai)
-            'ap-south-2': 'ASIA-SOUTH1',  # Hyderabad -> Asia South (Mumbai) - closest
-            'ap-east-1': 'ASIA-EAST1',    # Hong Kong -> Asia East (Taiwan)
-            
-            # Middle East Regions
-            'me-south-1': 'ASIA-SOUTH1',     # Bahrain -> Asia South (Mumbai) - closest
-            'me-central-1': 'ASIA-SOUTH1',   # UAE -> Asia South (Mumbai) - closest
-            'me-central-2': 'ASIA-SOUTH1',   # UAE -> Asia South (Mumbai) - closest
-            
-            # South America Regions
-            'sa-east-1': 'SOUTHAMERICA-EAST1',  # São Paulo -> South America East (São Paulo)
-            
-            # Canada Regions
-            'ca-central-1': 'US-EAST1',      # Montreal -> US East (South Carolina) - closest
-            'ca-west-1': 'US-WEST1',      # Calgary -> US West (Oregon) - closest
-            
-            # Africa Regions
-            'af-south-1': 'EUROPE-WEST1',  # Cape Town -> Europe West (Belgium) - closest geographically
-            
-            # China Regions (special handling - may need different credentials)
-            'cn-north-1': 'ASIA-NORTHEAST1',  # Beijing -> Asia Northeast (Tokyo) - closest
-            'cn-northwest-1': 'ASIA-NORTHEAST1',  # Ningxia -> Asia Northeast (Tokyo) - closest
-            
-            # Israel Regions
-            'il-central-1': 'EUROPE-WEST1',  # Tel Aviv -> Europe West (Belgium) - closest
-            
-            # Default fallback
-            'default': 'US',  # Default to US multi-region
-        }
-    
-    def _map_aws_region_to_gcp_location(self, aws_region: str) -> str:
-        """Map an AWS region to the closest GCP Cloud Storage location.
-        
-        Args:
-            aws_region: AWS region name (e.g., 'us-east-1', 'eu-west-1')
-            
-        Returns:
-            str: GCP location name (e.g., 'US-EAST1', 'EUROPE-WEST1')
-        """
-        # Normalize the AWS region (remove quotes, whitespace)
-        aws_region = aws_region.strip().strip('\'"').lower()
-        
-        # Get the mapping
-        region_map = self._get_aws_to_gcp_region_mapping()
-        
-        # Standard mapping
-        return region_map.get(aws_region, region_map.get('default', 'US'))
-    
     def _migrate_s3_to_gcs(self, code: str) -> tuple[str, dict]:
         """Migrate AWS S3 to Google Cloud Storage with improved structure and variable naming.
         
@@ -4338,21 +4635,24 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
         
         variable_mapping = {}  # Track ALL variable name changes for GCP-friendly naming
         
+        # Drop S3 client/resource arguments up front, so the call patterns below
+        # also match calls with nested parentheses such as config=Config(...)
+        if 'boto3' in code:
+            code = _strip_boto3_call_arguments(code, 's3')
+        
         # First pass: Identify ALL AWS-related variables BEFORE any transformation
         # Store original code for variable detection
         original_code = code
         
         # Pattern 1: Client variables (s3, s3_client, client when used with boto3.client('s3'))
-        client_pattern = r'(\w+)\s*=\s*boto3\.client\([\'\"]s3[\'\"].*?\)'
-        client_matches = re.finditer(client_pattern, original_code, flags=re.DOTALL)
+        client_matches = _S3_CLIENT_ASSIGNMENT_RE.finditer(original_code)
         for match in client_matches:
             var_name = match.group(1)
             if var_name not in variable_mapping:
                 variable_mapping[var_name] = 'gcs_client'
         
         # Pattern 2: Response variables from S3 list operations
-        response_pattern = r'(\w+)\s*=\s*(\w+)\.list_objects(?:_v2)?\('
-        response_matches = re.finditer(response_pattern, original_code)
+        response_matches = _S3_LIST_OBJECTS_RESPONSE_RE.finditer(original_code)
         for match in response_matches:
             response_var = match.group(1)
             client_var = match.group(2)
@@ -4365,27 +4665,28 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
                         variable_mapping[response_var] = 'blobs'
         
         # Pattern 3: Common AWS variable names (s3_bucket, s3_key, s3_object, etc.)
-        if re.search(r'\bs3_bucket\b', original_code):
+        if _S3_BUCKET_NAME_RE.search(original_code):
             variable_mapping['s3_bucket'] = 'gcs_bucket'
-        if re.search(r'\bs3_key\b', original_code):
+        if _S3_KEY_NAME_RE.search(original_code):
             variable_mapping['s3_key'] = 'blob_name'
-        if re.search(r'\bs3_object\b', original_code):
+        if _S3_OBJECT_NAME_RE.search(original_code):
             variable_mapping['s3_object'] = 'blob'
-        if re.search(r'\bs3_client\b', original_code):
+        if _S3_CLIENT_NAME_RE.search(original_code):
             variable_mapping['s3_client'] = 'gcs_client'
-        if re.search(r'\bs3\b(?=\s*\.)', original_code):
+        if _S3_CLIENT_ATTRIBUTE_RE.search(original_code):
             variable_mapping['s3'] = 'gcs_client'
         
         # Pattern 4: Loop variables (obj in S3 contexts)
-        if re.search(r'for\s+obj\s+in', original_code):
+        if _OBJ_LOOP_RE.search(original_code):
             variable_mapping['obj'] = 'blob'
         
         # Replace boto3 imports with GCS imports - be more aggressive
-        code = re.sub(r'^import\s+boto3\s*$', 'from google.cloud import storage', code, flags=re.MULTILINE)
-        code = re.sub(r'^from\s+boto3\s+', 'from google.cloud import storage', code, flags=re.MULTILINE)
-        # Also catch imports in the middle of the file
-        code = re.sub(r'\nimport\s+boto3\s*\n', '\nfrom google.cloud import storage\n', code)
-        code = re.sub(r'\nfrom\s+boto3\s+', '\nfrom google.cloud import storage ', code)
+        # (every pattern needs a literal "boto3", so skip them once none is left)
+        if 'boto3' in code:
+            code = _apply_rewrites(code, _S3_BOTO3_IMPORT_REWRITES)
+        if 'boto3' in code:
+            # Also catch imports in the middle of the file
+            code = _apply_rewrites(code, _S3_INLINE_BOTO3_IMPORT_REWRITES)
         
         # IMPORTANT: Replace S3 API method calls BEFORE client variable renaming
         # This ensures we catch patterns like s3.create_bucket() before s3 is renamed to gcs_client
@@ -4399,7 +4700,7 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
             
             # Extract location from CreateBucketConfiguration if present
             location = None
-            location_config_match = re.search(r'CreateBucketConfiguration\s*=\s*\{[^}]*LocationConstraint[^}]*:\s*([^,}]+)', full_match)
+            location_config_match = _CREATE_BUCKET_LOCATION_CONSTRAINT_RE.search(full_match)
             if location_config_match:
                 location_value = location_config_match.group(1).strip().strip('\'"')
                 # Map AWS regions to GCP locations using comprehensive mapping
@@ -4407,7 +4708,7 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
             
             # Check for region parameter in function signature (if location not found)
             if location is None:
-                region_match = re.search(r'region\s*=\s*[\'"]([^\'"]+)[\'"]', code)
+                region_match = _REGION_ASSIGNMENT_VALUE_RE.search(code)
                 if region_match:
                     aws_region = region_match.group(1)
                     location = self._map_aws_region_to_gcp_location(aws_region)
@@ -4433,20 +4734,20 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
             client_var = match.group(1)
             
             # Extract bucket name - could be Bucket=bucket_name or just bucket_name
-            bucket_match = re.search(r'Bucket\s*=\s*([^,)]+)', full_match)
+            bucket_match = _BUCKET_ARGUMENT_RE.search(full_match)
             if bucket_match:
                 bucket_name_expr = bucket_match.group(1).strip()
             else:
                 # Try to extract first parameter if Bucket= is not present
-                param_match = re.search(r'create_bucket\(\s*([^,)]+)', full_match)
+                param_match = _CREATE_BUCKET_FIRST_ARGUMENT_RE.search(full_match)
                 bucket_name_expr = param_match.group(1).strip() if param_match else 'bucket_name'
             
             # Extract location from CreateBucketConfiguration
             location = None
-            config_match = re.search(r'CreateBucketConfiguration\s*=\s*\{([^}]+)\}', full_match)
+            config_match = _CREATE_BUCKET_CONFIGURATION_RE.search(full_match)
             if config_match:
                 config_content = config_match.group(1)
-                location_match = re.search(r'LocationConstraint\s*:\s*([^,}]+)', config_content)
+                location_match = _LOCATION_CONSTRAINT_RE.search(config_content)
                 if location_match:
                     location_value = location_match.group(1).strip().strip('\'"')
                     # If it's a string literal, map it directly
@@ -4463,7 +4764,7 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
             
             # Check function parameter default value if location still not found
             if location is None:
-                region_match = re.search(r'region\s*=\s*[\'"]([^\'"]+)[\'"]', code)
+                region_match = _REGION_ASSIGNMENT_VALUE_RE.search(code)
                 if region_match:
                     aws_region = region_match.group(1)
                     location = self._map_aws_region_to_gcp_location(aws_region)
@@ -4506,8 +4807,7 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
             return -1
         
         # Find and replace all create_bucket calls using balanced parentheses
-        create_bucket_pattern = r'(\w+)\.create_bucket\('
-        matches = list(re.finditer(create_bucket_pattern, code))
+        matches = list(_S3_CREATE_BUCKET_CALL_RE.finditer(code))
         # Process matches in reverse order to avoid index shifting issues
         for match in reversed(matches):
             start_pos = match.end() - 1  # Position of opening paren
@@ -4518,20 +4818,20 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
                 client_var = match.group(1)
                 
                 # Extract bucket name
-                bucket_match = re.search(r'Bucket\s*=\s*([^,)]+)', full_call)
+                bucket_match = _BUCKET_ARGUMENT_RE.search(full_call)
                 if bucket_match:
                     bucket_name_expr = bucket_match.group(1).strip()
                 else:
                     # Try first parameter
-                    param_match = re.search(r'create_bucket\(\s*([^,)]+)', full_call)
+                    param_match = _CREATE_BUCKET_FIRST_ARGUMENT_RE.search(full_call)
                     bucket_name_expr = param_match.group(1).strip() if param_match else 'bucket_name'
                 
                 # Extract location from CreateBucketConfiguration
                 location = None
-                config_match = re.search(r'CreateBucketConfiguration\s*=\s*\{([^}]+)\}', full_call)
+                config_match = _CREATE_BUCKET_CONFIGURATION_RE.search(full_call)
                 if config_match:
                     config_content = config_match.group(1)
-                    location_match = re.search(r'LocationConstraint\s*:\s*([^,}]+)', config_content)
+                    location_match = _LOCATION_CONSTRAINT_RE.search(config_content)
                     if location_match:
                         location_value = location_match.group(1).strip().strip('\'"')
                         if location_value and (location_value.startswith("'") or location_value.startswith('"')):
@@ -4547,7 +4847,7 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
                 
                 # Check function parameter default
                 if location is None:
-                    region_match = re.search(r'region\s*=\s*[\'"]([^\'"]+)[\'"]', code)
+                    region_match = _REGION_ASSIGNMENT_VALUE_RE.search(code)
                     if region_match:
                         aws_region = region_match.group(1)
                         location = self._map_aws_region_to_gcp_location(aws_region)
@@ -4666,27 +4966,13 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
         
         # Also handle simple cases without CreateBucketConfiguration (fallback)
         # Match: s3.create_bucket('bucket-name') or s3.create_bucket(Bucket='name')
-        code = re.sub(
-            r'(\w+)\.create_bucket\(\s*([^,\)]+)\s*\)',
+        code = _S3_CREATE_BUCKET_POSITIONAL_RE.sub(
             replace_create_bucket_early,
             code
         )
         
         # Replace boto3.resource('s3') pattern - handle with region_name too
-        code = re.sub(
-            r'(\w+)\s*=\s*boto3\.resource\([\'\"]s3[\'\"][^\)]*\)',
-            r'\1 = storage.Client()',
-            code,
-            flags=re.DOTALL
-        )
-        
-        # Replace boto3.client('s3') pattern - handle with region_name and config too
-        code = re.sub(
-            r'(\w+)\s*=\s*boto3\.client\([\'\"]s3[\'\"][^\)]*\)',
-            r'\1 = storage.Client()',
-            code,
-            flags=re.DOTALL
-        )
+        code = _apply_rewrites(code, _S3_BOTO3_CLIENT_REWRITES)
         
         # Extract bucket and file names from the code to create named variables
         # Try to extract from various S3 operation patterns
@@ -4694,49 +4980,42 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
         file_names = set()
         
         # Extract from upload_file pattern
-        upload_pattern = r'\.upload_file\([\'\"]([^\'\"]+)[\'\"],\s*[\'\"]([^\'\"]+)[\'\"],\s*[\'\"]([^\'\"]+)[\'\"]\)'
-        upload_matches = re.findall(upload_pattern, code)
+        upload_matches = _S3_UPLOAD_FILE_NAMES_RE.findall(code)
         if upload_matches:
             bucket_names.add(upload_matches[0][1])
             file_names.add(upload_matches[0][0])  # local file
             file_names.add(upload_matches[0][2])   # remote file
         
         # Extract from download_file pattern
-        download_pattern = r'\.download_file\([\'\"]([^\'\"]+)[\'\"],\s*[\'\"]([^\'\"]+)[\'\"],\s*[\'\"]([^\'\"]+)[\'\"]\)'
-        download_matches = re.findall(download_pattern, code)
+        download_matches = _S3_DOWNLOAD_FILE_NAMES_RE.findall(code)
         if download_matches:
             bucket_names.add(download_matches[0][0])
             file_names.add(download_matches[0][1])  # remote file
             file_names.add(download_matches[0][2])  # local file
         
         # Extract from put_object/get_object/delete_object patterns
-        put_object_pattern = r'\.put_object\(Bucket=([^,]+),\s*Key=([^,]+)'
-        put_matches = re.findall(put_object_pattern, code)
+        put_matches = _S3_PUT_OBJECT_NAMES_RE.findall(code)
         if put_matches:
             bucket_names.add(put_matches[0][0].strip('\'"'))
             file_names.add(put_matches[0][1].strip('\'"'))
         
-        get_object_pattern = r'\.get_object\(Bucket=([^,]+),\s*Key=([^,\)]+)'
-        get_matches = re.findall(get_object_pattern, code)
+        get_matches = _S3_GET_OBJECT_NAMES_RE.findall(code)
         if get_matches:
             bucket_names.add(get_matches[0][0].strip('\'"'))
             file_names.add(get_matches[0][1].strip('\'"'))
         
-        delete_object_pattern = r'\.delete_object\(Bucket=([^,]+),\s*Key=([^,\)]+)'
-        delete_matches = re.findall(delete_object_pattern, code)
+        delete_matches = _S3_DELETE_OBJECT_NAMES_RE.findall(code)
         if delete_matches:
             bucket_names.add(delete_matches[0][0].strip('\'"'))
             file_names.add(delete_matches[0][1].strip('\'"'))
         
         # Extract from list_objects patterns
-        list_pattern = r'\.list_objects(?:_v2)?\(Bucket=([^,\)]+)'
-        list_matches = re.findall(list_pattern, code)
+        list_matches = _S3_LIST_OBJECTS_BUCKET_NAME_RE.findall(code)
         if list_matches:
             bucket_names.add(list_matches[0].strip('\'"'))
         
         # Extract from create_bucket/delete_bucket
-        bucket_pattern = r'\.(?:create|delete)_bucket\(Bucket=([^,\)]+)'
-        bucket_matches = re.findall(bucket_pattern, code)
+        bucket_matches = _S3_BUCKET_CALL_NAME_RE.findall(code)
         if bucket_matches:
             bucket_names.add(bucket_matches[0].strip('\'"'))
         
@@ -4765,7 +5044,7 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
         # Replace client instantiation - handle various formats
         # Change ANY variable name to gcs_client for consistency
         # First, capture the original variable name BEFORE replacement
-        client_var_match = re.search(r'(\w+)\s*=\s*boto3\.client\([\'\"]s3[\'\"].*?\)', code, flags=re.DOTALL)
+        client_var_match = _S3_CLIENT_ASSIGNMENT_RE.search(code)
         original_client_var = client_var_match.group(1) if client_var_match else None
         
         # Track ALL variable mappings for comprehensive renaming
@@ -4776,7 +5055,7 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
         if 's3_client' in code and 's3_client' not in variable_mapping:
             variable_mapping['s3_client'] = 'gcs_client'
         
-        if re.search(r'\bs3\b(?=\s*\.)', code) and 's3' not in variable_mapping:
+        if _S3_CLIENT_ATTRIBUTE_RE.search(code) and 's3' not in variable_mapping:
             variable_mapping['s3'] = 'gcs_client'
         
         # Track other AWS-specific variable names
@@ -4791,302 +5070,109 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
         
         # Apply comprehensive variable renaming FIRST (before transformations)
         # This ensures all AWS variables are renamed to GCP-friendly names
-        for old_var, new_var in variable_mapping.items():
-            if old_var != new_var:
-                # Use word boundaries to avoid partial matches
-                # Protect comments and strings
-                lines = code.split('\n')
-                renamed_lines = []
-                for line in lines:
-                    # Skip comment lines
-                    if line.strip().startswith('#'):
-                        renamed_lines.append(line)
-                        continue
-                    # Replace variable name when followed by . or = or whitespace/end or (
-                    # But not if it's part of a string literal
-                    protected_line = line
-                    # Replace variable name when followed by . or = or ( or whitespace/end
-                    pattern = rf'\b{re.escape(old_var)}\b(?=\s*[.=\(\)\[\],:]|\s*$)'
-                    protected_line = re.sub(pattern, new_var, protected_line)
-                    renamed_lines.append(protected_line)
-                code = '\n'.join(renamed_lines)
+        # Use word boundaries to avoid partial matches, skipping comment lines
+        code = _rename_variables(code, variable_mapping)
         
         # Replace client instantiation AFTER variable renaming
         # Handle boto3.client('s3') with optional region_name and config parameters
         # First, replace s3 = boto3.client('s3') -> gcs_client = storage.Client()
         # But only if gcs_client doesn't already exist AND the pattern still exists
-        if re.search(r'\bs3\s*=\s*boto3\.client\([\'\"]s3[\'\"][^\)]*\)', code, flags=re.DOTALL):
+        if _S3_BOTO3_CLIENT_RE.search(code):
             # Check if storage_client or gcs_client already exists - if so, just remove the boto3.client line
             if 'storage_client = storage.Client()' in code or 'gcs_client = storage.Client()' in code:
                 # Remove the boto3.client line instead of replacing it
                 # Match the entire line including the assignment
-                lines = code.split('\n')
-                cleaned_lines = []
-                for line in lines:
-                    # Skip lines that match s3 = boto3.client('s3', ...)
-                    if re.search(r'\bs3\s*=\s*boto3\.client\([\'\"]s3[\'\"][^\)]*\)', line, flags=re.DOTALL):
-                        continue  # Skip this line
-                    cleaned_lines.append(line)
-                code = '\n'.join(cleaned_lines)
+                search = _S3_BOTO3_CLIENT_RE.search
+                code = '\n'.join(line for line in code.split('\n') if not search(line))
             else:
-                code = re.sub(
-                    r'\bs3\s*=\s*boto3\.client\([\'\"]s3[\'\"][^\)]*\)',
+                code = _S3_BOTO3_CLIENT_RE.sub(
                     r'gcs_client = storage.Client()  # Use a better name for the GCS client',
-                    code,
-                    flags=re.DOTALL
+                    code
                 )
         # Then handle other variable names - but skip if storage_client or gcs_client already exists
         if 'storage_client = storage.Client()' not in code and 'gcs_client = storage.Client()' not in code:
-            code = re.sub(
-                r'(\w+)\s*=\s*boto3\.client\([\'\"]s3[\'\"][^\)]*\)',
+            code = _S3_CLIENT_VAR_INIT_RE.sub(
                 r'\1 = storage.Client()',
-                code,
-                flags=re.DOTALL
+                code
             )
         
         # Replace boto3.resource('s3') if not already replaced - handle with region_name too
         # First, replace s3 = boto3.resource('s3') -> gcs_client = storage.Client()
-        code = re.sub(
-            r'\bs3\s*=\s*boto3\.resource\([\'\"]s3[\'\"][^\)]*\)',
-            r'gcs_client = storage.Client()',
-            code,
-            flags=re.DOTALL
-        )
-        # Then handle other variable names
-        code = re.sub(
-            r'(\w+)\s*=\s*boto3\.resource\([\'\"]s3[\'\"][^\)]*\)',
-            r'\1 = storage.Client()',
-            code,
-            flags=re.DOTALL
-        )
-        
-        # Replace S3 resource Bucket pattern: s3.Bucket('name')
-        # But only if s3 is a storage.Client(), not if it's already gcs_client
-        code = re.sub(
-            r'(\w+)\.Bucket\(([^\)]+)\)',
-            r'gcs_client.bucket(\2)',
-            code
-        )
-        
-        # Also handle: bucket = s3.Bucket('name') -> bucket = gcs_client.bucket('name')
-        code = re.sub(
-            r'(\w+)\s*=\s*(\w+)\.Bucket\(([^\)]+)\)',
-            r'\1 = gcs_client.bucket(\3)',
-            code
-        )
-        
-        # Also replace common S3 variable names (do this after specific replacement)
-        code = re.sub(r'\bs3_client\b', 'gcs_client', code)
+        code = _apply_rewrites(code, _S3_RESOURCE_REWRITES)
         # Replace standalone 's3' variable when used as a client (followed by dot)
-        # Match: s3.upload_file, s3.put_object, etc. but not 's3' in strings
-        # But be careful - only replace if it's clearly a client variable
-        lines = code.split('\n')
-        result_lines = []
-        for line in lines:
-            # Skip if in string
-            if line.count('"') % 2 == 1 or line.count("'") % 2 == 1:
-                result_lines.append(line)
-                continue
-            # Replace s3 = storage.Client() -> gcs_client = storage.Client()
-            line = re.sub(r'\bs3\s*=\s*storage\.Client\(\)', 'gcs_client = storage.Client()', line)
-            # Replace s3 = ... (any assignment) -> gcs_client = ...
-            if re.search(r'\bs3\s*=\s*', line):
-                line = re.sub(r'\bs3\s*=\s*', 'gcs_client = ', line)
-            # Replace s3. with gcs_client. (but not s3 = or s3=)
-            if re.search(r'\bs3\s*\.', line) and not re.search(r'\bs3\s*=', line):
-                line = re.sub(r'\bs3\s*\.', 'gcs_client.', line)
-            # Replace standalone s3 variable (not in assignment) when followed by method call
-            if re.search(r'\bs3\b', line) and not re.search(r'\bs3\s*=', line) and re.search(r'\bs3\s*\.', line):
-                line = re.sub(r'\bs3\b(?=\s*\.)', 'gcs_client', line)
-            result_lines.append(line)
-        code = '\n'.join(result_lines)
-        
-        # Final pass: replace any remaining s3 variable references
-        # But be careful not to replace 's3' in strings
-        lines = code.split('\n')
-        result_lines = []
-        for line in lines:
-            # Skip if in string
-            if line.count('"') % 2 == 1 or line.count("'") % 2 == 1:
-                result_lines.append(line)
-                continue
-            # Replace s3 = storage.Client() if still present
-            line = re.sub(r'\bs3\s*=\s*storage\.Client\(\)', 'gcs_client = storage.Client()', line)
-            # Replace s3. method calls
-            line = re.sub(r'\bs3\s*\.', 'gcs_client.', line)
-            result_lines.append(line)
-        code = '\n'.join(result_lines)
-        
-        # Also handle cases where 's3' might be used without dot (less common but possible)
-        # But be careful - only replace if it's clearly a variable reference
-        # This is a fallback for edge cases
-        
-        # Add variable definitions after client initialization
-        # Find where to insert (after gcs_client line)
-        if 'gcs_client = storage.Client()' in code:
-            # Insert variable definitions after client
-            var_defs = f'\nbucket_name = "{bucket_name}"\nremote_file_name = "{remote_file_name}"\nlocal_upload_file = "{local_upload_file}"\nlocal_download_file = "{local_download_file}"'
-            # Replace the client line, preserving any existing comment format
-            code = re.sub(
-                r'gcs_client = storage\.Client\(\)\s*# Use a better name for the GCS client',
-                f'gcs_client = storage.Client()  # Use a better name for the GCS client{var_defs}',
-                code
-            )
-        
-        # Replace S3 upload_file -> GCS upload_from_filename with improved structure
-        # Pattern: s3_client.upload_file('local_file.txt', 'bucket-name', 'remote_file.txt')
-        # Should become: storage_client = storage.Client(); bucket = storage_client.bucket('bucket-name'); blob = bucket.blob('remote_file.txt'); blob.upload_from_filename('local_file.txt')
-        def replace_upload(match):
-            client_var = match.group(1)  # Could be 's3', 'gcs_client', etc.
-            local_file = match.group(2)
-            bucket_name_var = match.group(3)
-            remote_file = match.group(4)
-            # Correct GCS API pattern
-            return f'storage_client = storage.Client()\nbucket = storage_client.bucket({bucket_name_var})\nblob = bucket.blob({remote_file})\nblob.upload_from_filename({local_file})\nprint(f"File \'{local_file}\' uploaded to \'{bucket_name_var}/{remote_file}\' successfully.")'
-        code = re.sub(
-            r'(\w+)\.upload_file\([\'\"]([^\'\"]+)[\'\"],\s*[\'\"]([^\'\"]+)[\'\"],\s*[\'\"]([^\'\"]+)[\'\"]\)',
-            replace_upload,
-            code
-        )
-        
-        # Replace S3 download_file -> GCS download_to_filename with improved structure
-        # Pattern: s3_client.download_file('bucket-name', 'remote_file.txt', 'local_file.txt')
-        # Should become: storage_client = storage.Client(); bucket = storage_client.bucket('bucket-name'); blob = bucket.blob('remote_file.txt'); blob.download_to_filename('local_file.txt')
-        def replace_download(match):
-            client_var = match.group(1)
-            bucket_name_var = match.group(2)
-            remote_file = match.group(3)
-            local_file = match.group(4)
-            # Correct GCS API pattern
-            return f'storage_client = storage.Client()\nbucket = storage_client.bucket({bucket_name_var})\nblob = bucket.blob({remote_file})\nblob.download_to_filename({local_file})\nprint(f"File \'{remote_file}\' downloaded from \'{bucket_name_var}\' to \'{local_file}\' successfully.")'
-        code = re.sub(
-            r'(\w+)\.download_file\([\'\"]([^\'\"]+)[\'\"],\s*[\'\"]([^\'\"]+)[\'\"],\s*[\'\"]([^\'\"]+)[\'\"]\)',
-            replace_download,
-            code
-        )
-        
-        # COMPREHENSIVE S3 PATTERN COVERAGE - Handle ALL AWS S3 operations from documentation
-        
-        # Pattern: paginator.get_paginator("list_buckets")
-        code = re.sub(
-            r'(\w+)\s*=\s*(\w+)\.get_paginator\([\'"]list_buckets[\'"]\)',
-            r'# GCS list_buckets returns all buckets directly - no pagination needed\n    buckets = \2.list_buckets()',
-            code
-        )
-        code = re.sub(
-            r'(\w+)\.paginate\([^)]*PaginationConfig[^)]*\)',
-            r'buckets',
-            code
-        )
-        code = re.sub(
-            r'for\s+page\s+in\s+(\w+)\s*:',
-            r'for bucket in buckets:',
-            code
-        )
-        code = re.sub(
-            r'if\s+[\'"]Buckets[\'"]\s+in\s+page',
-            r'if bucket',
-            code
-        )
-        code = re.sub(
-            r'for\s+bucket\s+in\s+page\[[\'"]Buckets[\'"]\]',
-            r'for bucket in buckets',
-            code
-        )
-        code = re.sub(
-            r'bucket\[[\'"]Name[\'"]\]',
-            r'bucket.name',
-            code
-        )
-        
-        # Pattern: list_objects_v2
-        code = re.sub(
-            r'(\w+)\s*=\s*(\w+)\.list_objects_v2\(Bucket=([^,\)]+)\)',
-            r'bucket = storage_client.bucket(\3)\n    \1 = list(bucket.list_blobs())',
-            code
-        )
-        code = re.sub(
-            r'if\s+[\'"]Contents[\'"]\s+in\s+(\w+)',
-            r'if \1',
-            code
-        )
-        code = re.sub(
-            r'for\s+obj\s+in\s+(\w+)\[[\'"]Contents[\'"]\]',
-            r'for blob in \1',
-            code
-        )
-        code = re.sub(
-            r'obj\[[\'"]Key[\'"]\]',
-            r'blob.name',
-            code
-        )
-        
-        # Pattern: copy_object
-        code = re.sub(
-            r'(\w+)\.copy_object\s*\(\s*CopySource\s*=\s*\{[\'"]Bucket[\'"]:\s*([^,]+),\s*[\'"]Key[\'"]:\s*([^\)]+)\},\s*Bucket\s*=\s*([^,]+),\s*Key\s*=\s*([^\)]+)\s*\)',
-            r'# Copy blob in GCS\n    source_bucket = storage_client.bucket(\2)\n    source_blob = source_bucket.blob(\3)\n    dest_bucket = storage_client.bucket(\4)\n    dest_blob = dest_bucket.blob(\5)\n    dest_blob.rewrite(source_blob)',
-            code,
-            flags=re.DOTALL
-        )
-        
-        # Pattern: head_object
-        code = re.sub(
-            r'(\w+)\s*=\s*(\w+)\.head_object\(Bucket=([^,]+),\s*Key=([^,\)]+)\)',
-            r'bucket = storage_client.bucket(\3)\n    blob = bucket.blob(\4)\n    blob.reload()  # Fetch blob metadata\n    \1 = {\'ContentLength\': blob.size, \'ContentType\': blob.content_type, \'ETag\': blob.etag}',
-            code
-        )
-        code = re.sub(
-            r'(\w+)\[[\'"]ContentLength[\'"]\]',
-            r'blob.size',
-            code
-        )
+        # Match: s3.upload_file, s3.put_object, etc. but not 's3' in strings
+        # But be careful - only replace if it's clearly a client variable
+        # Replace s3 = storage.Client(), then any other s3 assignment, then s3. method calls
+        # (no s3 assignment is left by the time method calls are renamed)
+        code = _apply_line_rewrites(code, (
+            _S3_VAR_STORAGE_CLIENT_REWRITE,
+            _S3_VAR_ASSIGNMENT_REWRITE,
+            _S3_VAR_ATTRIBUTE_REWRITE,
+        ))
         
-        # Pattern: Bucket resource - bucket.objects.all()
-        code = re.sub(
-            r'(\w+)\.objects\.all\(\)',
-            r'storage_client.list_blobs(\1.name)',
-            code
-        )
-        code = re.sub(
-            r'(\w+)\.objects\.filter\(Prefix=([^\)]+)\)',
-            r'storage_client.list_blobs(\1.name, prefix=\2)',
-            code
-        )
+        # Final pass: replace any remaining s3 variable references
+        # But be careful not to replace 's3' in strings
+        code = _apply_line_rewrites(code, (_S3_VAR_STORAGE_CLIENT_REWRITE, _S3_VAR_ATTRIBUTE_REWRITE))
         
-        # Pattern: Object resource - obj.copy()
-        code = re.sub(
-            r'(\w+)\.copy\(\{[\'"]Bucket[\'"]:\s*([^,]+),\s*[\'"]Key[\'"]:\s*([^\)]+)\}\)',
-            r'# Copy blob in GCS\n    source_bucket = storage_client.bucket(\2)\n    source_blob = source_bucket.blob(\3)\n    dest_bucket = storage_client.bucket(\1.bucket.name)\n    dest_blob = dest_bucket.blob(\1.name)\n    dest_blob.rewrite(source_blob)',
-            code
-        )
+        # Also handle cases where 's3' might be used without dot (less common but possible)
+        # But be careful - only replace if it's clearly a variable reference
+        # This is a fallback for edge cases
         
-        # Pattern: Object resource - obj.delete()
-        code = re.sub(
-            r'(\w+)\.delete\(\)',
-            r'\1.delete()  # GCS blob.delete() works the same way',
-            code
-        )
+        # Add variable definitions after client initialization
+        # Find where to insert (after gcs_client line)
+        if 'gcs_client = storage.Client()' in code:
+            # Insert variable definitions after client
+            var_defs = f'\nbucket_name = "{bucket_name}"\nremote_file_name = "{remote_file_name}"\nlocal_upload_file = "{local_upload_file}"\nlocal_download_file = "{local_download_file}"'
+            # Replace the client line, preserving any existing comment format
+            code = _GCS_CLIENT_NAME_COMMENT_RE.sub(
+                f'gcs_client = storage.Client()  # Use a better name for the GCS client{var_defs}',
+                code
+            )
         
-        # Pattern: upload_fileobj
-        code = re.sub(
-            r'(\w+)\.upload_fileobj\(([^,]+),\s*([^,]+),\s*([^\)]+)\)',
-            r'bucket = storage_client.bucket(\3)\n    blob = bucket.blob(\4)\n    blob.upload_from_file(\2, rewind=True)',
+        # Replace S3 upload_file -> GCS upload_from_filename with improved structure
+        # Pattern: s3_client.upload_file('local_file.txt', 'bucket-name', 'remote_file.txt')
+        # Should become: storage_client = storage.Client(); bucket = storage_client.bucket('bucket-name'); blob = bucket.blob('remote_file.txt'); blob.upload_from_filename('local_file.txt')
+        def replace_upload(match):
+            client_var = match.group(1)  # Could be 's3', 'gcs_client', etc.
+            local_file = match.group(2)
+            bucket_name_var = match.group(3)
+            remote_file = match.group(4)
+            # Correct GCS API pattern
+            return f'storage_client = storage.Client()\nbucket = storage_client.bucket({bucket_name_var})\nblob = bucket.blob({remote_file})\nblob.upload_from_filename({local_file})\nprint(f"File \'{local_file}\' uploaded to \'{bucket_name_var}/{remote_file}\' successfully.")'
+        code = _S3_UPLOAD_FILE_LITERAL_RE.sub(
+            replace_upload,
             code
         )
         
-        # Pattern: download_fileobj
-        code = re.sub(
-            r'(\w+)\.download_fileobj\(([^\)]+)\)',
-            r'\1.download_to_file(\2)',
+        # Replace S3 download_file -> GCS download_to_filename with improved structure
+        # Pattern: s3_client.download_file('bucket-name', 'remote_file.txt', 'local_file.txt')
+        # Should become: storage_client = storage.Client(); bucket = storage_client.bucket('bucket-name'); blob = bucket.blob('remote_file.txt'); blob.download_to_filename('local_file.txt')
+        def replace_download(match):
+            client_var = match.group(1)
+            bucket_name_var = match.group(2)
+            remote_file = match.group(3)
+            local_file = match.group(4)
+            # Correct GCS API pattern
+            return f'storage_client = storage.Client()\nbucket = storage_client.bucket({bucket_name_var})\nblob = bucket.blob({remote_file})\nblob.download_to_filename({local_file})\nprint(f"File \'{remote_file}\' downloaded from \'{bucket_name_var}\' to \'{local_file}\' successfully.")'
+        code = _S3_DOWNLOAD_FILE_LITERAL_RE.sub(
+            replace_download,
             code
         )
         
-        # Pattern: delete_object
-        code = re.sub(
-            r'(\w+)\.delete_object\(Bucket=([^,]+),\s*Key=([^,\)]+)\)',
-            r'bucket = storage_client.bucket(\2)\n    blob = bucket.blob(\3)\n    blob.delete()',
-            code
-        )
+        # COMPREHENSIVE S3 PATTERN COVERAGE - Handle ALL AWS S3 operations from documentation
+        
+        # Pattern: paginator.get_paginator("list_buckets")
+        code = _apply_rewrites(code, _S3_PAGINATION_REWRITES)
+        
+        # Object copy/metadata/stream/delete calls -> GCS blob operations
+        code = _apply_call_rewrites(code, _S3_OBJECT_CALL_REWRITES)
+        # The object patterns below each need their key or method name, so the
+        # scans are skipped for code that does not mention it
+        if 'ContentLength' in code:
+            code = _S3_CONTENT_LENGTH_RE.sub(
+                r'blob.size',
+                code
+            )
         
         # Replace S3 put_object -> GCS upload with improved structure
         # This should happen AFTER client variable replacement
@@ -5095,11 +5181,11 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
             body_expr = match.group(4)
             return f'### 🚀 Upload file to GCS\nbucket = gcs_client.bucket(bucket_name)\nblob = bucket.blob(remote_file_name)\nblob.upload_from_string({body_expr})\nprint(f"File uploaded to gs://{{bucket_name}}/{{remote_file_name}}")'
         # Match put_object with proper handling of closing paren
-        code = re.sub(
-            r'(\w+)\.put_object\(Bucket=([^,]+),\s*Key=([^,]+),\s*Body=([^\)]+)\)',
-            replace_put_object,
-            code
-        )
+        if '.put_object(' in code:
+            code = _S3_PUT_OBJECT_RE.sub(
+                replace_put_object,
+                code
+            )
         
         # Replace S3 get_object -> GCS download with improved structure
         # Handle both: s3.get_object(...) and response = s3.get_object(...)
@@ -5114,39 +5200,19 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
         
         # Match get_object with optional additional parameters
         # Pattern: response = s3_client.get_object(Bucket=bucket_name, Key=object_key)
-        code = re.sub(
-            r'(\w+)\s*=\s*(\w+)\.get_object\(Bucket=([^,]+),\s*Key=([^,\)]+)[^\)]*\)',
-            replace_get_object,
-            code
-        )
-        code = re.sub(
-            r'(\w+)\.get_object\(Bucket=([^,]+),\s*Key=([^,\)]+)[^\)]*\)',
-            replace_get_object,
-            code
-        )
+        if '.get_object(' in code:
+            code = _S3_GET_OBJECT_ASSIGNMENT_RE.sub(
+                replace_get_object,
+                code
+            )
+            code = _S3_GET_OBJECT_RE.sub(
+                replace_get_object,
+                code
+            )
         
         # Handle response['Body'].read().decode('utf-8') pattern - replace with csv_content
         # This should happen after get_object transformation
-        code = re.sub(
-            r'(\w+)\[\'Body\'\]\.read\(\)\.decode\([\'"]utf-8[\'"]\)',
-            r'csv_content',
-            code
-        )
-        code = re.sub(
-            r'(\w+)\["Body"\]\.read\(\)\.decode\([\'"]utf-8[\'"]\)',
-            r'csv_content',
-            code
-        )
-        code = re.sub(
-            r'(\w+)\[\'Body\'\]\.read\(\)',
-            r'csv_content',
-            code
-        )
-        code = re.sub(
-            r'(\w+)\["Body"\]\.read\(\)',
-            r'csv_content',
-            code
-        )
+        code = _apply_rewrites(code, _S3_BODY_READ_REWRITES)
         
         # Replace S3 delete_object -> GCS delete with improved structure
         def replace_delete_object(match):
@@ -5154,11 +5220,11 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
             key_var = match.group(3).strip('\'"') if len(match.groups()) >= 3 else 'remote_file_name'
             # Correct GCS API pattern
             return f'storage_client = storage.Client()\nbucket = storage_client.bucket("{bucket_name_var}")\nblob = bucket.blob("{key_var}")\nblob.delete()\nprint(f"Object \'{key_var}\' deleted from bucket \'{bucket_name_var}\' successfully.")'
-        code = re.sub(
-            r'(\w+)\.delete_object\(Bucket=([^,]+),\s*Key=([^,\)]+)\)',
-            replace_delete_object,
-            code
-        )
+        if '.delete_object(' in code:
+            code = _S3_DELETE_OBJECT_RE.sub(
+                replace_delete_object,
+                code
+            )
         
         # Replace S3 list_objects_v2 -> GCS list_blobs with improved structure
         # Pattern: response = s3_client.list_objects_v2(Bucket='my-bucket')
@@ -5167,117 +5233,48 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
             # Correct GCS API pattern
             return f'storage_client = storage.Client()\nblobs = storage_client.list_blobs(bucket_name)\nprint(f"Contents of bucket \'{{bucket_name}}\':")\nfor blob in blobs:\n    print(f"- {{blob.name}}")'
         
-        code = re.sub(
-            r'(\w+)\s*=\s*(\w+)\.list_objects_v2\(Bucket=([^,\)]+)\)',
-            replace_list_objects_v2,
-            code
-        )
-        code = re.sub(
-            r'(\w+)\.list_objects_v2\(Bucket=([^,\)]+)\)',
-            replace_list_objects_v2,
-            code
-        )
-        
-        # Replace S3 list_objects -> GCS list_blobs
-        code = re.sub(
-            r'(\w+)\s*=\s*(\w+)\.list_objects\(Bucket=([^,\)]+)\)',
-            replace_list_objects_v2,
-            code
-        )
-        code = re.sub(
-            r'(\w+)\.list_objects\(Bucket=([^,\)]+)\)',
-            replace_list_objects_v2,
-            code
-        )
+        if '.list_objects' in code:
+            code = _S3_LIST_OBJECTS_V2_ASSIGNMENT_RE.sub(
+                replace_list_objects_v2,
+                code
+            )
+            code = _S3_LIST_OBJECTS_V2_RE.sub(
+                replace_list_objects_v2,
+                code
+            )
+            
+            # Replace S3 list_objects -> GCS list_blobs
+            code = _S3_LIST_OBJECTS_ASSIGNMENT_RE.sub(
+                replace_list_objects_v2,
+                code
+            )
+            code = _S3_LIST_OBJECTS_RE.sub(
+                replace_list_objects_v2,
+                code
+            )
         
         # Replace botocore.config import and usage
-        code = re.sub(r'from botocore\.config import Config', '', code)
-        code = re.sub(r'import botocore\.config', '', code)
-        code = re.sub(r'from botocore import config', '', code)
+        code = code.replace('from botocore.config import Config', '')
+        code = code.replace('import botocore.config', '')
+        code = code.replace('from botocore import config', '')
         # Remove config parameter from boto3.client calls - handle multiline
         # Handle: boto3.client('s3', config=Config(...)) - must match BEFORE variable assignment
-        code = re.sub(r'boto3\.client\s*\(\s*[\'\"]s3[\'\"],\s*config\s*=\s*Config\([^)]+\)\s*\)', 'storage.Client()', code, flags=re.DOTALL)
-        # Handle: s3_client = boto3.client('s3', config=Config(...))
-        code = re.sub(r'(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]s3[\'\"],\s*config\s*=\s*Config\([^)]+\)\s*\)', r'\1 = storage.Client()', code, flags=re.DOTALL)
-        # Remove config parameter from boto3.client calls - handle multiline (fallback)
-        code = re.sub(r',\s*config\s*=\s*Config\([^)]+\)', '', code, flags=re.DOTALL)
-        code = re.sub(r'config\s*=\s*Config\([^)]+\),\s*', '', code, flags=re.DOTALL)
-        code = re.sub(r'config\s*=\s*Config\([^)]+\)', '', code, flags=re.DOTALL)
-        
-        # Replace S3 generate_presigned_url -> GCS signed URL
-        # Pattern: url = s3_client.generate_presigned_url('get_object', Params={'Bucket': 'my-bucket', 'Key': 'file.txt'}, ExpiresIn=3600)
-        code = re.sub(
-            r'(\w+)\s*=\s*(\w+)\.generate_presigned_url\([\'"]get_object[\'"],\s*Params=\{[\'"]Bucket[\'"]:\s*([^,]+),\s*[\'"]Key[\'"]:\s*([^}]+)\},\s*ExpiresIn=([^\)]+)\)',
-            r'from datetime import datetime, timedelta\nbucket = gcs_client.bucket(\3)\nblob = bucket.blob(\4)\n\1 = blob.generate_signed_url(expiration=datetime.utcnow() + timedelta(seconds=\5), method="GET")',
-            code
-        )
-        code = re.sub(
-            r'(\w+)\.generate_presigned_url\([\'"]get_object[\'"],\s*Params=\{[\'"]Bucket[\'"]:\s*([^,]+),\s*[\'"]Key[\'"]:\s*([^}]+)\},\s*ExpiresIn=([^\)]+)\)',
-            r'from datetime import datetime, timedelta\nbucket = gcs_client.bucket(\2)\nblob = bucket.blob(\3)\nurl = blob.generate_signed_url(expiration=datetime.utcnow() + timedelta(seconds=\4), method="GET")',
-            code
-        )
+        code = _apply_rewrites(code, _S3_CONFIG_ARGUMENT_REWRITES)
         
-        # Replace S3 create_multipart_upload -> GCS (not directly supported, use resumable upload)
-        code = re.sub(
-            r'(\w+)\s*=\s*(\w+)\.create_multipart_upload\(Bucket=([^,]+),\s*Key=([^\)]+)\)',
-            r'# GCS uses resumable uploads instead of multipart\n# Use blob.upload_from_filename() for large files - it handles resumable uploads automatically\nbucket = gcs_client.bucket(\3)\nblob = bucket.blob(\4)\n# For resumable upload: blob.upload_from_filename("file.zip", resumable=True)',
-            code
-        )
-        code = re.sub(
-            r'(\w+)\.create_multipart_upload\(Bucket=([^,]+),\s*Key=([^\)]+)\)',
-            r'# GCS uses resumable uploads instead of multipart\n# Use blob.upload_from_filename() for large files - it handles resumable uploads automatically\nbucket = gcs_client.bucket(\2)\nblob = bucket.blob(\3)\n# For resumable upload: blob.upload_from_filename("file.zip", resumable=True)',
-            code
-        )
-        
-        # Replace S3 list_object_versions -> GCS versioning
-        # Pattern: versions = s3.list_object_versions(Bucket='my-bucket', Prefix='file.txt')
-        code = re.sub(
-            r'(\w+)\s*=\s*(\w+)\.list_object_versions\(Bucket=([^,]+),\s*Prefix=([^\)]+)\)',
-            r'bucket = gcs_client.bucket(\3)\nblobs = bucket.list_blobs(prefix=\4, versions=True)\n\1 = [{"VersionId": blob.generation, "Name": blob.name} for blob in blobs]',
-            code
-        )
-        code = re.sub(
-            r'(\w+)\.list_object_versions\(Bucket=([^,]+),\s*Prefix=([^\)]+)\)',
-            r'bucket = gcs_client.bucket(\2)\nblobs = bucket.list_blobs(prefix=\3, versions=True)\nversions = [{"VersionId": blob.generation, "Name": blob.name} for blob in blobs]',
-            code
-        )
+        # Presigned URLs, multipart uploads and object versions -> GCS equivalents
+        code = _apply_call_rewrites(code, _S3_SIGNED_URL_CALL_REWRITES)
         
         # Handle versions.get('Versions', []) pattern
-        code = re.sub(
-            r'versions\.get\([\'"]Versions[\'"],\s*\[\]\)',
-            r'versions',
-            code
-        )
-        
-        # Handle version['VersionId'] pattern
-        code = re.sub(
-            r'version\[[\'"]VersionId[\'"]\]',
-            r'version["VersionId"]',
-            code
-        )
-        
-        # Fix loops that use response.get('Contents', []) pattern
-        # Pattern: for obj in response.get('Contents', []): print(obj['Key'])
-        # Should become: for blob in blobs: print(blob.name)
-        code = re.sub(
-            r'for\s+obj\s+in\s+(\w+)\.get\([\'"]Contents[\'"],\s*\[\]\):',
-            r'for blob in blobs:\n    # Use blob.name to get the object key/path',
-            code
-        )
-        code = re.sub(
-            r'for\s+(\w+)\s+in\s+(\w+)\.get\([\'"]Contents[\'"],\s*\[\]\):',
-            r'for blob in blobs:\n    # Use blob.name to get the object key/path',
-            code
-        )
+        code = _apply_rewrites(code, _S3_VERSION_LISTING_REWRITES)
         # Replace obj['Key'] with blob.name (obj variable becomes blob)
         # Track this variable change
-        if re.search(r'\bobj\b', code) and 'obj' not in variable_mapping:
+        if _OBJ_NAME_RE.search(code) and 'obj' not in variable_mapping:
             variable_mapping['obj'] = 'blob'
         
-        code = re.sub(r"obj\['Key'\]", r'blob.name', code)
-        code = re.sub(r'obj\["Key"\]', r'blob.name', code)
+        code = code.replace("obj['Key']", 'blob.name')
+        code = code.replace('obj["Key"]', 'blob.name')
         # Also handle any other obj references in the loop context
-        code = re.sub(r'\bobj\b', 'blob', code)  # Replace obj with blob in loop context
+        code = _OBJ_NAME_RE.sub('blob', code)  # Replace obj with blob in loop context
         
         # Track response variable changes for list operations BEFORE transformation
         # Find response variables from list_objects operations in ORIGINAL code
@@ -5285,19 +5282,11 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
         # So we'll track it earlier, but apply renaming after we've identified all variables
         
         # Remove ALL AWS/S3 references from comments and replace with GCP comments
-        code = re.sub(r'#\s*AWS\s+S3\s+example', '# 🌟 GCP Cloud Storage Example', code, flags=re.IGNORECASE)
-        code = re.sub(r'#\s*Upload\s+file\s+to\s+S3', '', code, flags=re.IGNORECASE)
-        code = re.sub(r'#\s*Download\s+file\s+from\s+S3', '', code, flags=re.IGNORECASE)
-        code = re.sub(r'#\s*List\s+objects\s+in\s+bucket', '', code, flags=re.IGNORECASE)
-        code = re.sub(r'#\s*AWS.*?S3.*?', '', code, flags=re.IGNORECASE)
-        # Remove any remaining S3 references in comments
-        code = re.sub(r'#.*?S3.*?', '', code, flags=re.IGNORECASE)
-        code = re.sub(r'#.*?s3.*?', '', code, flags=re.IGNORECASE)
-        # Remove AWS region comments that mention S3
-        code = re.sub(r'#.*?AWS.*?region.*?S3.*?', '', code, flags=re.IGNORECASE)
+        # (in one scan, rewriting only the lines that have a "#")
+        code = _COMMENT_TAIL_RE.sub(_rewrite_s3_comment, code)
         
         # Clean up multiple blank lines
-        code = re.sub(r'\n{3,}', '\n\n', code)
+        code = _EXCESS_BLANK_LINES_RE.sub('\n\n', code)
         
         # Add header comment if not present
         if '# 🌟 GCP Cloud Storage Example' not in code:
@@ -5307,24 +5296,11 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
                                   'from google.cloud import storage\n\n# 🌟 GCP Cloud Storage Example', 1)
             else:
                 # Find import line and add after it
-                code = re.sub(r'(from google\.cloud import storage)',
-                            r'\1\n\n# 🌟 GCP Cloud Storage Example',
-                            code,
-                            count=1)
+                code = _GCS_STORAGE_IMPORT_RE.sub(r'\1\n\n# 🌟 GCP Cloud Storage Example', code, count=1)
         
         # Replace S3 list_buckets -> GCS list_buckets
         # Handle assignment pattern: buckets = s3.list_buckets()
-        code = re.sub(
-            r'(\w+)\s*=\s*(\w+)\.list_buckets\(\)',
-            r'\1 = list(\2.list_buckets())',
-            code
-        )
-        # Handle direct call pattern: s3.list_buckets() (but not if already wrapped in list())
-        code = re.sub(
-            r'(\w+)\.list_buckets\(\)(?!\s*\))',
-            r'list(\1.list_buckets())',
-            code
-        )
+        code = _apply_rewrites(code, _S3_LIST_BUCKETS_REWRITES)
         
         # Replace S3 create_bucket -> GCS bucket.create() (second pass - handles any remaining after variable renaming)
         # This handles cases where create_bucket wasn't caught in the first pass
@@ -5333,13 +5309,13 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
             bucket_name_expr = match.group(2).strip().strip('\'"')
             
             location = None
-            location_config_match = re.search(r'CreateBucketConfiguration\s*=\s*\{[^}]*LocationConstraint[^}]*:\s*[\'"]([^\'"]+)[\'"]', full_match)
+            location_config_match = _CREATE_BUCKET_LOCATION_CONSTRAINT_LITERAL_RE.search(full_match)
             if location_config_match:
                 aws_region = location_config_match.group(1)
                 location = self._map_aws_region_to_gcp_location(aws_region)
             
             if location is None:
-                region_match = re.search(r'region\s*=\s*[\'"]([^\'"]+)[\'"]', code)
+                region_match = _REGION_ASSIGNMENT_VALUE_RE.search(code)
                 if region_match:
                     aws_region = region_match.group(1)
                     location = self._map_aws_region_to_gcp_location(aws_region)
@@ -5354,14 +5330,11 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
                 return f'storage_client = storage.Client()\nbucket = storage_client.create_bucket({bucket_name_str})\nprint(f"Bucket \'{{bucket.name}}\' created successfully.")'
         
         # Match create_bucket with Bucket parameter (second pass - after variable renaming)
-        code = re.sub(
-            r'(\w+)\.create_bucket\(\s*Bucket\s*=\s*([^,]+)(?:,\s*CreateBucketConfiguration\s*=\s*\{[^}]+\})?\s*\)',
+        code = _S3_CREATE_BUCKET_KEYWORD_RE.sub(
             replace_create_bucket_late,
-            code,
-            flags=re.DOTALL
+            code
         )
-        code = re.sub(
-            r'(\w+)\.create_bucket\(\s*([^,\)]+)\s*\)',
+        code = _S3_CREATE_BUCKET_POSITIONAL_RE.sub(
             replace_create_bucket_late,
             code
         )
@@ -5371,8 +5344,7 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
             bucket_name_var = match.group(2).strip('\'"') if len(match.groups()) >= 2 else 'bucket_name'
             # Correct GCS API pattern: storage_client.get_bucket(bucket_name).delete()
             return f'storage_client = storage.Client()\nstorage_client.get_bucket("{bucket_name_var}").delete()\nprint(f"Bucket \'{bucket_name_var}\' deleted successfully.")'
-        code = re.sub(
-            r'(\w+)\.delete_bucket\(Bucket=([^,\)]+)\)',
+        code = _S3_DELETE_BUCKET_RE.sub(
             replace_delete_bucket,
             code
         )
@@ -5380,135 +5352,13 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
         # Remove or comment AWS region names
         # Replace AWS region constants/variables
         # BUT: Don't modify function parameter defaults - only modify variable assignments
-        aws_regions = [
-            'us-east-1', 'us-east-2', 'us-west-1', 'us-west-2',
-            'eu-west-1', 'eu-west-2', 'eu-west-3', 'eu-central-1',
-            'ap-southeast-1', 'ap-southeast-2', 'ap-northeast-1', 'ap-northeast-2',
-            'ap-south-1', 'sa-east-1', 'ca-central-1'
-        ]
-        for region in aws_regions:
-            # Comment out region assignments (but NOT function parameter defaults)
-            # Only match variable assignments, not function parameters
-            code = re.sub(
-                rf'^(\s+)(\w+)\s*=\s*[\'"]{region}[\'"]',
-                rf'\1# \2 = \'{region}\'  # Region not needed for GCP (uses GCP_REGION env var)',
-                code,
-                flags=re.MULTILINE
-            )
-            # Replace region_name parameter in client calls (already handled above, but ensure it's removed)
-            code = re.sub(
-                rf',\s*region_name=[\'"]?{region}[\'"]?',
-                '',
-                code
-            )
-            code = re.sub(
-                rf'region_name=[\'"]?{region}[\'"]?\s*,',
-                '',
-                code
-            )
+        # and drop region_name parameters in client calls (already handled above, but ensure they are removed)
+        code = _drop_aws_regions(code)
         
         # Remove region_name parameter completely if still present
         # Handle region_name in various positions - be more aggressive
         # First handle region_name with quotes - match more patterns
-        code = re.sub(
-            r',\s*region_name\s*=\s*[\'"][^\'"]+[\'"]',
-            '',
-            code
-        )
-        code = re.sub(
-            r'region_name\s*=\s*[\'"][^\'"]+[\'"]\s*,',
-            '',
-            code
-        )
-        code = re.sub(
-            r'region_name\s*=\s*[\'"][^\'"]+[\'"]',
-            '',
-            code
-        )
-        # Then handle region_name without quotes
-        code = re.sub(
-            r',\s*region_name\s*=\s*[^\s,\)]+',
-            '',
-            code
-        )
-        code = re.sub(
-            r'region_name\s*=\s*[^\s,\)]+\s*,',
-            '',
-            code
-        )
-        code = re.sub(
-            r'region_name\s*=\s*[^\s,\)]+',
-            '',
-            code
-        )
-        
-        # Also handle region_name in boto3.client/resource calls specifically
-        # Match: boto3.client('s3', region_name='us-west-2')
-        code = re.sub(
-            r'boto3\.(client|resource)\s*\(\s*([^,]+),\s*region_name\s*=\s*[^\)]+\)',
-            r'boto3.\1(\2)',
-            code
-        )
-        # Match: boto3.client('s3', region_name='us-west-2', ...)
-        code = re.sub(
-            r'boto3\.(client|resource)\s*\(\s*([^,]+),\s*region_name\s*=\s*[^,]+\s*,\s*([^\)]+)\)',
-            r'boto3.\1(\2, \3)',
-            code
-        )
-        # Match: s3_client = boto3.client('s3', region_name='us-west-2')
-        # This should remove region_name and then the final pass will replace boto3.client
-        # Handle with quotes: region_name='value' or region_name="value"
-        code = re.sub(
-            r'(\w+)\s*=\s*boto3\.(client|resource)\s*\(\s*([^,]+),\s*region_name\s*=\s*[\'"][^\'"]+[\'"]\s*\)',
-            r'\1 = boto3.\2(\3)',
-            code
-        )
-        # Match: dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
-        code = re.sub(
-            r'(\w+)\s*=\s*boto3\.(client|resource)\s*\(\s*[\'"](\w+)[\'"],\s*region_name\s*=\s*[\'"]([^\'"]+)[\'"]\s*\)',
-            r'\1 = boto3.\2(\'\3\')',
-            code
-        )
-        # Also handle without quotes (variable): region_name=var_name
-        code = re.sub(
-            r'(\w+)\s*=\s*boto3\.(client|resource)\s*\(\s*([^,]+),\s*region_name\s*=\s*[^,\)]+\s*\)',
-            r'\1 = boto3.\2(\3)',
-            code
-        )
-        
-        # After removing region_name, replace boto3.client/resource calls
-        # This ensures we catch cases where region_name was removed but boto3 call remains
-        # Handle all services, not just S3
-        code = re.sub(
-            r'(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]s3[\'\"][^\)]*\)',
-            r'\1 = storage.Client()',
-            code,
-            flags=re.DOTALL
-        )
-        code = re.sub(
-            r'(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]sqs[\'\"][^\)]*\)',
-            r'\1 = pubsub_v1.PublisherClient()',
-            code,
-            flags=re.DOTALL
-        )
-        code = re.sub(
-            r'(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]dynamodb[\'\"][^\)]*\)',
-            r'\1 = firestore.Client()',
-            code,
-            flags=re.DOTALL
-        )
-        code = re.sub(
-            r'(\w+)\s*=\s*boto3\.resource\s*\(\s*[\'\"]s3[\'\"][^\)]*\)',
-            r'\1 = storage.Client()',
-            code,
-            flags=re.DOTALL
-        )
-        code = re.sub(
-            r'(\w+)\s*=\s*boto3\.resource\s*\(\s*[\'\"]dynamodb[\'\"][^\)]*\)',
-            r'\1 = firestore.Client()',
-            code,
-            flags=re.DOTALL
-        )
+        code = _apply_rewrites(code, _S3_REGION_ARGUMENT_REWRITES)
         # Ensure imports are present for DynamoDB if needed
         if 'firestore.Client()' in code and 'from google.cloud import firestore' not in code:
             # Insert after storage import if present
@@ -5518,13 +5368,7 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
                 code = 'from google.cloud import firestore\n' + code
         
         # Clean up any double commas or trailing commas
-        code = re.sub(r',\s*,', ',', code)
-        code = re.sub(r'\(\s*,', '(', code)
-        code = re.sub(r',\s*\)', ')', code)
-        # Clean up empty function calls
-        code = re.sub(r'\(\s*\)', '()', code)
-        # Clean up spaces before closing paren
-        code = re.sub(r'\s+\)', ')', code)
+        code = _apply_rewrites(code, _S3_DANGLING_COMMA_REWRITES)
         
         # Final pass: If gcs_client exists but storage_client is referenced, replace storage_client with gcs_client
         # This ensures consistency when gcs_client was created by boto3.client replacement
@@ -5610,62 +5454,23 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
                     break
             
             # Also check for common AWS method patterns
-            aws_method_patterns = [
-                r'\bboto3\s*\.\s*(client|resource)\s*\(',
-                r'\bs3\s*\.\s*\w+',  # s3.something
-                r'\w+\s*\.\s*create_bucket\s*\(',
-                r'\w+\s*\.\s*upload_file\s*\(',
-                r'\w+\s*\.\s*download_file\s*\(',
-                r'\w+\s*\.\s*list_objects',
-                r'\w+\s*\.\s*delete_object\s*\(',
-                r'\w+\s*\.\s*put_object\s*\(',
-                r'\w+\s*\.\s*get_object\s*\(',
-                r'\w+\s*\.\s*batch_write_item\s*\(',
-                r'\w+\s*\.\s*send_message\s*\(',
-                r'\w+\s*\.\s*publish\s*\([^)]*TopicArn',
-                r'lambda_handler\s*\(',
-                r'event\s*\[\s*[\'"]Records[\'"]\s*\]',
-                r'record_event\s*\[\s*[\'"]s3[\'"]\s*\]',
-            ]
-            
             if not has_aws_patterns:
-                for pattern in aws_method_patterns:
-                    if re.search(pattern, refactored_code, re.IGNORECASE):
-                        has_aws_patterns = True
-                        break
+                has_aws_patterns = _AWS_METHOD_CALL_MARKER_RE.search(refactored_code) is not None
             
             # ALWAYS run Gemini validation if there are ANY AWS patterns detected
             # This ensures we catch everything, even if regex missed something
             if not has_aws_patterns:
                 # Double-check with more aggressive patterns
-                aggressive_patterns = [
-                    r'boto3',
-                    r'\.get_object\s*\(',
-                    r'\.batch_write_item\s*\(',
-                    r'\.send_message\s*\(',
-                    r'Bucket\s*=',
-                    r'Key\s*=',
-                    r'QueueUrl\s*=',
-                    r'TopicArn\s*=',
-                    r'RequestItems\s*=',
-                    r'DYNAMODB',
-                    r'SQS_',
-                    r'SNS_',
-                    r'lambda_handler',
-                ]
-                for pattern in aggressive_patterns:
-                    if re.search(pattern, refactored_code, re.IGNORECASE):
-                        has_aws_patterns = True
-                        break
+                has_aws_patterns = _AWS_AGGRESSIVE_MARKER_RE.search(refactored_code) is not None
             
             # ALWAYS validate with Gemini for multi-service code (Lambda with S3/DynamoDB/SQS/SNS)
             # Check if this is multi-service code
             is_multi_service = (
-                re.search(r'\blambda_handler\s*\(', refactored_code, re.IGNORECASE) or
-                re.search(r'\bprocess_gcs_file\s*\(', refactored_code, re.IGNORECASE) or
-                re.search(r'event\s*\[\s*[\'"]Records[\'"]\s*\]', refactored_code) or
-                (re.search(r'\b(get_object|batch_write|send_message|publish)\s*\(', refactored_code) and
-                 re.search(r'\b(storage|firestore|pubsub)\b', refactored_code))
+                _LAMBDA_HANDLER_CALL_RE.search(refactored_code) or
+                _PROCESS_GCS_FILE_CALL_RE.search(refactored_code) or
+                _EVENT_RECORDS_RE.search(refactored_code) or
+                (_AWS_DATA_CALL_RE.search(refactored_code) and
+                 _GCP_CLIENT_NAME_RE.search(refactored_code))
             )
             
             # ALWAYS run Gemini validation if:
@@ -5674,7 +5479,7 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
             # 3. Any suspicious AWS-like patterns
             if not has_aws_patterns and not is_multi_service:
                 # Final check - only skip if we're 100% certain there are no AWS patterns
-                if not re.search(r'\b(boto3|dynamodb|sqs|sns|lambda_handler|get_object|batch_write|send_message|QueueUrl|TopicArn|s3_client|dynamodb_client|sqs_client|sns_client)\b', refactored_code, re.IGNORECASE):
+                if not _AWS_LEFTOVER_NAME_RE.search(refactored_code):
                     # No AWS patterns found, return as-is
                     return refactored_code
             
@@ -5894,92 +5699,85 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
         """Add exception handling transformations for all AWS services"""
         # Ensure os is imported if not already
         if 'os.' in code and 'import os' not in code:
-            # Add import at the beginning if not present
-            lines = code.split('\n')
-            if not any('import os' in line for line in lines[:10]):
-                code = 'import os\n' + code
-        
-        # Replace botocore exceptions imports
-        # Handle multiple imports on one line first (most specific pattern first)
-        if re.search(r'from botocore\.exceptions import.*NoCredentialsError.*ClientError', code) or \
-           re.search(r'from botocore\.exceptions import.*ClientError.*NoCredentialsError', code):
-            # Check if they're on the same import line
-            code = re.sub(
-                r'from botocore\.exceptions import\s+NoCredentialsError,\s*ClientError',
-                'from google.auth.exceptions import DefaultCredentialsError\nfrom google.api_core import exceptions',
+            code = 'import os\n' + code
+        
+        # Replace botocore exceptions imports (all of them start with this prefix)
+        if 'from botocore.exceptions import' in code:
+            # Handle multiple imports on one line first (most specific pattern first)
+            if _BOTOCORE_IMPORTS_BOTH_RE.search(code) or \
+               _BOTOCORE_IMPORTS_BOTH_REVERSED_RE.search(code):
+                # Check if they're on the same import line
+                code = _BOTOCORE_IMPORT_BOTH_RE.sub(
+                    'from google.auth.exceptions import DefaultCredentialsError\nfrom google.api_core import exceptions',
+                    code
+                )
+                code = _BOTOCORE_IMPORT_BOTH_REVERSED_RE.sub(
+                    'from google.auth.exceptions import DefaultCredentialsError\nfrom google.api_core import exceptions',
+                    code
+                )
+        
+            # Handle single NoCredentialsError import
+            code = _BOTOCORE_IMPORT_NO_CREDENTIALS_RE.sub(
+                'from google.auth.exceptions import DefaultCredentialsError',
                 code
             )
-            code = re.sub(
-                r'from botocore\.exceptions import\s+ClientError,\s*NoCredentialsError',
-                'from google.auth.exceptions import DefaultCredentialsError\nfrom google.api_core import exceptions',
+            # Handle single ClientError import
+            code = _BOTOCORE_IMPORT_CLIENT_ERROR_RE.sub(
+                'from google.api_core import exceptions',
+                code
+            )
+            # Handle BotoCoreError and other botocore exceptions (catch-all)
+            code = _BOTOCORE_IMPORT_ANY_RE.sub(
+                'from google.api_core import exceptions',
                 code
             )
-        
-        # Handle single NoCredentialsError import
-        code = re.sub(
-            r'from botocore\.exceptions import\s+NoCredentialsError\b',
-            'from google.auth.exceptions import DefaultCredentialsError',
-            code
-        )
-        # Handle single ClientError import
-        code = re.sub(
-            r'from botocore\.exceptions import\s+ClientError\b',
-            'from google.api_core import exceptions',
-            code
-        )
-        # Handle BotoCoreError and other botocore exceptions (catch-all)
-        code = re.sub(
-            r'from botocore\.exceptions import\s+.*',
-            'from google.api_core import exceptions',
-            code
-        )
         
         # Replace exception usage (after imports are fixed)
         # Only replace if not in a string literal
-        lines = code.split('\n')
-        result_lines = []
-        in_string = False
-        string_char = None
+        # (only lines naming a boto exception change, so skip code that names none)
+        if _BOTO_EXCEPTION_NAME_RE.search(code):
+            lines = code.split('\n')
+            result_lines = []
+            in_string = False
+            string_char = None
         
-        for i, line in enumerate(lines):
-            # Track multiline strings
-            if '"""' in line or "'''" in line:
-                in_string = not in_string
-                string_char = '"""' if '"""' in line else "'''"
-            
-            # Skip if in multiline string
-            if in_string:
-                result_lines.append(line)
-                continue
+            for i, line in enumerate(lines):
+                # Track multiline strings
+                if '"""' in line or "'''" in line:
+                    in_string = not in_string
+                    string_char = '"""' if '"""' in line else "'''"
             
-            # Skip if in single-line string (simple check)
-            # But allow replacement in except clauses
-            if line.count('"') % 2 == 1 or line.count("'") % 2 == 1:
-                # Check if it's an except clause - we can still replace there
-                if re.search(r'except\s+(NoCredentialsError|ClientError|BotoCoreError)', line, re.IGNORECASE):
-                    # Replace exception names in except clauses
-                    line = re.sub(r'\bNoCredentialsError\b', 'DefaultCredentialsError', line)
-                    line = re.sub(r'\bClientError\b', 'exceptions.GoogleAPIError', line)
-                    line = re.sub(r'\bBotoCoreError\b', 'exceptions.GoogleAPIError', line)
-                    result_lines.append(line)
-                else:
-                    # Might be in string, be conservative
+                # Skip if in multiline string
+                if in_string:
                     result_lines.append(line)
-                continue
+                    continue
+            
+                # Skip if in single-line string (simple check)
+                # But allow replacement in except clauses
+                if line.count('"') % 2 == 1 or line.count("'") % 2 == 1:
+                    # Check if it's an except clause - we can still replace there
+                    if _EXCEPT_BOTO_EXCEPTION_RE.search(line):
+                        # Replace exception names in except clauses
+                        line = _NO_CREDENTIALS_ERROR_RE.sub('DefaultCredentialsError', line)
+                        line = _CLIENT_ERROR_RE.sub('exceptions.GoogleAPIError', line)
+                        line = _BOTO_CORE_ERROR_RE.sub('exceptions.GoogleAPIError', line)
+                        result_lines.append(line)
+                    else:
+                        # Might be in string, be conservative
+                        result_lines.append(line)
+                    continue
             
-            # Replace exception names
-            line = re.sub(r'\bNoCredentialsError\b', 'DefaultCredentialsError', line)
-            line = re.sub(r'\bClientError\b', 'exceptions.GoogleAPIError', line)
-            line = re.sub(r'\bBotoCoreError\b', 'exceptions.GoogleAPIError', line)
-            result_lines.append(line)
+                # Replace exception names
+                line = _NO_CREDENTIALS_ERROR_RE.sub('DefaultCredentialsError', line)
+                line = _CLIENT_ERROR_RE.sub('exceptions.GoogleAPIError', line)
+                line = _BOTO_CORE_ERROR_RE.sub('exceptions.GoogleAPIError', line)
+                result_lines.append(line)
         
-        code = '\n'.join(result_lines)
+            code = '\n'.join(result_lines)
         
         # Ensure exceptions module is available if ClientError/BotoCoreError is used
         if 'exceptions.GoogleAPIError' in code and 'from google.api_core import exceptions' not in code:
-            # Add import if not present
-            if 'from google.api_core import exceptions' not in code:
-                code = 'from google.api_core import exceptions\n' + code
+            code = 'from google.api_core import exceptions\n' + code
         
         return code
     
@@ -5996,103 +5794,29 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
         original_code = code
         
         # Pattern 1: Detect Lambda client variables
-        lambda_client_pattern = r'(\w+)\s*=\s*boto3\.client\([\'\"]lambda[\'\"].*?\)'
-        lambda_matches = re.finditer(lambda_client_pattern, original_code, flags=re.DOTALL)
+        lambda_matches = _LAMBDA_CLIENT_ASSIGNMENT_RE.finditer(original_code)
         for match in lambda_matches:
             var_name = match.group(1)
             if var_name not in variable_mapping:
                 variable_mapping[var_name] = 'gcf_client'
         
         # Pattern 2: Common Lambda variable names
-        if re.search(r'\blambda_client\b', original_code):
+        if _LAMBDA_CLIENT_NAME_RE.search(original_code):
             variable_mapping['lambda_client'] = 'gcf_client'
-        if re.search(r'\blambda_function\b', original_code):
+        if _LAMBDA_FUNCTION_NAME_RE.search(original_code):
             variable_mapping['lambda_function'] = 'gcf_function'
         
         # Replace Lambda client imports with GCP imports
-        code = re.sub(r'^import boto3\s*$', 'import functions_framework\nfrom google.cloud import functions_v2', code, flags=re.MULTILINE)
-        code = re.sub(r'^from boto3', 'import functions_framework\nfrom google.cloud import functions_v2', code, flags=re.MULTILINE)
+        code = _BOTO3_IMPORT_RE.sub('import functions_framework\nfrom google.cloud import functions_v2', code)
         
         # Apply variable renaming FIRST
-        for old_var, new_var in variable_mapping.items():
-            if old_var != new_var:
-                lines = code.split('\n')
-                renamed_lines = []
-                for line in lines:
-                    if line.strip().startswith('#'):
-                        renamed_lines.append(line)
-                        continue
-                    pattern = rf'\b{re.escape(old_var)}\b(?=\s*[.=\(\)\[\],:]|\s*$)'
-                    protected_line = re.sub(pattern, new_var, line)
-                    renamed_lines.append(protected_line)
-                code = '\n'.join(renamed_lines)
+        code = _rename_variables(code, variable_mapping)
         
         # Replace Lambda client instantiation (if still present after renaming)
         # This should happen AFTER variable renaming, so we match the renamed variable
-        code = re.sub(
-            r'(\w+)\s*=\s*boto3\.client\([\'\"]lambda[\'\"].*?\)',
-            r'\1 = functions_v2.FunctionServiceClient()  # GCP Cloud Functions client',
-            code,
-            flags=re.DOTALL
-        )
-        
-        # Also replace any remaining lambda_client references that weren't caught
-        code = re.sub(r'\blambda_client\b', 'gcf_client', code)
-        
-        # Handle S3 event trigger patterns FIRST (before handler transformation)
-        # Pattern: event['Records'][0]['s3']['bucket']['name']
-        # Replace nested patterns first
-        code = re.sub(
-            r'event\[[\'"]Records[\'"]\]\[(\d+)\]\[[\'"]s3[\'"]\]\[[\'"]bucket[\'"]\]\[[\'"]name[\'"]\]',
-            r'event["Records"][\1]["bucket"]["name"]  # Updated for Cloud Storage event format',
-            code
-        )
-        code = re.sub(
-            r'record\[[\'"]s3[\'"]\]\[[\'"]bucket[\'"]\]\[[\'"]name[\'"]\]',
-            r'record["bucket"]["name"]',
-            code
-        )
-        code = re.sub(
-            r'record\[[\'"]s3[\'"]\]\[[\'"]object[\'"]\]\[[\'"]key[\'"]\]',
-            r'record["name"]  # Cloud Storage event uses "name" instead of "key"',
-            code
-        )
-        # Replace record['s3']['bucket'] -> record['bucket']
-        code = re.sub(
-            r'record\[[\'"]s3[\'"]\]\[[\'"]bucket[\'"]\]',
-            r'record["bucket"]',
-            code
-        )
-        code = re.sub(
-            r'record\[[\'"]s3[\'"]\]\[[\'"]object[\'"]\]',
-            r'record["object"]',
-            code
-        )
-        # Also replace any remaining ['s3'] references in event records - be more aggressive
-        # Replace record['s3'] -> record['bucket']
-        code = re.sub(
-            r'record\[[\'"]s3[\'"]\]',
-            r'record["bucket"]',
-            code
-        )
-        # Replace event['Records'][i]['s3'] -> event['Records'][i]['bucket']
-        code = re.sub(
-            r'event\[[\'"]Records[\'"]\]\[(\d+)\]\[[\'"]s3[\'"]\]',
-            r'event["Records"][\1]["bucket"]',
-            code
-        )
+        code = _apply_rewrites(code, _LAMBDA_CLIENT_AND_EVENT_REWRITES)
         # Replace any ['s3'] pattern in dictionary access (but not in strings)
-        lines = code.split('\n')
-        result_lines = []
-        for line in lines:
-            # Skip if in string
-            if line.count('"') % 2 == 1 or line.count("'") % 2 == 1:
-                result_lines.append(line)
-                continue
-            # Replace ['s3'] -> ['bucket']
-            line = re.sub(r'\[[\'"]s3[\'"]\]', r'["bucket"]', line)
-            result_lines.append(line)
-        code = '\n'.join(result_lines)
+        code = _apply_line_rewrites(code, _S3_SUBSCRIPT_LINE_REWRITES)
         
         # Replace Lambda function handler patterns
         # Pattern: def lambda_handler(event, context):
@@ -6104,79 +5828,24 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
             return 'def process_gcs_file(data, context):\n    """\n    Background Cloud Function triggered by a new file in Cloud Storage.\n    The \'data\' parameter contains the bucket and file information.\n    The \'context\' parameter provides event metadata.\n    """'
         
         # First, check if it's an S3-triggered Lambda
-        is_s3_triggered = re.search(r'event\[[\'"]Records[\'"]\]', code) or re.search(r'record_event\[[\'"]s3[\'"]\]', code)
+        is_s3_triggered = _EVENT_RECORDS_INDEX_RE.search(code) or _RECORD_EVENT_S3_RE.search(code)
         
         if is_s3_triggered:
             # Replace with GCS background function handler
-            code = re.sub(
-                r'def\s+lambda_handler\s*\(\s*event\s*,\s*context\s*\)\s*:',
-                'def process_gcs_file(data, context):\n    """\n    Background Cloud Function triggered by a new file in Cloud Storage.\n    The \'data\' parameter contains the bucket and file information.\n    The \'context\' parameter provides event metadata.\n    """',
-                code,
-                flags=re.IGNORECASE
-            )
-            
-            # Replace event['Records'] loop with GCS event structure
-            # Pattern: for record_event in event['Records']:
-            code = re.sub(
-                r'for\s+record_event\s+in\s+event\[[\'"]Records[\'"]\]\s*:',
-                '# GCS background function receives single file event, not a list\n    # Process the single file event',
-                code
-            )
-            
-            # Replace event['Records'] access with direct data access
-            # Pattern: if not event.get('Records'):
-            code = re.sub(
-                r'if\s+not\s+event\.get\([\'"]Records[\'"]\)\s*:',
-                'if not data.get(\'bucket\') or not data.get(\'name\'):',
-                code
-            )
-            
-            # Replace record_event['s3']['bucket']['name'] -> data['bucket']
-            code = re.sub(
-                r'record_event\[[\'"]s3[\'"]\]\[[\'"]bucket[\'"]\]\[[\'"]name[\'"]\]',
-                'data.get(\'bucket\')',
-                code
-            )
-            code = re.sub(
-                r'record_event\[[\'"]s3[\'"]\]\[[\'"]object[\'"]\]\[[\'"]key[\'"]\]',
-                'data.get(\'name\')',
-                code
-            )
-            
-            # Replace bucket_name = record_event['s3']['bucket']['name']
-            code = re.sub(
-                r'bucket_name\s*=\s*record_event\[[\'"]s3[\'"]\]\[[\'"]bucket[\'"]\]\[[\'"]name[\'"]\]',
-                'bucket_name = data.get(\'bucket\')',
-                code
-            )
-            code = re.sub(
-                r'object_key\s*=\s*record_event\[[\'"]s3[\'"]\]\[[\'"]object[\'"]\]\[[\'"]key[\'"]\]',
-                'object_key = data.get(\'name\')',
-                code
-            )
+            code = _apply_rewrites(code, _LAMBDA_GCS_HANDLER_REWRITES)
         else:
             # HTTP-triggered function
-            code = re.sub(
-                r'def\s+lambda_handler\s*\(\s*event\s*,\s*context\s*\)\s*:',
+            code = _LAMBDA_HANDLER_DEF_RE.sub(
                 '@functions_framework.http\ndef function_handler(request):\n    """\n    Google Cloud Function HTTP handler.\n    Args:\n        request (flask.Request): The request object.\n    Returns:\n        The response text or JSON.\n    """\n    request_json = request.get_json(silent=True)\n    event = request_json if request_json else {}',
-                code,
-                flags=re.IGNORECASE
+                code
             )
         
         # Replace AWS environment variables FIRST (before S3 migration)
         # Handle os.environ.get() with optional default - be more aggressive
-        code = re.sub(r"os\.environ\.get\(['\"]S3_BUCKET_NAME['\"](?:,\s*[^)]+)?\)", "os.getenv('GCS_BUCKET_NAME')", code)
-        code = re.sub(r"os\.environ\[['\"]S3_BUCKET_NAME['\"]\]", "os.getenv('GCS_BUCKET_NAME')", code)
-        code = re.sub(r"os\.environ\.get\(['\"]AWS_REGION['\"](?:,\s*[^)]+)?\)", "os.getenv('GCP_REGION')", code)
-        code = re.sub(r"os\.environ\[['\"]AWS_REGION['\"]\]", "os.getenv('GCP_REGION')", code)
-        code = re.sub(r"os\.environ\.get\(['\"]AWS_LAMBDA_FUNCTION_NAME['\"](?:,\s*[^)]+)?\)", "os.getenv('GCP_FUNCTION_NAME')", code)
-        code = re.sub(r"os\.environ\[['\"]AWS_LAMBDA_FUNCTION_NAME['\"]\]", "os.getenv('GCP_FUNCTION_NAME')", code)
-        
-        # Also replace S3_BUCKET_NAME in any context (not just os.environ)
-        code = re.sub(r"['\"]S3_BUCKET_NAME['\"]", "'GCS_BUCKET_NAME'", code)
+        code = _apply_rewrites(code, _LAMBDA_ENVIRONMENT_REWRITES)
         
         # Ensure os is imported if environment variables are used
-        if re.search(r'os\.(getenv|environ)', code) and 'import os' not in code:
+        if _OS_ENVIRONMENT_USE_RE.search(code) and 'import os' not in code:
             lines = code.split('\n')
             if not any('import os' in line for line in lines[:10]):
                 # Insert after functions_framework import if present
@@ -6184,19 +5853,19 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
                     code = code.replace('import functions_framework', 'import functions_framework\nimport os', 1)
                 elif 'from google.cloud import' in code:
                     # Insert after GCP imports
-                    code = re.sub(r'(from google\.cloud import[^\n]+)', r'\1\nimport os', code, count=1)
+                    code = _GCP_IMPORT_LINE_RE.sub(r'\1\nimport os', code, count=1)
                 else:
                     code = 'import os\n' + code
         
         # If Lambda handler contains S3 code, migrate that too
         # Check for S3 patterns AFTER Lambda handler transformation
         # Be more aggressive in detection - check for any S3 patterns
-        has_s3 = (re.search(r'boto3\.(client|resource)\([\'\"]s3[\'\"]', code, re.IGNORECASE) or 
-                  re.search(r'\.(get_object|put_object|upload_file|download_file)', code) or
-                  re.search(r'event\[[\'"]Records[\'"]\]', code) or
-                  re.search(r'Bucket=', code) or
-                  re.search(r'Key=', code) or
-                  re.search(r'record\[[\'"]s3[\'"]\]', code))
+        has_s3 = (_S3_CLIENT_CALL_RE.search(code) or 
+                  _S3_DATA_CALL_RE.search(code) or
+                  _EVENT_RECORDS_INDEX_RE.search(code) or
+                  _BUCKET_KEYWORD_RE.search(code) or
+                  _KEY_KEYWORD_RE.search(code) or
+                  _RECORD_S3_INDEX_RE.search(code))
         
         if has_s3:
             # Migrate S3 code inside Lambda handler
@@ -6209,42 +5878,16 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
                 import logging
                 logging.warning(f"S3 migration in Lambda handler failed: {e}")
                 # Try to at least replace boto3.client('s3') manually - handle with region_name too
-                code = re.sub(r'boto3\.client\([\'\"]s3[\'\"][^\)]*\)', 'storage.Client()', code)
-                code = re.sub(r'boto3\.resource\([\'\"]s3[\'\"][^\)]*\)', 'storage.Client()', code)
+                code = _apply_rewrites(code, _LAMBDA_S3_CLIENT_FALLBACK_REWRITES)
                 # Ensure storage is imported
                 if 'from google.cloud import storage' not in code:
                     code = 'from google.cloud import storage\n' + code
                 # Replace S3 operations manually
-                code = re.sub(r'(\w+)\.get_object\(Bucket=([^,]+),\s*Key=([^\)]+)\)', 
-                             r'bucket = gcs_client.bucket(\2)\n    blob = bucket.blob(\3)\n    content = blob.download_as_text()', code)
-                # Replace s3 variable references - be more aggressive
-                # First replace s3 = storage.Client() -> gcs_client = storage.Client()
-                code = re.sub(r'\bs3\s*=\s*storage\.Client\(\)', 'gcs_client = storage.Client()', code)
-                # Replace s3 = boto3.client('s3') -> gcs_client = storage.Client()
-                code = re.sub(r'\bs3\s*=\s*boto3\.client\([\'\"]s3[\'\"][^\)]*\)', 'gcs_client = storage.Client()', code)
-                # Replace s3 = boto3.resource('s3') -> gcs_client = storage.Client()
-                code = re.sub(r'\bs3\s*=\s*boto3\.resource\([\'\"]s3[\'\"][^\)]*\)', 'gcs_client = storage.Client()', code)
+                code = _apply_rewrites(code, _LAMBDA_S3_OPERATION_FALLBACK_REWRITES)
                 # Then replace all s3. method calls with gcs_client.
-                lines = code.split('\n')
-                result_lines = []
-                for line in lines:
-                    # Skip if in string
-                    if line.count('"') % 2 == 1 or line.count("'") % 2 == 1:
-                        result_lines.append(line)
-                        continue
-                    # Replace s3 = ... -> gcs_client = ...
-                    if re.search(r'\bs3\s*=\s*', line):
-                        line = re.sub(r'\bs3\s*=\s*', 'gcs_client = ', line)
-                    # Replace s3. with gcs_client.
-                    if re.search(r'\bs3\s*\.', line):
-                        line = re.sub(r'\bs3\s*\.', 'gcs_client.', line)
-                    # Replace standalone s3 variable when used as client
-                    elif re.search(r'\bs3\b', line) and re.search(r'\bs3\s*\.', line):
-                        line = re.sub(r'\bs3\b(?=\s*\.)', 'gcs_client', line)
-                    result_lines.append(line)
-                code = '\n'.join(result_lines)
+                code = _apply_line_rewrites(code, (_S3_VAR_ASSIGNMENT_REWRITE, _S3_VAR_ATTRIBUTE_REWRITE))
                 # Final pass: replace any remaining s3 variable references
-                code = re.sub(r'\bs3\s*\.', 'gcs_client.', code)
+                code = _S3_VAR_ATTRIBUTE_RE.sub('gcs_client.', code)
                 # Continue with Lambda transformation even if S3 migration fails
         
         # Replace Lambda invocation calls with proper GCP HTTP requests
@@ -6273,8 +5916,6 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
         # This handles both single-line and multi-line patterns
         
         # Pattern for invoke calls (handles multi-line with DOTALL)
-        invoke_pattern = r'(\w+)\s*=\s*(\w+)\.invoke\s*\(\s*FunctionName\s*=\s*([^,]+)\s*,\s*InvocationType\s*=\s*([^,]+)?\s*,\s*Payload\s*=\s*([^\)]+)\s*\)'
-        
         def replace_invoke_full(match):
             var_name = match.group(1)
             function_name = match.group(3).strip('\'"')
@@ -6288,10 +5929,9 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
             return f'### 🌐 Invoke Cloud Function via HTTP\nimport os\nimport requests\n# For HTTP-triggered functions, use the function URL\n# Use GCP environment variables\nproject_id = os.getenv(\'GCP_PROJECT_ID\', \'your-project-id\')\nregion = os.getenv(\'GCP_REGION\', \'us-central1\')\nfunction_url = f"https://{{region}}-{{project_id}}.cloudfunctions.net/{function_name}"\n{var_name} = requests.post(function_url, json={payload})\nresult = {var_name}.json() if {var_name}.headers.get(\'content-type\', \'\').startswith(\'application/json\') else {var_name}.text\nprint(f"Function {function_name} invoked: {{result}}")'
         
         # Replace multi-line invoke calls
-        code = re.sub(invoke_pattern, replace_invoke_full, code, flags=re.DOTALL)
+        code = _LAMBDA_INVOKE_ASSIGNMENT_RE.sub(replace_invoke_full, code)
         
         # Also handle direct invoke (without assignment)
-        direct_invoke_pattern = r'(\w+)\.invoke\s*\(\s*FunctionName\s*=\s*([^,]+)\s*,\s*InvocationType\s*=\s*([^,]+)?\s*,\s*Payload\s*=\s*([^\)]+)\s*\)'
         def replace_invoke_direct_full(match):
             function_name = match.group(2).strip('\'"')
             payload = match.group(4).strip().strip('\'"')
@@ -6302,41 +5942,40 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
                 payload = payload[1:-1]
             return f'### 🌐 Invoke Cloud Function via HTTP\nimport os\nimport requests\n# For HTTP-triggered functions, use the function URL\n# Use GCP environment variables\nproject_id = os.getenv(\'GCP_PROJECT_ID\', \'your-project-id\')\nregion = os.getenv(\'GCP_REGION\', \'us-central1\')\nfunction_url = f"https://{{region}}-{{project_id}}.cloudfunctions.net/{function_name}"\nresponse = requests.post(function_url, json={payload})\nresult = response.json() if response.headers.get(\'content-type\', \'\').startswith(\'application/json\') else response.text\nprint(f"Function {function_name} invoked: {{result}}")'
         
-        code = re.sub(direct_invoke_pattern, replace_invoke_direct_full, code, flags=re.DOTALL)
+        code = _LAMBDA_INVOKE_RE.sub(replace_invoke_direct_full, code)
         
         # Replace create_function with proper GCP deployment pattern
         # Use regex with DOTALL to handle multi-line patterns
-        create_function_pattern = r'(\w+)\.create_function\s*\(\s*FunctionName\s*=\s*([^,]+)\s*,\s*Runtime\s*=\s*([^,]+)\s*,\s*Role\s*=\s*([^,]+)\s*,\s*Handler\s*=\s*([^,]+)\s*,\s*Code\s*=\s*([^\)]+)\s*\)'
-        
         def replace_create_function_full(match):
             function_name = match.group(2).strip('\'"')
             runtime = match.group(3).strip('\'"')
             handler = match.group(5).strip('\'"')
             return f'### 🚀 Deploy Cloud Function\n# Cloud Functions are deployed via gcloud CLI or Cloud Build\n# Example gcloud command:\n# gcloud functions deploy {function_name} \\\\\n#     --runtime={runtime} \\\\\n#     --trigger=http \\\\\n#     --entry-point={handler} \\\\\n#     --source=.\n#\n# Or use the Cloud Functions client for programmatic deployment:\nfrom google.cloud.functions_v2 import Function, CreateFunctionRequest\ngcf_client = functions_v2.FunctionServiceClient()\n# Note: Full deployment requires Cloud Build setup - see GCP documentation'
         
-        code = re.sub(create_function_pattern, replace_create_function_full, code, flags=re.DOTALL)
+        code = _LAMBDA_CREATE_FUNCTION_RE.sub(replace_create_function_full, code)
         
         # Remove AWS Lambda comments - be more careful to remove entire comment lines
-        code = re.sub(r'#\s*AWS\s+Lambda\s+example.*?\n', '# 🌟 Google Cloud Functions Example\n', code, flags=re.IGNORECASE)
+        code = _AWS_LAMBDA_EXAMPLE_COMMENT_RE.sub('# 🌟 Google Cloud Functions Example\n', code)
         # Remove comment lines that contain AWS Lambda references
-        lines = code.split('\n')
+        is_aws_lambda_comment = _AWS_LAMBDA_COMMENT_LINE_RE.match
+        is_lambda_comment = _LAMBDA_COMMENT_LINE_RE.match
         cleaned_lines = []
-        for line in lines:
+        for line in code.split('\n'):
             # Skip lines that are only AWS Lambda comments
-            if re.match(r'^\s*#.*?AWS.*?Lambda.*?$', line, re.IGNORECASE):
+            if is_aws_lambda_comment(line):
                 continue
             # Skip lines that are only Lambda comments (but keep other comments)
-            if re.match(r'^\s*#.*?Lambda.*?$', line, re.IGNORECASE) and 'Cloud Function' not in line:
+            if is_lambda_comment(line) and 'Cloud Function' not in line:
                 continue
             cleaned_lines.append(line)
         code = '\n'.join(cleaned_lines)
         
         # Clean up multiple blank lines
-        code = re.sub(r'\n{3,}', '\n\n', code)
+        code = _EXCESS_BLANK_LINES_RE.sub('\n\n', code)
         
         # If Lambda handler contains S3 code, migrate that too
         # Check for S3 patterns AFTER Lambda handler transformation
-        if re.search(r'boto3\.(client|resource)\([\'\"]s3[\'\"]', code, re.IGNORECASE):
+        if _S3_CLIENT_CALL_RE.search(code):
             # Migrate S3 code inside Lambda handler
             try:
                 s3_code, s3_var_mapping = self._migrate_s3_to_gcs(code)
@@ -6349,30 +5988,9 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
                 # Continue with Lambda transformation even if S3 migration fails
         
         # Replace AWS environment variables in Lambda handler
-        code = re.sub(r"os\.environ\.get\(['\"]S3_BUCKET_NAME['\"](?:,\s*[^)]+)?\)", "os.getenv('GCS_BUCKET_NAME')", code)
-        code = re.sub(r"os\.environ\[['\"]S3_BUCKET_NAME['\"]\]", "os.getenv('GCS_BUCKET_NAME')", code)
-        
-        # Final pass: ensure s3 variables are replaced with gcs_client
-        # Replace s3 = storage.Client() -> gcs_client = storage.Client()
-        code = re.sub(r'\bs3\s*=\s*storage\.Client\(\)', 'gcs_client = storage.Client()', code)
-        # Replace s3. method calls with gcs_client.
-        code = re.sub(r'\bs3\s*\.', 'gcs_client.', code)
+        code = _apply_rewrites(code, _LAMBDA_HANDLER_ENVIRONMENT_REWRITES)
         # Replace standalone s3 variable when used as client
-        lines = code.split('\n')
-        result_lines = []
-        for line in lines:
-            # Skip if in string
-            if line.count('"') % 2 == 1 or line.count("'") % 2 == 1:
-                result_lines.append(line)
-                continue
-            # Replace s3 = ... -> gcs_client = ...
-            if re.search(r'\bs3\s*=\s*', line):
-                line = re.sub(r'\bs3\s*=\s*', 'gcs_client = ', line)
-            # Replace s3. with gcs_client.
-            if re.search(r'\bs3\s*\.', line):
-                line = re.sub(r'\bs3\s*\.', 'gcs_client.', line)
-            result_lines.append(line)
-        code = '\n'.join(result_lines)
+        code = _apply_line_rewrites(code, (_S3_VAR_ASSIGNMENT_REWRITE, _S3_VAR_ATTRIBUTE_REWRITE))
         
         # Add exception handling
         code = self._add_exception_handling(code)
@@ -6396,8 +6014,8 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
         # Detect if this is a migration script (reads from DynamoDB, writes to Firestore)
         # Migration scripts typically have: scan(), get_item(), query() AND put_item()/batch_write_item()
         is_migration_script = (
-            re.search(r'\.(scan|get_item|query)\(', code, re.IGNORECASE) and
-            re.search(r'\.(put_item|batch_write_item)\(', code, re.IGNORECASE)
+            _DYNAMODB_READ_CALL_RE.search(code) and
+            _DYNAMODB_WRITE_CALL_RE.search(code)
         )
         
         if is_migration_script:
@@ -6406,39 +6024,32 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
         
         # APPLICATION CODE MODE: Replace all DynamoDB with Firestore
         # CRITICAL FIRST PASS: Catch ALL boto3.client('dynamodb') patterns BEFORE anything else
-        code = re.sub(
-            r'(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]dynamodb[\'\"][^\)]*\)',
+        code = _DYNAMODB_CLIENT_INIT_RE.sub(
             r'\1 = firestore.Client()',
-            code,
-            flags=re.DOTALL | re.IGNORECASE
+            code
         )
-        code = re.sub(r'\bdynamodb_client\s*=\s*', 'firestore_db = ', code)
-        code = re.sub(r'\bdynamodb_client\.', 'firestore_db.', code)
-        code = re.sub(r'\bdynamodb_client\b', 'firestore_db', code)
+        code = _DYNAMODB_CLIENT_NAME_ASSIGNMENT_RE.sub('firestore_db = ', code)
+        code = _DYNAMODB_CLIENT_NAME_ATTRIBUTE_RE.sub('firestore_db.', code)
+        code = _DYNAMODB_CLIENT_NAME_RE.sub('firestore_db', code)
         
         # Replace DynamoDB imports
-        code = re.sub(r'^import boto3\s*$', 'from google.cloud import firestore', code, flags=re.MULTILINE)
-        code = re.sub(r'^from boto3', 'from google.cloud import firestore', code, flags=re.MULTILINE)
+        code = _BOTO3_IMPORT_RE.sub('from google.cloud import firestore', code)
         
         # Track variable name for DynamoDB resource/client
-        dynamodb_var_match = re.search(r'(\w+)\s*=\s*boto3\.(resource|client)\([\'\"]dynamodb[\'\"]', code)
+        dynamodb_var_match = _DYNAMODB_INIT_VAR_RE.search(code)
         dynamodb_var = dynamodb_var_match.group(1) if dynamodb_var_match else 'dynamodb'
         db_var = 'db' if dynamodb_var == 'dynamodb' else f'{dynamodb_var}_db'
         
         # Replace DynamoDB resource (common pattern)
-        code = re.sub(
-            r'(\w+)\s*=\s*boto3\.resource\([\'\"]dynamodb[\'\"].*?\)',
+        code = _DYNAMODB_RESOURCE_INIT_CALL_RE.sub(
             rf'{db_var} = firestore.Client()',
-            code,
-            flags=re.DOTALL
+            code
         )
         
         # Replace DynamoDB client instantiation
-        code = re.sub(
-            r'(\w+)\s*=\s*boto3\.client\([\'\"]dynamodb[\'\"].*?\)',
+        code = _DYNAMODB_CLIENT_INIT_CALL_RE.sub(
             rf'{db_var} = firestore.Client()',
-            code,
-            flags=re.DOTALL
+            code
         )
         
         # Replace variable references BEFORE table operations
@@ -6459,70 +6070,71 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
         # Also handle cases where variable name is 'table' - rename to 'collection'
         # But be careful - only if it's clearly a DynamoDB table
         # Replace table = db.Table -> collection = db.collection
-        code = re.sub(r'\btable\s*=\s*(\w+)\.Table', r'collection = \1.collection', code)
-        code = re.sub(r'\btable\.put_item', r'collection.document().set', code)
-        code = re.sub(r'\btable\.get_item', r'collection.document', code)
-        
-        # table.put_item() -> collection.add() or document.set()
-        code = re.sub(
-            r'(\w+)\.put_item\(Item=([^,\)]+)\)',
-            r'doc_ref = \1.document()\n    doc_ref.set(\2)',
-            code
-        )
-        
-        code = re.sub(
-            r'(\w+)\.put_item\(TableName=([^,]+),\s*Item=([^,\)]+)\)',
-            r'db.collection(\2).document().set(\3)',
-            code
-        )
-        
-        # table.get_item() -> document.get()
-        code = re.sub(
-            r'(\w+)\.get_item\(Key=([^,\)]+)\)',
-            r'doc_ref = \1.document(\2)\n    doc = doc_ref.get()',
-            code
-        )
-        
-        code = re.sub(
-            r'(\w+)\.get_item\(TableName=([^,]+),\s*Key=([^,\)]+)\)',
-            r'doc = db.collection(\2).document(\3).get()',
-            code
-        )
+        code = _DYNAMODB_TABLE_ASSIGNMENT_RE.sub(r'collection = \1.collection', code)
+        code = _DYNAMODB_TABLE_PUT_ITEM_RE.sub(r'collection.document().set', code)
+        code = _DYNAMODB_TABLE_GET_ITEM_RE.sub(r'collection.document', code)
+        
+        # Only rewrite the DynamoDB calls the code actually makes (none of the
+        # rewrites below introduces one of these calls)
+        called = set(_ATTRIBUTE_CALL_RE.findall(code))
+        
+        if 'put_item' in called:
+            # table.put_item() -> collection.add() or document.set()
+            code = _DYNAMODB_PUT_ITEM_RE.sub(
+                r'doc_ref = \1.document()\n    doc_ref.set(\2)',
+                code
+            )
+            
+            code = _DYNAMODB_PUT_ITEM_TABLE_NAME_RE.sub(
+                r'db.collection(\2).document().set(\3)',
+                code
+            )
         
-        # table.query() -> collection.where()
-        code = re.sub(
-            r'(\w+)\.query\(KeyConditionExpression=([^,\)]+)\)',
-            r'query = \1.where(\2)\n    results = query.stream()',
-            code
-        )
+        if 'get_item' in called:
+            # table.get_item() -> document.get()
+            code = _DYNAMODB_GET_ITEM_RE.sub(
+                r'doc_ref = \1.document(\2)\n    doc = doc_ref.get()',
+                code
+            )
+            
+            code = _DYNAMODB_GET_ITEM_TABLE_NAME_RE.sub(
+                r'doc = db.collection(\2).document(\3).get()',
+                code
+            )
         
-        code = re.sub(
-            r'(\w+)\.query\(TableName=([^,]+),\s*KeyConditionExpression=([^,\)]+)\)',
-            r'query = db.collection(\2).where(\3)\n    results = query.stream()',
-            code
-        )
+        if 'query' in called:
+            # table.query() -> collection.where()
+            code = _DYNAMODB_QUERY_RE.sub(
+                r'query = \1.where(\2)\n    results = query.stream()',
+                code
+            )
+            
+            code = _DYNAMODB_QUERY_TABLE_NAME_RE.sub(
+                r'query = db.collection(\2).where(\3)\n    results = query.stream()',
+                code
+            )
         
-        # table.delete_item() -> document.delete()
-        code = re.sub(
-            r'(\w+)\.delete_item\(Key=([^,\)]+)\)',
-            r'\1.document(\2).delete()',
-            code
-        )
+        if 'delete_item' in called:
+            # table.delete_item() -> document.delete()
+            code = _DYNAMODB_DELETE_ITEM_RE.sub(
+                r'\1.document(\2).delete()',
+                code
+            )
         
-        # Replace batch_writer -> batch operations
-        # Pattern: with table.batch_writer() as batch:
-        code = re.sub(
-            r'with\s+(\w+)\.batch_writer\(\)\s+as\s+(\w+):',
-            r'batch = firestore_db.batch()\nwith batch:',
-            code
-        )
-        # Replace batch.put_item() inside batch_writer context
-        # This should match batch.put_item(Item={...}) where batch is the context variable
-        code = re.sub(
-            r'(\w+)\.put_item\(Item=([^\)]+)\)',
-            r'doc_ref = collection_ref.document()\n    batch.set(doc_ref, \2)',
-            code
-        )
+        if 'batch_writer' in called:
+            # Replace batch_writer -> batch operations
+            # Pattern: with table.batch_writer() as batch:
+            code = _DYNAMODB_BATCH_WRITER_RE.sub(
+                r'batch = firestore_db.batch()\nwith batch:',
+                code
+            )
+        if 'put_item' in called:
+            # Replace batch.put_item() inside batch_writer context
+            # This should match batch.put_item(Item={...}) where batch is the context variable
+            code = _DYNAMODB_BATCH_PUT_ITEM_RE.sub(
+                r'doc_ref = collection_ref.document()\n    batch.set(doc_ref, \2)',
+                code
+            )
         
         # Replace dynamodb_client.batch_write_item() -> Firestore batch operations
         # Pattern: dynamodb_client.batch_write_item(RequestItems={TABLE_NAME: [PutRequest: {Item: {...}}]})
@@ -6532,40 +6144,35 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
             # Extract items from PutRequest list
             return f'batch = firestore_db.batch()\ncollection_ref = firestore_db.collection({table_name})\n# Process items in batches of 500 (Firestore limit)\nfor item in items:\n    doc_id = item.pop(\'uuid\', str(uuid.uuid4()))\n    doc_ref = collection_ref.document(doc_id)\n    batch.set(doc_ref, item)\nbatch.commit()'
         
-        code = re.sub(
-            r'(\w+)\.batch_write_item\(\s*RequestItems\s*=\s*\{([^:]+):\s*\[([^\]]+)\]\}\s*\)',
-            replace_batch_write_item,
-            code,
-            flags=re.DOTALL
-        )
-        
-        # Also handle simpler pattern: batch_write_item(RequestItems={TABLE: batch})
-        code = re.sub(
-            r'(\w+)\.batch_write_item\(\s*RequestItems\s*=\s*\{([^}]+)\}\s*\)',
-            replace_batch_write_item,
-            code,
-            flags=re.DOTALL
-        )
+        if 'batch_write_item' in called:
+            code = _DYNAMODB_BATCH_WRITE_ITEM_LIST_RE.sub(
+                replace_batch_write_item,
+                code
+            )
+            
+            # Also handle simpler pattern: batch_write_item(RequestItems={TABLE: batch})
+            code = _DYNAMODB_BATCH_WRITE_ITEM_RE.sub(
+                replace_batch_write_item,
+                code
+            )
         
         # Replace DynamoDB item format {'S': 'value'} -> native Python dicts
         # Pattern: {'S': 'value'} -> 'value'
-        code = re.sub(
-            r'\{\s*[\'"]S[\'"]\s*:\s*([^}]+)\s*\}',
+        code = _DYNAMODB_STRING_ATTRIBUTE_RE.sub(
             r'\1',
             code
         )
-        code = re.sub(
-            r'\{\s*[\'"]N[\'"]\s*:\s*([^}]+)\s*\}',
+        code = _DYNAMODB_NUMBER_ATTRIBUTE_RE.sub(
             r'int(\1)',
             code
         )
         
         # Replace scan() -> collection.stream()
-        code = re.sub(
-            r'(\w+)\.scan\(\)',
-            r'\1.stream()',
-            code
-        )
+        if 'scan' in called:
+            code = _DYNAMODB_SCAN_RE.sub(
+                r'\1.stream()',
+                code
+            )
         
         # Add exception handling
         code = self._add_exception_handling(code)
@@ -6594,8 +6201,8 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
                 code = code.replace('import firebase_admin', 'import firebase_admin\nfrom firebase_admin import credentials, firestore\nfrom decimal import Decimal')
         
         # Find DynamoDB client/resource variable names (for reading)
-        dynamodb_resource_match = re.search(r'(\w+)\s*=\s*boto3\.resource\([\'\"]dynamodb[\'\"][^\)]*\)', code)
-        dynamodb_client_match = re.search(r'(\w+)\s*=\s*boto3\.client\([\'\"]dynamodb[\'\"][^\)]*\)', code)
+        dynamodb_resource_match = _DYNAMODB_RESOURCE_VAR_RE.search(code)
+        dynamodb_client_match = _DYNAMODB_CLIENT_VAR_RE.search(code)
         
         # Preserve DynamoDB resource/client initialization (for reading)
         # Don't replace these - they're needed for reading from DynamoDB
@@ -6604,12 +6211,11 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
         # Find where DynamoDB client/resource is initialized and add Firestore client nearby
         if dynamodb_resource_match or dynamodb_client_match:
             # Find the initialization line
-            init_pattern = r'(\w+)\s*=\s*boto3\.(resource|client)\([\'\"]dynamodb[\'\"][^\)]*\)'
             def add_firestore_init(match):
                 dynamodb_var = match.group(1)
                 # Add Firestore initialization after DynamoDB initialization
                 return match.group(0) + f'\n\n# Initialize Firestore for writing\nif not firebase_admin._apps:\n    cred = credentials.Certificate(GOOGLE_KEY_PATH)\n    firebase_admin.initialize_app(cred)\n\nfirestore_db = firestore.Client()'
-            code = re.sub(init_pattern, add_firestore_init, code, count=1)
+            code = _DYNAMODB_INIT_CALL_RE.sub(add_firestore_init, code, count=1)
         else:
             # No DynamoDB initialization found, add both
             code = '# Initialize AWS DynamoDB (for reading)\ndynamodb_resource = boto3.resource(\'dynamodb\', region_name=DYNAMO_REGION)\nsource_table = dynamodb_resource.Table(DYNAMO_TABLE_NAME)\n\n# Initialize Google Firestore (for writing)\nif not firebase_admin._apps:\n    cred = credentials.Certificate(GOOGLE_KEY_PATH)\n    firebase_admin.initialize_app(cred)\n\nfirestore_db = firestore.Client()\n' + code
@@ -6622,11 +6228,9 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
             # Try to extract table name from context or use a variable
             return f'# Write to Firestore\n    doc_ref = firestore_db.collection(FIRESTORE_COLLECTION).document()\n    doc_ref.set({item})'
         
-        code = re.sub(
-            r'(\w+)\.put_item\(\s*Item\s*=\s*([^\)]+)\)',
+        code = _DYNAMODB_PUT_ITEM_KEYWORD_RE.sub(
             replace_put_item,
-            code,
-            flags=re.DOTALL
+            code
         )
         
         # Replace batch_write_item() -> Firestore batch operations
@@ -6644,11 +6248,9 @@ class ExtendedPythonTransformer(BaseExtendedTransformer):
         batch.set(doc_ref, clean_item)
     batch.commit()'''
         
-        code = re.sub(
-            r'(\w+)\.batch_write_item\(\s*RequestItems\s*=\s*\{[^}]+\}\s*\)',
+        code = _DYNAMODB_BATCH_WRITE_ITEM_CALL_RE.sub(
             replace_batch_write,
-            code,
-            flags=re.DOTALL
+            code
         )
         
         # Add helper function for Decimal conversion if not present
@@ -6703,25 +6305,13 @@ PRIMARY_KEY_FIELD = 'UserId'  # Field in DynamoDB to use as Document ID in Fires
         original_code = code
         
         # CRITICAL FIRST PASS: Catch ALL boto3.client('sqs') patterns BEFORE anything else
-        code = re.sub(
-            r'(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]sqs[\'\"][^\)]*\)',
-            r'\1 = pubsub_v1.PublisherClient()',
-            code,
-            flags=re.DOTALL | re.IGNORECASE
-        )
-        code = re.sub(r'\bsqs_client\s*=\s*', 'pubsub_publisher = ', code)
-        code = re.sub(r'\bsqs_client\.', 'pubsub_publisher.', code)
-        code = re.sub(r'\bsqs_client\b', 'pubsub_publisher', code)
-        
-        # Replace SQS imports FIRST
-        code = re.sub(r'^import boto3\s*$', 'import os\nfrom google.cloud import pubsub_v1', code, flags=re.MULTILINE)
-        code = re.sub(r'^from boto3', 'import os\nfrom google.cloud import pubsub_v1', code, flags=re.MULTILINE)
+        code = _apply_rewrites(code, _SQS_FIRST_PASS_REWRITES)
         # Also handle if boto3 import is still present
         if 'import boto3' in code and 'from google.cloud import pubsub_v1' not in code:
-            code = re.sub(r'import boto3', 'import os\nfrom google.cloud import pubsub_v1', code, count=1)
+            code = code.replace('import boto3', 'import os\nfrom google.cloud import pubsub_v1', 1)
         
         # Track variable name for SQS client BEFORE replacement
-        sqs_var_match = re.search(r'(\w+)\s*=\s*boto3\.client\([\'\"]sqs[\'\"][^\)]*\)', code)
+        sqs_var_match = _SQS_CLIENT_VAR_RE.search(code)
         sqs_var = sqs_var_match.group(1) if sqs_var_match else 'sqs'
         publisher_var = 'publisher' if sqs_var == 'sqs' else f'{sqs_var}_publisher'
         
@@ -6732,11 +6322,9 @@ PRIMARY_KEY_FIELD = 'UserId'  # Field in DynamoDB to use as Document ID in Fires
             var_name = match.group(1)
             return f'{publisher_var} = pubsub_v1.PublisherClient()'
         
-        code = re.sub(
-            r'(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]sqs[\'\"][^\)]*\)',
+        code = _SQS_CLIENT_INIT_RE.sub(
             replace_sqs_client,
-            code,
-            flags=re.DOTALL
+            code
         )
         
         # Replace all sqs. method calls with publisher. BEFORE URL replacement
@@ -6745,39 +6333,25 @@ PRIMARY_KEY_FIELD = 'UserId'  # Field in DynamoDB to use as Document ID in Fires
         # Replace queue URL assignments (remove them, not needed for Pub/Sub)
         # Handle both variable assignments and direct usage - be more aggressive
         # Replace SQS URLs completely - handle both single and double quotes
-        code = re.sub(
-            r'(\w+)\s*=\s*[\'"]https://sqs\.[^\'"]+[\'"]',
+        code = _SQS_URL_ASSIGNMENT_RE.sub(
             rf'# Queue URL not needed for Pub/Sub - use topic_path instead',
             code
         )
         # Also replace any remaining SQS URL strings (but not in comments)
-        lines = code.split('\n')
-        result_lines = []
-        for line in lines:
-            if line.strip().startswith('#'):
-                result_lines.append(line)
-                continue
-            # Replace SQS URLs
-            line = re.sub(r'[\'"]https://sqs\.[^\'"]+[\'"]', r'# SQS URL replaced', line)
-            result_lines.append(line)
-        code = '\n'.join(result_lines)
+        replace_sqs_url = _SQS_URL_RE.sub
+        code = '\n'.join(
+            line if line.strip().startswith('#') else replace_sqs_url(r'# SQS URL replaced', line)
+            for line in code.split('\n')
+        )
         # Also replace queue URLs in function calls - handle variable references too
-        code = re.sub(
-            r'QueueUrl=[\'"]https://sqs\.[^\'"]+[\'"]',
+        code = _SQS_QUEUE_URL_ARGUMENT_RE.sub(
             r'# QueueUrl parameter removed - use topic_path instead',
             code
         )
         # Don't replace QueueUrl=variable_name as it might break code
         # Instead, replace queue_url variable usage after send_message transformation
         # Replace any remaining queue_url variable references (but not in strings)
-        lines = code.split('\n')
-        result_lines = []
-        for line in lines:
-            if line.count('"') % 2 == 0 and line.count("'") % 2 == 0:
-                # Replace queue_url variable references
-                line = re.sub(r'\bqueue_url\b(?=\s*[,\)])', 'topic_path', line)
-            result_lines.append(line)
-        code = '\n'.join(result_lines)
+        code = _apply_line_rewrites(code, _QUEUE_URL_ARGUMENT_LINE_REWRITES)
         
         # Replace SQS send_message -> Pub/Sub publish
         # Pattern: sqs.send_message(QueueUrl=url, MessageBody=body)
@@ -6788,69 +6362,50 @@ PRIMARY_KEY_FIELD = 'UserId'  # Field in DynamoDB to use as Document ID in Fires
             message_body = match.group(3)
             # Try to extract topic name from queue URL (could be variable or string)
             queue_url = queue_url_param.strip('\'"')
-            topic_match = re.search(r'/([^/]+)(?:\.fifo)?$', queue_url)
+            topic_match = _QUEUE_NAME_RE.search(queue_url)
             topic_name = topic_match.group(1) if topic_match else 'topic-name'
             return f'import os\n    topic_path = {publisher_var}.topic_path(os.getenv("GCP_PROJECT_ID", "your-project-id"), os.getenv("GCP_PUBSUB_TOPIC_ID", "{topic_name}"))\n    future = {publisher_var}.publish(topic_path, {message_body}.encode("utf-8"))'
         
-        # Handle send_message with QueueUrl parameter
-        code = re.sub(
-            r'(\w+)\.send_message\(QueueUrl=([^,]+),\s*MessageBody=([^,\)]+)\)',
-            replace_send_message,
-            code
-        )
+        # Only rewrite the SQS calls the code actually makes
+        called = set(_ATTRIBUTE_CALL_RE.findall(code))
         
-        # Also handle send_message with FIFO parameters
-        code = re.sub(
-            r'(\w+)\.send_message\(\s*QueueUrl=([^,]+),\s*MessageBody=([^,]+),\s*MessageGroupId=([^,]+),\s*MessageDeduplicationId=([^\)]+)\)',
-            replace_send_message,
-            code
-        )
+        if 'send_message' in called:
+            # Handle send_message with QueueUrl parameter
+            code = _SQS_SEND_MESSAGE_RE.sub(
+                replace_send_message,
+                code
+            )
+            
+            # Also handle send_message with FIFO parameters
+            code = _SQS_SEND_FIFO_MESSAGE_RE.sub(
+                replace_send_message,
+                code
+            )
         
         # Replace receive_message -> Pub/Sub pull
         def replace_receive_message(match):
             client_var = match.group(1)
             queue_url_param = match.group(2).strip().strip('\'"')
             # Try to extract subscription name from queue URL
-            sub_match = re.search(r'/([^/]+)(?:\.fifo)?$', queue_url_param)
+            sub_match = _QUEUE_NAME_RE.search(queue_url_param)
             sub_name = sub_match.group(1) if sub_match else 'subscription-name'
             return f'import os\n    subscriber = pubsub_v1.SubscriberClient()\n    subscription_path = subscriber.subscription_path(os.getenv("GCP_PROJECT_ID", "your-project-id"), os.getenv("GCP_PUBSUB_SUBSCRIPTION_ID", "{sub_name}"))\n    response = subscriber.pull(request={{"subscription": subscription_path, "max_messages": 1}})'
         
-        code = re.sub(
-            r'(\w+)\.receive_message\(QueueUrl=([^,\)]+)\)',
-            replace_receive_message,
-            code
-        )
+        if 'receive_message' in called:
+            code = _SQS_RECEIVE_MESSAGE_RE.sub(
+                replace_receive_message,
+                code
+            )
         
         # Replace delete_message -> Pub/Sub acknowledge
-        code = re.sub(
-            r'(\w+)\.delete_message\(QueueUrl=([^,]+),\s*ReceiptHandle=([^,\)]+)\)',
-            r'subscriber.acknowledge(request={{"subscription": subscription_path, "ack_ids": [\3]}})',
-            code
-        )
+        if 'delete_message' in called:
+            code = _SQS_DELETE_MESSAGE_RE.sub(
+                r'subscriber.acknowledge(request={{"subscription": subscription_path, "ack_ids": [\3]}})',
+                code
+            )
         
         # Replace FIFO queue patterns (MessageGroupId, MessageDeduplicationId)
-        # Pub/Sub doesn't have exact FIFO equivalent, but we can use ordering keys
-        # Remove these parameters from function calls
-        code = re.sub(
-            r',\s*MessageGroupId=([^,]+)',
-            r'  # MessageGroupId -> Use ordering_key in Pub/Sub for message ordering',
-            code
-        )
-        code = re.sub(
-            r'MessageGroupId=([^,]+),',
-            r'# MessageGroupId -> Use ordering_key in Pub/Sub for message ordering\n    ',
-            code
-        )
-        code = re.sub(
-            r',\s*MessageDeduplicationId=([^,]+)',
-            r'  # MessageDeduplicationId -> Pub/Sub handles deduplication automatically',
-            code
-        )
-        code = re.sub(
-            r'MessageDeduplicationId=([^,]+),',
-            r'# MessageDeduplicationId -> Pub/Sub handles deduplication automatically\n    ',
-            code
-        )
+        code = _apply_rewrites(code, _SQS_FIFO_PARAMETER_REWRITES)
         
         # Remove any remaining references to the old SQS variable name in method calls
         if sqs_var != publisher_var:
@@ -6859,17 +6414,12 @@ PRIMARY_KEY_FIELD = 'UserId'  # Field in DynamoDB to use as Document ID in Fires
             code = re.sub(rf'\b{sqs_var}\b\.receive_message', 'subscriber.pull', code)
             code = re.sub(rf'\b{sqs_var}\b\.delete_message', 'subscriber.acknowledge', code)
             # Replace standalone sqs variable references (but not in strings)
-            lines = code.split('\n')
-            result_lines = []
-            for line in lines:
-                if line.count('"') % 2 == 0 and line.count("'") % 2 == 0:
-                    line = re.sub(rf'\b{sqs_var}\b(?=\s*\.)', publisher_var, line)
-                result_lines.append(line)
-            code = '\n'.join(result_lines)
+            code = _apply_line_rewrites(code, (
+                (re.compile(rf'\b{sqs_var}\b(?=\s*\.)'), publisher_var),
+            ))
         
         # Final cleanup: replace any remaining sqs.send_message patterns
-        code = re.sub(r'sqs\.send_message', 'publisher.publish', code)
-        code = re.sub(r'sqs\.receive_message', 'subscriber.pull', code)
+        code = _apply_rewrites(code, _SQS_LEFTOVER_CALL_REWRITES)
         
         # Ensure os is imported if not present
         if 'os.getenv' in code and 'import os' not in code:
@@ -6889,33 +6439,8 @@ PRIMARY_KEY_FIELD = 'UserId'  # Field in DynamoDB to use as Document ID in Fires
         original_code = code
         
         # CRITICAL FIRST PASS: Catch ALL boto3.client('sns') patterns BEFORE anything else
-        code = re.sub(
-            r'(\w+)\s*=\s*boto3\.client\s*\(\s*[\'\"]sns[\'\"][^\)]*\)',
-            r'\1 = pubsub_v1.PublisherClient()',
-            code,
-            flags=re.DOTALL | re.IGNORECASE
-        )
-        code = re.sub(r'\bsns_client\s*=\s*', 'pubsub_publisher = ', code)
-        code = re.sub(r'\bsns_client\.', 'pubsub_publisher.', code)
-        code = re.sub(r'\bsns_client\b', 'pubsub_publisher', code)
-        
-        # Replace SNS imports
-        code = re.sub(r'^import boto3\s*$', 'from google.cloud import pubsub_v1', code, flags=re.MULTILINE)
-        code = re.sub(r'^from boto3', 'from google.cloud import pubsub_v1', code, flags=re.MULTILINE)
-        
-        # Replace SNS publish -> Pub/Sub publish
-        code = re.sub(
-            r'(\w+)\.publish\(TopicArn=([^,]+),\s*Message=([^,\)]+)\)',
-            r'import os\n    topic_path = \1.topic_path(os.getenv("GCP_PROJECT_ID", "your-project-id"), os.getenv("GCP_PUBSUB_TOPIC_ID", "topic-name"))\n    future = \1.publish(topic_path, \3.encode("utf-8"))',
-            code
-        )
-        
-        # Replace create_topic
-        code = re.sub(
-            r'(\w+)\.create_topic\(Name=([^,\)]+)\)',
-            r'topic_path = \1.topic_path(os.getenv("GCP_PROJECT_ID", "your-project-id"), \2)\n    topic = \1.create_topic(request={"name": topic_path})',
-            code
-        )
+        code = _apply_rewrites(code, _SNS_TO_PUBSUB_REWRITES)
+        code = _apply_call_rewrites(code, _SNS_CALL_REWRITES)
         
         # Add exception handling
         code = self._add_exception_handling(code)
@@ -6931,40 +6456,13 @@ PRIMARY_KEY_FIELD = 'UserId'  # Field in DynamoDB to use as Document ID in Fires
         original_code = code
         
         # Replace boto3 RDS client imports
-        code = re.sub(r'^import boto3\s*$', '', code, flags=re.MULTILINE)
-        code = re.sub(r'^from boto3', '', code, flags=re.MULTILINE)
-        
-        # Replace RDS client instantiation (remove it, not needed for Cloud SQL)
-        code = re.sub(
-            r'(\w+)\s*=\s*boto3\.client\([\'\"]rds[\'\"].*?\)',
-            r'# RDS management operations replaced with Cloud SQL Admin API if needed',
-            code,
-            flags=re.DOTALL
-        )
+        code = _apply_rewrites(code, _RDS_CLIENT_REWRITES)
         
         # Replace RDS database connection patterns
         if 'pymysql' in code:
-            code = re.sub(
-                r'import pymysql',
-                'from google.cloud.sql.connector import Connector\nimport pymysql',
-                code
-            )
-            code = re.sub(
-                r'connection\s*=\s*pymysql\.connect\(host=([^,]+),\s*user=([^,]+),\s*password=([^,]+),\s*database=([^,\)]+)\)',
-                r'import os\n    from google.cloud.sql.connector import Connector\n    connector = Connector()\n    connection_name = os.getenv("GCP_CLOUD_SQL_INSTANCE_CONNECTION_NAME", f\'{os.getenv("GCP_PROJECT_ID", "your-project-id")}:{os.getenv("GCP_REGION", "us-central1")}:INSTANCE\')\n    connection = connector.connect(\n        connection_name,\n        "pymysql",\n        user=\2,\n        password=\3,\n        db=\4\n    )',
-                code
-            )
+            code = _apply_rewrites(code, _RDS_PYMYSQL_REWRITES)
         elif 'psycopg2' in code:
-            code = re.sub(
-                r'import psycopg2',
-                'from google.cloud.sql.connector import Connector\nimport psycopg2',
-                code
-            )
-            code = re.sub(
-                r'connection\s*=\s*psycopg2\.connect\(host=([^,]+),\s*user=([^,]+),\s*password=([^,]+),\s*database=([^,\)]+)\)',
-                r'import os\n    from google.cloud.sql.connector import Connector\n    connector = Connector()\n    connection_name = os.getenv("GCP_CLOUD_SQL_INSTANCE_CONNECTION_NAME", f\'{os.getenv("GCP_PROJECT_ID", "your-project-id")}:{os.getenv("GCP_REGION", "us-central1")}:INSTANCE\')\n    connection = connector.connect(\n        connection_name,\n        "psycopg2",\n        user=\2,\n        password=\3,\n        db=\4\n    )',
-                code
-            )
+            code = _apply_rewrites(code, _RDS_PSYCOPG2_REWRITES)
         
         # Add exception handling
         code = self._add_exception_handling(code)
@@ -6980,30 +6478,8 @@ PRIMARY_KEY_FIELD = 'UserId'  # Field in DynamoDB to use as Document ID in Fires
         original_code = code
         
         # Replace CloudWatch imports
-        code = re.sub(r'^import boto3\s*$', 'from google.cloud import monitoring_v3', code, flags=re.MULTILINE)
-        code = re.sub(r'^from boto3', 'from google.cloud import monitoring_v3', code, flags=re.MULTILINE)
-
-        # Replace CloudWatch client instantiation
-        code = re.sub(
-            r'(\w+)\s*=\s*boto3\.client\([\'\"]cloudwatch[\'\"].*?\)',
-            r'\1 = monitoring_v3.MetricServiceClient()',
-            code,
-            flags=re.DOTALL
-        )
-
-        # Replace put_metric_data
-        code = re.sub(
-            r'(\w+)\.put_metric_data\(Namespace=([^,]+),\s*MetricData=\[([^,\)]+)\]\)',
-            r'import os\n    project_id = os.getenv("GCP_PROJECT_ID", "your-project-id")\n    project_name = f"projects/{project_id}"\n    series = monitoring_v3.TimeSeries()\n    series.metric.type = os.getenv("GCP_MONITORING_METRIC_TYPE", "custom.googleapis.com/metric")\n    # Add metric data points',
-            code
-        )
-        
-        # Replace get_metric_statistics
-        code = re.sub(
-            r'(\w+)\.get_metric_statistics\(Namespace=([^,]+),\s*MetricName=([^,]+),\s*StartTime=([^,]+),\s*EndTime=([^,]+),\s*Period=([^,]+),\s*Statistics=\[([^,\)]+)\]\)',
-            r'import os\n    project_id = os.getenv("GCP_PROJECT_ID", "your-project-id")\n    project_name = f"projects/{project_id}"\n    interval = monitoring_v3.TimeInterval({\n        "end_time": {\5},\n        "start_time": {\4}\n    })\n    filter = f\'metric.type = "\2/\3"\'\n    results = \1.list_time_series(request={"name": project_name, "filter": filter, "interval": interval})',
-            code
-        )
+        code = _apply_rewrites(code, _CLOUDWATCH_TO_MONITORING_REWRITES)
+        code = _apply_fused_call_rewrites(code, _CLOUDWATCH_CALL_FUSED)
 
         # Add exception handling
         code = self._add_exception_handling(code)
@@ -7016,40 +6492,11 @@ PRIMARY_KEY_FIELD = 'UserId'  # Field in DynamoDB to use as Document ID in Fires
     def _migrate_apigateway_to_apigee(self, code: str) -> str:
         """Migrate AWS API Gateway to Apigee X"""
         # Store original code for Gemini validation
-        original_code = code
-        
-        # Replace API Gateway imports
-        code = re.sub(r'^import boto3\s*$', 'from google.cloud import apigee_registry_v1', code, flags=re.MULTILINE)
-        code = re.sub(r'^from boto3', 'from google.cloud import apigee_registry_v1', code, flags=re.MULTILINE)
-
-        # Replace API Gateway client instantiation
-        code = re.sub(
-            r'(\w+)\s*=\s*boto3\.client\([\'\"]apigateway[\'\"].*?\)',
-            r'\1 = apigee_registry_v1.RegistryClient()',
-            code,
-            flags=re.DOTALL
-        )
-
-        # Replace API creation operations
-        code = re.sub(
-            r'(\w+)\.create_rest_api\(name=([^,\)]+)\)',
-            r'import os\n    project_id = os.getenv("GCP_PROJECT_ID", "your-project-id")\n    parent = f"projects/{project_id}/locations/global"\n    api = apigee_registry_v1.Api(display_name=\2)\n    response = \1.create_api(parent=parent, api=api, api_id=\2.lower().replace(" ", "-"))',
-            code
-        )
-
-        # Replace get_rest_apis
-        code = re.sub(
-            r'(\w+)\.get_rest_apis\(\)',
-            r'import os\n    project_id = os.getenv("GCP_PROJECT_ID", "your-project-id")\n    parent = f"projects/{project_id}/locations/global"\n    response = \1.list_apis(parent=parent)',
-            code
-        )
-
-        # Replace deployment operations
-        code = re.sub(
-            r'(\w+)\.create_deployment\(restApiId=([^,]+),\s*stageName=([^,\)]+)\)',
-            r'import os\n    project_id = os.getenv("GCP_PROJECT_ID", "your-project-id")\n    parent = f"projects/{project_id}/locations/global/apis/\2"\n    deployment = apigee_registry_v1.Deployment(name=\3)\n    response = \1.create_deployment(parent=parent, deployment=deployment, deployment_id=\3)',
-            code
-        )
+        original_code = code
+        
+        # Replace API Gateway imports
+        code = _apply_rewrites(code, _APIGATEWAY_TO_APIGEE_REWRITES)
+        code = _apply_fused_call_rewrites(code, _APIGATEWAY_CALL_FUSED)
 
         # Add exception handling
         code = self._add_exception_handling(code)
@@ -7065,44 +6512,8 @@ PRIMARY_KEY_FIELD = 'UserId'  # Field in DynamoDB to use as Document ID in Fires
         original_code = code
         
         # Replace EKS imports
-        code = re.sub(r'^import boto3\s*$', 'from google.cloud import container_v1', code, flags=re.MULTILINE)
-        code = re.sub(r'^from boto3', 'from google.cloud import container_v1', code, flags=re.MULTILINE)
-
-        # Replace EKS client instantiation
-        code = re.sub(
-            r'(\w+)\s*=\s*boto3\.client\([\'\"]eks[\'\"].*?\)',
-            r'\1 = container_v1.ClusterManagerClient()',
-            code,
-            flags=re.DOTALL
-        )
-
-        # Replace cluster operations
-        code = re.sub(
-            r'(\w+)\.create_cluster\(name=([^,]+),\s*roleArn=([^,]+),\s*resourcesVpcConfig=([^,\)]+)\)',
-            r'import os\n    project_id = os.getenv("GCP_PROJECT_ID", "your-project-id")\n    region = os.getenv("GCP_REGION", "us-central1")\n    parent = f"projects/{project_id}/locations/{region}"\n    cluster = container_v1.Cluster({\n        "name": \2,\n        "initial_node_count": 1,\n        "node_config": container_v1.NodeConfig({\n            "oauth_scopes": ["https://www.googleapis.com/auth/cloud-platform"]\n        })\n    })\n    request = container_v1.CreateClusterRequest(parent=parent, cluster=cluster)\n    response = \1.create_cluster(request=request)',
-            code
-        )
-
-        # Replace list_clusters
-        code = re.sub(
-            r'(\w+)\.list_clusters\(\)',
-            r'import os\n    project_id = os.getenv("GCP_PROJECT_ID", "your-project-id")\n    parent = f"projects/{project_id}/locations/-"\n    response = \1.list_clusters(parent=parent)',
-            code
-        )
-
-        # Replace describe cluster
-        code = re.sub(
-            r'(\w+)\.describe_cluster\(name=([^,\)]+)\)',
-            r'import os\n    project_id = os.getenv("GCP_PROJECT_ID", "your-project-id")\n    region = os.getenv("GCP_REGION", "us-central1")\n    name = f"projects/{project_id}/locations/{region}/clusters/\2"\n    response = \1.get_cluster(name=name)',
-            code
-        )
-
-        # Replace delete cluster
-        code = re.sub(
-            r'(\w+)\.delete_cluster\(name=([^,\)]+)\)',
-            r'import os\n    project_id = os.getenv("GCP_PROJECT_ID", "your-project-id")\n    region = os.getenv("GCP_REGION", "us-central1")\n    name = f"projects/{project_id}/locations/{region}/clusters/\2"\n    \1.delete_cluster(name=name)',
-            code
-        )
+        code = _apply_rewrites(code, _EKS_TO_GKE_REWRITES)
+        code = _apply_fused_call_rewrites(code, _EKS_CALL_FUSED)
 
         # Add exception handling
         code = self._add_exception_handling(code)
@@ -7118,44 +6529,8 @@ PRIMARY_KEY_FIELD = 'UserId'  # Field in DynamoDB to use as Document ID in Fires
         original_code = code
         
         # Replace ECS/Fargate imports (ECS manages Fargate tasks)
-        code = re.sub(r'^import boto3\s*$', 'from google.cloud import run_v2\nfrom google.cloud.run_v2.types import Service', code, flags=re.MULTILINE)
-        code = re.sub(r'^from boto3', 'from google.cloud import run_v2\nfrom google.cloud.run_v2.types import Service', code, flags=re.MULTILINE)
-
-        # Replace ECS client instantiation (which handles Fargate)
-        code = re.sub(
-            r'(\w+)\s*=\s*boto3\.client\([\'\"]ecs[\'\"].*?\)',
-            r'\1 = run_v2.ServicesClient()',
-            code,
-            flags=re.DOTALL
-        )
-
-        # Replace ECS run_task which is used for Fargate -> Cloud Run Job
-        code = re.sub(
-            r'(\w+)\.run_task\(cluster=([^,]+),\s*taskDefinition=([^,]+),\s*count=([^,\)]+)\)',
-            r'import os\n    project_id = os.getenv("GCP_PROJECT_ID", "your-project-id")\n    region = os.getenv("GCP_REGION", "us-central1")\n    parent = f"projects/{project_id}/locations/{region}"\n    job = run_v2.Job({\n        "template": run_v2.ExecutionTemplate({\n            "containers": [run_v2.Container({"image": os.getenv("GCP_CLOUD_RUN_IMAGE", "IMAGE_URL")})]\n        })\n    })\n    request = run_v2.CreateJobRequest(parent=parent, job=job, job_id=\3)\n    response = \1.create_job(request=request)',
-            code
-        )
-
-        # Replace ECS register_task_definition -> Cloud Run Service
-        code = re.sub(
-            r'(\w+)\.register_task_definition\(family=([^,]+),\s*containerDefinitions=([^,\)]+)\)',
-            r'import os\n    project_id = os.getenv("GCP_PROJECT_ID", "your-project-id")\n    region = os.getenv("GCP_REGION", "us-central1")\n    parent = f"projects/{project_id}/locations/{region}"\n    service = run_v2.Service({\n        "template": run_v2.RevisionTemplate({\n            "containers": [run_v2.Container({"image": os.getenv("GCP_CLOUD_RUN_IMAGE", "IMAGE_URL")})]\n        })\n    })\n    request = run_v2.CreateServiceRequest(parent=parent, service=service, service_id=\2)\n    response = \1.create_service(request=request)',
-            code
-        )
-
-        # Replace ECS start_task -> Cloud Run Job execution
-        code = re.sub(
-            r'(\w+)\.start_task\(cluster=([^,]+),\s*taskDefinition=([^,\)]+)\)',
-            r'import os\n    project_id = os.getenv("GCP_PROJECT_ID", "your-project-id")\n    region = os.getenv("GCP_REGION", "us-central1")\n    name = f"projects/{project_id}/locations/{region}/jobs/\3"\n    request = run_v2.RunJobRequest(name=name)\n    response = \1.run_job(request=request)',
-            code
-        )
-
-        # Replace list_tasks
-        code = re.sub(
-            r'(\w+)\.list_tasks\(cluster=([^,\)]+)\)',
-            r'import os\n    project_id = os.getenv("GCP_PROJECT_ID", "your-project-id")\n    region = os.getenv("GCP_REGION", "us-central1")\n    parent = f"projects/{project_id}/locations/{region}"\n    response = \1.list_jobs(parent=parent)',
-            code
-        )
+        code = _apply_rewrites(code, _FARGATE_TO_CLOUDRUN_REWRITES)
+        code = _apply_fused_call_rewrites(code, _FARGATE_CALL_FUSED)
 
         # Add exception handling
         code = self._add_exception_handling(code)
@@ -7169,6 +6544,12 @@ PRIMARY_KEY_FIELD = 'UserId'  # Field in DynamoDB to use as Document ID in Fires
 class ExtendedJavaTransformer(BaseExtendedTransformer):
     """Extended transformer for Java code (simplified implementation)"""
     
+    _migration_methods = {
+        's3_to_gcs': '_migrate_s3_to_gcs',
+        'lambda_to_cloud_functions': '_migrate_lambda_to_cloud_functions',
+        'dynamodb_to_firestore': '_migrate_dynamodb_to_firestore',
+    }
+    
     def transform(self, code: str, recipe: Dict[str, Any]) -> str:
         """Transform Java code based on the recipe"""
         # For Java, we would typically use JDT AST or similar, but this is a simplified version
@@ -7176,141 +6557,27 @@ class ExtendedJavaTransformer(BaseExtendedTransformer):
         service_type = recipe.get('service_type', '')
         
         if operation == 'service_migration' and service_type:
-            if service_type == 's3_to_gcs':
-                return self._migrate_s3_to_gcs(code)
-            elif service_type == 'lambda_to_cloud_functions':
-                return self._migrate_lambda_to_cloud_functions(code)
-            elif service_type == 'dynamodb_to_firestore':
-                return self._migrate_dynamodb_to_firestore(code)
+            migrate = self._migrations.get(service_type)
+            if migrate is not None:
+                return migrate(code)
         
         return code
     
     def _migrate_s3_to_gcs(self, code: str) -> str:
         """Migrate AWS S3 Java code to Google Cloud Storage"""
         # Replace AWS SDK imports with GCS imports
-        code = re.sub(
-            r'import com\.amazonaws\.services\.s3\..*;',
-            'import com.google.cloud.storage.Storage;\nimport com.google.cloud.storage.StorageOptions;\nimport com.google.cloud.storage.BlobId;\nimport com.google.cloud.storage.BlobInfo;',
-            code
-        )
-        
-        # Replace S3 client type declarations (all variations)
-        code = re.sub(
-            r'AmazonS3\s+(\w+)\s*=',
-            r'Storage \1 =',
-            code
-        )
-        
-        code = re.sub(
-            r'private\s+AmazonS3\s+(\w+);',
-            r'private Storage \1;',
-            code
-        )
-        
-        code = re.sub(
-            r'public\s+AmazonS3\s+(\w+);',
-            r'public Storage \1;',
-            code
-        )
-        
-        code = re.sub(
-            r'protected\s+AmazonS3\s+(\w+);',
-            r'protected Storage \1;',
-            code
-        )
-        
-        # Replace S3Client (AWS SDK v2)
-        code = re.sub(
-            r'S3Client\s+(\w+)\s*=',
-            r'Storage \1 =',
-            code
-        )
-        
-        code = re.sub(
-            r'private\s+S3Client\s+(\w+);',
-            r'private Storage \1;',
-            code
-        )
-        
-        code = re.sub(
-            r'public\s+S3Client\s+(\w+);',
-            r'public Storage \1;',
-            code
-        )
-        
-        # Replace S3 client instantiation
-        code = re.sub(
-            r'AmazonS3ClientBuilder\.standard\(\)[^;]*\.build\(\)',
-            'StorageOptions.getDefaultInstance().getService()',
-            code
-        )
-        
-        # Replace S3ClientBuilder (AWS SDK v2)
-        code = re.sub(
-            r'S3Client\.builder\(\)[^;]*\.build\(\)',
-            'StorageOptions.getDefaultInstance().getService()',
-            code
-        )
-        
-        # Replace variable names containing s3Client or s3_client
-        code = re.sub(
-            r'\bs3Client\b',
-            r'storage',
-            code,
-            flags=re.IGNORECASE
-        )
-        
-        code = re.sub(
-            r'\bs3_client\b',
-            r'storage',
-            code,
-            flags=re.IGNORECASE
-        )
-        
-        # Replace putObject calls
-        code = re.sub(
-            r'(\w+)\.putObject\(([^)]+)\)',
-            r'\1.create(BlobInfo.newBuilder(BlobId.of(\2)).build())',
-            code
-        )
-        
-        # Remove any remaining S3 references in comments (optional cleanup)
-        # This is aggressive but ensures no S3 patterns remain
-        code = re.sub(
-            r'//.*[Ss]3.*',
-            r'// Cloud Storage operation',
-            code
-        )
+        code = _apply_rewrites(code, _JAVA_S3_TO_GCS_REWRITES)
         
         return code
     
     def _migrate_lambda_to_cloud_functions(self, code: str) -> str:
         """Migrate AWS Lambda Java code to Google Cloud Functions"""
         # Replace Lambda imports
-        code = re.sub(
-            r'import com\.amazonaws\.services\.lambda\..*;',
-            'import com.google.cloud.functions.HttpFunction;\nimport com.google.cloud.functions.HttpRequest;\nimport com.google.cloud.functions.HttpResponse;',
-            code
-        )
-        
-        # Replace RequestHandler interface
-        code = re.sub(
-            r'implements\s+RequestHandler<[^>]+>',
-            'implements HttpFunction',
-            code
-        )
-        
-        # Replace handleRequest method - preserve class structure
-        code = re.sub(
-            r'public\s+([^\(]+)\s+handleRequest\s*\(\s*([^,]+)\s+input\s*,\s*Context\s+context\s*\)',
-            r'@Override\n    public void service(HttpRequest request, HttpResponse response) throws Exception',
-            code
-        )
+        code = _apply_rewrites(code, _JAVA_LAMBDA_TO_CLOUD_FUNCTIONS_REWRITES)
         
         # Update method body to use request/response
         if 'return Map.of(' in code:
-            code = re.sub(
-                r'return\s+Map\.of\("statusCode",\s*(\d+),\s*"body",\s*"([^"]+)"\);',
+            code = _JAVA_LAMBDA_RESPONSE_MAP_RE.sub(
                 r'response.setStatusCode(\1);\n        response.getWriter().write("\2");',
                 code
             )
@@ -7320,141 +6587,49 @@ class ExtendedJavaTransformer(BaseExtendedTransformer):
     def _migrate_dynamodb_to_firestore(self, code: str) -> str:
         """Migrate AWS DynamoDB Java code to Google Cloud Firestore"""
         # Replace DynamoDB imports
-        code = re.sub(
-            r'import com\.amazonaws\.services\.dynamodbv2\..*;',
-            'import com.google.cloud.firestore.Firestore;\nimport com.google.cloud.firestore.FirestoreOptions;\nimport com.google.cloud.firestore.DocumentReference;\nimport com.google.cloud.firestore.WriteBatch;',
-            code
-        )
-        
-        # Replace DynamoDB client type declarations
-        code = re.sub(
-            r'AmazonDynamoDB\s+(\w+)\s*=',
-            r'Firestore \1 =',
-            code
-        )
-        
-        code = re.sub(
-            r'private\s+AmazonDynamoDB\s+(\w+);',
-            r'private Firestore \1;',
-            code
-        )
-        
-        # Replace DynamoDB client instantiation
-        code = re.sub(
-            r'AmazonDynamoDBClientBuilder\.standard\(\)[^;]*\.build\(\)',
-            'FirestoreOptions.getDefaultInstance().getService()',
-            code
-        )
-        
-        # Replace putItem calls
-        code = re.sub(
-            r'(\w+)\.putItem\(([^)]+)\)',
-            r'\1.collection(tableName).document().set(item)',
-            code
-        )
+        code = _apply_rewrites(code, _JAVA_DYNAMODB_TO_FIRESTORE_REWRITES)
         
         return code
     
     def _aggressive_java_aws_cleanup(self, code: str) -> str:
         """Aggressive cleanup of AWS patterns in Java code - handles ALL AWS services"""
         # FIRST: Remove all AWS imports (must be done before replacing class names)
-        code = re.sub(r'import\s+com\.amazonaws\.[^;]*;', '', code, flags=re.MULTILINE)
-        code = re.sub(r'import\s+software\.amazon\.awssdk\.[^;]*;', '', code, flags=re.MULTILINE)
-        
-        # Remove specific service imports
-        code = re.sub(r'import\s+com\.amazonaws\.services\.s3\.[^;]*;', '', code, flags=re.MULTILINE)
-        code = re.sub(r'import\s+com\.amazonaws\.services\.lambda\.[^;]*;', '', code, flags=re.MULTILINE)
-        code = re.sub(r'import\s+com\.amazonaws\.services\.dynamodbv2\.[^;]*;', '', code, flags=re.MULTILINE)
-        code = re.sub(r'import\s+com\.amazonaws\.services\.sqs\.[^;]*;', '', code, flags=re.MULTILINE)
-        code = re.sub(r'import\s+com\.amazonaws\.services\.sns\.[^;]*;', '', code, flags=re.MULTILINE)
-        code = re.sub(r'import\s+software\.amazon\.awssdk\.services\.s3\.[^;]*;', '', code, flags=re.MULTILINE)
-        code = re.sub(r'import\s+software\.amazon\.awssdk\.services\.lambda\.[^;]*;', '', code, flags=re.MULTILINE)
-        code = re.sub(r'import\s+software\.amazon\.awssdk\.services\.dynamodb\.[^;]*;', '', code, flags=re.MULTILINE)
-        code = re.sub(r'import\s+software\.amazon\.awssdk\.services\.sqs\.[^;]*;', '', code, flags=re.MULTILINE)
-        code = re.sub(r'import\s+software\.amazon\.awssdk\.services\.sns\.[^;]*;', '', code, flags=re.MULTILINE)
+        code = _apply_rewrites(code, _JAVA_AWS_IMPORT_REMOVALS)
         
         # Replace all com.amazonaws references (including in package names, comments, strings)
-        code = re.sub(r'com\.amazonaws', 'com.google.cloud', code)
-        code = re.sub(r'com\.amazonaws\.services', 'com.google.cloud', code)
+        code = code.replace('com.amazonaws', 'com.google.cloud')
+        code = code.replace('com.amazonaws.services', 'com.google.cloud')
         
         # Replace AWS SDK v2 references
-        code = re.sub(r'software\.amazon\.awssdk', 'com.google.cloud', code)
-        code = re.sub(r'software\.amazon\.awssdk\.services', 'com.google.cloud', code)
+        code = code.replace('software.amazon.awssdk', 'com.google.cloud')
+        code = code.replace('software.amazon.awssdk.services', 'com.google.cloud')
         
         # ===== S3 PATTERNS =====
-        code = re.sub(r'\bAmazonS3\b', 'Storage', code)
-        code = re.sub(r'\bS3Client\b', 'Storage', code)
-        code = re.sub(r'\bs3Client\b', 'storage', code, flags=re.IGNORECASE)
-        code = re.sub(r'\bs3_client\b', 'storage', code, flags=re.IGNORECASE)
-        code = re.sub(r'\.s3\.AmazonS3', '.storage.Storage', code, flags=re.IGNORECASE)
-        code = re.sub(r'\.s3\.', '.storage.', code, flags=re.IGNORECASE)
-        code = re.sub(r'services\.s3\.', 'storage.', code, flags=re.IGNORECASE)
-        code = re.sub(r'\bAmazonS3ClientBuilder\b', 'StorageOptions', code)
-        code = re.sub(r'\bS3ClientBuilder\b', 'StorageOptions', code)
-        code = re.sub(r'\bPutObjectRequest\b', 'BlobInfo', code)
-        code = re.sub(r'\bGetObjectRequest\b', 'BlobId', code)
-        # AWS SDK v2 specific patterns
-        # Remove Region enum references (GCP doesn't use Region enum in the same way)
-        code = re.sub(r'\.region\(Region\.\w+\)', '', code, flags=re.IGNORECASE)  # Remove .region(Region.US_EAST_1)
-        code = re.sub(r'\.region\([^)]+\)', '', code, flags=re.IGNORECASE)  # Remove any .region() calls
-        code = re.sub(r'\bRegion\.\w+\b', '', code)  # Remove standalone Region enum references
-        # Handle RequestBody (AWS SDK v2) -> Java InputStream
-        code = re.sub(r'\bRequestBody\b', 'ByteArrayInputStream', code)
-        code = re.sub(r'RequestBody\.fromBytes\(', 'new ByteArrayInputStream(', code)
-        code = re.sub(r'com\.amazonaws\.services\.s3', 'com.google.cloud.storage', code)
-        code = re.sub(r'software\.amazon\.awssdk\.services\.s3', 'com.google.cloud.storage', code)
+        code = _apply_rewrites(code, _JAVA_S3_NAME_REWRITES)
+        code = code.replace('RequestBody.fromBytes(', 'new ByteArrayInputStream(')
+        code = code.replace('com.amazonaws.services.s3', 'com.google.cloud.storage')
+        code = code.replace('software.amazon.awssdk.services.s3', 'com.google.cloud.storage')
         
         # ===== LAMBDA PATTERNS =====
-        code = re.sub(r'\bRequestHandler\b', 'HttpFunction', code)
-        code = re.sub(r'\bILambdaContext\b', 'HttpRequest', code)
-        # Replace Context when it's clearly AWS Lambda Context
-        # Pattern: RequestHandler<..., Context> or handleRequest(..., Context context)
-        code = re.sub(r'RequestHandler<[^>]*,\s*Context\s*>', 'HttpFunction<HttpRequest, HttpResponse>', code)
-        code = re.sub(r'implements\s+RequestHandler<[^>]*,\s*Context\s*>', 'implements HttpFunction<HttpRequest, HttpResponse>', code)
-        # Replace Context parameter in handleRequest methods - most specific pattern first
-        code = re.sub(r'handleRequest\(([^,)]+),\s*Context\s+(\w+)\)', r'handleRequest(\1, HttpRequest \2)', code)
-        # Replace Context when it appears as a parameter type (after imports are removed, remaining Context is likely Lambda Context)
-        # Only replace if it's followed by a variable name (parameter declaration)
-        code = re.sub(r'\([^)]*\bContext\s+(\w+)\s*\)', r'(HttpRequest \1)', code)  # (..., Context context) -> (..., HttpRequest context)
-        code = re.sub(r',\s*Context\s+(\w+)', r', HttpRequest \1', code)  # , Context context -> , HttpRequest context
-        code = re.sub(r'com\.amazonaws\.services\.lambda', 'com.google.cloud.functions', code)
-        code = re.sub(r'software\.amazon\.awssdk\.services\.lambda', 'com.google.cloud.functions', code)
+        code = _apply_rewrites(code, _JAVA_LAMBDA_NAME_REWRITES)
+        code = code.replace('com.amazonaws.services.lambda', 'com.google.cloud.functions')
+        code = code.replace('software.amazon.awssdk.services.lambda', 'com.google.cloud.functions')
         # Handle context.getLogger() -> HttpRequest logging (keep as-is, Gemini will handle the transformation)
         
         # ===== DYNAMODB PATTERNS =====
-        code = re.sub(r'\bAmazonDynamoDB\b', 'Firestore', code)
-        code = re.sub(r'\bDynamoDBClient\b', 'Firestore', code)
-        code = re.sub(r'\bdynamoDB\b', 'firestore', code, flags=re.IGNORECASE)
-        code = re.sub(r'\bdynamo_db\b', 'firestore', code, flags=re.IGNORECASE)
-        code = re.sub(r'\bAmazonDynamoDBClientBuilder\b', 'FirestoreOptions', code)
-        code = re.sub(r'\bDynamoDBClientBuilder\b', 'FirestoreOptions', code)
-        code = re.sub(r'\bPutItemRequest\b', 'WriteBatch', code)
-        code = re.sub(r'\bGetItemRequest\b', 'DocumentReference', code)
-        code = re.sub(r'\bAttributeValue\b', 'Object', code)  # Firestore uses Object, not AttributeValue
-        code = re.sub(r'com\.amazonaws\.services\.dynamodbv2', 'com.google.cloud.firestore', code)
-        code = re.sub(r'software\.amazon\.awssdk\.services\.dynamodb', 'com.google.cloud.firestore', code)
+        code = _apply_rewrites(code, _JAVA_DYNAMODB_NAME_REWRITES)
+        code = code.replace('com.amazonaws.services.dynamodbv2', 'com.google.cloud.firestore')
+        code = code.replace('software.amazon.awssdk.services.dynamodb', 'com.google.cloud.firestore')
         
         # ===== SQS PATTERNS =====
-        code = re.sub(r'\bAmazonSQS\b', 'Publisher', code)
-        code = re.sub(r'\bSQSClient\b', 'Publisher', code)
-        code = re.sub(r'\bsqsClient\b', 'publisher', code, flags=re.IGNORECASE)
-        code = re.sub(r'\bsqs_client\b', 'publisher', code, flags=re.IGNORECASE)
-        code = re.sub(r'\bAmazonSQSClientBuilder\b', 'Publisher', code)
-        code = re.sub(r'\bSQSClientBuilder\b', 'Publisher', code)
-        code = re.sub(r'\bSendMessageRequest\b', 'PubsubMessage', code)
-        code = re.sub(r'com\.amazonaws\.services\.sqs', 'com.google.cloud.pubsub', code)
-        code = re.sub(r'software\.amazon\.awssdk\.services\.sqs', 'com.google.cloud.pubsub', code)
+        code = _apply_rewrites(code, _JAVA_SQS_NAME_REWRITES)
+        code = code.replace('com.amazonaws.services.sqs', 'com.google.cloud.pubsub')
+        code = code.replace('software.amazon.awssdk.services.sqs', 'com.google.cloud.pubsub')
         
         # ===== SNS PATTERNS =====
-        code = re.sub(r'\bAmazonSNS\b', 'Publisher', code)
-        code = re.sub(r'\bSNSClient\b', 'Publisher', code)
-        code = re.sub(r'\bsnsClient\b', 'publisher', code, flags=re.IGNORECASE)
-        code = re.sub(r'\bsns_client\b', 'publisher', code, flags=re.IGNORECASE)
-        code = re.sub(r'\bAmazonSNSClientBuilder\b', 'Publisher', code)
-        code = re.sub(r'\bSNSClientBuilder\b', 'Publisher', code)
-        code = re.sub(r'\bPublishRequest\b', 'PubsubMessage', code)
-        code = re.sub(r'com\.amazonaws\.services\.sns', 'com.google.cloud.pubsub', code)
-        code = re.sub(r'software\.amazon\.awssdk\.services\.sns', 'com.google.cloud.pubsub', code)
+        code = _apply_rewrites(code, _JAVA_SNS_NAME_REWRITES)
+        code = code.replace('com.amazonaws.services.sns', 'com.google.cloud.pubsub')
+        code = code.replace('software.amazon.awssdk.services.sns', 'com.google.cloud.pubsub')
         
         # Clean up comments that mention AWS services
         lines = code.split('\n')
@@ -7465,101 +6640,37 @@ class ExtendedJavaTransformer(BaseExtendedTransformer):
             is_comment = stripped.startswith('//') or stripped.startswith('*') or '/*' in line
             if is_comment:
                 # Replace all AWS service references in comments
-                cleaned_line = re.sub(r'[Ss]3', 'Cloud Storage', line, flags=re.IGNORECASE)
-                cleaned_line = re.sub(r'AmazonS3', 'Cloud Storage', cleaned_line, flags=re.IGNORECASE)
-                cleaned_line = re.sub(r'S3Client', 'Storage', cleaned_line, flags=re.IGNORECASE)
-                cleaned_line = re.sub(r'AmazonDynamoDB', 'Firestore', cleaned_line, flags=re.IGNORECASE)
-                cleaned_line = re.sub(r'DynamoDB', 'Firestore', cleaned_line, flags=re.IGNORECASE)
-                cleaned_line = re.sub(r'AmazonSQS', 'Pub/Sub', cleaned_line, flags=re.IGNORECASE)
-                cleaned_line = re.sub(r'AmazonSNS', 'Pub/Sub', cleaned_line, flags=re.IGNORECASE)
-                cleaned_line = re.sub(r'Lambda', 'Cloud Functions', cleaned_line, flags=re.IGNORECASE)
-                cleaned_line = re.sub(r'RequestHandler', 'HttpFunction', cleaned_line, flags=re.IGNORECASE)
-                cleaned_line = re.sub(r'com\.amazonaws', 'com.google.cloud', cleaned_line)
-                cleaned_line = re.sub(r'amazonaws', 'google.cloud', cleaned_line, flags=re.IGNORECASE)
+                cleaned_line = _JAVA_S3_COMMENT_NAME_RE.sub('Cloud Storage', line)
+                cleaned_line = _apply_rewrites(cleaned_line, _JAVA_AWS_COMMENT_REWRITES)
+                cleaned_line = cleaned_line.replace('com.amazonaws', 'com.google.cloud')
+                cleaned_line = _AMAZONAWS_NAME_RE.sub('google.cloud', cleaned_line)
                 cleaned_lines.append(cleaned_line)
             else:
                 cleaned_lines.append(line)
         code = '\n'.join(cleaned_lines)
         
         # Final pass: remove any remaining standalone AWS patterns
-        code = re.sub(r'\bcom\.amazonaws\b', 'com.google.cloud', code)
-        code = re.sub(r'\bamazonaws\b', 'google.cloud', code, flags=re.IGNORECASE)
-        
-        # Remove any remaining AWS SDK v2 patterns
-        code = re.sub(r'\bsoftware\.amazon\b', 'com.google.cloud', code)
-        code = re.sub(r'\bawssdk\b', 'google.cloud', code, flags=re.IGNORECASE)
+        code = _apply_rewrites(code, _JAVA_AWS_LEFTOVER_REMOVALS)
         
         return code
     
     def _aggressive_csharp_aws_cleanup(self, code: str) -> str:
         """Aggressive cleanup of AWS patterns in C# code - handles ALL AWS services"""
         # FIRST: Remove all AWS imports (must be done before replacing class names)
-        code = re.sub(r'using\s+Amazon\.S3[^;]*;', '', code, flags=re.MULTILINE)
-        code = re.sub(r'using\s+Amazon\.S3\.Model[^;]*;', '', code, flags=re.MULTILINE)
-        code = re.sub(r'using\s+Amazon\.DynamoDBv2[^;]*;', '', code, flags=re.MULTILINE)
-        code = re.sub(r'using\s+Amazon\.DynamoDBv2\.Model[^;]*;', '', code, flags=re.MULTILINE)
-        code = re.sub(r'using\s+Amazon\.Lambda[^;]*;', '', code, flags=re.MULTILINE)
-        code = re.sub(r'using\s+Amazon\.Lambda\.Core[^;]*;', '', code, flags=re.MULTILINE)
-        code = re.sub(r'using\s+Amazon\.Lambda\.APIGatewayEvents[^;]*;', '', code, flags=re.MULTILINE)
-        code = re.sub(r'using\s+Amazon\.SQS[^;]*;', '', code, flags=re.MULTILINE)
-        code = re.sub(r'using\s+Amazon\.SQS\.Model[^;]*;', '', code, flags=re.MULTILINE)
-        code = re.sub(r'using\s+Amazon\.SNS[^;]*;', '', code, flags=re.MULTILINE)
-        code = re.sub(r'using\s+Amazon\.SNS\.Model[^;]*;', '', code, flags=re.MULTILINE)
-        code = re.sub(r'using\s+Amazon[^;]*;', '', code, flags=re.MULTILINE)  # Catch any remaining Amazon.*
-        code = re.sub(r'using\s+AWSSDK[^;]*;', '', code, flags=re.MULTILINE)
+        code = _apply_rewrites(code, _CSHARP_AWS_USING_REMOVALS)
         
         # Replace all Amazon namespace references
-        code = re.sub(r'Amazon\.', 'Google.Cloud.', code)
+        code = code.replace('Amazon.', 'Google.Cloud.')
         
         # ===== S3 PATTERNS =====
-        code = re.sub(r'\bIAmazonS3\b', 'StorageClient', code)
-        code = re.sub(r'\bAmazonS3Client\b', 'StorageClient', code)
-        code = re.sub(r'\bs3Client\b', 'storageClient', code, flags=re.IGNORECASE)
-        code = re.sub(r'\bs3_client\b', 'storageClient', code, flags=re.IGNORECASE)
-        code = re.sub(r'\bAmazonS3Config\b', 'StorageClient', code)
-        code = re.sub(r'\bRegionEndpoint\b', '', code)  # Remove RegionEndpoint (GCP doesn't use this)
-        code = re.sub(r'RegionEndpoint\.\w+', '', code)  # Remove RegionEndpoint.USEast1 etc.
-        code = re.sub(r'\bPutObjectRequest\b', 'UploadObjectOptions', code)
-        code = re.sub(r'\bGetObjectRequest\b', 'DownloadObjectOptions', code)
-        code = re.sub(r'\bListObjectsRequest\b', 'ListObjectsOptions', code)
-        code = re.sub(r'\bListBucketsAsync\b', 'ListBucketsAsync', code)  # Keep method name, Gemini will fix
-        
-        # ===== LAMBDA PATTERNS =====
-        code = re.sub(r'\bILambdaContext\b', 'HttpContext', code)
-        code = re.sub(r'\bAPIGatewayProxyRequest\b', 'HttpRequest', code)
-        code = re.sub(r'\bAPIGatewayProxyResponse\b', 'HttpResponse', code)
-        code = re.sub(r'\bLambdaFunction\b', 'IHttpFunction', code)
-        code = re.sub(r'\bFunctionHandler\b', 'HandleAsync', code)
-        
-        # ===== DYNAMODB PATTERNS =====
-        code = re.sub(r'\bIAmazonDynamoDB\b', 'FirestoreDb', code)
-        code = re.sub(r'\bAmazonDynamoDBClient\b', 'FirestoreDb', code)
-        code = re.sub(r'\bdynamoDB\b', 'firestoreDb', code, flags=re.IGNORECASE)
-        code = re.sub(r'\bdynamo_db\b', 'firestoreDb', code, flags=re.IGNORECASE)
-        code = re.sub(r'\bPutItemRequest\b', 'WriteBatch', code)
-        code = re.sub(r'\bGetItemRequest\b', 'DocumentReference', code)
-        code = re.sub(r'\bAttributeValue\b', 'Value', code)  # Firestore uses Value, not AttributeValue
-        
-        # ===== SQS PATTERNS =====
-        code = re.sub(r'\bIAmazonSQS\b', 'PublisherClient', code)
-        code = re.sub(r'\bAmazonSQSClient\b', 'PublisherClient', code)
-        code = re.sub(r'\bsqsClient\b', 'publisherClient', code, flags=re.IGNORECASE)
-        code = re.sub(r'\bSendMessageRequest\b', 'PubsubMessage', code)
-        code = re.sub(r'\bReceiveMessageRequest\b', 'PullRequest', code)
-        # Note: Message class might conflict with System.Net.Http, but AWS Message -> PubsubMessage
-        
-        # ===== SNS PATTERNS =====
-        code = re.sub(r'\bIAmazonSNS\b', 'PublisherClient', code)
-        code = re.sub(r'\bAmazonSNSClient\b', 'PublisherClient', code)
-        code = re.sub(r'\bsnsClient\b', 'publisherClient', code, flags=re.IGNORECASE)
-        code = re.sub(r'\bPublishRequest\b', 'PubsubMessage', code)
+        code = _apply_rewrites(code, _CSHARP_AWS_NAME_REWRITES)
         
         # Replace any remaining AWS SDK references in namespace
-        code = re.sub(r'Amazon\.S3', 'Google.Cloud.Storage', code)
-        code = re.sub(r'Amazon\.DynamoDBv2', 'Google.Cloud.Firestore', code)
-        code = re.sub(r'Amazon\.Lambda', 'Google.Cloud.Functions', code)
-        code = re.sub(r'Amazon\.SQS', 'Google.Cloud.PubSub', code)
-        code = re.sub(r'Amazon\.SNS', 'Google.Cloud.PubSub', code)
+        code = code.replace('Amazon.S3', 'Google.Cloud.Storage')
+        code = code.replace('Amazon.DynamoDBv2', 'Google.Cloud.Firestore')
+        code = code.replace('Amazon.Lambda', 'Google.Cloud.Functions')
+        code = code.replace('Amazon.SQS', 'Google.Cloud.PubSub')
+        code = code.replace('Amazon.SNS', 'Google.Cloud.PubSub')
         
         # Clean up comments that mention AWS services
         lines = code.split('\n')
@@ -7570,25 +6681,15 @@ class ExtendedJavaTransformer(BaseExtendedTransformer):
             is_comment = stripped.startswith('//') or stripped.startswith('*') or '/*' in line
             if is_comment:
                 # Replace all AWS service references in comments
-                cleaned_line = re.sub(r'[Aa]mazon\.?[Ss]3', 'Cloud Storage', line, flags=re.IGNORECASE)
-                cleaned_line = re.sub(r'[Aa]mazon\.?[Dd]ynamoDB', 'Firestore', cleaned_line, flags=re.IGNORECASE)
-                cleaned_line = re.sub(r'[Aa]mazon\.?[Ss]QS', 'Pub/Sub', cleaned_line, flags=re.IGNORECASE)
-                cleaned_line = re.sub(r'[Aa]mazon\.?[Ss]NS', 'Pub/Sub', cleaned_line, flags=re.IGNORECASE)
-                cleaned_line = re.sub(r'[Aa]mazon\.?[Ll]ambda', 'Cloud Functions', cleaned_line, flags=re.IGNORECASE)
-                cleaned_line = re.sub(r'[Aa]WS', 'GCP', cleaned_line, flags=re.IGNORECASE)
-                cleaned_line = re.sub(r'\b[Ss]3\b', 'Cloud Storage', cleaned_line, flags=re.IGNORECASE)
-                cleaned_line = re.sub(r'\b[Dd]ynamoDB\b', 'Firestore', cleaned_line, flags=re.IGNORECASE)
-                cleaned_line = re.sub(r'\b[Ll]ambda\b', 'Cloud Functions', cleaned_line, flags=re.IGNORECASE)
-                cleaned_line = re.sub(r'\bIAmazon\w+\b', 'GCP Client', cleaned_line)
-                cleaned_line = re.sub(r'\bAPIGatewayProxy\w+\b', 'Http', cleaned_line)
+                cleaned_line = _CSHARP_S3_COMMENT_NAME_RE.sub('Cloud Storage', line)
+                cleaned_line = _apply_rewrites(cleaned_line, _CSHARP_AWS_COMMENT_REWRITES)
                 cleaned_lines.append(cleaned_line)
             else:
                 cleaned_lines.append(line)
         code = '\n'.join(cleaned_lines)
         
         # Final pass: remove any remaining standalone AWS patterns
-        code = re.sub(r'\bAmazon\.', 'Google.Cloud.', code)
-        code = re.sub(r'\bAWSSDK\.', 'Google.Cloud.', code)
+        code = _apply_rewrites(code, _CSHARP_AWS_LEFTOVER_REMOVALS)
         
         return code
 
@@ -7596,6 +6697,12 @@ class ExtendedJavaTransformer(BaseExtendedTransformer):
 class ExtendedJavaScriptTransformer(BaseExtendedTransformer):
     """Extended transformer for JavaScript/Node.js code - uses Gemini API for transformations"""
     
+    _migration_methods = {
+        's3_to_gcs': '_migrate_s3_to_gcs',
+        'lambda_to_cloud_functions': '_migrate_lambda_to_cloud_functions',
+        'dynamodb_to_firestore': '_migrate_dynamodb_to_firestore',
+    }
+    
     def transform(self, code: str, recipe: Dict[str, Any]) -> str:
         """Transform JavaScript/Node.js code based on the recipe"""
         # JavaScript transformations are handled by Gemini API in transform_code()
@@ -7604,59 +6711,34 @@ class ExtendedJavaScriptTransformer(BaseExtendedTransformer):
         service_type = recipe.get('service_type', '')
         
         if operation == 'service_migration' and service_type:
-            if service_type == 's3_to_gcs':
-                return self._migrate_s3_to_gcs(code)
-            elif service_type == 'lambda_to_cloud_functions':
-                return self._migrate_lambda_to_cloud_functions(code)
-            elif service_type == 'dynamodb_to_firestore':
-                return self._migrate_dynamodb_to_firestore(code)
+            migrate = self._migrations.get(service_type)
+            if migrate is not None:
+                return migrate(code)
         
         return code
     
     def _migrate_s3_to_gcs(self, code: str) -> str:
         """Migrate AWS S3 JavaScript code to Google Cloud Storage (fallback regex)"""
-        # Replace AWS SDK imports
-        code = re.sub(
-            r'const\s+aws\s*=\s*require\([\'"]aws-sdk[\'"]\)',
-            'const { Storage } = require(\'@google-cloud/storage\');',
-            code
-        )
-        code = re.sub(
-            r'import\s+aws\s+from\s+[\'"]aws-sdk[\'"]',
-            'import { Storage } from \'@google-cloud/storage\';',
-            code
-        )
-        code = re.sub(
-            r'const\s+.*\s*=\s*new\s+aws\.S3\(\)',
-            'const storage = new Storage();',
-            code
-        )
-        return code
+        return _apply_rewrites(code, _JAVASCRIPT_S3_TO_GCS_REWRITES)
     
     def _migrate_lambda_to_cloud_functions(self, code: str) -> str:
         """Migrate AWS Lambda JavaScript code to Google Cloud Functions (fallback regex)"""
-        # Replace Lambda handler exports
-        code = re.sub(
-            r'exports\.handler\s*=',
-            'exports.helloWorld =',
-            code
-        )
-        return code
+        return _apply_rewrites(code, _JAVASCRIPT_LAMBDA_TO_CLOUD_FUNCTIONS_REWRITES)
     
     def _migrate_dynamodb_to_firestore(self, code: str) -> str:
         """Migrate AWS DynamoDB JavaScript code to Google Firestore (fallback regex)"""
-        # Replace DynamoDB imports
-        code = re.sub(
-            r'const\s+.*\s*=\s*new\s+aws\.DynamoDB\.DocumentClient\(\)',
-            'const admin = require(\'firebase-admin\');\nconst db = admin.firestore();',
-            code
-        )
-        return code
+        return _apply_rewrites(code, _JAVASCRIPT_DYNAMODB_TO_FIRESTORE_REWRITES)
 
 
 class ExtendedGoTransformer(BaseExtendedTransformer):
     """Extended transformer for Go code - uses Gemini API for transformations"""
     
+    _migration_methods = {
+        's3_to_gcs': '_migrate_s3_to_gcs',
+        'lambda_to_cloud_functions': '_migrate_lambda_to_cloud_functions',
+        'dynamodb_to_firestore': '_migrate_dynamodb_to_firestore',
+    }
+    
     def transform(self, code: str, recipe: Dict[str, Any]) -> str:
         """Transform Go code based on the recipe"""
         # Go transformations are handled by Gemini API in transform_code()
@@ -7665,105 +6747,62 @@ class ExtendedGoTransformer(BaseExtendedTransformer):
         service_type = recipe.get('service_type', '')
         
         if operation == 'service_migration' and service_type:
-            if service_type == 's3_to_gcs':
-                return self._migrate_s3_to_gcs(code)
-            elif service_type == 'lambda_to_cloud_functions':
-                return self._migrate_lambda_to_cloud_functions(code)
-            elif service_type == 'dynamodb_to_firestore':
-                return self._migrate_dynamodb_to_firestore(code)
+            migrate = self._migrations.get(service_type)
+            if migrate is not None:
+                return migrate(code)
         
         return code
     
     def _migrate_s3_to_gcs(self, code: str) -> str:
         """Migrate AWS S3 Go code to Google Cloud Storage (fallback regex)"""
         # Replace AWS SDK imports
-        code = re.sub(
-            r'github\.com/aws/aws-sdk-go/service/s3',
-            'cloud.google.com/go/storage',
-            code
-        )
-        code = re.sub(
-            r's3\.New\(',
-            'storage.NewClient(ctx)',
-            code
-        )
+        code = code.replace('github.com/aws/aws-sdk-go/service/s3', 'cloud.google.com/go/storage')
+        code = code.replace('s3.New(', 'storage.NewClient(ctx)')
         return code
     
     def _migrate_lambda_to_cloud_functions(self, code: str) -> str:
         """Migrate AWS Lambda Go code to Google Cloud Functions (fallback regex)"""
-        # Replace Lambda handler signature
-        code = re.sub(
-            r'func\s+Handler\(',
-            'func HelloWorld(',
-            code
-        )
-        return code
+        return _apply_rewrites(code, _GO_LAMBDA_TO_CLOUD_FUNCTIONS_REWRITES)
     
     def _migrate_dynamodb_to_firestore(self, code: str) -> str:
         """Migrate AWS DynamoDB Go code to Google Firestore (fallback regex)"""
         # Replace DynamoDB imports
-        code = re.sub(
-            r'github\.com/aws/aws-sdk-go/service/dynamodb',
-            'cloud.google.com/go/firestore',
-            code
-        )
-        code = re.sub(
-            r'dynamodb\.New\(',
-            'firestore.NewClient(ctx, projectID)',
-            code
-        )
+        code = code.replace('github.com/aws/aws-sdk-go/service/dynamodb', 'cloud.google.com/go/firestore')
+        code = code.replace('dynamodb.New(', 'firestore.NewClient(ctx, projectID)')
         return code
     
     def _migrate_sqs_to_pubsub(self, code: str) -> str:
         """Migrate AWS SQS Go code to Google Pub/Sub (fallback regex)"""
-        code = re.sub(
-            r'github\.com/aws/aws-sdk-go/service/sqs',
-            'cloud.google.com/go/pubsub',
-            code
-        )
-        code = re.sub(
-            r'sqs\.New\(',
-            'pubsub.NewClient(ctx, projectID)',
-            code
-        )
+        code = code.replace('github.com/aws/aws-sdk-go/service/sqs', 'cloud.google.com/go/pubsub')
+        code = code.replace('sqs.New(', 'pubsub.NewClient(ctx, projectID)')
         return code
     
     def _migrate_sns_to_pubsub(self, code: str) -> str:
         """Migrate AWS SNS Go code to Google Pub/Sub (fallback regex)"""
-        code = re.sub(
-            r'github\.com/aws/aws-sdk-go/service/sns',
-            'cloud.google.com/go/pubsub',
-            code
-        )
-        code = re.sub(
-            r'sns\.New\(',
-            'pubsub.NewClient(ctx, projectID)',
-            code
-        )
+        code = code.replace('github.com/aws/aws-sdk-go/service/sns', 'cloud.google.com/go/pubsub')
+        code = code.replace('sns.New(', 'pubsub.NewClient(ctx, projectID)')
         return code
     
     def _migrate_rds_to_cloud_sql(self, code: str) -> str:
         """Migrate AWS RDS Go code to Google Cloud SQL (fallback regex)"""
-        code = re.sub(
-            r'github\.com/aws/aws-sdk-go/service/rds',
-            'cloud.google.com/go/cloudsqlconn',
-            code
-        )
+        code = code.replace('github.com/aws/aws-sdk-go/service/rds', 'cloud.google.com/go/cloudsqlconn')
         return code
     
     def _migrate_ec2_to_compute_engine(self, code: str) -> str:
         """Migrate AWS EC2 Go code to Google Compute Engine (fallback regex)"""
-        code = re.sub(
-            r'github\.com/aws/aws-sdk-go/service/ec2',
-            'cloud.google.com/go/compute/apiv1',
-            code
-        )
+        code = code.replace('github.com/aws/aws-sdk-go/service/ec2', 'cloud.google.com/go/compute/apiv1')
         return code
     
 
 class ExtendedCSharpTransformer(BaseExtendedTransformer):
     """Extended transformer for C# code - uses Gemini API for transformations"""
     
+    _migration_methods = {
+        's3_to_gcs': '_migrate_s3_to_gcs',
+        'lambda_to_cloud_functions': '_migrate_lambda_to_cloud_functions',
+        'dynamodb_to_firestore': '_migrate_dynamodb_to_firestore',
+    }
+    
     def transform(self, code: str, recipe: Dict[str, Any]) -> str:
         """Transform C# code based on the recipe"""
         # C# transformations are handled by Gemini API in transform_code()
@@ -7772,47 +6811,100 @@ class ExtendedCSharpTransformer(BaseExtendedTransformer):
         service_type = recipe.get('service_type', '')
         
         if operation == 'service_migration' and service_type:
-            if service_type == 's3_to_gcs':
-                return self._migrate_s3_to_gcs(code)
-            elif service_type == 'lambda_to_cloud_functions':
-                return self._migrate_lambda_to_cloud_functions(code)
-            elif service_type == 'dynamodb_to_firestore':
-                return self._migrate_dynamodb_to_firestore(code)
+            migrate = self._migrations.get(service_type)
+            if migrate is not None:
+                return migrate(code)
         
         return code
     
     def _migrate_s3_to_gcs(self, code: str) -> str:
         """Migrate AWS S3 C# code to Google Cloud Storage (fallback regex)"""
-        # Basic import replacement
-        code = re.sub(
-            r'using\s+Amazon\.S3[^;]*;',
-            'using Google.Cloud.Storage.V1;',
-            code
-        )
-        code = re.sub(
-            r'IAmazonS3\s+(\w+)\s*=',
-            r'StorageClient \1 =',
-            code
-        )
-        return code
+        return _apply_rewrites(code, _CSHARP_S3_TO_GCS_REWRITES)
     
     def _migrate_lambda_to_cloud_functions(self, code: str) -> str:
         """Migrate AWS Lambda C# code to Google Cloud Functions (fallback regex)"""
-        code = re.sub(
-            r'using\s+Amazon\.Lambda[^;]*;',
-            'using Google.Cloud.Functions.Framework;',
-            code
-        )
-        return code
+        return _apply_rewrites(code, _CSHARP_LAMBDA_TO_CLOUD_FUNCTIONS_REWRITES)
     
     def _migrate_dynamodb_to_firestore(self, code: str) -> str:
         """Migrate AWS DynamoDB C# code to Google Cloud Firestore (fallback regex)"""
-        code = re.sub(
-            r'using\s+Amazon\.DynamoDBv2[^;]*;',
-            'using Google.Cloud.Firestore;',
-            code
-        )
-        return code
+        return _apply_rewrites(code, _CSHARP_DYNAMODB_TO_FIRESTORE_REWRITES)
+
+
+# GCP target API inferred by apply_refactoring when none is given
+_TARGET_API = MappingProxyType({
+    's3_to_gcs': 'GCS',
+    'lambda_to_cloud_functions': 'Cloud Functions',
+    'dynamodb_to_firestore': 'Firestore',
+    'sqs_to_pubsub': 'Pub/Sub',
+    'sns_to_pubsub': 'Pub/Sub',
+    'rds_to_cloud_sql': 'Cloud SQL',
+    'cloudwatch_to_monitoring': 'Cloud Monitoring',
+})
+
+# AWS services identify_and_migrate_services migrates
+_SUPPORTED_AWS = frozenset({
+    AWSService.S3, AWSService.LAMBDA, AWSService.DYNAMODB,
+    AWSService.SQS, AWSService.SNS, AWSService.RDS, AWSService.CLOUDWATCH,
+})
+
+# (step, AWS pattern suffix, target replacement suffix) for each recipe step
+_TRANSFORMATION_STEP_TEMPLATES = (
+    ('replace_imports', 'imports', 'SDK imports'),
+    ('replace_client_init', 'client initialization', 'client initialization'),
+    ('replace_api_calls', 'API calls', 'API calls'),
+)
+
+
+@lru_cache(maxsize=128)
+def _source_api_name(service_type: str) -> str:
+    """AWS API name for a service type, e.g. 'AWS S3' for 's3_to_gcs'"""
+    return f'AWS {service_type.partition("_to_")[0].upper()}'
+
+
+@lru_cache(maxsize=128)
+def _migration_service_type(aws_service: AWSService, gcp_service: GCPService) -> str:
+    """Service type identify_and_migrate_services migrates a service under, e.g. 's3-to-cloud-storage'"""
+    return f"{aws_service.value}_to_{gcp_service.value}".replace('_', '-')
+
+
+def _service_migration_plan(code_analyzer: ExtendedCodeAnalyzer, service_mapper: ServiceMapper,
+                            source_code: str) -> tuple[Dict[str, Dict[str, Any]], List[str]]:
+    """identify_and_migrate_services' per-service results for source_code, and the service types it migrates in order"""
+    migration_results = {}
+    service_types = []
+    for aws_service, matches in code_analyzer.identify_aws_services_usage(source_code).items():
+        if aws_service in _SUPPORTED_AWS:
+            service_mapping = service_mapper.get_mapping(aws_service)
+            if service_mapping:
+                service_types.append(_migration_service_type(aws_service, service_mapping.gcp_service))
+                migration_results[aws_service.value] = {
+                    'status': 'migrated',
+                    'target_service': service_mapping.gcp_service.value,
+                    'patterns_found': len(matches)
+                }
+            else:
+                migration_results[aws_service.value] = {
+                    'status': 'not_supported',
+                    'target_service': 'unknown',
+                    'patterns_found': len(matches)
+                }
+    return migration_results, service_types
+
+
+# Engine used by _transform_code_in_worker, built once per worker process by
+# _start_transform_worker like the engine whose batch the pool transforms
+_worker_ast_engine = None
+
+
+def _start_transform_worker(engine_type: type, service_mapper: ServiceMapper) -> None:
+    """Build the worker process's engine from the batching engine's class and service mapper"""
+    global _worker_ast_engine
+    _worker_ast_engine = engine_type(service_mapper)
+
+
+def _transform_code_in_worker(code: str, language: str, recipe: Dict[str, Any]) -> tuple[str, dict]:
+    """Apply transform_code to one source inside a process pool worker"""
+    return _worker_ast_engine.transform_code(code, language, recipe)
 
 
 class ExtendedSemanticRefactoringService:
@@ -7823,9 +6915,17 @@ class ExtendedSemanticRefactoringService:
     for multiple service types.
     """
     
+    # Maximum number of transformed sources kept by apply_refactoring
+    REFACTORING_CACHE_SIZE = 1024
+    
     def __init__(self, ast_engine: ExtendedASTTransformationEngine):
         self.ast_engine = ast_engine
-        self.service_mapper = ServiceMapper()
+        # Share the engine's mapper rather than building a second one
+        self.service_mapper = ast_engine.service_mapper
+        # Reused by every identify_and_migrate_services call
+        self.code_analyzer = ExtendedCodeAnalyzer(aws_service_mapper=self.service_mapper)
+        # (source digest, language, service_type, target_api) -> transformed code
+        self._refactoring_cache = LRUCache(self.REFACTORING_CACHE_SIZE)
     
     def generate_transformation_recipe(self, source_code: str, target_api: str, language: str, service_type: str, llm_recipe: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -7834,30 +6934,23 @@ class ExtendedSemanticRefactoringService:
         If llm_recipe is provided, it contains LLM-generated guidance for transformations.
         Otherwise, uses rule-based recipe generation.
         """
+        source_api = _source_api_name(service_type)
+        
         # Base recipe structure
         recipe = {
             'language': language,
             'operation': 'service_migration',
             'service_type': service_type,
-            'source_api': f'AWS {service_type.split("_to_")[0].upper()}',
+            'source_api': source_api,
             'target_api': target_api,
             'llm_recipe': llm_recipe,  # Include LLM guidance if available
             'transformation_steps': [
                 {
-                    'step': 'replace_imports',
-                    'pattern': f'AWS {service_type.split("_to_")[0].upper()} imports',
-                    'replacement': f'{target_api} SDK imports'
-                },
-                {
-                    'step': 'replace_client_init',
-                    'pattern': f'AWS {service_type.split("_to_")[0].upper()} client initialization',
-                    'replacement': f'{target_api} client initialization'
-                },
-                {
-                    'step': 'replace_api_calls',
-                    'pattern': f'AWS {service_type.split("_to_")[0].upper()} API calls',
-                    'replacement': f'{target_api} API calls'
+                    'step': step,
+                    'pattern': f'{source_api} {pattern}',
+                    'replacement': f'{target_api} {replacement}'
                 }
+                for step, pattern, replacement in _TRANSFORMATION_STEP_TEMPLATES
             ]
         }
         
@@ -7874,28 +6967,32 @@ class ExtendedSemanticRefactoringService:
     def apply_refactoring(self, source_code: str, language: str, service_type: str, target_api: str = None) -> str:
         """
         Apply refactoring to the source code for the specified service type
+        
+        Results are cached, so refactoring an identical source again skips both
+        cleanup passes as well as the transformation; fallback results and
+        sources above _MAX_CACHED_CODE_LENGTH are not cached.
         """
+        # If target API is not specified, infer it from the service type
+        if not target_api:
+            target_api = _TARGET_API.get(service_type, target_api)
+        
+        # Identical sources (e.g. generated files in a monorepo) are transformed once
+        cache_key = None
+        if len(source_code) <= _MAX_CACHED_CODE_LENGTH:
+            cache_key = (
+                _source_digest(source_code),
+                language,
+                service_type,
+                target_api
+            )
+            cached = self._refactoring_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
         # CRITICAL: Run aggressive AWS cleanup FIRST, before any processing
         if language == 'python':
             source_code = self.ast_engine._aggressive_aws_cleanup(source_code)
         
-        # If target API is not specified, infer it from the service type
-        if not target_api:
-            if service_type == 's3_to_gcs':
-                target_api = 'GCS'
-            elif service_type == 'lambda_to_cloud_functions':
-                target_api = 'Cloud Functions'
-            elif service_type == 'dynamodb_to_firestore':
-                target_api = 'Firestore'
-            elif service_type == 'sqs_to_pubsub':
-                target_api = 'Pub/Sub'
-            elif service_type == 'sns_to_pubsub':
-                target_api = 'Pub/Sub'
-            elif service_type == 'rds_to_cloud_sql':
-                target_api = 'Cloud SQL'
-            elif service_type == 'cloudwatch_to_monitoring':
-                target_api = 'Cloud Monitoring'
-        
         # Generate transformation recipe (llm_recipe parameter can be passed from use case)
         recipe = self.generate_transformation_recipe(
             source_code, 
@@ -7908,6 +7005,7 @@ class ExtendedSemanticRefactoringService:
         # Apply transformations using AST engine
         # transform_code returns (transformed_code, variable_mapping) tuple
         result = self.ast_engine.transform_code(source_code, language, recipe)
+        used_fallback = self.ast_engine.used_fallback
         
         # Handle both tuple and string returns
         if isinstance(result, tuple):
@@ -7919,42 +7017,64 @@ class ExtendedSemanticRefactoringService:
         if language == 'python':
             transformed_code = self.ast_engine._aggressive_aws_cleanup(transformed_code)
         
+        if cache_key is not None and not used_fallback:
+            self._refactoring_cache.put(cache_key, transformed_code)
+        
         return transformed_code
     
     def identify_and_migrate_services(self, source_code: str, language: str) -> Dict[str, str]:
         """
         Identify which AWS services are used in the code and migrate them
         """
-        code_analyzer = ExtendedCodeAnalyzer()
-        services_found = code_analyzer.identify_aws_services_usage(source_code)
+        migration_results, service_types = _service_migration_plan(self.code_analyzer, self.service_mapper, source_code)
         
         migrated_code = source_code
-        migration_results = {}
-        
-        for aws_service, matches in services_found.items():
-            if aws_service in [AWSService.S3, AWSService.LAMBDA, AWSService.DYNAMODB, 
-                             AWSService.SQS, AWSService.SNS, AWSService.RDS, AWSService.CLOUDWATCH]:
-                
-                service_mapping = self.service_mapper.get_mapping(aws_service)
-                if service_mapping:
-                    # Create service type string
-                    service_type = f"{aws_service.value}_to_{service_mapping.gcp_service.value}"
-                    service_type = service_type.replace('_', '-')
-                    
-                    migrated_code = self.apply_refactoring(migrated_code, language, service_type)
-                    migration_results[aws_service.value] = {
-                        'status': 'migrated',
-                        'target_service': service_mapping.gcp_service.value,
-                        'patterns_found': len(matches)
-                    }
-                else:
-                    migration_results[aws_service.value] = {
-                        'status': 'not_supported',
-                        'target_service': 'unknown',
-                        'patterns_found': len(matches)
-                    }
+        for service_type in service_types:
+            migrated_code = self.apply_refactoring(migrated_code, language, service_type)
         
         return migration_results
+    
+    def identify_and_migrate_services_batch(self, sources: List[tuple], max_workers: Optional[int] = None) -> List[Dict[str, str]]:
+        """
+        Identify the services of many sources, given as (source_code, language) tuples
+        
+        Returns, in input order, the results identify_and_migrate_services would
+        return, without running the migrations whose code those results leave out.
+        Batches the engine's transform_batch would spread over a process pool are
+        analyzed the same way, with this service's analyzer and mapper; others
+        run inline.
+        """
+        sources = list(sources)
+        if (len(sources) >= self.ast_engine.PARALLEL_BATCH_MIN_ITEMS
+                and sum(len(code) for code, _ in sources) >= self.ast_engine.PARALLEL_BATCH_MIN_SOURCE_SIZE
+                and max_workers != 1):
+            try:
+                with ProcessPoolExecutor(max_workers=max_workers, initializer=_start_service_analysis_worker,
+                                         initargs=(self.code_analyzer, self.service_mapper)) as executor:
+                    return list(executor.map(_service_migration_results_in_worker, (code for code, _ in sources)))
+            except (OSError, BrokenProcessPool) as e:
+                import logging
+                logging.getLogger(__name__).warning(f"Parallel service analysis unavailable, analyzing serially: {e}")
+        
+        return [_service_migration_plan(self.code_analyzer, self.service_mapper, code)[0] for code, _ in sources]
+
+
+# Analyzer and mapper used by _service_migration_results_in_worker, set once per
+# worker process by _start_service_analysis_worker
+_worker_code_analyzer = None
+_worker_service_mapper = None
+
+
+def _start_service_analysis_worker(code_analyzer: ExtendedCodeAnalyzer, service_mapper: ServiceMapper) -> None:
+    """Keep the batching service's analyzer and mapper for the worker process"""
+    global _worker_code_analyzer, _worker_service_mapper
+    _worker_code_analyzer = code_analyzer
+    _worker_service_mapper = service_mapper
+
+
+def _service_migration_results_in_worker(source_code: str) -> Dict[str, Dict[str, Any]]:
+    """identify_and_migrate_services' results for one source, inside a process pool worker"""
+    return _service_migration_plan(_worker_code_analyzer, _worker_service_mapper, source_code)[0]
 
 
 def create_extended_semantic_refactoring_engine() -> ExtendedSemanticRefactoringService:
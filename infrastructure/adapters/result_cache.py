@@ -0,0 +1,38 @@
+"""
+Bounded LRU Cache for Transformation Results
+
+Shared by the AWS and Azure refactoring engines, so both keep repeated
+identical transformations under the same size bound and eviction policy.
+"""
+
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class LRUCache:
+    """
+    Cache holding at most maxsize entries, evicting the least recently used
+
+    None is not a cacheable value: get returns it for a miss.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the value cached for key, marking it most recently used, or None"""
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Cache value for key, evicting the least recently used entry when full"""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -5,6 +5,7 @@ This module extends the original agent to support multiple cloud services
 with their GCP equivalents, including AWS and Azure services.
 """
 
+import re
 from enum import Enum
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
@@ -390,23 +391,34 @@ class ServiceMapper:
         return list(cls.SERVICE_MAPPINGS.keys())
 
 
+# The client name each AWS service's API patterns all contain, matched with
+# the same case-insensitivity; a service whose name the code lacks cannot
+# match any of its patterns
+_AWS_SERVICE_CLIENT_NAME_RES = {
+    aws_service: re.compile({AWSService.FARGATE: 'ecs'}.get(aws_service, aws_service.value), re.IGNORECASE)
+    for aws_service in AWSService
+}
+
+
 class ExtendedCodeAnalyzer:
     """Extended code analyzer that can identify multiple cloud services"""
 
-    def __init__(self):
-        self.aws_service_mapper = ServiceMapper()
-        self.azure_service_mapper = AzureServiceMapper()
+    def __init__(self, aws_service_mapper: Optional[ServiceMapper] = None,
+                 azure_service_mapper: Optional[AzureServiceMapper] = None):
+        self.aws_service_mapper = aws_service_mapper if aws_service_mapper is not None else ServiceMapper()
+        self.azure_service_mapper = azure_service_mapper if azure_service_mapper is not None else AzureServiceMapper()
 
     def identify_aws_services_usage(self, code_content: str) -> Dict[AWSService, List[str]]:
         """Identify which AWS services are used in the given code content"""
         services_found = {}
 
         for aws_service, mapping in self.aws_service_mapper.get_all_mappings().items():
+            if not _AWS_SERVICE_CLIENT_NAME_RES[aws_service].search(code_content):
+                continue
             patterns = mapping.aws_api_patterns
             matches = []
 
             for pattern in patterns:
-                import re
                 matches.extend(re.findall(pattern, code_content, re.IGNORECASE))
 
             if matches:
@@ -418,13 +430,12 @@ class ExtendedCodeAnalyzer:
         """Identify which Azure services are used in the given code content"""
         services_found = {}
 
-        for azure_service, mapping in self.azure_service_mapper.get_all_mappings().items():
-            patterns = mapping.azure_api_patterns
+        for azure_service in self.azure_service_mapper.get_all_mappings():
+            patterns, _ = self.azure_service_mapper.get_compiled_api_patterns(azure_service)
             matches = []
 
             for pattern in patterns:
-                import re
-                matches.extend(re.findall(pattern, code_content, re.IGNORECASE))
+                matches.extend(pattern.findall(code_content))
 
             if matches:
                 services_found[azure_service] = matches
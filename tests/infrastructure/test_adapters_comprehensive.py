@@ -9,6 +9,7 @@ import unittest
 import tempfile
 import os
 from unittest.mock import Mock, patch, MagicMock, mock_open
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
 from domain.entities.codebase import Codebase, ProgrammingLanguage
@@ -20,6 +21,7 @@ from infrastructure.adapters import (
 from infrastructure.repositories import (
     FileRepositoryAdapter, CodebaseRepositoryAdapter, PlanRepositoryAdapter
 )
+from infrastructure.adapters.dependency_graph_builder import DependencyGraphBuilder
 
 
 class TestFileRepositoryAdapterComprehensive(unittest.TestCase):
@@ -496,5 +498,66 @@ class TestTestRunnerAdapterComprehensive(unittest.TestCase):
             self.assertIn(key, results)
 
 
+class TestDependencyGraphBuilderComprehensive(unittest.TestCase):
+    """Comprehensive test cases for DependencyGraphBuilder"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.builder = DependencyGraphBuilder()
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_python_exports_are_top_level_only(self):
+        """Test that names defined inside functions and classes are not exports"""
+        with open(os.path.join(self.temp_dir, "helpers.py"), 'w') as f:
+            f.write(
+                "import os\n"
+                "LIMIT = 10\n"
+                "def load():\n"
+                "    import json\n"
+                "    local_value = 1\n"
+                "    def inner():\n"
+                "        pass\n"
+                "class Loader:\n"
+                "    def read(self):\n"
+                "        pass\n"
+            )
+        
+        self.builder.build_graph(self.temp_dir, ['python'])
+        
+        self.assertEqual(self.builder.exports_map["helpers.py"], ["LIMIT", "load", "Loader"])
+        self.assertEqual(self.builder.imports_map["helpers.py"], ["os", "json"])
+
+    def test_parallel_analysis_matches_serial_build(self):
+        """Test that analyzing files in a process pool builds the same graph as inline analysis"""
+        sources = {
+            "models.py": "LIMIT = 10\nclass User:\n    pass\n",
+            "service.py": "import os\nfrom models import User, LIMIT\ndef load():\n    return User()\n",
+            "app.py": "import service\nfrom models import User\nservice.load()\n",
+            "utils.py": "def helper():\n    pass\n",
+            "Main.java": "import com.example.Util;\npublic class Main {\n    public static final int LIMIT = 1;\n}\n",
+        }
+        for name, source in sources.items():
+            with open(os.path.join(self.temp_dir, name), 'w') as f:
+                f.write(source)
+
+        serial_builder = DependencyGraphBuilder(max_workers=1)
+        serial_graph = serial_builder.build_graph(self.temp_dir, ['python', 'java'])
+
+        parallel_builder = DependencyGraphBuilder(max_workers=2)
+        parallel_builder.PARALLEL_ANALYSIS_MIN_FILES = 1
+        with patch('infrastructure.adapters.dependency_graph_builder.ProcessPoolExecutor',
+                   wraps=ProcessPoolExecutor) as pool:
+            parallel_graph = parallel_builder.build_graph(self.temp_dir, ['python', 'java'])
+
+        pool.assert_called_once_with(max_workers=2)
+        self.assertTrue(serial_graph)
+        self.assertEqual(parallel_graph, serial_graph)
+        self.assertEqual(parallel_builder.imports_map, serial_builder.imports_map)
+        self.assertEqual(parallel_builder.exports_map, serial_builder.exports_map)
+
+
 if __name__ == '__main__':
     unittest.main()
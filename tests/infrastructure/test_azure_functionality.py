@@ -3,7 +3,8 @@ Test for Azure to GCP functionality
 """
 
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
+from infrastructure.adapters import azure_extended_semantic_engine
 from infrastructure.adapters.azure_extended_semantic_engine import AzureExtendedSemanticRefactoringService, AzureExtendedASTTransformationEngine
 from infrastructure.adapters.service_mapping import ExtendedCodeAnalyzer
 from infrastructure.adapters.azure_mapping import AzureServiceMapper
@@ -218,6 +219,90 @@ telemetry_client.flush()
             mapping = mapper.get_mapping(service)
             self.assertIsNotNone(mapping, f"Mapping for {service} should exist")
 
+    def test_apply_refactoring_reuses_result_for_identical_source(self):
+        """Test that identical source code is only transformed once per service type"""
+        original_code = """
+from azure.storage.blob import BlobServiceClient
+blob_service_client = BlobServiceClient.from_connection_string(conn_str="connection_string")
+"""
+        self.ast_engine.transform_code = Mock(wraps=self.ast_engine.transform_code)
+
+        first = self.service.apply_refactoring(original_code, "python", "azure_blob_storage_to_gcs")
+        second = self.service.apply_refactoring(original_code, "python", "azure_blob_storage_to_gcs")
+        self.service.apply_refactoring(original_code, "python", "azure_cosmos_db_to_firestore")
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.ast_engine.transform_code.call_count, 2)
+
+    def test_apply_refactoring_cache_evicts_least_recently_used(self):
+        """Test that a full refactoring cache evicts the least recently used source"""
+        sources = [f"from azure.storage.blob import BlobServiceClient\ncontainer_{index} = None\n" for index in range(3)]
+        self.service._refactoring_cache.maxsize = 2
+        self.ast_engine.transform_code = Mock(wraps=self.ast_engine.transform_code)
+
+        self.service.apply_refactoring(sources[0], "python", "azure_blob_storage_to_gcs")
+        self.service.apply_refactoring(sources[1], "python", "azure_blob_storage_to_gcs")
+        # Reusing the first source makes the second the least recently used
+        self.service.apply_refactoring(sources[0], "python", "azure_blob_storage_to_gcs")
+        self.service.apply_refactoring(sources[2], "python", "azure_blob_storage_to_gcs")
+        self.assertEqual(self.ast_engine.transform_code.call_count, 3)
+
+        self.service.apply_refactoring(sources[0], "python", "azure_blob_storage_to_gcs")
+        self.assertEqual(self.ast_engine.transform_code.call_count, 3)
+        self.service.apply_refactoring(sources[1], "python", "azure_blob_storage_to_gcs")
+        self.assertEqual(self.ast_engine.transform_code.call_count, 4)
+
+    def test_apply_refactoring_does_not_cache_gemini_fallback(self):
+        """Test that a source returned unchanged after Gemini fails is transformed again next time"""
+        original_code = 'package main\n\nimport "github.com/Azure/azure-sdk-for-go/sdk/storage/azblob"\n'
+        migrated_code = 'package main\n\n// Migrated by Gemini\nimport "cloud.google.com/go/storage"\n'
+
+        with patch.dict('sys.modules', {'google.generativeai': None}):
+            first = self.service.apply_refactoring(original_code, "go", "azure_blob_storage_to_gcs")
+        with patch.object(self.ast_engine, '_transform_azure_with_gemini_primary',
+                          return_value=migrated_code) as transform:
+            second = self.service.apply_refactoring(original_code, "go", "azure_blob_storage_to_gcs")
+            third = self.service.apply_refactoring(original_code, "go", "azure_blob_storage_to_gcs")
+
+        self.assertNotEqual(first, second)
+        self.assertIn('// Migrated by Gemini', second)
+        self.assertEqual(third, second)
+        transform.assert_called_once()
+
+    def test_migration_is_found_for_service_type_containing_it(self):
+        """Test that the Python transformer dispatches a prefixed service type like an exact one"""
+        transformer = self.ast_engine.transformers['python']
+
+        self.assertEqual(
+            transformer._migration_containing('azure_aks_to_gke'),
+            transformer._migrate_azure_aks_to_gke,
+        )
+        self.assertEqual(
+            transformer._migration_containing('migrate_azure_aks_to_gke'),
+            transformer._migrate_azure_aks_to_gke,
+        )
+        self.assertIsNone(transformer._migration_containing('azure_unknown'))
+
+    def test_target_api_is_inferred_from_service_type(self):
+        """Test that the target API is looked up for exact and prefixed service types"""
+        self.assertEqual(azure_extended_semantic_engine._inferred_target_api('azure_aks_to_gke'), 'GKE')
+        self.assertEqual(azure_extended_semantic_engine._inferred_target_api('migrate_aws_s3_to_gcs'), 'GCS')
+        self.assertIsNone(azure_extended_semantic_engine._inferred_target_api('azure_unknown'))
+
+    def test_syntax_check_remembers_valid_sources_only(self):
+        """Test that parsed sources are cached while invalid ones raise every time"""
+        check = azure_extended_semantic_engine._check_python_syntax
+        azure_extended_semantic_engine._cached_syntax_check.cache_clear()
+
+        check("bucket = client.bucket('name')\n")
+        check("bucket = client.bucket('name')\n")
+        for _ in range(2):
+            with self.assertRaises(SyntaxError):
+                check("bucket = client.bucket(\n")
+
+        info = azure_extended_semantic_engine._cached_syntax_check.cache_info()
+        self.assertEqual((info.hits, info.currsize), (1, 1))
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -5,12 +5,14 @@ Testing the extended functionality for multi-service migrations
 """
 
 import unittest
+import re
 from unittest.mock import Mock, patch
 import tempfile
 import os
 
 from infrastructure.adapters.service_mapping import ServiceMapper, ExtendedCodeAnalyzer
 from domain.value_objects import AWSService
+from infrastructure.adapters import extended_semantic_engine
 from infrastructure.adapters.extended_semantic_engine import ExtendedSemanticRefactoringService, ExtendedASTTransformationEngine
 from infrastructure.adapters.s3_gcs_migration import MultiServicePlannerAgent, MultiServiceRefactoringEngineAgent
 from application.use_cases import CreateMultiServiceRefactoringPlanUseCase
@@ -72,6 +74,19 @@ response = lambda_client.invoke(FunctionName='my-function', Payload='{}')
         self.assertIn(AWSService.LAMBDA, services_found)
         self.assertGreater(len(services_found[AWSService.LAMBDA]), 0)
 
+    def test_identify_usage_ignores_case(self):
+        """Test that the service name check is as case-insensitive as the API patterns"""
+        services_found = self.analyzer.identify_aws_services_usage("S3.Upload_File('file', 'bucket', 'key')\n")
+        self.assertEqual(list(services_found), [AWSService.S3])
+
+    def test_code_without_service_names_is_not_scanned(self):
+        """Test that no API pattern runs over code that names no AWS service"""
+        with patch('infrastructure.adapters.service_mapping.re.findall') as findall:
+            services_found = self.analyzer.identify_aws_services_usage("def add(a, b):\n    return a + b\n")
+
+        self.assertEqual(services_found, {})
+        findall.assert_not_called()
+
 
 class TestExtendedSemanticRefactoringService(unittest.TestCase):
     """Test cases for ExtendedSemanticRefactoringService"""
@@ -111,7 +126,67 @@ s3_client.upload_file('local_file', 'bucket_name', 's3_key')
         # The refactored code should contain GCS patterns
         self.assertIn("google.cloud", refactored_code)
         self.assertNotIn("boto3.client('s3')", refactored_code)
-    
+
+    def test_repeated_refactoring_hits_cache(self):
+        """Test that a second identical refactoring reuses the cached transformation"""
+        original_code = """
+import boto3
+s3_client = boto3.client('s3')
+s3_client.upload_file('local_file', 'bucket_name', 's3_key')
+"""
+
+        with patch.object(self.ast_engine, '_transform_code_uncached',
+                          wraps=self.ast_engine._transform_code_uncached) as transform:
+            first = self.service.apply_refactoring(original_code, "python", "s3_to_gcs")
+            second = self.service.apply_refactoring(original_code, "python", "s3_to_gcs")
+
+        transform.assert_called_once()
+        self.assertEqual(first, second)
+
+    def test_repeated_refactoring_skips_cleanup(self):
+        """Test that a second identical refactoring returns the cached result without cleaning up again"""
+        original_code = """
+import boto3
+s3_client = boto3.client('s3')
+s3_client.upload_file('local_file', 'bucket_name', 's3_key')
+"""
+
+        with patch.object(self.ast_engine, '_aggressive_aws_cleanup',
+                          wraps=self.ast_engine._aggressive_aws_cleanup) as cleanup:
+            first = self.service.apply_refactoring(original_code, "python", "s3_to_gcs")
+            calls_for_first = cleanup.call_count
+            second = self.service.apply_refactoring(original_code, "python", "s3_to_gcs")
+
+        self.assertEqual(cleanup.call_count, calls_for_first)
+        self.assertEqual(first, second)
+
+    def test_fallback_refactoring_is_not_cached(self):
+        """Test that a result produced after Gemini fails is transformed again next time"""
+        original_code = """
+import boto3
+sqs = boto3.client('sqs')
+sqs.send_message(QueueUrl='queue-url', MessageBody='hello')
+"""
+
+        with patch.dict('sys.modules', {'google.generativeai': None}), \
+                patch.object(self.ast_engine, '_transform_code_uncached',
+                             wraps=self.ast_engine._transform_code_uncached) as transform:
+            self.service.apply_refactoring(original_code, "python", "sqs_to_pubsub")
+            self.service.apply_refactoring(original_code, "python", "sqs_to_pubsub")
+
+        self.assertEqual(transform.call_count, 2)
+
+    def test_used_fallback_is_reset_by_each_transformation(self):
+        """Test that the engine reports a fallback for the call that used it only"""
+        sqs_code = "import boto3\nsqs = boto3.client('sqs')\nsqs.send_message(QueueUrl='queue-url', MessageBody='hello')\n"
+        s3_code = "import boto3\ns3_client = boto3.client('s3')\ns3_client.upload_file('file', 'bucket', 'key')\n"
+
+        with patch.dict('sys.modules', {'google.generativeai': None}):
+            self.ast_engine.transform_code(sqs_code, "python", {'operation': 'service_migration', 'service_type': 'sqs_to_pubsub'})
+            self.assertTrue(self.ast_engine.used_fallback)
+            self.ast_engine.transform_code(s3_code, "python", {'operation': 'service_migration', 'service_type': 's3_to_gcs'})
+            self.assertFalse(self.ast_engine.used_fallback)
+
     def test_identify_and_migrate_services(self):
         """Test identifying and migrating multiple services"""
         code_with_multiple_services = """
@@ -131,6 +206,413 @@ lambda_client.invoke(FunctionName='func', Payload='{}')
         self.assertIn('s3', results)
         self.assertIn('lambda', results)
 
+    def test_code_analyzer_shares_the_engine_mapper(self):
+        """Test that the service's analyzer is built once around the engine's mapper"""
+        self.assertIs(self.service.code_analyzer.aws_service_mapper, self.ast_engine.service_mapper)
+
+
+class _TaggingEngine(ExtendedASTTransformationEngine):
+    """Engine subclass whose results show which class transformed them"""
+
+    def transform_code(self, code, language, transformation_recipe):
+        transformed_code, variable_mapping = super().transform_code(code, language, transformation_recipe)
+        return transformed_code + '# tagged\n', variable_mapping
+
+
+class _S3UnsupportedMapper(ServiceMapper):
+    """Service mapper configured without an S3 migration"""
+
+    def get_mapping(self, aws_service):
+        return None if aws_service == AWSService.S3 else super().get_mapping(aws_service)
+
+
+class TestTransformBatch(unittest.TestCase):
+    """Test cases for ExtendedASTTransformationEngine.transform_batch"""
+    
+    def setUp(self):
+        self.engine = ExtendedASTTransformationEngine()
+        s3_recipe = {'operation': 'service_migration', 'service_type': 's3_to_gcs'}
+        self.items = [
+            ("import boto3\ns3_client = boto3.client('s3')\ns3_client.upload_file('file', 'bucket', 'key')\n", 'python', s3_recipe),
+            ("import boto3\ns3 = boto3.client('s3')\ns3.download_file('bucket', 'key', 'file')\n", 'python', s3_recipe),
+            ("x = 1\n", 'python', s3_recipe),
+        ]
+        self.expected = [ExtendedASTTransformationEngine().transform_code(*item) for item in self.items]
+    
+    def test_parallel_batch_keeps_input_order(self):
+        """Test that pooled results come back in input order"""
+        self.engine.PARALLEL_BATCH_MIN_SOURCE_SIZE = 0
+        
+        self.assertEqual(self.engine.transform_batch(self.items, max_workers=2), self.expected)
+    
+    def test_small_batch_runs_serially(self):
+        """Test that batches below the size threshold do not start a process pool"""
+        with patch('infrastructure.adapters.extended_semantic_engine.ProcessPoolExecutor') as pool:
+            results = self.engine.transform_batch(self.items)
+        
+        pool.assert_not_called()
+        self.assertEqual(results, self.expected)
+    
+    def test_pool_failure_falls_back_to_serial(self):
+        """Test that the batch is transformed serially when no process pool can start"""
+        self.engine.PARALLEL_BATCH_MIN_SOURCE_SIZE = 0
+        with patch('infrastructure.adapters.extended_semantic_engine.ProcessPoolExecutor',
+                   side_effect=OSError('process pool unavailable')) as pool:
+            results = self.engine.transform_batch(self.items, max_workers=2)
+        
+        pool.assert_called_once()
+        self.assertEqual(results, self.expected)
+
+    def test_parallel_batch_uses_the_engine_class_and_mapper(self):
+        """Test that pool workers transform like the batching engine rather than a default one"""
+        engine = _TaggingEngine(ServiceMapper())
+        engine.PARALLEL_BATCH_MIN_SOURCE_SIZE = 0
+        expected = [engine.transform_code(*item) for item in self.items]
+        
+        self.assertEqual(engine.transform_batch(self.items, max_workers=2), expected)
+
+
+class TestVariableMappings(unittest.TestCase):
+    """Test cases for the variable mappings kept by the Python transformer"""
+
+    def test_mapping_is_found_by_source_content(self):
+        """Test that an equal source built separately finds the stored variable mapping"""
+        transformer = ExtendedASTTransformationEngine().transformers['python']
+        code = "import boto3\ns3 = boto3.client('s3')\ns3.download_file('bucket', 'key', 'file')\n"
+        transformer.transform(code, {'operation': 'service_migration', 'service_type': 's3_to_gcs'})
+
+        equal_code = ''.join(code.splitlines(keepends=True))
+        self.assertIsNot(equal_code, code)
+        mapping = transformer._variable_mappings.get(extended_semantic_engine._source_digest(equal_code))
+        self.assertEqual(mapping, {'s3': 'gcs_client'})
+
+
+class TestIdentifyAndMigrateServicesBatch(unittest.TestCase):
+    """Test cases for ExtendedSemanticRefactoringService.identify_and_migrate_services_batch"""
+    
+    def setUp(self):
+        self.service = ExtendedSemanticRefactoringService(ExtendedASTTransformationEngine())
+        self.sources = [
+            ("import boto3\ns3_client = boto3.client('s3')\ns3_client.upload_file('file', 'bucket', 'key')\n", 'python'),
+            ("import boto3\nlambda_client = boto3.client('lambda')\nlambda_client.invoke(FunctionName='func', Payload='{}')\n", 'python'),
+            ("x = 1\n", 'python'),
+        ]
+        reference = ExtendedSemanticRefactoringService(ExtendedASTTransformationEngine())
+        self.expected = [reference.identify_and_migrate_services(*source) for source in self.sources]
+    
+    def test_parallel_batch_keeps_input_order(self):
+        """Test that pooled results come back in input order"""
+        self.service.ast_engine.PARALLEL_BATCH_MIN_SOURCE_SIZE = 0
+        
+        self.assertEqual(self.service.identify_and_migrate_services_batch(self.sources, max_workers=2), self.expected)
+    
+    def test_small_batch_runs_serially(self):
+        """Test that batches below the size threshold do not start a process pool"""
+        with patch('infrastructure.adapters.extended_semantic_engine.ProcessPoolExecutor') as pool:
+            results = self.service.identify_and_migrate_services_batch(self.sources)
+        
+        pool.assert_not_called()
+        self.assertEqual(results, self.expected)
+    
+    def test_batch_does_not_run_migrations(self):
+        """Test that the batch reports services without migrating code it would discard"""
+        with patch.object(self.service, 'apply_refactoring') as apply_refactoring:
+            results = self.service.identify_and_migrate_services_batch(self.sources)
+        
+        apply_refactoring.assert_not_called()
+        self.assertEqual(results, self.expected)
+    
+    def test_parallel_batch_uses_the_service_mapper(self):
+        """Test that pool workers analyze with the batching service's mapper"""
+        service = ExtendedSemanticRefactoringService(ExtendedASTTransformationEngine(_S3UnsupportedMapper()))
+        service.ast_engine.PARALLEL_BATCH_MIN_SOURCE_SIZE = 0
+        
+        results = service.identify_and_migrate_services_batch(self.sources, max_workers=2)
+        
+        self.assertEqual(results[0]['s3']['status'], 'not_supported')
+        self.assertEqual(results, [service.identify_and_migrate_services(*source) for source in self.sources])
+
+
+class TestDetectAwsServices(unittest.TestCase):
+    """Test cases for the single-scan AWS service detection"""
+
+    CODE = """
+import boto3
+s3 = boto3.client('S3')
+table.put_item(Item=item)
+sqs.send_message(QueueUrl=url, MessageBody=body)
+
+def lambda_handler(event, context):
+    return {}
+"""
+
+    def test_regex_scan_detects_services(self):
+        """Test detection without Hyperscan"""
+        with patch.object(extended_semantic_engine, '_aws_service_usage_database', return_value=None):
+            services = extended_semantic_engine._detect_aws_services(self.CODE)
+
+        self.assertEqual(services, frozenset({'s3', 'dynamodb', 'sqs', 'lambda'}))
+
+    @unittest.skipIf(extended_semantic_engine.hyperscan is None, "hyperscan not installed")
+    def test_hyperscan_scan_matches_regex_scan(self):
+        """Test that the Hyperscan database finds the same services as the regex"""
+        for code in (self.CODE, "x = 1\n", "sns.publish(TopicArn=arn)\nfn.invoke(FunctionName=name)\n"):
+            with patch.object(extended_semantic_engine, '_aws_service_usage_database', return_value=None):
+                expected = extended_semantic_engine._detect_aws_services(code)
+            self.assertEqual(extended_semantic_engine._detect_aws_services(code), expected)
+
+
+class TestDropAwsRegions(unittest.TestCase):
+    """Test cases for the token-based AWS region removal"""
+
+    def test_assignments_and_region_name_arguments(self):
+        """Test that region assignments are commented out and region_name arguments dropped"""
+        code = """def connect():
+    region = 'us-east-1'
+    return boto3.client('s3', region_name='us-west-2')
+"""
+
+        result = extended_semantic_engine._drop_aws_regions(code)
+
+        self.assertIn("    # region = 'us-east-1'  # Region not needed for GCP", result)
+        self.assertIn("boto3.client('s3')", result)
+
+    def test_comments_docstrings_and_keyword_arguments_are_kept(self):
+        """Test that regions outside assignments and region_name arguments are left alone"""
+        code = '''def connect(region='us-east-1'):
+    """Connect with region_name='us-east-1', like the console"""
+    # region = 'us-east-1'
+    return configure(
+        region='us-west-2',
+    )
+'''
+
+        self.assertEqual(extended_semantic_engine._drop_aws_regions(code), code)
+
+    def test_module_level_region_constant_is_kept(self):
+        """Test that a module-level region constant used later is not commented out"""
+        code = """import boto3
+
+DYNAMO_REGION = 'us-east-1'
+
+def connect():
+    return boto3.resource('dynamodb', region_name=DYNAMO_REGION)
+"""
+
+        self.assertEqual(extended_semantic_engine._drop_aws_regions(code), code)
+        # Code that does not tokenize goes through the regexes, which keep it too
+        self.assertEqual(extended_semantic_engine._drop_aws_regions(code + '(\n'), code + '(\n')
+
+    def test_duplicate_region_name_arguments_are_both_dropped(self):
+        """Test that edits sharing the comma between two region_name arguments do not clash"""
+        code = "c = boto3.client(region_name='us-east-1', region_name='us-west-2')\n"
+
+        self.assertEqual(extended_semantic_engine._drop_aws_regions(code), "c = boto3.client()\n")
+
+
+class TestApplyEdits(unittest.TestCase):
+    """Test cases for one-pass offset edits"""
+
+    def test_edits_are_applied_in_one_pass(self):
+        """Test that each edit's offsets refer to the original code"""
+        code = "client = boto3.client('s3', region_name=region)"
+
+        self.assertEqual(
+            extended_semantic_engine._apply_edits(code, [(0, 6, 'gcs'), (26, 46, '')]),
+            "gcs = boto3.client('s3')",
+        )
+
+    def test_bytes_are_edited(self):
+        """Test that encoded source is edited as bytes"""
+        self.assertEqual(extended_semantic_engine._apply_edits(b'abcdef', [(1, 3, b'X')]), b'aXdef')
+
+
+class TestAsciiRewrites(unittest.TestCase):
+    """Test cases for rewrites scanned with re.ASCII patterns"""
+
+    def test_non_ascii_identifiers_keep_unicode_matching(self):
+        """Test that a non-ASCII identifier is matched whole, as under Unicode rules"""
+        rewrites = ((re.compile(r'\b\w+ = boto3'), 'client = boto3'),)
+
+        self.assertEqual(
+            extended_semantic_engine._apply_rewrites("café = boto3.client('s3')", rewrites),
+            "client = boto3.client('s3')",
+        )
+
+    def test_replacement_adding_non_ascii_text_switches_back_to_unicode(self):
+        """Test that rules after one inserting non-ASCII text match under Unicode rules"""
+        rewrites = (
+            ('s3', re.compile(r'\bs3\b'), 'données'),
+            ('=', re.compile(r'\b\w+ ='), 'client ='),
+        )
+
+        self.assertEqual(extended_semantic_engine._apply_call_rewrites('s3 = 1', rewrites), 'client = 1')
+
+
+class TestFusedCallRewrites(unittest.TestCase):
+    """Test cases for call rewrites fused into one alternation"""
+
+    def test_fused_pass_matches_rules_applied_in_order(self):
+        """Test that one fused pass rewrites every call like the rules applied in order"""
+        code = """eks.create_cluster(name='c1', roleArn=arn, resourcesVpcConfig=cfg)
+clusters = eks.list_clusters()
+eks.describe_cluster(name='c1')
+eks.delete_cluster(name='c1')
+"""
+
+        self.assertEqual(
+            extended_semantic_engine._apply_fused_call_rewrites(code, extended_semantic_engine._EKS_CALL_FUSED),
+            extended_semantic_engine._apply_call_rewrites(code, extended_semantic_engine._EKS_CALL_REWRITES),
+        )
+
+    def test_pattern_without_receiver_is_rejected(self):
+        """Test that a rule not starting with the receiver prefix cannot be fused"""
+        rewrites = (('create_cluster(', re.compile(r'create_cluster\(\)'), 'create()'),)
+
+        with self.assertRaises(ValueError):
+            extended_semantic_engine._fuse_call_rewrites(rewrites)
+
+
+class TestClientAssignmentRewrites(unittest.TestCase):
+    """Test cases for the boto3 client assignment rewrites"""
+
+    def test_client_call_spanning_lines_is_replaced_up_to_its_parenthesis(self):
+        """Test that a client call with arguments on several lines is replaced whole"""
+        code = "eks = boto3.client('eks',\n    region_name='us-east-1')\nclusters = eks.list_clusters()\n"
+
+        result = extended_semantic_engine._apply_rewrites(code, extended_semantic_engine._EKS_TO_GKE_REWRITES)
+
+        self.assertEqual(result, "eks = container_v1.ClusterManagerClient()\nclusters = eks.list_clusters()\n")
+
+    def test_client_call_without_closing_parenthesis_is_left_alone(self):
+        """Test that an unterminated client call does not match"""
+        code = "ecs = boto3.client('ecs', region_name='us-east-1'\n"
+
+        self.assertEqual(
+            extended_semantic_engine._apply_rewrites(code, extended_semantic_engine._FARGATE_TO_CLOUDRUN_REWRITES),
+            code,
+        )
+
+
+class TestRenameVariables(unittest.TestCase):
+    """Test cases for renaming variables in one scan of the source"""
+
+    def test_names_are_renamed_outside_strings(self):
+        """Test that names are renamed in code and f-string fields but not in string text"""
+        code = """sqs = boto3.client('sqs')
+queue_url = 'https://sqs.us-east-1.amazonaws.com/123456789012/queue'
+print(f"{sqs.meta} sent")
+"""
+
+        self.assertEqual(
+            extended_semantic_engine._rename_variables(code, {'sqs': 'publisher'}),
+            """publisher = boto3.client('sqs')
+queue_url = 'https://sqs.us-east-1.amazonaws.com/123456789012/queue'
+print(f"{publisher.meta} sent")
+""",
+        )
+
+    def test_code_that_does_not_tokenize_is_renamed_as_text(self):
+        """Test that an unclosed bracket falls back to renaming over the text"""
+        self.assertEqual(
+            extended_semantic_engine._rename_variables("s3.upload(\n# s3.x\ns3.close()\n", {'s3': 'gcs_client'}),
+            "gcs_client.upload(\n# s3.x\ngcs_client.close()\n",
+        )
+
+    def test_names_are_renamed_outside_comment_lines(self):
+        """Test that uses as names are renamed while comment lines keep the old names"""
+        code = """s3 = storage.Client()
+    # s3.list_buckets() is replaced below
+obj = s3.bucket('b')  # s3 stays in a trailing comment
+print(s3)
+"""
+
+        self.assertEqual(
+            extended_semantic_engine._rename_variables(code, {'s3': 'gcs_client', 'obj': 'blob'}),
+            """gcs_client = storage.Client()
+    # s3.list_buckets() is replaced below
+blob = gcs_client.bucket('b')  # s3 stays in a trailing comment
+print(gcs_client)
+""",
+        )
+
+
+class TestRequiredLiteral(unittest.TestCase):
+    """Test cases for the literal gating of rewrite rules"""
+
+    def test_longest_unquantified_literal_is_required(self):
+        """Test that the longest literal outside groups and quantifiers is read off a pattern"""
+        pattern = re.compile(r'\b(\w+)\s*=\s*(\w+)\.get_object\(Bucket=([^,]+)\)')
+
+        self.assertEqual(extended_semantic_engine._required_literal(pattern), '.get_object(Bucket=')
+
+    def test_quantified_character_is_not_required(self):
+        """Test that a character followed by a quantifier ends the literal"""
+        pattern = re.compile(r'boto3\.clients?\(')
+
+        self.assertEqual(extended_semantic_engine._required_literal(pattern), 'boto3.client')
+
+    def test_patterns_without_a_safe_literal_always_run(self):
+        """Test that case-insensitive and alternation patterns get no literal"""
+        self.assertEqual(extended_semantic_engine._required_literal(re.compile(r'boto3', re.IGNORECASE)), '')
+        self.assertEqual(extended_semantic_engine._required_literal(re.compile(r'sqs_client|sns_client')), '')
+
+    def test_gated_rules_match_ungated_rules(self):
+        """Test that literal gating leaves the rewrites' output unchanged"""
+        rewrites = (
+            (re.compile(r'\bs3_client\b'), 'storage_client'),
+            (re.compile(r'\b(\w+)\.list_objects_v2\s*\(\s*Bucket\s*=\s*([^\)]+)\s*\)'), r'\1.list_blobs(\2)'),
+        )
+        code = "objects = s3_client.list_objects_v2(Bucket='b')\n"
+
+        self.assertEqual(
+            extended_semantic_engine._apply_call_rewrites(code, extended_semantic_engine._with_required_literals(rewrites)),
+            extended_semantic_engine._apply_rewrites(code, rewrites),
+        )
+
+
+class TestPartiallyMigratedCode(unittest.TestCase):
+    """Test cases for service migrations on code that already imports the GCP client"""
+
+    def setUp(self):
+        self.transformer = ExtendedASTTransformationEngine().transformers['python']
+
+    def _migrate(self, code, service_type):
+        return self.transformer.transform(code, {'operation': 'service_migration', 'service_type': service_type})
+
+    def test_remaining_s3_calls_are_migrated(self):
+        """Test that S3 calls are rewritten even when google.cloud.storage is imported"""
+        code = """from google.cloud import storage
+
+
+def save(s3, bucket, key, body):
+    s3.put_object(Bucket=bucket, Key=key, Body=body)
+"""
+
+        self.assertNotIn('put_object', self._migrate(code, 's3_to_gcs'))
+
+    def test_remaining_sqs_calls_are_migrated(self):
+        """Test that SQS calls are rewritten even when google.cloud.pubsub_v1 is imported"""
+        code = """from google.cloud import pubsub_v1
+
+
+def send(sqs_client, queue_url, body):
+    sqs_client.send_message(QueueUrl=queue_url, MessageBody=body)
+"""
+
+        self.assertNotIn('send_message', self._migrate(code, 'sqs_to_pubsub'))
+
+    def test_fully_migrated_code_is_unchanged(self):
+        """Test that code with the GCP import and no AWS calls is returned as is"""
+        code = """from google.cloud import pubsub_v1
+
+
+def send(publisher, topic_path, body):
+    publisher.publish(topic_path, body.encode('utf-8'))
+"""
+
+        self.assertEqual(self._migrate(code, 'sqs_to_pubsub'), code)
+
 
 class TestMultiServiceUseCases(unittest.TestCase):
     """Test cases for multi-service use cases"""